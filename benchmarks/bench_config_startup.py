@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Startup-time benchmark for YAML config loading.
+
+Generates a synthetic overlay set and measures, in fresh interpreter processes,
+the time from importing the config modules to having the merged document:
+
+- cold-pure:  `load_yaml_files` with PyYAML's pure-Python SafeLoader
+- cold-c:     `load_yaml_files` with the libyaml CSafeLoader (if available)
+- warm-cache: `config_cache.load_yaml_files_cached` with a populated cache
+
+Usage:
+    python benchmarks/bench_config_startup.py [--files 20] [--keys 200] [--runs 7]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_CHILD = r"""
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.config import config_loader
+mode = {mode!r}
+if mode == "cold-pure":
+    config_loader._SafeLoader = config_loader.yaml.SafeLoader
+    config_loader.load_yaml_files({config_dir!r})
+elif mode == "cold-c":
+    config_loader.load_yaml_files({config_dir!r})
+else:
+    from src.config.config_cache import load_yaml_files_cached
+    load_yaml_files_cached({config_dir!r}, {cache_dir!r})
+print(time.perf_counter() - t0)
+"""
+
+
+def write_overlays(config_dir: Path, files: int, keys: int) -> None:
+    for i in range(files):
+        doc = {
+            "agents": {f"agent_{j}": {"enable": True, "interval_seconds": i * j, "name": f"a{i}-{j}"} for j in range(keys // 4)},
+            f"section_{i}": {
+                f"key_{j}": {"value": j, "tags": [f"t{k}" for k in range(3)], "url": "${OPENCLAW_API_BASE_URL}/x"}
+                for j in range(keys)
+            },
+        }
+        # JSON is valid YAML and keeps generation dependency-free
+        (config_dir / f"{i:03d}_overlay.yaml").write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+
+def run_child(mode: str, config_dir: Path, cache_dir: Path) -> float:
+    code = _CHILD.format(root=str(ROOT), mode=mode, config_dir=str(config_dir), cache_dir=str(cache_dir))
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20, help="number of overlay files")
+    parser.add_argument("--keys", type=int, default=200, help="keys per overlay section")
+    parser.add_argument("--runs", type=int, default=7, help="fresh processes per mode")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    from src.config import config_loader
+
+    modes = ["cold-pure", "warm-cache"]
+    if getattr(config_loader.yaml, "CSafeLoader", None) is not None:
+        modes.insert(1, "cold-c")
+    else:
+        print("note: PyYAML built without libyaml; skipping cold-c")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp) / "config"
+        cache_dir = Path(tmp) / "cache"
+        config_dir.mkdir()
+        write_overlays(config_dir, args.files, args.keys)
+        size = sum(f.stat().st_size for f in config_dir.iterdir())
+        print(f"{args.files} files, {size / 1024:.0f} KiB of YAML, {args.runs} runs per mode")
+
+        run_child("warm-cache", config_dir, cache_dir)  # populate the cache
+        results = {}
+        for mode in modes:
+            timings = [run_child(mode, config_dir, cache_dir) for _ in range(args.runs)]
+            results[mode] = statistics.median(timings)
+
+    base = results["cold-pure"]
+    for mode, t in results.items():
+        print(f"{mode:<11} {t * 1000:9.1f} ms  ({base / t:5.1f}x vs cold-pure)")
+
+
+if __name__ == "__main__":
+    main()
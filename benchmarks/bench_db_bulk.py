@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark for the pooled repository layer (src/db/database.py, src/db/repository.py).
+
+Compares inserting research findings one row per transaction (the naive
+design) with `bulk_insert` in "batch" and "copy" mode, then streams the table
+back and reports rows/s and peak Python memory while streaming. Runs against
+a SQLite file by default; pass `--postgres` to use `db_config.json` / `DB_*`
+(requires psycopg and a reachable server).
+
+Usage:
+    python benchmarks/bench_db_bulk.py [--rows 20000] [--naive-rows 2000] [--postgres]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.db.database import Database  # noqa: E402
+from src.db.repository import FINDING_COLUMNS, ChimeraRepository  # noqa: E402
+
+
+def finding(task_id: int, i: int) -> dict:
+    return {
+        "task_id": task_id,
+        "trends_data": {"topic": f"trend-{i}", "score": i % 100, "tags": ["a", "b"]},
+        "topic_ideation": f"idea {i}",
+        "audience_signals": "18-34, urban",
+        "source_urls": [f"https://example.com/{i}"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="rows per bulk method")
+    parser.add_argument("--naive-rows", type=int, default=2000, help="rows for the per-row baseline")
+    parser.add_argument("--postgres", action="store_true", help="use db_config.json / DB_* instead of SQLite")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    db = Database() if args.postgres else Database.sqlite(Path(tmp.name) / "bench.db", pool_max=4)
+    db.create_schema()
+    repo = ChimeraRepository(db)
+    task_id = repo.create_task(repo.create_influencer("bench", "benchmark persona"), "bench task")
+
+    insert = f"INSERT INTO research_findings ({', '.join(FINDING_COLUMNS)}) VALUES ({', '.join(['%s'] * len(FINDING_COLUMNS))})"
+    start = time.perf_counter()
+    for i in range(args.naive_rows):
+        row = finding(task_id, i)
+        db.execute(insert, [db.backend.adapt(c, row.get(c)) for c in FINDING_COLUMNS])
+    naive = args.naive_rows / (time.perf_counter() - start)
+    print(f"{'per-row transactions':<22} {naive:10.0f} rows/s")
+
+    for method in ("batch", "copy"):
+        rows = (finding(task_id, i) for i in range(args.rows))
+        start = time.perf_counter()
+        n = repo.add_findings(rows, method=method)
+        rate = n / (time.perf_counter() - start)
+        print(f"{'bulk_insert ' + method:<22} {rate:10.0f} rows/s  ({rate / naive:.0f}x)")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = sum(1 for _ in repo.iter_findings(task_id, batch_size=500))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{'stream read':<22} {count / elapsed:10.0f} rows/s  ({count} rows, peak {peak / 1024:.0f} KiB)")
+    print("pool:", db.pool.stats())
+    db.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark for compiled OpenClaw payload validation.
+
+Measures per-payload validation time for the Influencer, Campaign and
+Research shapes (specs/openclaw_integration.md) against
+`schemas/openclaw_payload_schema.json`, for single payloads (`is_valid`),
+batches (`validate_many`) and an invalid payload with error paths.
+
+Usage:
+    python benchmarks/bench_payload_validation.py [--number 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.openclaw.validation import load_validator  # noqa: E402
+
+PAYLOADS = {
+    "influencer": {
+        "influencer_id": "inf-123",
+        "name": "Ada",
+        "platform": "instagram",
+        "followers": 125000,
+        "engagement_score": 0.043,
+        "category": "tech",
+    },
+    "campaign": {
+        "campaign_id": "cmp-9",
+        "keywords": ["ai", "gadgets", "launch"],
+        "start_date": "2026-03-01",
+        "end_date": "2026-03-31",
+        "objective": "awareness",
+    },
+    "research": {
+        "trend": "wearable ai",
+        "influencer_ids": ["inf-123", "inf-456"],
+        "insights": "Rising interest among early adopters.",
+        "timestamp": "2026-02-05T10:00:00Z",
+    },
+}
+
+INVALID = {"campaign_id": "cmp-9", "keywords": ["ai", 3], "start_date": "2026-03-01", "end_date": "soon", "objective": "x"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="iterations per measurement")
+    args = parser.parse_args()
+
+    validator = load_validator(ROOT / "schemas" / "openclaw_payload_schema.json")
+    for name, payload in PAYLOADS.items():
+        assert validator.is_valid(payload), name
+        per = min(timeit.repeat(lambda: validator.is_valid(payload), number=args.number, repeat=5)) / args.number
+        print(f"is_valid   {name:<11} {per * 1e6:7.2f} us/payload")
+
+    batch = list(PAYLOADS.values()) * 100
+    per = min(timeit.repeat(lambda: validator.validate_many(batch), number=max(1, args.number // 300), repeat=5))
+    per /= max(1, args.number // 300) * len(batch)
+    print(f"batch      mixed       {per * 1e6:7.2f} us/payload ({len(batch)} per batch)")
+
+    per = min(timeit.repeat(lambda: validator.validate(INVALID), number=args.number // 10, repeat=3)) / (args.number // 10)
+    print(f"validate   invalid     {per * 1e6:7.2f} us/payload ({len(validator.validate(INVALID))} issues)")
+
+    per = min(timeit.repeat(lambda: load_validator(ROOT / "schemas" / "openclaw_payload_schema.json"), number=1000, repeat=3)) / 1000
+    print(f"load       cached      {per * 1e6:7.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
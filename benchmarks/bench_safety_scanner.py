@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the safety scanning pipeline (src/agents/safety_agent).
+
+Generates `--drafts` synthetic drafts (a few percent containing policy terms)
+and a policy list padded to `--terms` phrases, then reports drafts/s for:
+
+- the naive design: one substring search per term per draft, single core
+  (run on a sample, it is slow);
+- `SafetyScanner.scan_batch` inline (one core) and on process pools of 2,
+  4, ... up to `--max-workers`;
+- `SafetyScanJob.run_once` end to end on a SQLite file (read drafts, score,
+  write reviews and mark drafts scanned).
+
+Pool numbers only scale up to the number of CPUs in the machine.
+
+Usage:
+    python benchmarks/bench_safety_scanner.py [--drafts 20000] [--terms 2000] [--max-workers 8] [--chunk-size 256]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.agents.safety_agent.scanner import (  # noqa: E402
+    DEFAULT_POLICIES,
+    PolicyCategory,
+    SafetyScanJob,
+    SafetyScanner,
+)
+from src.db.database import Database  # noqa: E402
+from src.db.repository import ChimeraRepository  # noqa: E402
+
+WORDS = (
+    "the a new today launch product review style morning coffee city travel summer vibe team collab fitness "
+    "routine recipe unboxing honest thoughts behind scenes creator community update week favorite look drop "
+    "limited edition code link bio story reel live stream podcast episode guest tips tricks beginner guide"
+).split()
+
+
+def make_policies(terms: int, rnd: random.Random) -> list:
+    policies = list(DEFAULT_POLICIES)
+    have = sum(len(p.terms) for p in policies)
+    extra = tuple(f"zq{rnd.randrange(10**6)} {rnd.choice(WORDS)}" for _ in range(max(0, terms - have)))
+    if extra:
+        policies.append(PolicyCategory("synthetic", 0.5, extra))
+    return policies
+
+
+def make_drafts(n: int, rnd: random.Random, words: int = 250) -> list:
+    flagged = [t for p in DEFAULT_POLICIES for t in p.terms]
+    drafts = []
+    for i in range(n):
+        body = [rnd.choice(WORDS) for _ in range(words)]
+        if rnd.random() < 0.05:
+            body.insert(rnd.randrange(words), rnd.choice(flagged))
+        drafts.append({"id": i + 1, "content_body": " ".join(body).capitalize() + "."})
+    return drafts
+
+
+def naive(drafts: list, policies: list) -> int:
+    terms = [t for p in policies for t in p.terms]
+    hits = 0
+    for d in drafts:
+        text = d["content_body"].casefold()
+        hits += sum(1 for t in terms if t in text)
+    return hits
+
+
+def rate(n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drafts", type=int, default=20000)
+    parser.add_argument("--terms", type=int, default=2000, help="policy phrases in total")
+    parser.add_argument("--max-workers", type=int, default=max(4, os.cpu_count() or 1))
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--naive-drafts", type=int, default=500, help="sample size for the naive baseline")
+    args = parser.parse_args()
+
+    rnd = random.Random(7)
+    policies = make_policies(args.terms, rnd)
+    drafts = make_drafts(args.drafts, rnd)
+    print(f"{args.drafts} drafts, {sum(len(p.terms) for p in policies)} terms, {os.cpu_count()} CPUs")
+
+    sample = drafts[: args.naive_drafts]
+    base = rate(len(sample), lambda: naive(sample, policies))
+    print(f"{'naive per-term scan':<24} {base:10.0f} drafts/s")
+
+    with SafetyScanner(policies, workers=1) as scanner:
+        inline = rate(len(drafts), lambda: scanner.scan_batch(drafts))
+    print(f"{'workers=1 (inline)':<24} {inline:10.0f} drafts/s  ({inline / base:.0f}x naive)")
+
+    workers = 2
+    while workers <= args.max_workers:
+        with SafetyScanner(policies, workers=workers, chunk_size=args.chunk_size) as scanner:
+            scanner.scan_batch(drafts[: args.chunk_size * workers * 2])  # start the pool
+            pooled = rate(len(drafts), lambda: scanner.scan_batch(drafts))
+        print(f"{'workers=' + str(workers):<24} {pooled:10.0f} drafts/s  ({pooled / inline:.2f}x inline)")
+        workers *= 2
+
+    tmp = tempfile.TemporaryDirectory()
+    db = Database.sqlite(Path(tmp.name) / "safety.db", pool_max=4)
+    db.create_schema()
+    repo = ChimeraRepository(db)
+    task_id = repo.create_task(repo.create_influencer("bench", "benchmark persona"), "bench task")
+    repo.add_drafts({"task_id": task_id, "content_body": d["content_body"]} for d in drafts)
+    scanner = SafetyScanner(policies, workers=min(args.max_workers, os.cpu_count() or 1), chunk_size=args.chunk_size)
+    job = SafetyScanJob(scanner, repo, batch_size=2000, alert_on_violation=False)
+    start = time.perf_counter()
+    result = job.run_once()
+    elapsed = time.perf_counter() - start
+    print(f"{'incremental job':<24} {args.drafts / elapsed:10.0f} drafts/s  {result}")
+    start = time.perf_counter()
+    job.run_once()
+    print(f"{'job with nothing new':<24} {(time.perf_counter() - start) * 1e3:10.1f} ms")
+    scanner.close()
+    db.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Multi-worker contention benchmark for the tasks work queue (src/db/task_queue.py).
+
+Seeds `--tasks` pending tasks, then runs `--workers` threads that each claim
+batches of `--batch` tasks and complete them until the queue is empty. Reports
+claims/s and the number of tasks handed to more than one worker. For
+comparison it runs the naive "SELECT candidates, then UPDATE them" pattern,
+which races and double-claims. Runs on a SQLite file by default; `--postgres`
+uses `db_config.json` / `DB_*` (requires psycopg and a server with schema.sql
+applied; the benchmark truncates `tasks`).
+
+Usage:
+    python benchmarks/bench_task_queue.py [--tasks 5000] [--workers 8] [--batch 10] [--postgres]
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.db.database import Database  # noqa: E402
+from src.db.task_queue import TaskQueue  # noqa: E402
+
+
+def seed(db: Database, n: int) -> None:
+    db.execute("DELETE FROM tasks")
+    db.bulk_insert("tasks", ("description", "priority"), ((f"task {i}", i % 10) for i in range(n)), method="batch")
+
+
+def run_workers(workers: int, work) -> tuple:
+    claims: "collections.Counter[int]" = collections.Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(workers + 1)
+
+    def loop(w: int) -> None:
+        barrier.wait()
+        while True:
+            ids = work(w)
+            if not ids:
+                return
+            with lock:
+                claims.update(ids)
+
+    threads = [threading.Thread(target=loop, args=(w,)) for w in range(workers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(claims.values()), sum(1 for c in claims.values() if c > 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=10, help="tasks claimed per statement")
+    parser.add_argument("--postgres", action="store_true", help="use db_config.json / DB_* instead of SQLite")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    if args.postgres:
+        db = Database()
+    else:
+        db = Database.sqlite(Path(tmp.name) / "queue.db", pool_max=args.workers + 1)
+        db.create_schema()
+
+    seed(db, args.tasks)
+    queues = [TaskQueue(db, worker_id=f"w{w}", lease_seconds=60) for w in range(args.workers)]
+
+    def claim(w: int) -> list:
+        rows = queues[w].claim(args.batch)
+        for r in rows:
+            queues[w].complete(r["id"], "drafting")
+        return [r["id"] for r in rows]
+
+    elapsed, total, dup = run_workers(args.workers, claim)
+    print(f"{'TaskQueue.claim':<22} {total / elapsed:9.0f} tasks/s  claimed={total} double-claimed={dup}")
+
+    seed(db, args.tasks)
+
+    def naive(w: int) -> list:
+        rows = db.fetch_all(
+            "SELECT id FROM tasks WHERE status = 'pending' ORDER BY priority DESC, created_at LIMIT %s", [args.batch]
+        )
+        ids = [r["id"] for r in rows]
+        for i in ids:
+            db.execute("UPDATE tasks SET status = 'drafting', claimed_by = %s WHERE id = %s", [f"w{w}", i])
+        return ids
+
+    elapsed, total, dup = run_workers(args.workers, naive)
+    print(f"{'naive select+update':<22} {total / elapsed:9.0f} tasks/s  claimed={total} double-claimed={dup}")
+
+    db.execute("DELETE FROM tasks")
+    waiter = TaskQueue(db, worker_id="waiter", poll_interval=5.0)
+    got: list = []
+    t = threading.Thread(target=lambda: got.append((waiter.claim_wait(1, timeout=5.0), time.perf_counter())))
+    t.start()
+    time.sleep(0.1)
+    sent = time.perf_counter()
+    db.execute("INSERT INTO tasks (description) VALUES ('wake')")
+    queues[0].notify()  # PostgreSQL: the tasks_notify_ready trigger does this
+    t.join()
+    rows, woke = got[0]
+    print(f"wakeup latency: {(woke - sent) * 1e3:.1f} ms (poll interval 5000 ms, claimed {len(rows)})")
+    db.close()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""Microbenchmark suite with a stored baseline and a regression gate.
+
+Covers the hot paths every agent goes through:
+
+- config:  `parse_dotenv`, `load_yaml_files`, `_deep_merge`,
+           `resolve_placeholders` and `validate_required_keys` on synthetic
+           configs of increasing size (`--sizes`, keys per config)
+- logging: records/s through loggers built by `get_logger` with a console
+           handler, console + rotating file, and the async pipeline
+- adapter: `send_payload` and `health_check(force=True)` against an
+           in-process HTTP stub (keep-alive, always 200). The client rate
+           limiter is disabled so the request path, not the token bucket, is
+           measured.
+
+Each case is timed with an auto-ranged loop (at least `--min-time` seconds per
+repeat) `--repeat` times. Results are written to `--output` (under the
+git-ignored `benchmarks/results/`) as JSON. With `--save-baseline` they also
+become the baseline; otherwise every case is compared with the baseline and the
+run exits with status 1 if any case regressed. The gate compares the median of
+the repeats, not the best: on a shared host the best of a few repeats moved by
+30-40 % between back-to-back runs with no code change, the median by under
+20 %. A case counts as regressed only if its median is slower by more than
+`--threshold` (0.5 = 50 %) *and* by more than `--noise-floor` seconds per
+operation, so sub-10 us cases cannot fail on scheduler jitter alone.
+
+Baselines are machine specific, so they are kept under version control in
+`benchmarks/baselines/<runner>.json`, one per runner. The runner key is
+`--runner`, else `$BENCH_RUNNER` (set it to the CI runner name), else derived
+from the OS, CPU architecture, Python version and CPU count. A run without a
+baseline for its runner only reports; an explicit `--baseline` path that does
+not exist is an error (status 2), so a misconfigured gate cannot pass silently.
+A baseline saved with `--advisory` (e.g. one recorded on a shared or
+single-CPU host) is compared and reported, but never fails the run; record a
+non-advisory baseline on a dedicated runner to make the gate binding.
+The single-topic `bench_*.py` scripts remain for deeper runs.
+
+Usage:
+    python benchmarks/run_suite.py [--save-baseline] [--runner ci-linux] [--baseline PATH]
+                                   [--threshold 0.5] [--noise-floor 2e-6] [--advisory]
+                                   [--filter config.] [--quick]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.config import config_loader  # noqa: E402
+from src.logging.logger import flush_logging, get_logger  # noqa: E402
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+BASELINES_DIR = ROOT / "benchmarks" / "baselines"
+FORMAT_VERSION = 1
+
+
+@dataclass
+class Case:
+    """One timed operation; `fn` performs `per_call` units of work."""
+
+    name: str
+    fn: Callable[[], Any]
+    per_call: int = 1
+    unit: str = "op"
+
+
+# -- config ----------------------------------------------------------------------
+def _nested(keys: int, leaf: Callable[[int], Any]) -> dict:
+    """`keys` leaves spread over sections of 10, like agents.<name>.<key>."""
+    doc: dict = {}
+    for i in range(keys):
+        doc.setdefault(f"section_{i // 10}", {}).setdefault(f"group_{i % 3}", {})[f"key_{i}"] = leaf(i)
+    return doc
+
+
+def config_cases(tmp: Path, sizes: Sequence[int]) -> Iterator[Case]:
+    for n in sizes:
+        env_file = tmp / f"bench_{n}.env"
+        env_file.write_text(
+            "# synthetic\n" + "".join(f'BENCH_SUITE_{n}_{i}="value-{i}"\n' for i in range(n)), encoding="utf-8"
+        )
+        yield Case(f"config.parse_dotenv[{n}]", lambda p=env_file: config_loader.parse_dotenv(p))
+
+        config_dir = tmp / f"config_{n}"
+        config_dir.mkdir()
+        for f in range(3):
+            doc = _nested(n, lambda i, f=f: {"value": i + f, "url": "${BENCH_BASE_URL}/x", "tags": ["a", "b"]})
+            # JSON is valid YAML and keeps generation dependency-free
+            (config_dir / f"{f:02d}_overlay.yaml").write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        yield Case(f"config.load_yaml_files[{n}]", lambda d=config_dir: config_loader.load_yaml_files(d))
+
+        base = _nested(n, lambda i: {"value": i, "enabled": True})
+        overlay = _nested(n, lambda i: {"value": -i})
+        # merging the same overlay again does identical work, so `base` can be reused
+        yield Case(f"config._deep_merge[{n}]", lambda b=base, o=overlay: config_loader._deep_merge(b, o))
+
+        doc = _nested(n, lambda i: {"url": "${BENCH_BASE_URL}/v1/" + str(i), "key": "${BENCH_API_KEY}", "n": i})
+        env = {"BENCH_BASE_URL": "https://api.example.com", "BENCH_API_KEY": "k"}
+        yield Case(f"config.resolve_placeholders[{n}]", lambda d=doc: config_loader.resolve_placeholders(d, env))
+
+        required = [f"section_{i // 10}.group_{i % 3}.key_{i}" for i in range(n)]
+        yield Case(
+            f"config.validate_required_keys[{n}]",
+            lambda d=base, r=required: config_loader.validate_required_keys(d, r),
+        )
+
+
+# -- logging ---------------------------------------------------------------------
+def logging_cases(tmp: Path, batch: int = 100) -> Iterator[Case]:
+    setups = {
+        "console": {"level": "INFO"},
+        "console+file": {"level": "INFO", "file": str(tmp / "logs" / "sync.log"), "max_bytes": 1 << 20, "backup_count": 2},
+        "async": {
+            "level": "INFO",
+            "file": str(tmp / "logs" / "async.log"),
+            "max_bytes": 1 << 20,
+            "backup_count": 2,
+            "async": True,
+            "queue_size": 10000,
+        },
+    }
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    for label, cfg in setups.items():
+        with contextlib.redirect_stderr(devnull):  # console handlers bind the current stream
+            logger = get_logger(f"bench.suite.{label}", {"logging": cfg})
+
+        def emit(logger: logging.Logger = logger, flush: bool = bool(cfg.get("async"))) -> None:
+            for i in range(batch):
+                logger.info("benchmark record %d for %s", i, "tenant-42")
+            if flush:
+                flush_logging()
+
+        yield Case(f"logging.info[{label}]", emit, per_call=batch, unit="record")
+
+    yield Case(
+        "logging.get_logger[configured]",
+        lambda: get_logger("bench.suite.console", {"logging": setups["console"]}),
+    )
+
+
+# -- adapter ---------------------------------------------------------------------
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real gateway
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    body = b'{"status":"ok"}'
+
+    def _reply(self, send_body: bool = True) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(self.body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._reply()
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._reply()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self._reply(send_body=False)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+@contextlib.contextmanager
+def stub_server() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="bench-stub", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def adapter_cases(stack: contextlib.ExitStack) -> Iterator[Case]:
+    base_url = stack.enter_context(stub_server())
+    saved = {k: os.environ.get(k) for k in ("OPENCLAW_API_BASE_URL", "OPENCLAW_API_KEY")}
+
+    def restore() -> None:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+    stack.callback(restore)
+    os.environ["OPENCLAW_API_BASE_URL"] = base_url
+    os.environ["OPENCLAW_API_KEY"] = "bench-key"
+
+    from config import openclaw_adapter as adapter
+
+    cfg = adapter.get_config()
+    adapter.get_resilient_caller({**cfg, "rate_limit": {}})  # first call builds the shared caller
+    payload = {
+        "trend": "wearable ai",
+        "influencer_ids": ["inf-123", "inf-456"],
+        "insights": "Rising interest among early adopters.",
+        "timestamp": "2026-02-05T10:00:00Z",
+    }
+    result = adapter.send_payload(payload)
+    if result.get("status") != "ok":
+        raise RuntimeError(f"send_payload against the stub failed: {result}")
+    yield Case("adapter.send_payload", lambda: adapter.send_payload(payload), unit="request")
+    yield Case("adapter.health_check", lambda: adapter.health_check(force=True), unit="check")
+
+
+# -- timing ----------------------------------------------------------------------
+def measure(case: Case, repeat: int, min_time: float) -> Dict[str, Any]:
+    fn = case.fn
+    fn()  # warm up caches, pooled connections and lazy imports
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        # aim slightly past min_time, never more than 10x per step
+        number = max(number + 1, min(number * 10, int(number * min_time * 1.2 / max(elapsed, 1e-9))))
+    timings = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append(time.perf_counter() - start)
+    units = number * case.per_call
+    best = min(timings) / units
+    return {
+        "unit": case.unit,
+        "number": number,
+        "per_call": case.per_call,
+        "best_s": best,
+        "median_s": statistics.median(timings) / units,
+        "per_second": 1.0 / best if best else float("inf"),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def runner_key() -> str:
+    """Default baseline key: OS, architecture, Python minor version and CPU count."""
+    key = os.environ.get("BENCH_RUNNER", "").strip()
+    if key:
+        return key
+    py = "".join(platform.python_version_tuple()[:2])
+    return f"{platform.system().lower()}-{platform.machine().lower()}-py{py}-{os.cpu_count()}cpu"
+
+
+def _typical(result: Dict[str, Any]) -> float:
+    # baselines recorded before medians were stored only have the best time
+    return result.get("median_s", result["best_s"])
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, noise_floor: float) -> List[str]:
+    """Print a comparison of median times; returns the names of regressed cases."""
+    regressions = []
+    old = baseline.get("results", {})
+    print(f"\n{'case (median)':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, cur in results.items():
+        prev = old.get(name)
+        if prev is None:
+            print(f"{name:<40} {'-':>12} {_fmt(_typical(cur)):>12} {'new':>8}")
+            continue
+        then, now = _typical(prev), _typical(cur)
+        change = now / then - 1.0
+        flag = ""
+        if change > threshold and now - then > noise_floor:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {_fmt(then):>12} {_fmt(now):>12} {change:+8.1%}{flag}")
+    return regressions
+
+
+def _fmt(seconds: float) -> str:
+    for scale, unit in ((1.0, "s"), (1e-3, "ms"), (1e-6, "us")):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def _write(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", type=Path, help="baseline file (default: benchmarks/baselines/<runner>.json)")
+    parser.add_argument("--runner", help="baseline key (default: $BENCH_RUNNER or derived from this machine)")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--advisory", action="store_true", help="with --save-baseline: report against it, never fail")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed median slowdown per case (0.5 = 50%%)")
+    parser.add_argument(
+        "--noise-floor", type=float, default=2e-6, help="ignore slowdowns below this many seconds per operation"
+    )
+    parser.add_argument("--filter", default="", help="regex; only run matching case names")
+    parser.add_argument("--sizes", default="10,100,1000", help="config sizes (keys per config)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per repeat")
+    parser.add_argument("--quick", action="store_true", help="repeat=3, min-time=0.02 (smoke runs)")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    args = parser.parse_args(argv)
+    explicit_baseline = args.baseline is not None
+    if not explicit_baseline:
+        args.baseline = BASELINES_DIR / f"{args.runner or runner_key()}.json"
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.02
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    pattern = re.compile(args.filter)
+
+    if args.list:
+        for group in ("config", "logging", "adapter"):
+            for name in _names(group, sizes):
+                if pattern.search(name):
+                    print(name)
+        return 0
+    if explicit_baseline and not args.save_baseline and not args.baseline.exists():
+        # checked before running so a misconfigured gate fails fast
+        print(f"baseline {args.baseline} does not exist", file=sys.stderr)
+        return 2
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+        groups = {
+            "config": lambda: config_cases(Path(tmp), sizes),
+            "logging": lambda: logging_cases(Path(tmp)),
+            "adapter": lambda: adapter_cases(stack),
+        }
+        for group, make in groups.items():
+            # skip a group's setup (e.g. the stub server) when none of its cases can match
+            if not any(pattern.search(name) for name in _names(group, sizes)):
+                continue
+            for case in make():
+                if not pattern.search(case.name):
+                    continue
+                r = measure(case, args.repeat, args.min_time)
+                results[case.name] = r
+                print(f"{case.name:<40} {_fmt(r['best_s']):>12}/{r['unit']}  {r['per_second']:12,.0f} {r['unit']}s/s")
+        flush_logging()
+
+    report = {
+        "version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": {"repeat": args.repeat, "min_time": args.min_time, "sizes": sizes},
+        "results": results,
+    }
+    _write(args.output, report)
+    if args.save_baseline:
+        _write(args.baseline, {**report, "advisory": True} if args.advisory else report)
+        print(f"\nbaseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nno baseline for this runner at {args.baseline}; run with --save-baseline and commit it")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("version") != FORMAT_VERSION:
+        print(f"\nbaseline format {baseline.get('version')} != {FORMAT_VERSION}; re-record it with --save-baseline")
+        return 2
+    env_now, env_then = report["environment"], baseline.get("environment", {})
+    if any(env_now.get(k) != env_then.get(k) for k in ("python", "machine", "cpus")):
+        print(f"\nwarning: baseline recorded on {env_then}, running on {env_now}")
+    regressions = compare(results, baseline, args.threshold, args.noise_floor)
+    missing = sorted(set(baseline.get("results", {})) - set(results))
+    if missing and not args.filter:
+        print(f"in baseline but not run: {', '.join(missing)}")
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        if baseline.get("advisory"):
+            print(f"{args.baseline} is advisory; not failing. Record a dedicated runner's baseline to gate on it.")
+            return 0
+        return 1
+    print(f"\nno regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+def _names(group: str, sizes: Sequence[int]) -> List[str]:
+    """Case names of a group without running its setup."""
+    if group == "config":
+        funcs = ("parse_dotenv", "load_yaml_files", "_deep_merge", "resolve_placeholders", "validate_required_keys")
+        return [f"config.{f}[{n}]" for n in sizes for f in funcs]
+    if group == "logging":
+        return [f"logging.info[{x}]" for x in ("console", "console+file", "async")] + ["logging.get_logger[configured]"]
+    return ["adapter.send_payload", "adapter.health_check"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,9 +3,24 @@
 Responsibilities:
 - Load OpenClaw config from `config/openclaw_config.yaml`.
 - Resolve environment placeholders (no secrets printed).
-- Provide `send_payload()` with schema validation (if schema file available).
-- Provide `health_check()` to test connectivity using configured auth.
-- Implements retry/backoff and returns status codes without exposing secrets.
+- Provide `send_payload()` with compiled schema validation (if schema file available).
+- Provide `send_batch()` / `batch_sender()` for bulk NDJSON/JSON-array ingestion.
+- Spool undeliverable payloads to a durable outbox and replay them
+  (`start_outbox_drainer()`).
+- Provide `health_check()` to test connectivity using configured auth
+  (concurrent probes, overall deadline, cached verdict).
+- Implements jittered retry/backoff, a per-endpoint circuit breaker and
+  client-side rate limiting (`src/openclaw/resilience.py`), and returns status
+  codes without exposing secrets.
+- Reuses pooled keep-alive connections (`src/openclaw/transport.py`) instead of
+  opening a new TCP/TLS connection per request.
+- Wraps each HTTP request in a tracing span and sends `traceparent` /
+  `X-Request-ID` headers (`src/logging/tracing.py`); `start_tracing()`
+  installs the span file exporter.
+- Records request latency, outcomes and retries in the in-process metrics
+  registry (`src/logging/metrics.py`); `start_metrics()` exposes them.
+- Provide `event_stream()`: a reconnecting, back-pressured consumer of
+  `openclaw.events.stream_url` (`src/openclaw/stream.py`).
 - Emits a lightweight telemetry event to MCP Sense via `.mcp/telemetry.yaml` (best-effort).
 
 This file is intentionally non-invasive and placed under `config/` so agents
@@ -15,22 +30,43 @@ from __future__ import annotations
 
 import json
 import os
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 try:
     import yaml
 except Exception:  # pragma: no cover - environment may not have pyyaml
     yaml = None  # type: ignore
 
-import urllib.request
-import urllib.error
-
 
 ROOT = Path(__file__).resolve().parents[1]
 CONFIG_PATH = ROOT / "config" / "openclaw_config.yaml"
 
+if str(ROOT) not in sys.path:  # allow `python config/openclaw_adapter.py`
+    sys.path.insert(0, str(ROOT))
+
+from src.logging.metrics import counter, histogram, start_metrics as _start_metrics  # noqa: E402
+from src.logging.tracing import configure_tracing, inject_headers, start_span, traced  # noqa: E402
+from src.openclaw.batching import (  # noqa: E402
+    BatchResult,
+    BatchSender,
+    ItemResult,
+    encode_batch,
+    encode_item,
+    item_results,
+    summarize,
+)
+from src.openclaw.outbox import Outbox, OutboxDrainer, OutboxError  # noqa: E402
+from src.openclaw.probe import ProbeEngine, build_probes  # noqa: E402
+from src.openclaw.resilience import CircuitBreaker, ResilientCaller, RetryPolicy, TokenBucket, classify  # noqa: E402
+from src.openclaw.stream import EventStream  # noqa: E402
+from src.openclaw.transport import AsyncHTTPTransport, HTTPTransport, Timeouts, TransportError  # noqa: E402
+from src.openclaw.validation import KindValidator, PayloadValidator, load_validator  # noqa: E402
+
 
 def _load_yaml(path: Path) -> dict:
     if yaml is None:
@@ -54,34 +90,131 @@ def load_config() -> dict:
         "api_key_present": bool(api_key),
         "auth_type": api_cfg.get("auth_type", "api_key"),
         "timeout_seconds": api_cfg.get("timeout_seconds", 30),
+        "connect_timeout_seconds": api_cfg.get("connect_timeout_seconds", min(10, api_cfg.get("timeout_seconds", 30))),
+        "pool_size": api_cfg.get("pool_size", 10),
+        "pool_idle_timeout_seconds": api_cfg.get("pool_idle_timeout_seconds", 30),
         "max_retries": api_cfg.get("max_retries", 3),
         "retry_backoff_seconds": api_cfg.get("retry_backoff_seconds", 5),
+        "retry_max_backoff_seconds": api_cfg.get("retry_max_backoff_seconds", 30),
+        "rate_limit": api_cfg.get("rate_limit", {}),
+        "circuit_breaker": api_cfg.get("circuit_breaker", {}),
         "validation": cfg.get("openclaw", {}).get("validation", {}),
+        "health_check": cfg.get("openclaw", {}).get("health_check", {}),
+        "batching": cfg.get("openclaw", {}).get("batching", {}),
+        "outbox": cfg.get("openclaw", {}).get("outbox", {}),
+        "metrics": cfg.get("openclaw", {}).get("metrics", {}),
+        "tracing": cfg.get("openclaw", {}).get("tracing", {}),
+        "events": cfg.get("openclaw", {}).get("events", {}),
     }
     return result
 
 
-def _request(url: str, method: str = "GET", headers: Optional[Dict[str, str]] = None, data: Optional[bytes] = None, timeout: int = 10) -> Tuple[Optional[int], Optional[str]]:
-    req = urllib.request.Request(url, method=method, data=data)
-    req.add_header("User-Agent", "openclaw-adapter/1.0")
-    if headers:
-        for k, v in headers.items():
-            req.add_header(k, v)
+_config_cache: Optional[Tuple[Tuple[Any, ...], dict]] = None
+
+
+def get_config() -> dict:
+    """Return `load_config()`, re-reading the YAML only when it or the env overrides change."""
+    global _config_cache
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return resp.getcode(), resp.read().decode("utf-8", errors="ignore")
-    except urllib.error.HTTPError as he:
-        return he.code, None
-    except Exception:
-        return None, None
+        st = CONFIG_PATH.stat()
+        file_key: Tuple[Any, ...] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        file_key = (None, None)
+    key = file_key + (os.environ.get("OPENCLAW_API_BASE_URL"), os.environ.get("OPENCLAW_API_KEY"))
+    cached = _config_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    cfg = load_config()
+    _config_cache = (key, cfg)
+    return cfg
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport(cfg: Optional[Dict[str, Any]] = None) -> HTTPTransport:
+    """Return the shared pooled transport, creating it from config on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                cfg = cfg if cfg is not None else get_config()
+                _transport = HTTPTransport(
+                    timeouts=Timeouts.from_config(cfg),
+                    pool_size=int(cfg.get("pool_size", 10)),
+                    idle_timeout=float(cfg.get("pool_idle_timeout_seconds", 30)),
+                )
+    return _transport
+
+
+_REQUEST_SECONDS = histogram("openclaw_request_seconds", "OpenClaw HTTP request latency", ("method",))
+_REQUESTS = counter("openclaw_requests_total", "OpenClaw HTTP requests by status class", ("method", "status"))
+_RETRIES = counter("openclaw_retries_total", "Retried OpenClaw deliveries (attempts beyond the first)")
+_CIRCUIT_OPEN = counter("openclaw_circuit_open_total", "Deliveries rejected by an open circuit breaker")
+
 
+def _observe_request(method: str, start: float, code: Optional[int]) -> None:
+    _REQUEST_SECONDS.labels(method).observe(time.perf_counter() - start)
+    _REQUESTS.labels(method, f"{code // 100}xx" if code else "error").inc()
 
-def health_check() -> Dict[str, Any]:
+
+def start_metrics() -> Dict[str, Any]:
+    """Start the metrics endpoint / snapshot writer configured under `openclaw.metrics`."""
+    return _start_metrics({"metrics": get_config().get("metrics", {})})
+
+
+def start_tracing() -> Any:
+    """Install the span file exporter configured under `openclaw.tracing` (None if disabled)."""
+    return configure_tracing({"tracing": get_config().get("tracing", {})})
+
+
+def _request(url: str, method: str = "GET", headers: Optional[Dict[str, str]] = None, data: Optional[bytes] = None, timeout: int = 10) -> Tuple[Optional[int], Optional[str]]:
+    start = time.perf_counter()
+    with start_span("openclaw.http", method=method, path=urlsplit(url).path) as span:
+        try:
+            code, body = get_transport().request(url, method=method, headers=inject_headers(dict(headers or {})), data=data, timeout=timeout)
+        except TransportError as exc:
+            span.record_exception(exc)
+            _observe_request(method, start, None)
+            return None, None
+        span.set_attribute("status_code", code)
+    _observe_request(method, start, code)
+    if code >= 400:
+        return code, None
+    return code, body
+
+
+_probe_engine: Optional[ProbeEngine] = None
+
+
+def get_probe_engine(cfg: Optional[Dict[str, Any]] = None) -> ProbeEngine:
+    """Return the shared health probe engine, creating it from config on first use."""
+    global _probe_engine
+    if _probe_engine is None:
+        with _transport_lock:
+            if _probe_engine is None:
+                hc = (cfg if cfg is not None else get_config()).get("health_check", {})
+                _probe_engine = ProbeEngine(
+                    _request,
+                    max_workers=int(hc.get("max_workers", 8)),
+                    deadline=float(hc.get("deadline_seconds", 10)),
+                    cache_ttl=float(hc.get("cache_ttl_seconds", 30)),
+                )
+    return _probe_engine
+
+
+def health_check(force: bool = False) -> Dict[str, Any]:
     """Try multiple common endpoints/methods and common auth headers.
 
-    Returns a summary dict with observed status codes and whether auth appears accepted.
+    Probes run concurrently under an overall deadline and stop once the gateway
+    is reachable and an auth header is accepted; the verdict is cached for
+    `openclaw.health_check.cache_ttl_seconds` unless `force=True`.
+
+    Returns a summary dict with observed status codes, whether auth appears
+    accepted, and per-probe latency.
     """
-    cfg = load_config()
+    cfg = get_config()
     base = cfg.get("base_url")
     if not base:
         return {"error": "missing_base_url"}
@@ -97,61 +230,376 @@ def health_check() -> Dict[str, Any]:
         {},
     ]
 
-    observed = {}
-    auth_accepted = False
-    any_reachable = False
-
-    for path in paths:
-        url = base.rstrip("/") + path
-        for hdr in headers_variants:
-            for method in methods:
-                data = None
-                if method == "POST":
-                    body = {"ping": True}
-                    data = json.dumps(body).encode("utf-8")
-                code, _ = _request(url, method=method, headers=hdr or None, data=data, timeout=cfg.get("timeout_seconds", 10))
-                observed.setdefault(code, 0)
-                observed[code] += 1
-                if code and 200 <= code < 300:
-                    any_reachable = True
-                    if hdr and ("X-API-Key" in hdr or "Api-Key" in hdr or "Authorization" in hdr):
-                        auth_accepted = True
-
-    return {"observed_codes": observed, "any_reachable": any_reachable, "auth_accepted": auth_accepted}
+    probes = build_probes(paths, headers_variants, methods, post_body=json.dumps({"ping": True}).encode("utf-8"))
+    # key on the key's presence/identity without keeping the secret itself
+    cache_key = (base, hash(api_key) if api_key else None)
+    return get_probe_engine(cfg).run(base, probes, timeout=cfg.get("timeout_seconds", 10), cache_key=cache_key, force=force)
+
+
+_outbox: Optional[Outbox] = None
+
+
+def get_outbox(cfg: Optional[Dict[str, Any]] = None) -> Optional[Outbox]:
+    """Return the shared durable outbox, or None when `openclaw.outbox.enable` is off."""
+    global _outbox
+    ocfg = (cfg if cfg is not None else get_config()).get("outbox", {})
+    if not ocfg.get("enable", False):
+        return None
+    if _outbox is None:
+        with _transport_lock:
+            if _outbox is None:
+                path = Path(ocfg.get("path", "spool/openclaw_outbox.db"))
+                _outbox = Outbox(
+                    path if path.is_absolute() else ROOT / path,
+                    synchronous=str(ocfg.get("synchronous", "NORMAL")),
+                )
+    return _outbox
+
+
+def _spool(cfg: Dict[str, Any], entries: List[Tuple[str, bytes, str]]) -> bool:
+    outbox = get_outbox(cfg)
+    if outbox is None:
+        return False
+    try:
+        outbox.append_many(entries)
+    except OutboxError:
+        return False
+    return True
+
+
+def start_outbox_drainer() -> Optional[OutboxDrainer]:
+    """Start replaying spooled deliveries in the background; None if the outbox is disabled."""
+    cfg = get_config()
+    outbox = get_outbox(cfg)
+    if outbox is None:
+        return None
+    ocfg = cfg.get("outbox", {})
+
+    def deliver(endpoint_path: str, body: bytes, content_type: str) -> Tuple[Optional[int], Dict[str, str]]:
+        current = get_config()
+        base = current.get("base_url")
+        if not base:
+            return None, {}
+        headers = {"Content-Type": content_type, **_auth_headers()}
+        # headers too, so the drainer can honour Retry-After
+        code, _, resp_headers = _fetch(base.rstrip("/") + endpoint_path, "POST", headers, body, current.get("timeout_seconds", 10))
+        return code, resp_headers
+
+    drainer = OutboxDrainer(
+        outbox,
+        deliver,
+        concurrency=int(ocfg.get("concurrency", 4)),
+        interval=float(ocfg.get("drain_interval_seconds", 5)),
+        max_attempts=int(ocfg.get("max_attempts", 20)),
+    )
+    drainer.start()
+    return drainer
+
+
+Validator = Union[PayloadValidator, KindValidator]
+
+# (config mapping, validator); the mapping itself is held so its identity can't be reused after GC
+_validator_cache: Optional[Tuple[Dict[str, Any], Optional[Validator]]] = None
+
+
+def get_validator(cfg: Optional[Dict[str, Any]] = None) -> Optional[Validator]:
+    """Return the compiled payload validator, or None if schema enforcement is off or no schema exists.
+
+    With `openclaw.validation.kinds` (schema definition -> identifying field)
+    each payload is validated against its own kind's definition and payloads
+    of other kinds are not validated; without it the whole schema applies.
+    The schema is compiled once per config load (and cached by file hash).
+    """
+    global _validator_cache
+    cfg = cfg if cfg is not None else get_config()
+    cached = _validator_cache
+    if cached is not None and cached[0] is cfg:
+        return cached[1]
+    vcfg = cfg.get("validation", {})
+    validator: Optional[PayloadValidator] = None
+    if vcfg.get("enforce_schema") and vcfg.get("schema_file"):
+        path = Path(vcfg["schema_file"])
+        path = path if path.is_absolute() else ROOT / path
+        if path.exists():
+            kinds = vcfg.get("kinds") or {}
+            if kinds:
+                validator = KindValidator(
+                    [(field, load_validator(path, f"#/definitions/{name}")) for name, field in kinds.items()]
+                )
+            else:
+                validator = load_validator(path)
+    _validator_cache = (cfg, validator)
+    return validator
+
+
+def _auth_headers() -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    api_key = os.environ.get("OPENCLAW_API_KEY")
+    if api_key:
+        # prefer X-API-Key header for API-key auth (config.auth_type suggests api_key)
+        headers["X-API-Key"] = "REDACTED"
+    return headers
+
 
+_caller: Optional[ResilientCaller] = None
 
+
+def get_resilient_caller(cfg: Optional[Dict[str, Any]] = None) -> ResilientCaller:
+    """Return the shared retry/circuit-breaker/rate-limit policy, built from config on first use."""
+    global _caller
+    if _caller is None:
+        with _transport_lock:
+            if _caller is None:
+                cfg = cfg if cfg is not None else get_config()
+                rl = cfg.get("rate_limit", {})
+                cb = cfg.get("circuit_breaker", {})
+                rate = float(rl.get("requests_per_second", 0) or 0)
+                _caller = ResilientCaller(
+                    policy=RetryPolicy.from_config(cfg),
+                    limiter=TokenBucket(rate, float(rl.get("burst", rate))) if rate > 0 else None,
+                    breaker_factory=lambda: CircuitBreaker(
+                        failure_threshold=int(cb.get("failure_threshold", 5)),
+                        reset_timeout=float(cb.get("reset_timeout_seconds", 30)),
+                    ),
+                )
+    return _caller
+
+
+def _fetch(url: str, method: str, headers: Dict[str, str], data: Optional[bytes], timeout: float) -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+    start = time.perf_counter()
+    with start_span("openclaw.http", method=method, path=urlsplit(url).path) as span:
+        try:
+            resp = get_transport().fetch(url, method=method, headers=inject_headers(dict(headers)), data=data, timeout=timeout)
+        except TransportError as exc:
+            span.record_exception(exc)
+            _observe_request(method, start, None)
+            return None, None, {}
+        span.set_attribute("status_code", resp.status)
+    _observe_request(method, start, resp.status)
+    return resp.status, (resp.text if resp.status < 400 else None), resp.headers
+
+
+def _post_with_retries(cfg: Dict[str, Any], url: str, body: bytes, headers: Dict[str, str]) -> Tuple[Optional[int], Optional[str], int]:
+    """POST an already-serialized body through the resilience layer; returns (code, body, attempts).
+
+    Retries only transient failures (connection errors, 408/429/5xx) with
+    jittered exponential backoff, honoring `Retry-After`; fails fast while the
+    endpoint's circuit breaker is open.
+    """
+    timeout = cfg.get("timeout_seconds", 10)
+    # do not include secret in logs/outputs; adapter uses API key in header for real runs
+    outcome = get_resilient_caller(cfg).call(url, lambda: _fetch(url, "POST", headers, body, timeout))
+    if outcome.attempts > 1:
+        _RETRIES.inc(outcome.attempts - 1)
+    if outcome.status == "circuit_open":
+        _CIRCUIT_OPEN.inc()
+    return outcome.code, outcome.body, outcome.attempts
+
+
+@traced("openclaw.send_payload")
 def send_payload(payload: Dict[str, Any], endpoint_path: str = "/ingest") -> Dict[str, Any]:
     """Send payload to OpenClaw with retries and schema validation (best-effort).
 
-    Returns a result summary: status_code and attempts.
+    Payloads failing `openclaw.validation` are rejected without a request
+    (`"status": "invalid"` with error paths).
+
+    Returns a result summary: status_code and attempts. When a transient
+    failure outlasts the retries and `openclaw.outbox.enable` is set, the
+    payload is spooled to the durable outbox (`"spooled": True`) for later replay.
     """
-    cfg = load_config()
+    cfg = get_config()
     base = cfg.get("base_url")
     if not base:
         return {"error": "missing_base_url"}
     url = base.rstrip("/") + endpoint_path
 
-    headers = {"Content-Type": "application/json"}
-    api_key = os.environ.get("OPENCLAW_API_KEY")
-    if api_key:
-        # prefer X-API-Key header for API-key auth (config.auth_type suggests api_key)
-        headers["X-API-Key"] = "REDACTED"
+    validator = get_validator(cfg)
+    if validator is not None:
+        issues = validator.validate(payload)
+        if issues:
+            return {"status": "invalid", "code": None, "attempts": 0, "errors": [str(i) for i in issues]}
+
+    headers = {"Content-Type": "application/json", **_auth_headers()}
+    body = json.dumps(payload).encode("utf-8")
+    code, _, attempts = _post_with_retries(cfg, url, body, headers)
+    if code and 200 <= code < 300:
+        return {"status": "ok", "code": code, "attempts": attempts}
+    result: Dict[str, Any] = {"status": "failed", "code": code, "attempts": attempts}
+    if classify(code) == "retry" and _spool(cfg, [(endpoint_path, body, "application/json")]):
+        result["spooled"] = True
+    return result
+
+
+async def send_payload_async(
+    payload: Dict[str, Any],
+    endpoint_path: str = "/ingest",
+    transport: Optional[AsyncHTTPTransport] = None,
+) -> Dict[str, Any]:
+    """asyncio variant of `send_payload`: backoff and rate limiting never block the loop.
+
+    Pass a long-lived `transport` to reuse connections across calls.
+    """
+    cfg = get_config()
+    base = cfg.get("base_url")
+    if not base:
+        return {"error": "missing_base_url"}
+    url = base.rstrip("/") + endpoint_path
+    validator = get_validator(cfg)
+    if validator is not None:
+        issues = validator.validate(payload)
+        if issues:
+            return {"status": "invalid", "code": None, "attempts": 0, "errors": [str(i) for i in issues]}
+    headers = {"Content-Type": "application/json", **_auth_headers()}
+    body = json.dumps(payload).encode("utf-8")
+    timeout = cfg.get("timeout_seconds", 10)
+    own = transport is None
+    client = transport or AsyncHTTPTransport(timeouts=Timeouts.from_config(cfg))
+
+    async def attempt() -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+        start = time.perf_counter()
+        with start_span("openclaw.http", method="POST", path=endpoint_path) as span:
+            try:
+                resp = await client.fetch(url, method="POST", headers=inject_headers(dict(headers)), data=body, timeout=timeout)
+            except TransportError as exc:
+                span.record_exception(exc)
+                _observe_request("POST", start, None)
+                return None, None, {}
+            span.set_attribute("status_code", resp.status)
+        _observe_request("POST", start, resp.status)
+        return resp.status, (resp.text if resp.status < 400 else None), resp.headers
 
-    max_retries = cfg.get("max_retries", 3)
-    backoff = cfg.get("retry_backoff_seconds", 2)
+    try:
+        outcome = await get_resilient_caller(cfg).acall(url, attempt)
+    finally:
+        if own:
+            await client.aclose()
+    if outcome.attempts > 1:
+        _RETRIES.inc(outcome.attempts - 1)
+    if outcome.status == "circuit_open":
+        _CIRCUIT_OPEN.inc()
+    if outcome.status == "ok":
+        return {"status": "ok", "code": outcome.code, "attempts": outcome.attempts}
+    result: Dict[str, Any] = {"status": "failed", "code": outcome.code, "attempts": outcome.attempts}
+    if classify(outcome.code) == "retry" and _spool(cfg, [(endpoint_path, body, "application/json")]):
+        result["spooled"] = True
+    return result
+
+
+def _invalid_payloads(cfg: Dict[str, Any], payloads: List[Any]) -> Dict[int, str]:
+    """{index: error} for payloads failing `openclaw.validation` (empty when it is off)."""
+    validator = get_validator(cfg)
+    if validator is None:
+        return {}
+    return {i: "; ".join(str(x) for x in issues) for i, issues in validator.validate_many(payloads).items()}
+
+
+def _spool_items(cfg: Dict[str, Any], endpoint_path: str, encoded: List[bytes]) -> bool:
+    return _spool(cfg, [(endpoint_path, item, "application/json") for item in encoded])
+
+
+def _batch_send_fn(endpoint_path: str) -> Callable[[bytes, Dict[str, str], int], BatchResult]:
+    def send(body: bytes, headers: Dict[str, str], count: int) -> BatchResult:
+        cfg = get_config()
+        base = cfg.get("base_url")
+        if not base:
+            return summarize([ItemResult(i, "failed", None, "missing_base_url") for i in range(count)], None, 0)
+        code, text, attempts = _post_with_retries(cfg, base.rstrip("/") + endpoint_path, body, {**headers, **_auth_headers()})
+        return summarize(item_results(count, code, text), code, attempts)
+
+    return send
+
+
+@traced("openclaw.send_batch")
+def send_batch(
+    payloads: List[Dict[str, Any]],
+    endpoint_path: str = "/ingest",
+    fmt: Optional[str] = None,
+    compress: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Send many payloads in one request (NDJSON or JSON array, optionally gzip).
+
+    Payloads failing schema validation are reported as `"invalid"` items and
+    not sent. The body is serialized once and reused across retries. Returns a summary
+    with per-item results and `failed_indexes` for individual retry; items
+    that failed transiently are spooled individually when the outbox is enabled.
+    Defaults for `fmt`/`compress` come from `openclaw.batching`.
+    """
+    cfg = get_config()
+    if not cfg.get("base_url"):
+        return {"error": "missing_base_url"}
+    if not payloads:
+        return {"status": "ok", "code": None, "attempts": 0, "items": [], "failed_indexes": []}
+    invalid = _invalid_payloads(cfg, payloads)
+    sendable = [i for i in range(len(payloads)) if i not in invalid]
 
+    items: List[ItemResult] = [ItemResult(i, "invalid", None, error) for i, error in invalid.items()]
+    code: Optional[int] = None
     attempts = 0
-    last_code = None
-    for attempt in range(1, max_retries + 1):
-        attempts = attempt
-        # do not include secret in logs/outputs; adapter uses API key in header for real runs
-        code, _ = _request(url, method="POST", headers=headers, data=json.dumps(payload).encode("utf-8"), timeout=cfg.get("timeout_seconds", 10))
-        last_code = code
-        if code and 200 <= code < 300:
-            return {"status": "ok", "code": code, "attempts": attempts}
-        time.sleep(backoff)
-
-    return {"status": "failed", "code": last_code, "attempts": attempts}
+    if sendable:
+        bcfg = cfg.get("batching", {})
+        body, headers = encode_batch(
+            [payloads[i] for i in sendable],
+            fmt=fmt or bcfg.get("format", "ndjson"),
+            compress=bool(bcfg.get("gzip", False)) if compress is None else compress,
+        )
+        sent = _batch_send_fn(endpoint_path)(body, headers, len(sendable))
+        code, attempts = sent.code, sent.attempts
+        # map positions in the sent batch back to the caller's indexes
+        items.extend(ItemResult(sendable[r.index], r.status, r.code, r.error) for r in sent.items)
+    items.sort(key=lambda r: r.index)
+    result = summarize(items, code, attempts).as_dict()
+
+    failed = [r.index for r in items if r.status == "failed" and classify(r.code) == "retry"]
+    if failed and _spool_items(cfg, endpoint_path, [encode_item(payloads[i]) for i in failed]):
+        result["spooled"] = True
+    return result
+
+
+def batch_sender(endpoint_path: str = "/ingest", **overrides: Any) -> BatchSender:
+    """Return a `BatchSender` flushing to `endpoint_path`, configured from `openclaw.batching`.
+
+    Like `send_batch`, payloads failing `openclaw.validation` are reported as
+    "invalid" and not sent, and transiently failed items go to the outbox
+    (unless `requeue_failed=True` keeps them buffered). Keyword arguments
+    override the config (see `BatchSender`). Call `start()` (or use it as a
+    context manager) to enable age-based flushing.
+    """
+    bcfg = get_config().get("batching", {})
+    options: Dict[str, Any] = {
+        "max_items": int(bcfg.get("max_items", 500)),
+        "max_bytes": int(bcfg.get("max_bytes", 1_048_576)),
+        "max_age": float(bcfg.get("max_age_seconds", 2)),
+        "fmt": bcfg.get("format", "ndjson"),
+        "compress": bool(bcfg.get("gzip", False)),
+        # read config at flush time, as the send function does
+        "validate": lambda payloads: _invalid_payloads(get_config(), payloads),
+        "spool": lambda encoded: _spool_items(get_config(), endpoint_path, encoded),
+    }
+    options.update(overrides)
+    return BatchSender(_batch_send_fn(endpoint_path), **options)
+
+
+def event_stream(**overrides: Any) -> Optional[EventStream]:
+    """Return an `EventStream` for `openclaw.events.stream_url` (None if streaming is disabled).
+
+    Keyword arguments override the config (see `EventStream`). Add consumers
+    with `subscribe()` and drive it with `await stream.run()`.
+    """
+    ecfg = get_config().get("events", {})
+    if not ecfg.get("enable_streaming") or not ecfg.get("stream_url"):
+        return None
+    heartbeat = float(ecfg.get("heartbeat_interval_seconds", 60))
+    options: Dict[str, Any] = {
+        "headers": _auth_headers(),
+        "heartbeat_interval": heartbeat,
+        "heartbeat_timeout": float(ecfg.get("heartbeat_timeout_seconds", heartbeat * 2)),
+        "reconnect_base": float(ecfg.get("reconnect_backoff_seconds", 1)),
+        "reconnect_max": float(ecfg.get("reconnect_max_backoff_seconds", 60)),
+        "queue_size": int(ecfg.get("queue_size", 1000)),
+        "overflow_policy": ecfg.get("overflow_policy", "block"),
+    }
+    options.update(overrides)
+    return EventStream(ecfg["stream_url"], **options)
 
 
 if __name__ == "__main__":
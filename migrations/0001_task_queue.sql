@@ -0,0 +1,33 @@
+-- Migration 0001: turn `tasks` into a contention-free work queue.
+-- Adds lease columns, queue indexes and the LISTEN/NOTIFY trigger to a
+-- database created from an older schema.sql. Safe to re-run.
+-- Apply with: psql "$DATABASE_URL" -f migrations/0001_task_queue.sql
+
+BEGIN;
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(255);
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION notify_task_ready() RETURNS trigger AS $$
+BEGIN
+    IF NEW.claimed_by IS NULL THEN
+        PERFORM pg_notify('chimera_tasks', NEW.status);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_notify_ready ON tasks;
+CREATE TRIGGER tasks_notify_ready
+    AFTER INSERT OR UPDATE OF status, claimed_by ON tasks
+    FOR EACH ROW EXECUTE FUNCTION notify_task_ready();
+
+COMMIT;
+
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block; building
+-- concurrently avoids locking out writers on a large, live tasks table.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_status_priority ON tasks (status, priority DESC, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_claimable ON tasks (status, priority DESC, created_at, id)
+    WHERE claimed_by IS NULL AND status IN ('pending', 'researching', 'drafting', 'safety_check');
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_lease ON tasks (lease_expires_at) WHERE claimed_by IS NOT NULL;
@@ -0,0 +1,86 @@
+-- Migration 0002: partition research_findings and safety_reviews by month.
+-- Converts the unpartitioned tables of an older schema.sql into the
+-- range-partitioned layout (created_at / reviewed_at) managed by
+-- src/db/partitions.py. The old tables are kept as *_legacy until verified.
+-- Apply with: psql "$DATABASE_URL" -f migrations/0002_partition_findings_reviews.sql
+-- Then run: python -m src.db.partitions maintain
+--
+-- The copy runs inside one transaction and holds locks on both tables; for
+-- very large tables run it in a maintenance window.
+
+BEGIN;
+
+-- Foreign keys cannot target a partitioned table whose key includes the
+-- partition column, and archived findings leave the database anyway.
+ALTER TABLE content_drafts DROP CONSTRAINT IF EXISTS content_drafts_research_finding_id_fkey;
+ALTER TABLE content_drafts ALTER COLUMN research_finding_id TYPE BIGINT;
+
+ALTER TABLE research_findings RENAME TO research_findings_legacy;
+ALTER INDEX research_findings_pkey RENAME TO research_findings_legacy_pkey;
+ALTER SEQUENCE research_findings_id_seq RENAME TO research_findings_legacy_id_seq;
+
+ALTER TABLE safety_reviews RENAME TO safety_reviews_legacy;
+ALTER INDEX safety_reviews_pkey RENAME TO safety_reviews_legacy_pkey;
+ALTER SEQUENCE safety_reviews_id_seq RENAME TO safety_reviews_legacy_id_seq;
+
+CREATE TABLE research_findings (
+    id BIGSERIAL,
+    task_id INTEGER REFERENCES tasks(id) ON DELETE CASCADE,
+    trends_data JSONB,
+    topic_ideation TEXT,
+    audience_signals TEXT,
+    source_urls TEXT[],
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE safety_reviews (
+    id BIGSERIAL,
+    draft_id INTEGER REFERENCES content_drafts(id) ON DELETE CASCADE,
+    verdict VARCHAR(50) NOT NULL,
+    confidence_score DECIMAL(5, 4),
+    policy_violations JSONB,
+    human_reviewer_notes TEXT,
+    reviewed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, reviewed_at)
+) PARTITION BY RANGE (reviewed_at);
+
+CREATE TABLE research_findings_default PARTITION OF research_findings DEFAULT;
+CREATE TABLE safety_reviews_default PARTITION OF safety_reviews DEFAULT;
+
+-- One partition per month from the oldest legacy row through three months
+-- ahead (UTC month boundaries, named <table>_pYYYY_MM like partitions.py).
+CREATE FUNCTION pg_temp.make_monthly_partitions(tbl text, first_ts timestamptz) RETURNS void AS $$
+DECLARE
+    m timestamptz := date_trunc('month', coalesce(first_ts, now()) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    last timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '3 months';
+BEGIN
+    WHILE m <= last LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            tbl || '_p' || to_char(m AT TIME ZONE 'UTC', 'YYYY_MM'), tbl, m, m + interval '1 month'
+        );
+        m := m + interval '1 month';
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT pg_temp.make_monthly_partitions('research_findings', (SELECT min(created_at) FROM research_findings_legacy));
+SELECT pg_temp.make_monthly_partitions('safety_reviews', (SELECT min(reviewed_at) FROM safety_reviews_legacy));
+
+INSERT INTO research_findings (id, task_id, trends_data, topic_ideation, audience_signals, source_urls, created_at)
+SELECT id, task_id, trends_data, topic_ideation, audience_signals, source_urls, coalesce(created_at, now())
+FROM research_findings_legacy;
+
+INSERT INTO safety_reviews (id, draft_id, verdict, confidence_score, policy_violations, human_reviewer_notes, reviewed_at)
+SELECT id, draft_id, verdict, confidence_score, policy_violations, human_reviewer_notes, coalesce(reviewed_at, now())
+FROM safety_reviews_legacy;
+
+SELECT setval('research_findings_id_seq', coalesce((SELECT max(id) FROM research_findings), 0) + 1, false);
+SELECT setval('safety_reviews_id_seq', coalesce((SELECT max(id) FROM safety_reviews), 0) + 1, false);
+
+COMMIT;
+
+-- After verifying row counts, drop the legacy tables:
+-- DROP TABLE research_findings_legacy;
+-- DROP TABLE safety_reviews_legacy;
@@ -0,0 +1,9 @@
+-- Migration 0003: persistent tier of the research result cache.
+-- Adds the normalized query hash written by src/agents/research_agent/cache.py
+-- and the index used to find the newest finding for a key. Safe to re-run.
+-- Apply with: psql "$DATABASE_URL" -f migrations/0003_research_cache_key.sql
+
+ALTER TABLE research_findings ADD COLUMN IF NOT EXISTS cache_key VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS idx_research_findings_cache_key ON research_findings (cache_key, created_at DESC)
+    WHERE cache_key IS NOT NULL;
@@ -0,0 +1,15 @@
+-- Migration 0004: track which drafts the safety scanner has reviewed.
+-- src/agents/safety_agent/scanner.py selects drafts with safety_scanned_at IS
+-- NULL and sets it in the transaction that writes the draft's safety_reviews
+-- row. An id watermark is not used because drafts from long-running insert
+-- transactions can commit with ids below one already scanned. Safe to re-run.
+-- Apply with: psql "$DATABASE_URL" -f migrations/0004_draft_safety_scan.sql
+
+ALTER TABLE content_drafts ADD COLUMN IF NOT EXISTS safety_scanned_at TIMESTAMP WITH TIME ZONE;
+
+-- Drafts that already have a review count as scanned
+UPDATE content_drafts d SET safety_scanned_at = r.reviewed_at
+FROM (SELECT draft_id, min(reviewed_at) AS reviewed_at FROM safety_reviews GROUP BY draft_id) r
+WHERE d.id = r.draft_id AND d.safety_scanned_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_content_drafts_unscanned ON content_drafts (id) WHERE safety_scanned_at IS NULL;
@@ -21,43 +21,89 @@ CREATE TABLE tasks (
     -- Status flow: pending -> researching -> drafting -> safety_check -> approved/rejected
     status VARCHAR(50) NOT NULL DEFAULT 'pending',
     priority INTEGER DEFAULT 0,
+    -- Work-queue lease: set while a worker owns the task, see src/db/task_queue.py
+    claimed_by VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    attempts INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Queue indexes: claim order within a status, unclaimed work per hot status,
+-- and expired leases of crashed workers
+CREATE INDEX idx_tasks_status_priority ON tasks (status, priority DESC, created_at);
+CREATE INDEX idx_tasks_claimable ON tasks (status, priority DESC, created_at, id)
+    WHERE claimed_by IS NULL AND status IN ('pending', 'researching', 'drafting', 'safety_check');
+CREATE INDEX idx_tasks_lease ON tasks (lease_expires_at) WHERE claimed_by IS NOT NULL;
+
+-- postgres-only:begin
+-- Wake LISTENing workers when work becomes claimable
+CREATE OR REPLACE FUNCTION notify_task_ready() RETURNS trigger AS $$
+BEGIN
+    IF NEW.claimed_by IS NULL THEN
+        PERFORM pg_notify('chimera_tasks', NEW.status);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_notify_ready
+    AFTER INSERT OR UPDATE OF status, claimed_by ON tasks
+    FOR EACH ROW EXECUTE FUNCTION notify_task_ready();
+-- postgres-only:end
+
 -- 2. Research Agent Entities
 -- Stores trend discovery and audience analysis outputs
 CREATE TABLE research_findings (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     task_id INTEGER REFERENCES tasks(id) ON DELETE CASCADE,
     trends_data JSONB, -- Structured trend analysis
     topic_ideation TEXT,
     audience_signals TEXT,
     source_urls TEXT[], -- Array of sources analyzed
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    cache_key VARCHAR(64), -- Normalized query hash (src/agents/research_agent/cache.py)
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Partitioned monthly on created_at (src/db/partitions.py); the key must include it
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX idx_research_findings_cache_key ON research_findings (cache_key, created_at DESC)
+    WHERE cache_key IS NOT NULL;
 
 -- 3. Generation Agent Entities
 -- Stores content drafts and reasoning metadata
 CREATE TABLE content_drafts (
     id SERIAL PRIMARY KEY,
     task_id INTEGER REFERENCES tasks(id) ON DELETE CASCADE,
-    research_finding_id INTEGER REFERENCES research_findings(id),
+    research_finding_id BIGINT, -- research_findings(id); no FK since findings are partitioned and archived
     content_body TEXT NOT NULL,
     media_prompts TEXT, -- For image/video generation
     style_reasoning TEXT, -- "Must attach reasoning metadata" constraint
     platform VARCHAR(50), -- e.g., 'twitter', 'instagram'
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    safety_scanned_at TIMESTAMP WITH TIME ZONE -- set with the draft's safety_reviews row; NULL = not scanned yet
 );
 
+-- Drafts still waiting for the Safety Agent (src/agents/safety_agent/scanner.py)
+CREATE INDEX idx_content_drafts_unscanned ON content_drafts (id) WHERE safety_scanned_at IS NULL;
+
 -- 4. Safety Agent Entities
 -- Implements the "Gatekeeper" and "Human-in-the-Loop" patterns
 CREATE TABLE safety_reviews (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     draft_id INTEGER REFERENCES content_drafts(id) ON DELETE CASCADE,
     verdict VARCHAR(50) NOT NULL, -- 'approved', 'rejected', 'escalated_to_human'
     confidence_score DECIMAL(5, 4), -- 0.0000 to 1.0000
     policy_violations JSONB, -- List of detected risks/violations
     human_reviewer_notes TEXT, -- For HITL scenarios
-    reviewed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+    reviewed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Partitioned monthly on reviewed_at (src/db/partitions.py)
+    PRIMARY KEY (id, reviewed_at)
+) PARTITION BY RANGE (reviewed_at);
+
+-- postgres-only:begin
+-- Catch-all partitions; `python -m src.db.partitions maintain` pre-creates the
+-- monthly ones (run it after loading this schema and then daily).
+CREATE TABLE research_findings_default PARTITION OF research_findings DEFAULT;
+CREATE TABLE safety_reviews_default PARTITION OF safety_reviews DEFAULT;
+-- postgres-only:end
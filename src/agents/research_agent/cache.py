@@ -0,0 +1,346 @@
+"""Content-addressed cache for Research Agent results.
+
+`specs/research_agent.contract.md` requires the Research Agent to avoid
+redundant research and to fall back to previously known data. Research rows
+(`trends_data`, `topic_ideation`, `audience_signals`, `source_urls`) are
+expensive to produce, so `ResearchCache` sits in front of the research
+function:
+
+- Queries are keyed by a SHA-256 of the normalized (keywords, category, time
+  window): keywords are case-folded, stripped of `#`, de-duplicated and
+  sorted, windows accept "7d"/"12h"/seconds. Equivalent requests share a key.
+- Tier 1 is an in-memory LRU bounded by entry count and by the approximate
+  encoded size of the cached results.
+- Tier 2 is `research_findings` itself: results are written with their
+  `cache_key`, and a memory miss reads the newest finding for the key, so
+  restarts and other workers reuse earlier research.
+- Within `ttl` (`agents.research_agent.update_interval_seconds`) a result is
+  served as is; up to `stale_ttl` it is served immediately while one
+  background refresh runs (stale-while-revalidate); older results are
+  recomputed.
+- Concurrent requests for the same key share one computation.
+- If recomputation fails, any previous result younger than
+  `max_stale_on_error` is returned instead of the error.
+- Every lookup is counted once, as a memory hit, a stale hit, a caller that
+  joined an in-flight computation (coalesced), a database hit, or a miss that
+  computed; counts and rates are available from `stats()` and the metrics
+  registry.
+
+Must be used from one event loop at a time. Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from ...config.config_view import parse_duration
+from ...db.repository import ChimeraRepository
+from ...logging.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ("trends_data", "topic_ideation", "audience_signals", "source_urls")
+
+_REQUESTS = counter("research_cache_requests_total", "Research cache lookups by result", ("result",))
+_COMPUTES = counter("research_cache_computes_total", "Research computations by outcome", ("outcome",))
+_EVICTIONS = counter("research_cache_evictions_total", "Entries evicted from the in-memory tier")
+
+
+@dataclass(frozen=True)
+class ResearchQuery:
+    """A normalized research request."""
+
+    keywords: Tuple[str, ...]
+    category: str
+    window_seconds: float
+
+    @classmethod
+    def normalize(cls, keywords: Iterable[str] | str, category: str = "", window: Any = "7d") -> "ResearchQuery":
+        if isinstance(keywords, str):
+            keywords = keywords.replace(",", " ").split()
+        words = {" ".join(k.strip().lstrip("#").casefold().split()) for k in keywords}
+        return cls(tuple(sorted(w for w in words if w)), " ".join(category.casefold().split()), parse_duration(window))
+
+    @property
+    def key(self) -> str:
+        payload = json.dumps([self.keywords, self.category, self.window_seconds], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResearch:
+    """One cached research result."""
+
+    key: str
+    data: Dict[str, Any]
+    fetched_at: float
+    size: int
+    source: str  # where the value was produced: "compute" or "database"
+
+
+ResearchFn = Callable[[ResearchQuery], Awaitable[Mapping[str, Any]]]
+
+
+def _encoded_size(data: Mapping[str, Any]) -> int:
+    return len(json.dumps(data, default=str, separators=(",", ":")))
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    return datetime.strptime(str(value)[:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+
+
+class _LRU:
+    """OrderedDict LRU bounded by entry count and total `size`."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, CachedResearch]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedResearch]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def put(self, entry: CachedResearch) -> None:
+        old = self._data.pop(entry.key, None)
+        if old is not None:
+            self.bytes -= old.size
+        if entry.size > self.max_bytes:
+            return  # would evict everything else; keep it in the persistent tier only
+        self._data[entry.key] = entry
+        self.bytes += entry.size
+        while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+            _EVICTIONS.inc()
+
+    def pop(self, key: str) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResearchCache:
+    """
+    Two-tier, coalescing, stale-while-revalidate cache around a research function.
+
+    Parameters
+    - compute: async callable(ResearchQuery) -> mapping with `RESULT_FIELDS`.
+    - repository: `ChimeraRepository` for the persistent tier (None = memory only).
+    - ttl / stale_ttl: fresh and serve-stale ages in seconds.
+    - max_stale_on_error: oldest result returned when recomputation fails.
+    - max_entries / max_bytes: in-memory tier bounds.
+    """
+
+    def __init__(
+        self,
+        compute: ResearchFn,
+        repository: Optional[ChimeraRepository] = None,
+        ttl: float = 300.0,
+        stale_ttl: float = 3600.0,
+        max_stale_on_error: float = 7 * 86400.0,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.compute = compute
+        self.repository = repository
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_stale_on_error = max(max_stale_on_error, self.stale_ttl)
+        self._clock = clock
+        self._memory = _LRU(max_entries, max_bytes)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "db_hits": 0,
+            "computes": 0,
+            "errors": 0,
+            "fallbacks": 0,
+        }
+
+    @classmethod
+    def from_config(
+        cls, config: Mapping[str, Any], compute: ResearchFn, repository: Optional[ChimeraRepository] = None
+    ) -> "ResearchCache":
+        """Build from `agents.research_agent` (`update_interval_seconds` and the `cache` block)."""
+        rcfg = config.get("agents", {}).get("research_agent", {}) or {}
+        ccfg = rcfg.get("cache", {}) or {}
+        if repository is None and ccfg.get("persist", True):
+            repository = ChimeraRepository()
+        return cls(
+            compute,
+            repository=repository,
+            ttl=parse_duration(rcfg.get("update_interval_seconds", 300)),
+            stale_ttl=parse_duration(ccfg.get("stale_seconds", 3600)),
+            max_stale_on_error=parse_duration(ccfg.get("max_stale_on_error_seconds", 7 * 86400)),
+            max_entries=int(ccfg.get("max_entries", 1024)),
+            max_bytes=int(ccfg.get("max_bytes", 64 * 1024 * 1024)),
+        )
+
+    # -- persistent tier -----------------------------------------------------------
+    def _since(self, max_age: float) -> Any:
+        cutoff = datetime.fromtimestamp(self._clock() - max_age, timezone.utc)
+        if self.repository is not None and self.repository.db.backend.name == "sqlite":
+            return cutoff.strftime("%Y-%m-%d %H:%M:%S")  # matches SQLite CURRENT_TIMESTAMP text
+        return cutoff
+
+    async def _load(self, key: str) -> Optional[CachedResearch]:
+        if self.repository is None:
+            return None
+        row = await asyncio.to_thread(self.repository.latest_finding, key, self._since(self.max_stale_on_error))
+        if row is None:
+            return None
+        data = {f: row.get(f) for f in RESULT_FIELDS}
+        entry = CachedResearch(key, data, _timestamp(row["created_at"]), _encoded_size(data), "database")
+        self._memory.put(entry)
+        return entry
+
+    async def _store(self, key: str, data: Dict[str, Any], task_id: Optional[int]) -> None:
+        if self.repository is None:
+            return
+        row = dict(data, cache_key=key, task_id=task_id)
+        try:
+            await asyncio.to_thread(self.repository.add_findings, [row], "batch")
+        except Exception:
+            # the result is still served from memory; persistence is best-effort
+            logger.exception("Unable to persist research result %s", key[:12])
+
+    # -- computation ---------------------------------------------------------------
+    def _count(self, stat: str, label: str) -> None:
+        self._stats[stat] += 1
+        _REQUESTS.labels(label).inc()
+
+    async def _run(self, query: ResearchQuery, task_id: Optional[int], check_db: bool, lookup: bool) -> CachedResearch:
+        # lookup: started by a caller's memory miss (count it), not a background refresh
+        key = query.key
+        previous = self._memory.get(key)
+        if check_db:
+            loaded = await self._load(key)
+            if loaded is not None:
+                age = self._clock() - loaded.fetched_at
+                if age < self.stale_ttl:
+                    if lookup:
+                        self._count("db_hits", "db_hit")
+                    if age >= self.ttl:
+                        self._schedule(query, task_id)  # revalidate after this task finishes
+                    return loaded
+                previous = loaded  # too old to serve; only a fallback if compute fails
+        if lookup:
+            self._count("misses", "miss")
+        self._stats["computes"] += 1
+        try:
+            result = await self.compute(query)
+        except Exception as exc:
+            self._stats["errors"] += 1
+            _COMPUTES.labels("error").inc()
+            if previous is not None and self._clock() - previous.fetched_at < self.max_stale_on_error:
+                self._stats["fallbacks"] += 1
+                logger.warning("Research for %s failed (%s); serving cached result", query.keywords, exc)
+                return previous
+            raise
+        _COMPUTES.labels("ok").inc()
+        data = {f: result.get(f) for f in RESULT_FIELDS}
+        entry = CachedResearch(key, data, self._clock(), _encoded_size(data), "compute")
+        self._memory.put(entry)
+        await self._store(key, data, task_id)
+        return entry
+
+    def _refresh(
+        self, query: ResearchQuery, task_id: Optional[int], check_db: bool = False, lookup: bool = False
+    ) -> asyncio.Task:
+        key = query.key
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            if lookup:
+                self._count("coalesced", "coalesced")
+            return task
+        task = asyncio.get_running_loop().create_task(self._run(query, task_id, check_db, lookup))
+        task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+        self._inflight[key] = task
+        return task
+
+    def _schedule(self, query: ResearchQuery, task_id: Optional[int]) -> None:
+        # called from inside the in-flight task for this key; start once it is done
+        current = self._inflight.get(query.key)
+        if current is None:
+            self._refresh(query, task_id)
+        else:
+            current.add_done_callback(lambda _t: self._refresh(query, task_id))
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("research refresh for %s failed: %s", key[:12], task.exception())
+
+    # -- public API ------------------------------------------------------------------
+    async def get(
+        self,
+        keywords: Iterable[str] | str,
+        category: str = "",
+        window: Any = "7d",
+        force: bool = False,
+        task_id: Optional[int] = None,
+    ) -> CachedResearch:
+        """Return research for the query, computing it at most once per key at a time."""
+        query = ResearchQuery.normalize(keywords, category, window)
+        entry = None if force else self._memory.get(query.key)
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            if age < self.ttl:
+                self._count("hits", "hit")
+                return entry
+            if age < self.stale_ttl:
+                self._count("stale_hits", "stale")
+                self._refresh(query, task_id)
+                return entry
+        # counted as coalesced, db_hit or miss once it is known which one it is;
+        # shield: a cancelled caller must not cancel the computation others share
+        task = self._refresh(query, task_id, check_db=not force and entry is None, lookup=True)
+        return await asyncio.shield(task)
+
+    def invalidate(self, keywords: Iterable[str] | str, category: str = "", window: Any = "7d") -> None:
+        """Drop the in-memory entry (the persistent copy ages out by `ttl`)."""
+        self._memory.pop(ResearchQuery.normalize(keywords, category, window).key)
+
+    def stats(self) -> Dict[str, Any]:
+        s = dict(self._stats)
+        lookups = s["hits"] + s["stale_hits"] + s["coalesced"] + s["db_hits"] + s["misses"]
+        served = lookups - s["misses"]
+        s.update(
+            {
+                "lookups": lookups,
+                "hit_rate": (s["hits"] + s["stale_hits"]) / lookups if lookups else 0.0,
+                "miss_rate": s["misses"] / lookups if lookups else 0.0,
+                # answered from memory, the database or another caller's computation
+                "reuse_rate": served / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "bytes": self._memory.bytes,
+                "evictions": self._memory.evictions,
+            }
+        )
+        return s
+
+
+__all__ = ["CachedResearch", "RESULT_FIELDS", "ResearchCache", "ResearchFn", "ResearchQuery"]
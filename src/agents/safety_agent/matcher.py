@@ -0,0 +1,112 @@
+"""Multi-pattern phrase matcher for the Safety Agent.
+
+Checking a draft against every policy term with `term in text` costs
+O(terms x length) per draft. `PhraseMatcher` compiles all terms once into an
+Aho-Corasick automaton and finds every occurrence of every term in a single
+pass over the draft:
+
+- Text and terms are case-folded and split into word tokens (`\\w+`), so the
+  automaton runs over tokens rather than characters (far fewer Python steps
+  per draft) and matches are whole words / phrases only: "kill" does not fire
+  on "skill", and "self-harm" matches "self harm" as well.
+- Failure links make overlapping and nested phrases ("buy followers",
+  "followers") all report in the same pass.
+- The compiled automaton is plain lists and dicts, so it pickles cheaply and
+  can be shipped once to each worker process.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded word tokens of `text`."""
+    return _TOKEN.findall(text.casefold())
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Parameters
+    - phrases: terms to find; each may be one or more words. Pattern ids are
+      the positions in this sequence. Phrases with no word characters are
+      ignored.
+    """
+
+    def __init__(self, phrases: Sequence[str]) -> None:
+        self.phrases = list(phrases)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pid, phrase in enumerate(self.phrases):
+            state = 0
+            for tok in tokenize(phrase):
+                nxt = self._goto[state].get(tok)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][tok] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            if state:
+                self._out[state] += (pid,)
+        self._fail = [0] * len(self._goto)
+        # breadth-first so a state's failure target is final before its children use it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for tok, child in self._goto[state].items():
+                queue.append(child)
+                f = self._fail[state]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(tok, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str) -> List[int]:
+        """Pattern ids of every occurrence in `text` (repeats included), in text order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        hits: List[int] = []
+        state = 0
+        for tok in _TOKEN.findall(text.casefold()):
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0) if state else root.get(tok, 0)
+            if out[state]:
+                hits.extend(out[state])
+        return hits
+
+    def counts(self, text: str) -> Dict[int, int]:
+        """Occurrences per pattern id in `text`."""
+        result: Dict[int, int] = {}
+        for pid in self.find(text):
+            result[pid] = result.get(pid, 0) + 1
+        return result
+
+    def find_naive(self, text: str) -> List[int]:
+        """Reference implementation scanning once per phrase (same hits, unordered)."""
+        tokens = tokenize(text)
+        hits: List[int] = []
+        for pid, phrase in enumerate(self.phrases):
+            words = tokenize(phrase)
+            n = len(words)
+            if not n:
+                continue
+            for i in range(len(tokens) - n + 1):
+                if tokens[i : i + n] == words:
+                    hits.append(pid)
+        return hits
+
+
+__all__ = ["PhraseMatcher", "tokenize"]
@@ -0,0 +1,374 @@
+"""Batched safety scanning of `content_drafts`.
+
+The Safety Agent must attach a `verdict`, `confidence_score` and
+`policy_violations` (a `safety_reviews` row) to every draft, every
+`agents.safety_agent.scan_frequency_seconds`. Doing that one draft and one
+policy term at a time is O(drafts x terms x length) on a single core, so the
+pipeline is split into three parts:
+
+- Matching: every policy term of every category is compiled once into a
+  `PhraseMatcher` (Aho-Corasick over word tokens), so a draft is scanned in
+  one pass regardless of how many terms the policies list.
+- Scoring: `SafetyScanner.scan_batch()` splits a batch into `chunk_size`
+  chunks and scores them on a process pool. The compiled matcher is sent to
+  each worker once (pool initializer), not with every chunk; small batches
+  are scored inline to avoid the pool round trip.
+- Incremental runs: `SafetyScanJob.run_once()` only reads drafts whose
+  `content_drafts.safety_scanned_at` is NULL (a partial index keeps this
+  cheap). A draft is marked scanned in the transaction that writes its
+  review, and drafts another scanner marked first are skipped, so every
+  draft gets exactly one review. No id watermark is used: drafts inserted by
+  long transactions can commit with ids below ones already scanned.
+
+A draft's risk is 1 - prod(1 - severity) over the policy categories it hits.
+Risk >= `reject_threshold` is "rejected", >= `escalate_threshold` is
+"escalated_to_human", anything lower "approved". `confidence_score` is the
+risk for rejected/escalated drafts and 1 - risk for approved ones.
+
+Run `python -m src.agents.safety_agent.scanner --once` for a single pass.
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ...config.config_view import parse_duration
+from ...db.repository import ChimeraRepository
+from ...logging.metrics import counter, histogram
+from ...logging.tracing import ContextProcessPoolExecutor
+from .matcher import PhraseMatcher
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[3]
+
+VERDICTS = ("approved", "rejected", "escalated_to_human")
+
+_SCANNED = counter("safety_scan_drafts_total", "Drafts scored by verdict", ("verdict",))
+_SKIPPED = counter("safety_scan_skipped_total", "Scored drafts already reviewed by another scanner")
+_BATCH_SECONDS = histogram("safety_scan_batch_seconds", "Wall time to score one batch of drafts")
+
+
+@dataclass(frozen=True)
+class PolicyCategory:
+    """A named list of prohibited terms and the risk one hit carries (0..1)."""
+
+    name: str
+    severity: float
+    terms: Tuple[str, ...]
+
+
+DEFAULT_POLICIES = (
+    PolicyCategory("violence", 0.95, ("kill yourself", "shoot up", "bomb threat", "mass shooting", "make a bomb")),
+    PolicyCategory("self_harm", 0.95, ("self harm", "suicide method", "cut yourself", "pro ana", "thinspiration")),
+    PolicyCategory("hate", 0.95, ("ethnic cleansing", "subhuman", "white power", "race war")),
+    PolicyCategory("adult", 0.8, ("nsfw", "onlyfans", "nudes", "xxx")),
+    PolicyCategory(
+        "scam",
+        0.6,
+        ("guaranteed returns", "double your money", "get rich quick", "send crypto", "wire transfer", "giveaway dm"),
+    ),
+    PolicyCategory("health_claims", 0.5, ("miracle cure", "cures cancer", "lose weight fast", "detox tea")),
+    PolicyCategory("engagement_bait", 0.3, ("buy followers", "follow for follow", "like for like", "sub4sub")),
+)
+
+
+def load_policies(overrides: Optional[Mapping[str, Any]] = None) -> Tuple[PolicyCategory, ...]:
+    """
+    `DEFAULT_POLICIES` updated with `agents.safety_agent.policies`.
+
+    Each override is `{category: {severity: float, terms: [...]}}`; a category
+    present in the defaults keeps its terms and severity unless given, and an
+    empty `terms` list disables it.
+    """
+    merged = {p.name: p for p in DEFAULT_POLICIES}
+    for name, spec in (overrides or {}).items():
+        spec = spec or {}
+        base = merged.get(name)
+        severity = float(spec.get("severity", base.severity if base else 0.5))
+        if not 0.0 <= severity <= 1.0:
+            raise ValueError(f"Policy {name!r}: severity must be within 0..1, got {severity}")
+        terms = spec.get("terms", base.terms if base else ())
+        merged[name] = PolicyCategory(name, severity, tuple(str(t) for t in terms))
+    return tuple(p for p in merged.values() if p.terms)
+
+
+# -- scoring -------------------------------------------------------------------
+class _Engine:
+    """Picklable matcher + scoring rules; one copy lives in each worker process."""
+
+    def __init__(self, policies: Sequence[PolicyCategory], reject_threshold: float, escalate_threshold: float) -> None:
+        self.categories = [p.name for p in policies]
+        self.severity = [p.severity for p in policies]
+        phrases: List[str] = []
+        self.owner: List[int] = []  # pattern id -> category index
+        for index, policy in enumerate(policies):
+            phrases.extend(policy.terms)
+            self.owner.extend([index] * len(policy.terms))
+        self.matcher = PhraseMatcher(phrases)
+        self.reject_threshold = reject_threshold
+        self.escalate_threshold = escalate_threshold
+
+    def review(self, draft_id: Any, text: str) -> Dict[str, Any]:
+        hits = self.matcher.counts(text or "")
+        per_category: Dict[int, List[Tuple[str, int]]] = {}
+        for pid, count in hits.items():
+            per_category.setdefault(self.owner[pid], []).append((self.matcher.phrases[pid], count))
+        safe = 1.0
+        violations = []
+        for index in sorted(per_category, key=lambda i: -self.severity[i]):
+            safe *= 1.0 - self.severity[index]
+            terms = sorted(per_category[index])
+            violations.append(
+                {
+                    "category": self.categories[index],
+                    "severity": self.severity[index],
+                    "terms": [t for t, _ in terms],
+                    "count": sum(c for _, c in terms),
+                }
+            )
+        risk = 1.0 - safe
+        if risk >= self.reject_threshold:
+            verdict, confidence = "rejected", risk
+        elif risk >= self.escalate_threshold:
+            verdict, confidence = "escalated_to_human", risk
+        else:
+            verdict, confidence = "approved", 1.0 - risk
+        return {
+            "draft_id": draft_id,
+            "verdict": verdict,
+            "confidence_score": round(confidence, 4),  # DECIMAL(5, 4)
+            "policy_violations": violations,
+            "human_reviewer_notes": None,
+        }
+
+    def review_chunk(self, chunk: Sequence[Tuple[Any, str]]) -> List[Dict[str, Any]]:
+        return [self.review(draft_id, text) for draft_id, text in chunk]
+
+
+_worker_engine: Optional[_Engine] = None
+
+
+def _init_worker(engine: _Engine) -> None:
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _review_chunk(chunk: Sequence[Tuple[Any, str]]) -> List[Dict[str, Any]]:
+    assert _worker_engine is not None, "worker not initialized"
+    return _worker_engine.review_chunk(chunk)
+
+
+class SafetyScanner:
+    """
+    Scores drafts against the policy lists, optionally on a process pool.
+
+    Parameters
+    - policies: categories to enforce (`load_policies()` by default).
+    - reject_threshold / escalate_threshold: risk cut-offs for the verdicts.
+    - workers: pool size; None uses every CPU, 1 scores inline.
+    - chunk_size: drafts per pool task. Batches no larger than one chunk are
+      scored inline.
+
+    The pool is created on first use and kept until `close()`.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Sequence[PolicyCategory]] = None,
+        reject_threshold: float = 0.9,
+        escalate_threshold: float = 0.3,
+        workers: Optional[int] = None,
+        chunk_size: int = 256,
+    ) -> None:
+        if not 0.0 < escalate_threshold <= reject_threshold <= 1.0:
+            raise ValueError("Expected 0 < escalate_threshold <= reject_threshold <= 1")
+        self.policies = tuple(policies if policies is not None else load_policies())
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.chunk_size = max(1, int(chunk_size))
+        self._engine = _Engine(self.policies, reject_threshold, escalate_threshold)
+        self._pool: Optional[ContextProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "SafetyScanner":
+        """Build from the `agents.safety_agent` block of the merged config."""
+        scfg = config.get("agents", {}).get("safety_agent", {}) or {}
+        return cls(
+            policies=load_policies(scfg.get("policies")),
+            reject_threshold=float(scfg.get("reject_threshold", 0.9)),
+            escalate_threshold=float(scfg.get("escalate_threshold", 0.3)),
+            workers=int(scfg.get("workers", 0) or 0) or None,
+            chunk_size=int(scfg.get("chunk_size", 256)),
+        )
+
+    @property
+    def terms(self) -> int:
+        return len(self._engine.matcher.phrases)
+
+    def scan(self, draft: Mapping[str, Any]) -> Dict[str, Any]:
+        """Review one draft (a `content_drafts` row) inline."""
+        review = self._engine.review(draft.get("id"), draft.get("content_body") or "")
+        _SCANNED.labels(review["verdict"]).inc()
+        return review
+
+    def scan_batch(self, drafts: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Review `drafts`, returning one `safety_reviews` mapping per draft in input order."""
+        start = time.perf_counter()
+        items = [(d.get("id"), d.get("content_body") or "") for d in drafts]
+        if self.workers == 1 or len(items) <= self.chunk_size:
+            reviews = self._engine.review_chunk(items)
+        else:
+            chunks = [items[i : i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+            reviews = [r for part in self._executor().map(_review_chunk, chunks) for r in part]
+        _BATCH_SECONDS.observe(time.perf_counter() - start)
+        for verdict in VERDICTS:
+            n = sum(1 for r in reviews if r["verdict"] == verdict)
+            if n:
+                _SCANNED.labels(verdict).inc(n)
+        return reviews
+
+    def _executor(self) -> ContextProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ContextProcessPoolExecutor(
+                        max_workers=self.workers, initializer=_init_worker, initargs=(self._engine,)
+                    )
+        return self._pool
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def __enter__(self) -> "SafetyScanner":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# -- incremental job -----------------------------------------------------------
+class SafetyScanJob:
+    """
+    Reviews drafts created since the last run.
+
+    Parameters
+    - scanner: the `SafetyScanner` to score with.
+    - repository: data access (default `ChimeraRepository()`).
+    - batch_size: drafts read, scored and committed per step.
+    - interval: seconds between passes in `run_forever`.
+    - alert_on_violation: log a warning for every batch with non-approved drafts.
+    """
+
+    def __init__(
+        self,
+        scanner: SafetyScanner,
+        repository: Optional[ChimeraRepository] = None,
+        batch_size: int = 2000,
+        interval: float = 120.0,
+        alert_on_violation: bool = True,
+    ) -> None:
+        self.scanner = scanner
+        self.repository = repository or ChimeraRepository()
+        self.batch_size = max(1, int(batch_size))
+        self.interval = interval
+        self.alert_on_violation = alert_on_violation
+
+    @classmethod
+    def from_config(
+        cls, config: Mapping[str, Any], repository: Optional[ChimeraRepository] = None
+    ) -> "SafetyScanJob":
+        scfg = config.get("agents", {}).get("safety_agent", {}) or {}
+        return cls(
+            SafetyScanner.from_config(config),
+            repository=repository,
+            batch_size=int(scfg.get("batch_size", 2000)),
+            interval=parse_duration(scfg.get("scan_frequency_seconds", 120)),
+            alert_on_violation=bool(scfg.get("alert_on_violation", True)),
+        )
+
+    def run_once(self) -> Dict[str, int]:
+        """Scan until no unscanned drafts remain; returns counts per verdict."""
+        totals = dict.fromkeys(VERDICTS, 0)
+        while True:
+            drafts = self.repository.unscanned_drafts(self.batch_size)
+            if not drafts:
+                break
+            scored = self.scanner.scan_batch(drafts)
+            written = set(self.repository.record_safety_reviews(scored))
+            reviews = [r for r in scored if r["draft_id"] in written]
+            if len(reviews) < len(scored):
+                _SKIPPED.inc(len(scored) - len(reviews))
+                logger.info("%d drafts were already reviewed by another scanner", len(scored) - len(reviews))
+            for r in reviews:
+                totals[r["verdict"]] += 1
+            flagged = [r for r in reviews if r["verdict"] != "approved"]
+            if flagged and self.alert_on_violation:
+                logger.warning(
+                    "Safety scan flagged %d of %d drafts: %s",
+                    len(flagged),
+                    len(reviews),
+                    ", ".join(f"{r['draft_id']}={r['verdict']}" for r in flagged[:10]),
+                )
+            if len(drafts) < self.batch_size:
+                break
+        return totals
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        """Call `run_once` every `interval` seconds until `stop` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                result = self.run_once()
+                logger.info("Safety scan pass: %s", result)
+            except Exception:
+                logger.exception("Safety scan pass failed")
+            stop.wait(self.interval)
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    from ...config.config_loader import load_yaml_files
+
+    parser = argparse.ArgumentParser(description="Review new content drafts against the safety policies.")
+    parser.add_argument("--once", action="store_true", help="run one pass and exit")
+    parser.add_argument("--workers", type=int, help="override agents.safety_agent.workers")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    config = load_yaml_files(ROOT / "config")
+    if args.workers is not None:
+        config.setdefault("agents", {}).setdefault("safety_agent", {})["workers"] = args.workers
+    job = SafetyScanJob.from_config(config)
+    try:
+        if args.once:
+            print(json.dumps(job.run_once(), indent=2))
+        else:
+            job.run_forever()
+    finally:
+        job.scanner.close()
+    return 0
+
+
+__all__ = [
+    "DEFAULT_POLICIES",
+    "PolicyCategory",
+    "SafetyScanJob",
+    "SafetyScanner",
+    "VERDICTS",
+    "load_policies",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
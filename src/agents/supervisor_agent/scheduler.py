@@ -0,0 +1,446 @@
+"""Concurrent task scheduler for the Supervisor Agent.
+
+`specs/supervisor_agent.contract.md` asks the supervisor to sequence dependent
+agent work (Research -> Generation -> Safety) while running independent work
+in parallel. `TaskScheduler` is the asyncio execution engine for that:
+
+- Tasks are dispatched in `tasks.priority` order (higher first, FIFO within a
+  priority). Waiting tasks age: their effective priority grows by
+  `aging_per_second` for every second spent queued, so low-priority work is
+  not starved when the queue stays full. `reprioritize()` changes a queued
+  task's priority in place.
+- Dependencies form a DAG: a task becomes ready only when every task in
+  `depends_on` has succeeded, and receives their results. A failed or
+  cancelled dependency fails its dependents. `submit_pipeline()` wires the
+  standard Research -> Generation -> Safety chain for one campaign task.
+- Concurrency is capped globally (`agents.supervisor_agent.max_concurrent_tasks`)
+  and per agent (`per_agent_limits`).
+- Work is a stream: tasks may be submitted at any time and start as soon as a
+  slot and their dependencies allow; there are no batch boundaries.
+- Results and errors of finished tasks are kept while a queued dependent still
+  needs them, then only for the last `retain_finished` tasks, so a
+  long-running supervisor does not grow without bound.
+- `shutdown()` closes the scheduler: nothing new starts or is accepted, running
+  tasks are cancelled and everything queued fails.
+- The supervisor state (Idle / Scheduling / Executing), throughput, queue wait
+  and run time are exposed via `stats()` and the metrics registry.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ...logging.metrics import counter, gauge, histogram
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = ("research", "generation", "safety")
+
+TaskFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+_TASKS = counter("supervisor_tasks_total", "Supervisor tasks finished by agent and outcome", ("agent", "outcome"))
+_WAIT = histogram("supervisor_queue_wait_seconds", "Time a ready task waited for a slot", ("agent",))
+_RUN = histogram("supervisor_task_seconds", "Task execution time", ("agent",))
+_RUNNING = gauge("supervisor_running_tasks", "Tasks currently executing")
+_QUEUED = gauge("supervisor_queued_tasks", "Ready tasks waiting for a slot")
+
+
+class SchedulerError(RuntimeError):
+    """Raised for invalid submissions (duplicate ids, unknown dependencies)."""
+
+
+class DependencyFailed(SchedulerError):
+    """Set on a task whose upstream dependency failed or was cancelled."""
+
+
+@dataclass
+class ScheduledTask:
+    """Bookkeeping for one submitted task."""
+
+    id: str
+    agent: str
+    fn: TaskFn
+    priority: int
+    depends_on: Tuple[str, ...]
+    future: "asyncio.Future[Any]"
+    submitted_at: float
+    ready_at: Optional[float] = None
+    started_at: Optional[float] = None
+    waiting_on: int = 0
+    dependents: List[str] = field(default_factory=list)
+    # heap entry currently representing this task; replaced on reprioritize
+    entry: Optional[list] = None
+
+
+class TaskScheduler:
+    """
+    Priority + DAG aware asyncio scheduler with global and per-agent caps.
+
+    Parameters
+    - max_concurrent: global cap on tasks executing at once.
+    - per_agent_limits: optional {agent: cap}; agents not listed are only
+      bound by the global cap.
+    - aging_per_second: priority points a ready task gains per second queued.
+    - retain_finished: finished tasks whose result/error stay available to
+      `result()` and to late `depends_on` once no queued task needs them.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 5,
+        per_agent_limits: Optional[Mapping[str, int]] = None,
+        aging_per_second: float = 0.0,
+        retain_finished: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        self.max_concurrent = int(max_concurrent)
+        self.per_agent_limits = {k: max(1, int(v)) for k, v in (per_agent_limits or {}).items()}
+        self.aging_per_second = float(aging_per_second)
+        self.retain_finished = max(0, int(retain_finished))
+        self._clock = clock
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._results: Dict[str, Any] = {}
+        self._failed: Dict[str, BaseException] = {}
+        # finished id -> live dependents that still need its result
+        self._refs: Dict[str, int] = {}
+        # finished ids nobody needs any more, oldest first; trimmed to retain_finished
+        self._history: "OrderedDict[str, None]" = OrderedDict()
+        self._closed = False
+        # one ready heap per agent so a saturated agent never blocks the others
+        self._ready: Dict[str, List[list]] = {}
+        self._running: Dict[str, int] = {}
+        self._total_running = 0
+        self._queued = 0
+        self._seq = itertools.count()
+        self._inflight: set = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._started = clock()
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds_total = 0.0
+        _RUNNING.set_function(lambda: self._total_running)
+        _QUEUED.set_function(lambda: self._queued)
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "TaskScheduler":
+        """Build from the `agents.supervisor_agent` block of the merged config."""
+        scfg = config.get("agents", {}).get("supervisor_agent", {}) or {}
+        return cls(
+            max_concurrent=int(scfg.get("max_concurrent_tasks", 5)),
+            per_agent_limits=scfg.get("per_agent_limits") or {},
+            aging_per_second=float(scfg.get("priority_aging_per_second", 0) or 0),
+            retain_finished=int(scfg.get("retain_finished_tasks", 1024)),
+        )
+
+    # -- submission ------------------------------------------------------------
+    def submit(
+        self,
+        task_id: str,
+        agent: str,
+        fn: TaskFn,
+        priority: int = 0,
+        depends_on: Iterable[str] = (),
+    ) -> "asyncio.Future[Any]":
+        """
+        Queue `fn` to run as `agent` once `depends_on` have succeeded.
+
+        `fn` is awaited with a {dependency id: result} mapping. Returns a future
+        resolving to its result. Dependencies must already be submitted (or
+        finished); this keeps the graph acyclic by construction.
+        """
+        if self._closed:
+            raise SchedulerError("Scheduler is shut down")
+        if task_id in self._tasks or task_id in self._results or task_id in self._failed:
+            raise SchedulerError(f"Task {task_id!r} already submitted")
+        deps = tuple(depends_on)
+        for dep in deps:
+            if dep not in self._tasks and dep not in self._results and dep not in self._failed:
+                raise SchedulerError(f"Task {task_id!r} depends on unknown task {dep!r}")
+        now = self._clock()
+        task = ScheduledTask(
+            task_id, agent, fn, int(priority), deps, asyncio.get_running_loop().create_future(), now
+        )
+        self._tasks[task_id] = task
+        self._idle.clear()
+        for dep in deps:
+            if dep not in self._tasks:
+                self._retain(dep)
+        failed = next((d for d in deps if d in self._failed), None)
+        if failed is not None:
+            self._fail(task, DependencyFailed(f"Dependency {failed!r} of {task_id!r} failed"))
+            return task.future
+        for dep in deps:
+            if dep in self._tasks:
+                self._tasks[dep].dependents.append(task_id)
+                task.waiting_on += 1
+        if task.waiting_on == 0:
+            self._make_ready(task)
+            self._pump()
+        return task.future
+
+    def submit_pipeline(
+        self,
+        task_id: str,
+        stages: Mapping[str, TaskFn],
+        priority: int = 0,
+    ) -> "asyncio.Future[Any]":
+        """
+        Submit the Research -> Generation -> Safety chain for one campaign task.
+
+        `stages` maps stage names from `PIPELINE_STAGES` to callables; missing
+        stages are skipped. Sub-task ids are `<task_id>:<stage>` and each stage
+        runs as the `<stage>_agent`. Returns the future of the last stage.
+        """
+        previous: Tuple[str, ...] = ()
+        future: Optional[asyncio.Future[Any]] = None
+        for stage in PIPELINE_STAGES:
+            fn = stages.get(stage)
+            if fn is None:
+                continue
+            sub_id = f"{task_id}:{stage}"
+            future = self.submit(sub_id, f"{stage}_agent", fn, priority, previous)
+            previous = (sub_id,)
+        if future is None:
+            raise SchedulerError(f"Pipeline {task_id!r} has no stages")
+        return future
+
+    def reprioritize(self, task_id: str, priority: int) -> bool:
+        """Change a not-yet-started task's priority; False if it already started or finished."""
+        task = self._tasks.get(task_id)
+        if task is None or task.started_at is not None:
+            return False
+        task.priority = int(priority)
+        if task.entry is not None:
+            task.entry[-1] = None  # lazy delete the stale heap entry
+            self._queued -= 1
+            self._push(task)
+            self._pump()
+        return True
+
+    # -- dispatch --------------------------------------------------------------
+    def _push(self, task: ScheduledTask) -> None:
+        # aging is linear in waiting time, so (priority + a * (now - ready_at))
+        # orders the same as (priority - a * ready_at): the key never changes.
+        key = -(task.priority - self.aging_per_second * (task.ready_at or 0.0))
+        task.entry = [key, next(self._seq), task]
+        heapq.heappush(self._ready.setdefault(task.agent, []), task.entry)
+        self._queued += 1
+
+    def _make_ready(self, task: ScheduledTask) -> None:
+        task.ready_at = self._clock()
+        self._push(task)
+
+    def _peek(self, agent: str) -> Optional[list]:
+        heap = self._ready.get(agent)
+        while heap and heap[0][-1] is None:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _pump(self) -> None:
+        """Start as many ready tasks as the global and per-agent caps allow."""
+        if self._closed:
+            return
+        while self._total_running < self.max_concurrent and self._queued:
+            best: Optional[list] = None
+            best_agent = ""
+            for agent in self._ready:
+                limit = self.per_agent_limits.get(agent)
+                if limit is not None and self._running.get(agent, 0) >= limit:
+                    continue
+                head = self._peek(agent)
+                if head is not None and (best is None or head[:2] < best[:2]):
+                    best, best_agent = head, agent
+            if best is None:
+                return  # everything ready belongs to saturated agents
+            heapq.heappop(self._ready[best_agent])
+            self._queued -= 1
+            task: ScheduledTask = best[-1]
+            task.entry = None
+            self._start(task)
+
+    def _start(self, task: ScheduledTask) -> None:
+        now = self._clock()
+        task.started_at = now
+        self.started += 1
+        waited = now - (task.ready_at or now)
+        self.wait_seconds_total += waited
+        _WAIT.labels(task.agent).observe(waited)
+        self._running[task.agent] = self._running.get(task.agent, 0) + 1
+        self._total_running += 1
+        upstream = {dep: self._results[dep] for dep in task.depends_on}
+        self._release_deps(task)
+        runner = asyncio.ensure_future(self._execute(task, upstream))
+        self._inflight.add(runner)
+        runner.add_done_callback(self._inflight.discard)
+
+    async def _execute(self, task: ScheduledTask, upstream: Dict[str, Any]) -> None:
+        try:
+            result = await task.fn(upstream)
+        except asyncio.CancelledError as exc:
+            self._finish(task, None, exc)
+            raise
+        except Exception as exc:
+            logger.warning("Task %s (%s) failed: %s", task.id, task.agent, exc)
+            self._finish(task, None, exc)
+        else:
+            self._finish(task, result, None)
+
+    def _finish(self, task: ScheduledTask, result: Any, error: Optional[BaseException]) -> None:
+        _RUN.labels(task.agent).observe(self._clock() - (task.started_at or self._clock()))
+        self._running[task.agent] -= 1
+        self._total_running -= 1
+        if error is None:
+            self._complete(task, result)
+        else:
+            self._fail(task, error)
+        self._pump()
+
+    def _complete(self, task: ScheduledTask, result: Any) -> None:
+        self._tasks.pop(task.id, None)
+        self._results[task.id] = result
+        self._hold(task)
+        self.completed += 1
+        _TASKS.labels(task.agent, "ok").inc()
+        if not task.future.done():
+            task.future.set_result(result)
+        for dep_id in task.dependents:
+            child = self._tasks.get(dep_id)
+            if child is None:
+                continue
+            child.waiting_on -= 1
+            if child.waiting_on == 0:
+                self._make_ready(child)
+        self._check_idle()
+
+    def _fail(self, task: ScheduledTask, error: BaseException) -> None:
+        # iterative so a long chain of dependents cannot hit the recursion limit
+        stack = [(task, error)]
+        while stack:
+            current, exc = stack.pop()
+            if self._tasks.pop(current.id, None) is None:
+                continue  # already failed through another dependency
+            if current.started_at is None:
+                self._release_deps(current)  # a started task released them in _start
+            if current.entry is not None:
+                current.entry[-1] = None
+                current.entry = None
+                self._queued -= 1
+            self._failed[current.id] = exc
+            self._hold(current)
+            self.failed += 1
+            _TASKS.labels(current.agent, "dependency_failed" if isinstance(exc, DependencyFailed) else "error").inc()
+            if not current.future.done():
+                if isinstance(exc, asyncio.CancelledError):
+                    current.future.cancel()
+                else:
+                    current.future.set_exception(exc)
+                    current.future.exception()  # callers may never await it; don't warn on GC
+            for dep_id in current.dependents:
+                child = self._tasks.get(dep_id)
+                if child is not None:
+                    stack.append((child, DependencyFailed(f"Dependency {current.id!r} of {dep_id!r} failed")))
+        self._check_idle()
+
+    # -- retention -------------------------------------------------------------
+    def _hold(self, task: ScheduledTask) -> None:
+        """Keep a just-finished task's outcome for as long as queued dependents need it."""
+        live = sum(1 for dep_id in task.dependents if dep_id in self._tasks)
+        if live:
+            self._refs[task.id] = live
+        else:
+            self._retire(task.id)
+
+    def _retain(self, task_id: str) -> None:
+        self._refs[task_id] = self._refs.get(task_id, 0) + 1
+        self._history.pop(task_id, None)
+
+    def _release_deps(self, task: ScheduledTask) -> None:
+        """`task` started or failed: it no longer needs its finished dependencies."""
+        for dep in task.depends_on:
+            refs = self._refs.get(dep)
+            if refs is None:
+                continue  # still running, or failed after this task was counted out
+            if refs > 1:
+                self._refs[dep] = refs - 1
+            else:
+                del self._refs[dep]
+                self._retire(dep)
+
+    def _retire(self, task_id: str) -> None:
+        self._history[task_id] = None
+        while len(self._history) > self.retain_finished:
+            old, _ = self._history.popitem(last=False)
+            self._results.pop(old, None)
+            self._failed.pop(old, None)
+
+    def _check_idle(self) -> None:
+        if not self._tasks:
+            self._idle.set()
+
+    # -- observation -----------------------------------------------------------
+    @property
+    def state(self) -> str:
+        """Supervisor execution state from the contract: Idle, Scheduling or Executing."""
+        if self._total_running:
+            return "Executing"
+        return "Scheduling" if self._tasks else "Idle"
+
+    def result(self, task_id: str) -> Any:
+        """Result of a recently finished task (raises its error if it failed)."""
+        if task_id in self._failed:
+            raise self._failed[task_id]
+        return self._results[task_id]
+
+    async def join(self) -> None:
+        """Wait until every submitted task has finished."""
+        await self._idle.wait()
+
+    async def shutdown(self) -> None:
+        """Stop accepting and starting tasks, cancel running ones and fail everything queued."""
+        self._closed = True
+        for runner in list(self._inflight):
+            runner.cancel()
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+        for task in list(self._tasks.values()):
+            if task.id not in self._tasks:
+                continue
+            if task.started_at is not None:
+                # cancelled before its coroutine ran, so _finish never released the slot
+                self._running[task.agent] -= 1
+                self._total_running -= 1
+            self._fail(task, asyncio.CancelledError())
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(self._clock() - self._started, 1e-9)
+        return {
+            "state": self.state,
+            "running": self._total_running,
+            "running_by_agent": {k: v for k, v in self._running.items() if v},
+            "queued": self._queued,
+            "blocked": len(self._tasks) - self._queued - self._total_running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "throughput_per_second": self.completed / elapsed,
+            "mean_wait_seconds": self.wait_seconds_total / self.started if self.started else 0.0,
+        }
+
+
+__all__ = [
+    "DependencyFailed",
+    "PIPELINE_STAGES",
+    "ScheduledTask",
+    "SchedulerError",
+    "TaskScheduler",
+]
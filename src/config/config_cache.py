@@ -0,0 +1,164 @@
+"""Persistent, content-addressed cache of the merged YAML configuration.
+
+Short-lived agent processes and cron jobs spend most of their startup inside
+`load_yaml_files` parsing YAML. This module stores the merged, pre-placeholder
+document in `marshal` format under a key derived from the names and bytes of
+every input file, so a fresh process only has to read and hash the YAML files
+and unmarshal one blob instead of parsing them.
+
+- The cache key covers file names, file contents and the Python version
+  (the `marshal` format is version specific).
+- Placeholders are *not* resolved before caching, so secrets from `.env`
+  never reach the cache file.
+- Writes are atomic (temp file + `os.replace`); unreadable or corrupt entries
+  are treated as misses.
+- Documents containing values `marshal` cannot encode (e.g. YAML timestamps)
+  are returned normally but not cached.
+- After a successful write every other entry in the cache directory is
+  pruned, so edited configs do not leave stale blobs behind.
+
+Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from . import config_loader
+from .config_loader import ConfigError, _deep_merge, _list_yaml_files
+
+logger = logging.getLogger(__name__)
+
+_CACHE_SUFFIX = ".marshal"
+_TMP_PREFIX = ".tmp-"
+_FORMAT_TAG = f"chimera-config-v1-py{sys.version_info[0]}.{sys.version_info[1]}".encode()
+
+
+def _read_inputs(config_dir: Path) -> list[tuple[Path, bytes]]:
+    if not config_dir.exists() or not config_dir.is_dir():
+        raise ConfigError(f"Configuration directory not found: {config_dir}")
+    files = _list_yaml_files(config_dir)
+    if not files:
+        raise ConfigError(f"No YAML configuration files found in: {config_dir}")
+    return [(f, f.read_bytes()) for f in files]
+
+
+def cache_key(inputs: Iterable[tuple[Path, bytes]]) -> str:
+    """Return the content hash identifying a set of (path, content) inputs."""
+    h = hashlib.sha256(_FORMAT_TAG)
+    for path, content in inputs:
+        name = path.name.encode("utf-8")
+        h.update(len(name).to_bytes(4, "big"))
+        h.update(name)
+        h.update(len(content).to_bytes(8, "big"))
+        h.update(content)
+    return h.hexdigest()
+
+
+def _parse_and_merge(inputs: Iterable[tuple[Path, bytes]]) -> dict:
+    yaml = config_loader.yaml
+    if yaml is None:
+        raise ConfigError("PyYAML is required to load YAML config files (install with 'pip install pyyaml').")
+    result: dict[str, Any] = {}
+    for f, content in inputs:
+        try:
+            data = yaml.load(content.decode("utf-8"), Loader=config_loader._SafeLoader) or {}
+        except yaml.YAMLError as ye:  # pragma: no cover - YAML parsing error path
+            raise ConfigError(f"Failed to parse YAML file {f}: {ye}") from ye
+        if not isinstance(data, dict):
+            raise ConfigError(f"Top-level YAML document must be a mapping in {f}")
+        _deep_merge(result, data)
+        logger.debug("Parsed config file: %s", f)
+    return result
+
+
+def _read_cache(path: Path) -> Optional[dict]:
+    try:
+        with path.open("rb") as fh:
+            data = marshal.load(fh)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as exc:
+        logger.warning("Ignoring unreadable config cache %s: %s", path, exc)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_cache(path: Path, data: dict) -> bool:
+    """Atomically write `data` to `path`; returns False if nothing was written."""
+    try:
+        blob = marshal.dumps(data)
+    except ValueError:
+        logger.debug("Config contains values marshal cannot encode; not caching")
+        return False
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=_TMP_PREFIX, suffix=_CACHE_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError as exc:  # cache is best-effort
+        logger.warning("Unable to write config cache %s: %s", path, exc)
+        return False
+    return True
+
+
+def load_yaml_files_cached(config_dir: str | Path = "config", cache_dir: str | Path = ".cache/config") -> dict:
+    """Cached equivalent of `config_loader.load_yaml_files`.
+
+    Returns a fresh (mutable) merged document; on a cache hit no YAML is parsed.
+    """
+    inputs = _read_inputs(Path(config_dir))
+    key = cache_key(inputs)
+    path = Path(cache_dir) / (key + _CACHE_SUFFIX)
+
+    cached = _read_cache(path)
+    if cached is not None:
+        logger.debug("Config cache hit: %s", path)
+        return cached
+
+    logger.debug("Config cache miss: %s", path)
+    result = _parse_and_merge(inputs)
+    if _write_cache(path, result):
+        removed = prune_cache(cache_dir, keep=(key,))
+        if removed:
+            logger.debug("Pruned %d stale config cache entries from %s", removed, cache_dir)
+    return result
+
+
+def prune_cache(cache_dir: str | Path = ".cache/config", keep: Iterable[str] = ()) -> int:
+    """Remove cache entries whose key is not in `keep`; returns the number removed.
+
+    Temp files of writes still in progress are left alone.
+    """
+    keep_names = {k + _CACHE_SUFFIX for k in keep}
+    removed = 0
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        return 0
+    for entry in cache_dir.glob("*" + _CACHE_SUFFIX):
+        if entry.name not in keep_names and not entry.name.startswith(_TMP_PREFIX):
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:  # pragma: no cover - concurrent removal
+                pass
+    return removed
+
+
+__all__ = [
+    "cache_key",
+    "load_yaml_files_cached",
+    "prune_cache",
+]
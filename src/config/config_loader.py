@@ -14,17 +14,26 @@ from __future__ import annotations
 
 import os
 import re
+import time
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping
 import logging
 
+from ..logging.metrics import counter, histogram
+
 logger = logging.getLogger(__name__)
 
+_LOAD_SECONDS = histogram("chimera_config_load_seconds", "Wall time of load_config calls")
+_LOAD_FAILURES = counter("chimera_config_load_failures_total", "load_config calls that raised")
+
 try:
     import yaml
 except Exception as exc:  # pragma: no cover - defensive import message
     yaml = None  # type: ignore
 
+# Prefer the libyaml-backed loader (several times faster) when PyYAML was built with it.
+_SafeLoader = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
 
 class ConfigError(RuntimeError):
     """Raised when configuration cannot be loaded or validated."""
@@ -83,6 +92,10 @@ def _deep_merge(base: dict, extra: dict) -> dict:
     return base
 
 
+def _list_yaml_files(config_dir: Path) -> list[Path]:
+    return sorted(config_dir.glob("*.yaml")) + sorted(config_dir.glob("*.yml"))
+
+
 def load_yaml_files(config_dir: str | Path = "config") -> dict:
     """Load all YAML files from the provided directory and deep-merge them.
 
@@ -96,14 +109,14 @@ def load_yaml_files(config_dir: str | Path = "config") -> dict:
         raise ConfigError(f"Configuration directory not found: {config_dir}")
 
     result: dict[str, Any] = {}
-    yaml_files = sorted(config_dir.glob("*.yaml")) + sorted(config_dir.glob("*.yml"))
+    yaml_files = _list_yaml_files(config_dir)
     if not yaml_files:
         raise ConfigError(f"No YAML configuration files found in: {config_dir}")
 
     for f in yaml_files:
         try:
             with f.open("r", encoding="utf-8") as fh:
-                data = yaml.safe_load(fh) or {}
+                data = yaml.load(fh, Loader=_SafeLoader) or {}
             if not isinstance(data, dict):
                 raise ConfigError(f"Top-level YAML document must be a mapping in {f}")
             _deep_merge(result, data)
@@ -156,7 +169,9 @@ def _get_by_path(mapping: Mapping[str, Any], path: str) -> Any:
 def validate_required_keys(config: Mapping[str, Any], required: Iterable[str]) -> None:
     """Ensure the provided dot-separated keys are present in the configuration.
 
-    Raises ConfigError listing all missing keys.
+    Raises ConfigError listing all missing keys. Walks each path once, which is
+    cheaper than building a `ConfigView` for a one-off check; repeated lookups
+    should go through a view (as `ConfigStore` does).
     """
     missing: list[str] = []
     for key in required:
@@ -175,21 +190,52 @@ def load_config(
     dotenv_path: str | Path = ".env",
     required_keys: Iterable[str] | None = None,
     override_dotenv: bool = False,
+    cache_dir: str | Path | None = None,
 ) -> dict:
     """Load configuration following these steps:
 
     1. Parse and inject `.env` into environment (non-destructive unless `override_dotenv=True`).
     2. Load and deep-merge YAML config files from `config_dir`.
-    3. Resolve ${ENV_VAR} placeholders using the current environment.
+    3. Resolve ${ENV_VAR} placeholders using the current environment (all missing
+       variables are reported together).
     4. Validate presence of `required_keys` (if provided).
 
+    If `cache_dir` is given, step 2 goes through the persistent merged-document
+    cache in `config_cache` so unchanged YAML files are not parsed again.
+
     Returns the final config dictionary.
     """
+    start = time.perf_counter()
+    try:
+        return _load_config(config_dir, dotenv_path, required_keys, override_dotenv, cache_dir)
+    except Exception:
+        _LOAD_FAILURES.inc()
+        raise
+    finally:
+        _LOAD_SECONDS.observe(time.perf_counter() - start)
+
+
+def _load_config(
+    config_dir: str | Path,
+    dotenv_path: str | Path,
+    required_keys: Iterable[str] | None,
+    override_dotenv: bool,
+    cache_dir: str | Path | None,
+) -> dict:
     parse_dotenv(dotenv_path, override=override_dotenv)
-    config = load_yaml_files(config_dir)
+    if cache_dir is not None:
+        from .config_cache import load_yaml_files_cached  # local import: config_cache imports this module
+
+        config = load_yaml_files_cached(config_dir, cache_dir)
+    else:
+        config = load_yaml_files(config_dir)
+
+    # Resolve placeholders within the config; the compiled plan copies only the
+    # placeholder-bearing paths and reports every missing variable at once. The
+    # document was loaded for this call, so the caller may own it (frozen=False).
+    from .placeholders import compile_placeholders  # local import: placeholders imports this module
 
-    # Resolve placeholders within the config
-    config = resolve_placeholders(config)
+    config = compile_placeholders(config, cache_size=0, frozen=False).resolve()
 
     if required_keys:
         validate_required_keys(config, required_keys)
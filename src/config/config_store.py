@@ -0,0 +1,332 @@
+"""Process-wide, change-aware configuration snapshots for Project Chimera.
+
+`load_config` re-parses `.env`, re-globs and re-parses every YAML file and
+re-resolves placeholders on every call. Long-running agents call it from
+periodic jobs, so this module keeps a frozen snapshot per configuration source
+and only rebuilds it when one of its inputs actually changed:
+
+- the `.env` file (mtime/size, then content hash),
+- each YAML file in the config directory (mtime/size, then content hash),
+- the set of YAML files (directory listing),
+- the values of the environment variables referenced by `${VAR}` placeholders.
+
+When a change is detected the snapshot is rebuilt and swapped atomically and
+subscribers are notified with `(old, new)` so workers can pick up new
+`agents.*` settings without restarting.
+
+Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from .config_cache import load_yaml_files_cached
+from .config_loader import (
+    ConfigError,
+    _list_yaml_files,
+    load_yaml_files,
+    parse_dotenv,
+)
+from .config_view import ConfigView
+from .placeholders import PlaceholderPlan, compile_placeholders, freeze
+from ..logging.metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+_REBUILD_SECONDS = histogram("chimera_config_rebuild_seconds", "Wall time of ConfigStore snapshot rebuilds")
+
+# (path, digest) for each input file; digest is None for a missing `.env`.
+FileFingerprint = Tuple[Tuple[str, Optional[str]], ...]
+Subscriber = Callable[["ConfigSnapshot | None", "ConfigSnapshot"], None]
+
+
+def referenced_env_vars(obj: Any) -> frozenset[str]:
+    """Return the names of all `${VAR}` placeholders referenced in `obj`."""
+    return frozenset(compile_placeholders(obj, cache_size=0, frozen=False).variables)
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """An immutable, fully resolved configuration plus the inputs it was built from."""
+
+    config: Mapping[str, Any]
+    version: int
+    files: FileFingerprint
+    env: Tuple[Tuple[str, Optional[str]], ...]
+    loaded_at: float = field(default_factory=time.time)
+
+    @cached_property
+    def view(self) -> ConfigView:
+        """Flattened dotted-key index over `config`, built on first use."""
+        return ConfigView(self.config)
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """Return the value at dot-separated `path`, or `default` if absent."""
+        return self.view.get(path, default)
+
+
+class ConfigStore:
+    """Caches a frozen `ConfigSnapshot` and rebuilds it only when inputs change.
+
+    Parameters mirror `config_loader.load_config`. `check_interval` bounds how
+    often the filesystem is consulted: calls to `get()` within that many
+    seconds of the previous check return the current snapshot without any I/O.
+    `cache_dir` enables the persistent merged-document cache for rebuilds.
+    """
+
+    def __init__(
+        self,
+        config_dir: str | Path = "config",
+        dotenv_path: str | Path = ".env",
+        required_keys: Iterable[str] | None = None,
+        override_dotenv: bool = False,
+        check_interval: float = 1.0,
+        cache_dir: str | Path | None = None,
+    ) -> None:
+        self.config_dir = Path(config_dir)
+        self.dotenv_path = Path(dotenv_path)
+        self.required_keys = tuple(required_keys or ())
+        self.override_dotenv = override_dotenv
+        self.check_interval = check_interval
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._plan: Optional[PlaceholderPlan] = None
+        self._build_lock = threading.Lock()
+        self._subscribers: list[Subscriber] = []
+        self._subscribers_lock = threading.Lock()
+        self._last_check = 0.0
+        # path -> (mtime_ns, size, digest); avoids re-hashing untouched files
+        self._stat_cache: Dict[str, Tuple[int, int, str]] = {}
+        # directory mtime_ns -> sorted YAML file list; avoids re-globbing
+        self._listing: Tuple[int, Tuple[Path, ...]] | None = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+        # .env keys this store put into os.environ, with the value it set
+        self._injected: Dict[str, str] = {}
+
+    # -- fingerprinting -------------------------------------------------
+    def _yaml_files(self) -> Tuple[Path, ...]:
+        try:
+            dir_mtime = self.config_dir.stat().st_mtime_ns
+        except OSError as exc:
+            raise ConfigError(f"Configuration directory not found: {self.config_dir}") from exc
+        if self._listing is not None and self._listing[0] == dir_mtime:
+            return self._listing[1]
+        files = tuple(_list_yaml_files(self.config_dir))
+        self._listing = (dir_mtime, files)
+        return files
+
+    def _fingerprint_file(self, path: Path) -> Optional[str]:
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError:
+            self._stat_cache.pop(key, None)
+            return None
+        cached = self._stat_cache.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        digest = _file_digest(path)
+        self._stat_cache[key] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def _file_fingerprint(self) -> FileFingerprint:
+        paths = (self.dotenv_path,) + self._yaml_files()
+        return tuple((str(p), self._fingerprint_file(p)) for p in paths)
+
+    @staticmethod
+    def _env_fingerprint(names: Iterable[str]) -> Tuple[Tuple[str, Optional[str]], ...]:
+        return tuple((name, os.environ.get(name)) for name in sorted(names))
+
+    def _is_current(self, snap: ConfigSnapshot, files: FileFingerprint) -> bool:
+        if snap.files != files:
+            return False
+        return snap.env == self._env_fingerprint(name for name, _ in snap.env)
+
+    # -- building ---------------------------------------------------------
+    def _apply_dotenv(self) -> None:
+        """Parse `.env` into os.environ, updating values this store injected on an earlier build.
+
+        `parse_dotenv` never overwrites an existing variable unless
+        `override_dotenv` is set, which would pin the first value of every key
+        the store injected itself. Variables set by anyone else are still left
+        alone, and injected keys deleted from `.env` are removed again.
+        """
+        before = set(os.environ)
+        loaded = parse_dotenv(self.dotenv_path, override=self.override_dotenv)
+        injected: Dict[str, str] = {}
+        for key, value in loaded.items():
+            ours = self._injected.get(key)
+            if ours is not None and os.environ.get(key) == ours:
+                os.environ[key] = value
+            if os.environ.get(key) == value and (self.override_dotenv or key not in before or ours is not None):
+                injected[key] = value
+        for key, value in self._injected.items():
+            if key not in loaded and os.environ.get(key) == value:
+                del os.environ[key]
+        self._injected = injected
+
+    def _build(self, files: FileFingerprint, version: int, old: Optional[ConfigSnapshot]) -> ConfigSnapshot:
+        self._apply_dotenv()
+        if old is None or old.files != files or self._plan is None:
+            if self.cache_dir is not None:
+                raw = load_yaml_files_cached(self.config_dir, self.cache_dir)
+            else:
+                raw = load_yaml_files(self.config_dir)
+            plan = compile_placeholders(raw, cache_size=1)
+        else:
+            # only referenced env vars changed: re-resolve without touching the files
+            plan = self._plan
+        env = self._env_fingerprint(plan.variables)
+        config = plan.resolve()  # read-only; unchanged subtrees are shared between snapshots
+        snap = ConfigSnapshot(config=config, version=version, files=files, env=env)
+        # validating through the view builds the index `get()` reuses afterwards
+        _check_required(snap, self.required_keys)
+        self._plan = plan
+        logger.info("Configuration snapshot v%d built from %s", version, self.config_dir)
+        return snap
+
+    def refresh(self, force: bool = False) -> ConfigSnapshot:
+        """Check inputs now and rebuild the snapshot if anything changed.
+
+        Returns the (possibly unchanged) current snapshot. Raises `ConfigError`
+        if a rebuild fails; the previous snapshot stays in place in that case.
+        """
+        with self._build_lock:
+            self._last_check = time.monotonic()
+            old = self._snapshot
+            files = self._file_fingerprint()
+            if old is not None and not force and self._is_current(old, files):
+                return old
+            start = time.perf_counter()
+            new = self._build(files, version=(old.version + 1) if old else 1, old=old)
+            _REBUILD_SECONDS.observe(time.perf_counter() - start)
+            self._snapshot = new
+        self._notify(old, new)
+        return new
+
+    def get(self) -> ConfigSnapshot:
+        """Return the current snapshot, rebuilding it first if inputs changed."""
+        snap = self._snapshot
+        if snap is not None and time.monotonic() - self._last_check < self.check_interval:
+            return snap
+        return self.refresh()
+
+    @property
+    def snapshot(self) -> Optional[ConfigSnapshot]:
+        """The last built snapshot without checking inputs (None before first load)."""
+        return self._snapshot
+
+    # -- subscriptions ----------------------------------------------------
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Register `callback(old, new)` for snapshot changes; returns an unsubscribe function."""
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._subscribers_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _notify(self, old: Optional[ConfigSnapshot], new: ConfigSnapshot) -> None:
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for cb in subscribers:
+            try:
+                cb(old, new)
+            except Exception:  # subscriber failures must not break reloads
+                logger.exception("Config subscriber %r failed", cb)
+
+    # -- background watching ---------------------------------------------
+    def start_watching(self, interval: float = 5.0) -> None:
+        """Poll inputs every `interval` seconds on a daemon thread and notify on change."""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+
+        def _run() -> None:
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.refresh()
+                except ConfigError as exc:
+                    logger.error("Config reload failed; keeping previous snapshot: %s", exc)
+
+        self._watch_thread = threading.Thread(target=_run, name="config-store-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher started by `start_watching`."""
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+
+
+_stores: Dict[Tuple[str, str], ConfigStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_config_store(
+    config_dir: str | Path = "config",
+    dotenv_path: str | Path = ".env",
+    **kwargs: Any,
+) -> ConfigStore:
+    """Return the process-wide `ConfigStore` for (`config_dir`, `dotenv_path`).
+
+    Keyword arguments are only used when the store is first created.
+    """
+    key = (str(Path(config_dir).resolve()), str(Path(dotenv_path).expanduser().resolve()))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ConfigStore(config_dir, dotenv_path, **kwargs)
+            _stores[key] = store
+        return store
+
+
+def load_config_snapshot(
+    config_dir: str | Path = "config",
+    dotenv_path: str | Path = ".env",
+    required_keys: Iterable[str] | None = None,
+) -> ConfigSnapshot:
+    """Cached counterpart of `load_config` returning the shared frozen snapshot."""
+    snap = get_config_store(config_dir, dotenv_path).get()
+    _check_required(snap, required_keys or ())
+    return snap
+
+
+def _check_required(snap: ConfigSnapshot, required_keys: Iterable[str]) -> None:
+    """`validate_required_keys` against the snapshot's dotted-key index."""
+    missing = [key for key in required_keys if snap.view.get(key) is None]
+    if missing:
+        raise ConfigError(f"Missing required configuration keys: {', '.join(missing)}")
+
+
+__all__ = [
+    "ConfigSnapshot",
+    "ConfigStore",
+    "freeze",
+    "referenced_env_vars",
+    "get_config_store",
+    "load_config_snapshot",
+]
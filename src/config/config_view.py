@@ -0,0 +1,180 @@
+"""Read-only, flattened view over a merged configuration.
+
+`_get_by_path` / `validate_required_keys` split a dotted string and walk nested
+mappings on every lookup. Agent loops repeatedly read keys such as
+`agents.supervisor_agent.max_concurrent_tasks`, so `ConfigView` flattens the
+configuration once into a dotted-key index:
+
+- every mapping node and leaf is reachable by its dotted path in O(1),
+- optional typed coercion (`int`, `float`, `bool`, `str`, `duration`, or any
+  callable) is applied once at build time,
+- required keys and schema types are validated in bulk, reporting all
+  problems in a single `ConfigError`.
+
+The index is never mutated after construction, so lookups are lock-free from
+any thread and do not allocate.
+
+Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import re
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Union
+
+from .config_loader import ConfigError
+
+Coercer = Callable[[Any], Any]
+TypeSpec = Union[str, type, Coercer]
+
+_MISSING = object()
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d)?\s*$", re.IGNORECASE)
+_DURATION_UNITS = {None: 1.0, "ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+_TRUE = {"1", "true", "yes", "on", "y"}
+_FALSE = {"0", "false", "no", "off", "n"}
+
+
+def parse_bool(value: Any) -> bool:
+    """Coerce YAML/env style booleans ("true", "off", 1, ...) to bool."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        v = value.strip().lower()
+        if v in _TRUE:
+            return True
+        if v in _FALSE:
+            return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def parse_duration(value: Any) -> float:
+    """Coerce a duration ("250ms", "30s", "5m", "1h", "2d" or a number of seconds) to seconds."""
+    if isinstance(value, bool):
+        raise ValueError(f"not a duration: {value!r}")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        m = _DURATION.match(value)
+        if m:
+            unit = m.group(2).lower() if m.group(2) else None
+            return float(m.group(1)) * _DURATION_UNITS[unit]
+    raise ValueError(f"not a duration: {value!r}")
+
+
+def _strict_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"not an integer: {value!r}")
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"not an integer: {value!r}")
+    return int(value)
+
+
+def _strict_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"not a number: {value!r}")
+    return float(value)
+
+
+_COERCERS: Dict[Any, Coercer] = {
+    "int": _strict_int,
+    int: _strict_int,
+    "float": _strict_float,
+    float: _strict_float,
+    "bool": parse_bool,
+    bool: parse_bool,
+    "str": str,
+    str: str,
+    "duration": parse_duration,
+}
+
+
+def _coercer(spec: TypeSpec) -> Coercer:
+    if spec in _COERCERS:
+        return _COERCERS[spec]
+    if callable(spec):
+        return spec  # type: ignore[return-value]
+    raise ConfigError(f"Unknown config type spec: {spec!r}")
+
+
+def _flatten(obj: Mapping[str, Any], prefix: str, out: Dict[str, Any]) -> None:
+    for key, val in obj.items():
+        path = f"{prefix}{key}"
+        out[path] = val
+        if isinstance(val, Mapping):
+            _flatten(val, path + ".", out)
+
+
+class ConfigView(Mapping[str, Any]):
+    """Immutable dotted-key index over a configuration mapping.
+
+    Parameters
+    - config: merged (and resolved) configuration mapping.
+    - schema: optional mapping of dotted key -> type spec. Keys present in the
+      config are coerced; absent keys are ignored unless also required.
+    - required: dotted keys that must be present and not None.
+
+    Raises ConfigError listing every missing key and every coercion failure.
+    """
+
+    __slots__ = ("_index", "config")
+
+    def __init__(
+        self,
+        config: Mapping[str, Any],
+        schema: Mapping[str, TypeSpec] | None = None,
+        required: Iterable[str] = (),
+    ) -> None:
+        index: Dict[str, Any] = {}
+        _flatten(config, "", index)
+
+        problems: list[str] = []
+        missing = [key for key in required if index.get(key) is None]
+        if missing:
+            problems.append(f"Missing required configuration keys: {', '.join(missing)}")
+        for key, spec in (schema or {}).items():
+            coerce = _coercer(spec)
+            if key not in index or index[key] is None:
+                continue
+            try:
+                index[key] = coerce(index[key])
+            except (TypeError, ValueError) as exc:
+                problems.append(f"Invalid value for {key}: {exc}")
+        if problems:
+            raise ConfigError("; ".join(problems))
+
+        self.config = config
+        self._index = MappingProxyType(index)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._index[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the (coerced) value at dotted `key`, or `default` if absent."""
+        return self._index.get(key, default)
+
+    def require(self, key: str) -> Any:
+        """Return the value at dotted `key`; raises ConfigError if absent or None."""
+        val = self._index.get(key, _MISSING)
+        if val is _MISSING or val is None:
+            raise ConfigError(f"Missing required configuration key: {key}")
+        return val
+
+
+__all__ = [
+    "ConfigView",
+    "parse_bool",
+    "parse_duration",
+]
@@ -6,29 +6,59 @@ basic status checks (`openclaw models status`). This module is intentionally
 lightweight and only depends on the existing `config_loader.parse_dotenv` to
 help load env files used by OpenClaw.
 
+The resolved CLI path is cached per `PATH` value. `OpenClawStatusService`
+runs the status command with asyncio (no blocked threads), coalesces
+concurrent callers onto one in-flight invocation and caches the parsed result
+with a TTL plus a stale-while-revalidate window; `get_models_status()` uses a
+shared instance.
+
 See: https://docs.openclaw.ai/gateway/authentication
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import os
 import shutil
 import subprocess
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
 
 from .config_loader import parse_dotenv
+from ..logging.metrics import counter, histogram
+from ..logging.tracing import inject_env, start_span
 
 logger = logging.getLogger(__name__)
 
+_CLI_SECONDS = histogram("openclaw_cli_seconds", "Wall time of `openclaw models status` runs")
+_CLI_RUNS = counter("openclaw_cli_runs_total", "`openclaw models status` runs by outcome", ("outcome",))
+
 
 class OpenClawError(RuntimeError):
     """Raised for OpenClaw specific failures."""
 
 
-def openclaw_cli_path() -> Optional[str]:
-    """Return full path to `openclaw` CLI if available, otherwise None."""
-    return shutil.which("openclaw")
+# (PATH value, resolved path) - avoids rescanning PATH on every status check
+_cli_path_cache: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+
+def openclaw_cli_path(refresh: bool = False) -> Optional[str]:
+    """Return full path to `openclaw` CLI if available, otherwise None.
+
+    The lookup is cached until `PATH` changes (or `refresh=True`); a missing
+    CLI is re-checked on every call so installing it is noticed immediately.
+    """
+    global _cli_path_cache
+    env_path = os.environ.get("PATH")
+    cached = _cli_path_cache
+    if not refresh and cached is not None and cached[0] == env_path and cached[1] is not None:
+        return cached[1]
+    path = shutil.which("openclaw")
+    _cli_path_cache = (env_path, path)
+    return path
 
 
 def check_openclaw_cli() -> bool:
@@ -66,23 +96,206 @@ def run_openclaw_models_status(args: Iterable[str] | None = None, timeout: float
     - If the `openclaw` CLI is not found, raises `OpenClawError`.
     - `args` may include additional flags like `--check`.
     """
-    if not check_openclaw_cli():
+    cli = openclaw_cli_path()
+    if not cli:
+        logger.debug("openclaw CLI not found on PATH")
         raise OpenClawError("openclaw CLI not found on PATH")
 
-    cmd = ["openclaw", "models", "status"]
+    cmd = [cli, "models", "status"]
     if args:
         cmd.extend(list(args))
 
     logger.debug("Running command: %s", " ".join(cmd))
-    try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        out = (proc.stdout or "") + (proc.stderr or "")
-        logger.debug("openclaw exit=%s; output=%s", proc.returncode, out)
-        return proc.returncode, out
-    except subprocess.TimeoutExpired as te:
-        raise OpenClawError(f"openclaw command timed out: {te}") from te
-    except OSError as oe:
-        raise OpenClawError(f"Failed to execute openclaw CLI: {oe}") from oe
+    start = time.perf_counter()
+    outcome = "error"
+    with start_span("openclaw.cli", command="models status") as span:
+        try:
+            # the child inherits the request id / parent span via TRACEPARENT and CHIMERA_REQUEST_ID
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=inject_env())
+            out = (proc.stdout or "") + (proc.stderr or "")
+            logger.debug("openclaw exit=%s; output=%s", proc.returncode, out)
+            outcome = "ok" if proc.returncode == 0 else "nonzero_exit"
+            span.set_attribute("exit_code", proc.returncode)
+            return proc.returncode, out
+        except subprocess.TimeoutExpired as te:
+            outcome = "timeout"
+            raise OpenClawError(f"openclaw command timed out: {te}") from te
+        except OSError as oe:
+            openclaw_cli_path(refresh=True)  # the cached binary may have moved
+            raise OpenClawError(f"Failed to execute openclaw CLI: {oe}") from oe
+        finally:
+            _CLI_SECONDS.observe(time.perf_counter() - start)
+            _CLI_RUNS.labels(outcome).inc()
+
+
+def parse_models_status(output: str) -> Dict[str, Any]:
+    """Best-effort parse of `openclaw models status` output.
+
+    JSON output (e.g. with `--json`) is returned as-is when it is an object;
+    otherwise `key: value` lines become a flat mapping (keys lower-cased).
+    """
+    text = output.strip()
+    if text.startswith("{"):
+        try:
+            parsed = json.loads(text)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+    result: Dict[str, Any] = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            result[key.strip().lower()] = value.strip()
+    return result
+
+
+@dataclass(frozen=True)
+class ModelsStatus:
+    """One `openclaw models status` result."""
+
+    exit_code: int
+    output: str
+    parsed: Dict[str, Any] = field(default_factory=dict)
+    checked_at: float = 0.0  # service clock (monotonic) when the run finished
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+async def run_openclaw_models_status_async(args: Iterable[str] | None = None, timeout: float = 15.0) -> Tuple[int, str]:
+    """Non-blocking `run_openclaw_models_status`: same result and errors, via asyncio subprocesses."""
+    cli = openclaw_cli_path()
+    if not cli:
+        raise OpenClawError("openclaw CLI not found on PATH")
+    cmd = [cli, "models", "status", *(args or ())]
+    logger.debug("Running command: %s", " ".join(cmd))
+    start = time.perf_counter()
+    outcome = "error"
+    with start_span("openclaw.cli", command="models status") as span:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=inject_env(),
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                outcome = "timeout"
+                raise OpenClawError(f"openclaw command timed out after {timeout}s") from None
+            out = stdout.decode("utf-8", "replace") + stderr.decode("utf-8", "replace")
+            logger.debug("openclaw exit=%s; output=%s", proc.returncode, out)
+            outcome = "ok" if proc.returncode == 0 else "nonzero_exit"
+            span.set_attribute("exit_code", proc.returncode)
+            return int(proc.returncode or 0), out
+        except OSError as oe:
+            openclaw_cli_path(refresh=True)
+            raise OpenClawError(f"Failed to execute openclaw CLI: {oe}") from oe
+        finally:
+            _CLI_SECONDS.observe(time.perf_counter() - start)
+            _CLI_RUNS.labels(outcome).inc()
+
+
+class OpenClawStatusService:
+    """Cached, coalescing async front-end for `openclaw models status`.
+
+    - Within `ttl` seconds of the last run the cached result is returned.
+    - Up to `stale_ttl` seconds the stale result is returned immediately and
+      one background refresh is started (stale-while-revalidate).
+    - Older or missing results are awaited; concurrent callers share a single
+      in-flight subprocess.
+    - A failed refresh keeps serving the last good result within `stale_ttl`;
+      without one the `OpenClawError` propagates to every waiting caller.
+
+    Must be used from one event loop at a time.
+    """
+
+    def __init__(
+        self,
+        args: Sequence[str] = (),
+        ttl: float = 30.0,
+        stale_ttl: float = 300.0,
+        timeout: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.args = tuple(args)
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.timeout = timeout
+        self._clock = clock
+        self._cached: Optional[ModelsStatus] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "runs": 0, "errors": 0}
+
+    async def _run(self) -> ModelsStatus:
+        self.stats["runs"] += 1
+        start = self._clock()
+        try:
+            code, out = await run_openclaw_models_status_async(self.args, timeout=self.timeout)
+        except OpenClawError:
+            self.stats["errors"] += 1
+            raise
+        now = self._clock()
+        result = ModelsStatus(code, out, parse_models_status(out), checked_at=now, elapsed_seconds=now - start)
+        self._cached = result
+        return result
+
+    def _refresh(self) -> asyncio.Task:
+        task = self._inflight
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.stats["coalesced"] += 1
+            return task
+        task = asyncio.get_running_loop().create_task(self._run())
+        task.add_done_callback(self._on_done)
+        self._inflight = task
+        return task
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if self._inflight is task:
+            self._inflight = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("openclaw status refresh failed: %s", task.exception())
+
+    async def get(self, force: bool = False) -> ModelsStatus:
+        """Return the (possibly cached) status, refreshing per the TTL rules above."""
+        cached = self._cached
+        if cached is not None and not force:
+            age = self._clock() - cached.checked_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return cached
+            if age < self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._refresh()
+                return cached
+        self.stats["misses"] += 1
+        # shield: one caller being cancelled must not cancel the shared run
+        return await asyncio.shield(self._refresh())
+
+    def invalidate(self) -> None:
+        self._cached = None
+
+
+_status_service: Optional[OpenClawStatusService] = None
+
+
+def get_status_service(**kwargs: Any) -> OpenClawStatusService:
+    """Return the shared status service (keyword arguments apply on first creation only)."""
+    global _status_service
+    if _status_service is None:
+        _status_service = OpenClawStatusService(**kwargs)
+    return _status_service
+
+
+async def get_models_status(force: bool = False) -> ModelsStatus:
+    """Cached `openclaw models status` via the shared `OpenClawStatusService`."""
+    return await get_status_service().get(force=force)
 
 
 __all__ = [
@@ -92,4 +305,10 @@ __all__ = [
     "load_env_for_openclaw",
     "get_openclaw_api_key",
     "run_openclaw_models_status",
+    "run_openclaw_models_status_async",
+    "parse_models_status",
+    "ModelsStatus",
+    "OpenClawStatusService",
+    "get_status_service",
+    "get_models_status",
 ]
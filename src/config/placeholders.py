@@ -0,0 +1,190 @@
+"""Compiled `${ENV_VAR}` placeholder resolution.
+
+`config_loader.resolve_placeholders` rebuilds every dict and list and re-runs
+the placeholder regex on every call. For configurations that are resolved
+repeatedly (per tenant, or on every env change) this module compiles the
+document once:
+
+- the exact paths of placeholder-bearing strings are recorded in a trie,
+- each such string is pre-split into literal and variable parts,
+- the set of referenced variable names is computed up front.
+
+`PlaceholderPlan.resolve(env)` then copies only the containers on those paths
+(everything else is shared with the source document), reports *all* missing
+variables in a single `ConfigError`, and memoizes results by the values of the
+referenced variables so an unchanged environment costs one tuple comparison.
+
+Because results share subtrees with the source and with each other, a plan
+freezes its source once when compiled (dicts -> `MappingProxyType`, lists ->
+tuples) and returns read-only results; a caller cannot change what the next
+`resolve` returns. One-shot callers that own the document and want plain
+dicts/lists back use `frozen=False`, which disables the result cache.
+
+Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .config_loader import _ENV_PLACEHOLDER, ConfigError
+
+PathKey = Union[str, int]
+
+
+def freeze(obj: Any) -> Any:
+    """Return a read-only deep copy of `obj` (dicts -> MappingProxyType, lists -> tuples)."""
+    if isinstance(obj, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(i) for i in obj)
+    return obj
+
+
+class _Template:
+    """A placeholder-bearing string split into alternating literal/variable parts."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, s: str) -> None:
+        # re.split with one group yields [lit, name, lit, name, ..., lit]
+        self.parts = tuple(_ENV_PLACEHOLDER.split(s))
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.parts[1::2]
+
+    def render(self, values: Mapping[str, str]) -> str:
+        parts = self.parts
+        out = [parts[0]]
+        for i in range(1, len(parts), 2):
+            out.append(values[parts[i]])
+            out.append(parts[i + 1])
+        return "".join(out)
+
+
+# Trie node: key/index -> child node or template leaf
+_Node = Dict[PathKey, Union["_Node", _Template]]
+
+
+def _compile(obj: Any, node: _Node, names: set[str], path: list[PathKey], paths: list[Tuple[PathKey, ...]]) -> bool:
+    """Populate `node` for `obj`; returns True if any placeholder was found below."""
+    if isinstance(obj, Mapping):
+        items = obj.items()
+    elif isinstance(obj, (list, tuple)):
+        items = enumerate(obj)
+    else:
+        return False
+    found = False
+    for key, val in items:
+        if isinstance(val, str):
+            if "${" in val and _ENV_PLACEHOLDER.search(val):
+                tpl = _Template(val)
+                node[key] = tpl
+                names.update(tpl.names)
+                paths.append(tuple(path) + (key,))
+                found = True
+        elif isinstance(val, (Mapping, list, tuple)):
+            child: _Node = {}
+            path.append(key)
+            if _compile(val, child, names, path, paths):
+                node[key] = child
+                found = True
+            path.pop()
+    return found
+
+
+class PlaceholderPlan:
+    """
+    Compiled resolution plan for one configuration document.
+
+    Parameters
+    - source: the document; with `frozen` (default) a read-only copy is kept.
+    - cache_size: resolved results memoized per environment (frozen only).
+    - frozen: return read-only results. With False the caller owns `source`
+      and every result (which share unchanged subtrees with it) and nothing
+      is cached.
+    """
+
+    def __init__(self, source: Any, cache_size: int = 8, frozen: bool = True) -> None:
+        self.frozen = frozen
+        self.source = freeze(source) if frozen else source
+        source = self.source
+        self._root: _Node = {}
+        names: set[str] = set()
+        paths: list[Tuple[PathKey, ...]] = []
+        self._root_template: Optional[_Template] = None
+        if isinstance(source, str) and _ENV_PLACEHOLDER.search(source):
+            self._root_template = _Template(source)
+            names.update(self._root_template.names)
+            paths.append(())
+        else:
+            _compile(source, self._root, names, [], paths)
+        self.variables: Tuple[str, ...] = tuple(sorted(names))
+        self.paths: Tuple[Tuple[PathKey, ...], ...] = tuple(paths)
+        self._cache_size = cache_size if frozen else 0
+        self._cache: "OrderedDict[Tuple[Optional[str], ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _apply(self, src: Any, node: _Node, values: Mapping[str, str]) -> Any:
+        is_map = isinstance(src, Mapping)
+        copy: Any = dict(src) if is_map else list(src)
+        for key, child in node.items():
+            if isinstance(child, _Template):
+                copy[key] = child.render(values)
+            else:
+                copy[key] = self._apply(src[key], child, values)
+        if self.frozen:
+            return MappingProxyType(copy) if is_map else tuple(copy)
+        return copy
+
+    def resolve(self, env: Mapping[str, str] | None = None) -> Any:
+        """Return the source with placeholders substituted from `env` (default `os.environ`).
+
+        The result is read-only unless the plan was built with `frozen=False`.
+        Raises ConfigError naming every referenced variable missing from `env`.
+        """
+        if env is None:
+            env = os.environ
+        if not self.variables:
+            return self.source
+        key = tuple(env.get(name) for name in self.variables)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+
+        missing = [name for name, val in zip(self.variables, key) if val is None]
+        if missing:
+            raise ConfigError(
+                "Missing environment variables for placeholders: " + ", ".join(f"${{{n}}}" for n in missing)
+            )
+        values = dict(zip(self.variables, key))
+        if self._root_template is not None:
+            result = self._root_template.render(values)
+        else:
+            result = self._apply(self.source, self._root, values)
+
+        if self._cache_size:
+            with self._lock:
+                self._cache[key] = result
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+
+def compile_placeholders(obj: Any, cache_size: int = 8, frozen: bool = True) -> PlaceholderPlan:
+    """Compile `obj` into a `PlaceholderPlan` (see module docstring)."""
+    return PlaceholderPlan(obj, cache_size=cache_size, frozen=frozen)
+
+
+__all__ = [
+    "PlaceholderPlan",
+    "compile_placeholders",
+    "freeze",
+]
@@ -0,0 +1,574 @@
+"""Pooled database access for the Chimera schema (`schema.sql`).
+
+Agents write research findings and drafts in bursts; opening a connection per
+call and inserting row by row would make the database the bottleneck. This
+module provides:
+
+- `DatabaseConfig`: settings from `db_config.json` overridden by `DB_*`
+  environment variables (`DB_DRIVER`, `DB_HOST`, `DB_PORT`, `DB_NAME`,
+  `DB_USER`, `DB_PASSWORD`, `DB_POOL_MIN`, `DB_POOL_MAX`, `DB_POOL_TIMEOUT`).
+- `ConnectionPool`: a bounded, thread-safe pool; callers wait up to
+  `pool_timeout` for a free connection instead of opening unbounded ones, and
+  broken connections are discarded instead of being handed out again.
+- Two backends behind one `Database` facade:
+  - PostgreSQL via the optional `psycopg` (v3) driver: server-side prepared
+    statements (`prepare=True`), `COPY ... FROM STDIN` bulk loads and named
+    server-side cursors for streaming reads.
+  - SQLite (stdlib) for local tests and benchmarks: the schema is translated
+    on the fly, statements are reused through sqlite3's statement cache and
+    bulk writes run as one `executemany` per batch in a single transaction.
+- SQL is written once with `%s` placeholders; the SQLite backend rewrites them
+  (cached) to `?`.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..logging.metrics import counter, gauge, histogram
+
+try:  # optional PostgreSQL driver
+    import psycopg
+except ImportError:  # pragma: no cover - environment may not have psycopg
+    psycopg = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CONFIG_PATH = ROOT / "db_config.json"
+SCHEMA_PATH = ROOT / "schema.sql"
+
+# columns stored as JSONB / arrays in PostgreSQL and as JSON text in SQLite
+JSON_COLUMNS = frozenset({"trends_data", "policy_violations"})
+ARRAY_COLUMNS = frozenset({"source_urls"})
+_ENCODED_COLUMNS = JSON_COLUMNS | ARRAY_COLUMNS
+
+_POOL_WAIT = histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection")
+_POOL_TIMEOUTS = counter("db_pool_timeouts_total", "Connection requests that timed out waiting for the pool")
+_ROWS_WRITTEN = counter("db_bulk_rows_total", "Rows written through bulk_insert", ("table",))
+_IN_USE = gauge("db_pool_connections_in_use", "Pooled connections currently checked out")
+
+
+class DatabaseError(RuntimeError):
+    """Raised for configuration, pool and backend errors."""
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    """Connection and pool settings."""
+
+    driver: str = "postgresql"
+    host: str = "localhost"
+    port: int = 5432
+    database: str = "chimera_db"
+    username: str = ""
+    password: str = ""
+    pool_min: int = 1
+    pool_max: int = 10
+    pool_timeout: float = 30.0
+    batch_size: int = 1000
+
+    _ENV = {
+        "DB_DRIVER": "driver",
+        "DB_HOST": "host",
+        "DB_PORT": "port",
+        "DB_NAME": "database",
+        "DB_USER": "username",
+        "DB_PASSWORD": "password",
+        "DB_POOL_MIN": "pool_min",
+        "DB_POOL_MAX": "pool_max",
+        "DB_POOL_TIMEOUT": "pool_timeout",
+        "DB_BATCH_SIZE": "batch_size",
+    }
+
+    @classmethod
+    def load(cls, path: str | Path | None = None, env: Optional[Mapping[str, str]] = None) -> "DatabaseConfig":
+        """Read `db_config.json` (if present) and apply `DB_*` overrides."""
+        path = Path(path) if path is not None else DEFAULT_CONFIG_PATH
+        env = os.environ if env is None else env
+        raw: Dict[str, Any] = {}
+        if path.exists():
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError as exc:
+                raise DatabaseError(f"Invalid database config {path}: {exc}") from exc
+        for var, key in cls._ENV.items():
+            if env.get(var):
+                raw[key] = env[var]
+        known = {f for f in cls.__dataclass_fields__ if not f.startswith("_")}
+        values: Dict[str, Any] = {}
+        for key, value in raw.items():
+            if key not in known:
+                continue
+            default = cls.__dataclass_fields__[key].default
+            try:
+                values[key] = type(default)(value)
+            except (TypeError, ValueError) as exc:
+                raise DatabaseError(f"Invalid database setting {key}={value!r}") from exc
+        cfg = cls(**values)
+        if cfg.pool_max < 1 or cfg.pool_min > cfg.pool_max:
+            raise DatabaseError(f"Invalid pool bounds min={cfg.pool_min} max={cfg.pool_max}")
+        return cfg
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.driver.lower() in ("sqlite", "sqlite3")
+
+    def redacted(self) -> Dict[str, Any]:
+        """Settings safe to log (no password)."""
+        return {k: ("***" if k == "password" and v else v) for k, v in self.__dict__.items()}
+
+
+# -- pool ------------------------------------------------------------------------
+class ConnectionPool:
+    """
+    Bounded LIFO pool of DB-API connections.
+
+    Parameters
+    - factory: opens a new connection.
+    - max_size: hard cap on open connections.
+    - min_size: connections opened eagerly.
+    - timeout: seconds to wait for a free connection before raising.
+    - check: optional callable(conn) -> bool run on reuse of idle connections
+      older than `check_after` seconds.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 10,
+        min_size: int = 0,
+        timeout: float = 30.0,
+        check: Optional[Callable[[Any], bool]] = None,
+        check_after: float = 30.0,
+    ) -> None:
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.timeout = float(timeout)
+        self._check = check
+        self._check_after = check_after
+        self._idle: List[Tuple[Any, float]] = []
+        self._open = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        for _ in range(min(int(min_size), self.max_size)):
+            self._idle.append((factory(), time.monotonic()))
+            self._open += 1
+        _IN_USE.set_function(lambda: self._in_use)
+
+    def acquire(self) -> Any:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        conn = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DatabaseError("Connection pool is closed")
+                if self._idle:
+                    conn, since = self._idle.pop()
+                    if self._check is not None and time.monotonic() - since > self._check_after and not self._check(conn):
+                        self._discard(conn)
+                        conn = None
+                        continue
+                    break
+                if self._open < self.max_size:
+                    self._open += 1  # reserve the slot; connect outside the lock
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    _POOL_TIMEOUTS.inc()
+                    raise DatabaseError(f"Timed out after {self.timeout}s waiting for a database connection")
+                self._cond.wait(remaining)
+            self._in_use += 1
+        if conn is None:
+            try:
+                conn = self._factory()
+            except BaseException:
+                with self._cond:
+                    self._open -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        _POOL_WAIT.observe(time.monotonic() - start)
+        return conn
+
+    def release(self, conn: Any, broken: bool = False) -> None:
+        with self._cond:
+            self._in_use -= 1
+            if broken or self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn: Any) -> None:
+        self._open -= 1
+        try:
+            conn.close()
+        except Exception:  # pragma: no cover - already broken
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Check out a connection; commit on success, roll back on error."""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except BaseException as exc:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            if _is_disconnect(exc):
+                broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"open": self._open, "idle": len(self._idle), "in_use": self._in_use, "max_size": self.max_size}
+
+
+def _is_disconnect(exc: BaseException) -> bool:
+    if psycopg is not None and isinstance(exc, psycopg.OperationalError):
+        return True
+    return isinstance(exc, (ConnectionError, sqlite3.ProgrammingError))
+
+
+# -- backends --------------------------------------------------------------------
+_SQLITE_DDL = [
+    (re.compile(r"\bSERIAL PRIMARY KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    # partitioned tables: `id BIGSERIAL` + composite key `(id, <partition column>)`
+    (re.compile(r"\bBIGSERIAL,", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT,"),
+    (re.compile(r",(\s*--[^\n]*)*\s*PRIMARY KEY \(id, \w+\)", re.I), ""),
+    (re.compile(r"\)\s*PARTITION BY RANGE \(\w+\)", re.I), ")"),
+    (re.compile(r"\bBIGINT\b", re.I), "INTEGER"),
+    (re.compile(r"\bJSONB?\b", re.I), "TEXT"),
+    (re.compile(r"\bTEXT\[\]", re.I), "TEXT"),
+    (re.compile(r"\bTIMESTAMP WITH TIME ZONE\b", re.I), "TIMESTAMP"),
+]
+
+
+_PG_ONLY = re.compile(r"^-- postgres-only:begin$.*?^-- postgres-only:end$", re.M | re.S)
+
+
+def sqlite_schema(sql: str) -> str:
+    """Translate the PostgreSQL DDL in `schema.sql` to SQLite (dropping `postgres-only` blocks)."""
+    sql = _PG_ONLY.sub("", sql)
+    for pattern, repl in _SQLITE_DDL:
+        sql = pattern.sub(repl, sql)
+    return sql
+
+
+@lru_cache(maxsize=512)
+def _qmark(sql: str) -> str:
+    return sql.replace("%s", "?")
+
+
+class _SQLiteBackend:
+    name = "sqlite"
+
+    def __init__(self, cfg: DatabaseConfig) -> None:
+        db = cfg.database
+        if db in ("", ":memory:"):
+            # a named shared-cache memory DB so every pooled connection sees the same data
+            self._target, self._uri = f"file:chimera-{uuid.uuid4().hex}?mode=memory&cache=shared", True
+            self._keepalive: Optional[sqlite3.Connection] = self.connect()
+        else:
+            self._target, self._uri = db, False
+            self._keepalive = None
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._target, uri=self._uri, check_same_thread=False, timeout=30.0, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        if not self._uri:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def check(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def sql(self, sql: str) -> str:
+        return _qmark(sql)
+
+    def adapt(self, column: str, value: Any) -> Any:
+        if value is not None and column in _ENCODED_COLUMNS:
+            return json.dumps(value, separators=(",", ":"))
+        return value
+
+    def row(self, cursor: Any, raw: Any) -> Dict[str, Any]:
+        out = dict(raw)
+        for column in _ENCODED_COLUMNS:
+            value = out.get(column)
+            if isinstance(value, str):
+                try:
+                    out[column] = json.loads(value)
+                except ValueError:
+                    pass
+        return out
+
+    def execute(self, conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> Any:
+        return conn.execute(_qmark(sql), params)
+
+    def executemany(self, conn: sqlite3.Connection, sql: str, rows: Iterable[Sequence[Any]]) -> None:
+        conn.executemany(_qmark(sql), rows)
+
+    def copy(self, conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> None:
+        marks = ",".join("?" * len(columns))
+        conn.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({marks})", rows)
+
+    def stream(self, conn: sqlite3.Connection, sql: str, params: Sequence[Any], batch_size: int) -> Iterator[Dict[str, Any]]:
+        # sqlite steps the statement lazily, so fetchmany never materializes the result
+        cur = conn.execute(_qmark(sql), params)
+        try:
+            while True:
+                chunk = cur.fetchmany(batch_size)
+                if not chunk:
+                    return
+                for raw in chunk:
+                    yield self.row(cur, raw)
+        finally:
+            cur.close()
+
+    def create_schema(self, conn: sqlite3.Connection, ddl: str) -> None:
+        conn.executescript(sqlite_schema(ddl))
+
+    def close(self) -> None:
+        if self._keepalive is not None:
+            self._keepalive.close()
+            self._keepalive = None
+
+
+class _PostgresBackend:
+    name = "postgresql"
+
+    def __init__(self, cfg: DatabaseConfig) -> None:
+        if psycopg is None:
+            raise DatabaseError("PostgreSQL backend requires the 'psycopg' package (pip install 'psycopg[binary]')")
+        self._kwargs = {
+            "host": cfg.host,
+            "port": cfg.port,
+            "dbname": cfg.database,
+            "user": cfg.username,
+            "password": cfg.password,
+        }
+
+    def connect(self) -> Any:
+        # prepare_threshold=0: every statement is prepared server-side on first use per connection
+        return psycopg.connect(**self._kwargs, prepare_threshold=0)
+
+    def check(self, conn: Any) -> bool:
+        return not conn.closed and not conn.broken
+
+    def sql(self, sql: str) -> str:
+        return sql
+
+    def adapt(self, column: str, value: Any) -> Any:
+        if value is not None and column in JSON_COLUMNS:
+            return json.dumps(value, separators=(",", ":"))
+        return value
+
+    def row(self, cursor: Any, raw: Any) -> Dict[str, Any]:
+        return dict(zip((d.name for d in cursor.description), raw))
+
+    def execute(self, conn: Any, sql: str, params: Sequence[Any] = ()) -> Any:
+        return conn.execute(sql, params, prepare=True)
+
+    def executemany(self, conn: Any, sql: str, rows: Iterable[Sequence[Any]]) -> None:
+        with conn.cursor() as cur:
+            cur.executemany(sql, rows)  # pipelined by psycopg 3
+
+    def copy(self, conn: Any, table: str, columns: Sequence[str], rows: List[Sequence[Any]]) -> None:
+        with conn.cursor() as cur:
+            with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+    def stream(self, conn: Any, sql: str, params: Sequence[Any], batch_size: int) -> Iterator[Dict[str, Any]]:
+        # named cursor = server-side; rows arrive `itersize` at a time
+        with conn.cursor(name=f"chimera_{uuid.uuid4().hex[:12]}") as cur:
+            cur.itersize = batch_size
+            cur.execute(sql, params)
+            names = [d.name for d in cur.description]
+            for raw in cur:
+                yield dict(zip(names, raw))
+
+    def create_schema(self, conn: Any, ddl: str) -> None:
+        conn.execute(ddl)
+
+    def close(self) -> None:
+        return None
+
+
+# -- facade ----------------------------------------------------------------------
+class Database:
+    """Pool + backend. All methods are thread-safe."""
+
+    def __init__(self, cfg: Optional[DatabaseConfig] = None) -> None:
+        self.config = cfg or DatabaseConfig.load()
+        self.backend = _SQLiteBackend(self.config) if self.config.is_sqlite else _PostgresBackend(self.config)
+        self.pool = ConnectionPool(
+            self.backend.connect,
+            max_size=self.config.pool_max,
+            min_size=self.config.pool_min,
+            timeout=self.config.pool_timeout,
+            check=self.backend.check,
+        )
+
+    @classmethod
+    def sqlite(cls, path: str | Path = ":memory:", **overrides: Any) -> "Database":
+        """Convenience constructor for a SQLite database (tests, benchmarks)."""
+        return cls(replace(DatabaseConfig(driver="sqlite", database=str(path)), **overrides))
+
+    def connection(self):
+        """Context manager yielding a pooled connection inside one transaction."""
+        return self.pool.connection()
+
+    def create_schema(self, path: str | Path = SCHEMA_PATH) -> None:
+        ddl = Path(path).read_text(encoding="utf-8")
+        with self.connection() as conn:
+            self.backend.create_schema(conn, ddl)
+
+    def execute(self, sql: str, params: Sequence[Any] = (), conn: Any = None) -> int:
+        """Run a statement; returns the affected row count."""
+        if conn is not None:
+            return self.backend.execute(conn, sql, params).rowcount
+        with self.connection() as c:
+            return self.backend.execute(c, sql, params).rowcount
+
+    def fetch_one(self, sql: str, params: Sequence[Any] = (), conn: Any = None) -> Optional[Dict[str, Any]]:
+        rows = self.fetch_all(sql, params, conn)
+        return rows[0] if rows else None
+
+    def fetch_all(self, sql: str, params: Sequence[Any] = (), conn: Any = None) -> List[Dict[str, Any]]:
+        if conn is None:
+            with self.connection() as c:
+                return self.fetch_all(sql, params, c)
+        cur = self.backend.execute(conn, sql, params)
+        return [self.backend.row(cur, r) for r in cur.fetchall()]
+
+    def stream(self, sql: str, params: Sequence[Any] = (), batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield rows of a large result without materializing it.
+
+        The pooled connection is held until the iterator is exhausted or
+        closed, so consume it promptly (or use `contextlib.closing`).
+        """
+        with self.connection() as conn:
+            yield from self.backend.stream(conn, sql, params, batch_size or self.config.batch_size)
+
+    def bulk_insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any] | Mapping[str, Any]],
+        method: str = "copy",
+        batch_size: Optional[int] = None,
+        conn: Any = None,
+    ) -> int:
+        """
+        Insert many rows, `batch_size` at a time, in one transaction.
+
+        `rows` are sequences in `columns` order or mappings keyed by column.
+        `method` is "copy" (COPY FROM STDIN on PostgreSQL) or "batch"
+        (prepared INSERT via executemany). Pass `conn` to write inside the
+        caller's transaction. Returns the number of rows written.
+        """
+        if method not in ("copy", "batch"):
+            raise ValueError(f"Unknown bulk insert method {method!r}; expected copy or batch")
+        if not _IDENT.fullmatch(table) or not all(_IDENT.fullmatch(c) for c in columns):
+            raise DatabaseError(f"Invalid table/column name in bulk insert into {table!r}")
+        batch = batch_size or self.config.batch_size
+        adapt = self.backend.adapt
+        cols = tuple(columns)
+        needs_adapt = [c in _ENCODED_COLUMNS for c in cols]
+        insert = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})"
+        if conn is None:
+            with self.connection() as c:
+                return self.bulk_insert(table, cols, rows, method, batch_size, c)
+        total = 0
+        buf: List[Sequence[Any]] = []
+        for row in rows:
+            values = [row.get(c) for c in cols] if isinstance(row, Mapping) else list(row)
+            if any(needs_adapt):
+                values = [adapt(c, v) if a else v for c, v, a in zip(cols, values, needs_adapt)]
+            buf.append(values)
+            if len(buf) >= batch:
+                total += self._write(conn, method, table, cols, insert, buf)
+                buf = []
+        if buf:
+            total += self._write(conn, method, table, cols, insert, buf)
+        _ROWS_WRITTEN.labels(table).inc(total)
+        return total
+
+    def _write(self, conn: Any, method: str, table: str, cols: Tuple[str, ...], insert: str, rows: List[Sequence[Any]]) -> int:
+        if method == "copy":
+            self.backend.copy(conn, table, cols, rows)
+        else:
+            self.backend.executemany(conn, insert, rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self.pool.close()
+        self.backend.close()
+
+
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+_default_db: Optional[Database] = None
+_default_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    """Return the process-wide `Database` built from `db_config.json` / `DB_*`."""
+    global _default_db
+    if _default_db is None:
+        with _default_lock:
+            if _default_db is None:
+                _default_db = Database()
+                logger.info("Database pool ready: %s", _default_db.config.redacted())
+    return _default_db
+
+
+__all__ = [
+    "ARRAY_COLUMNS",
+    "ConnectionPool",
+    "Database",
+    "DatabaseConfig",
+    "DatabaseError",
+    "JSON_COLUMNS",
+    "get_database",
+    "sqlite_schema",
+]
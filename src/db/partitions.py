@@ -0,0 +1,471 @@
+"""Monthly partition maintenance and archival for findings and reviews.
+
+`research_findings` and `safety_reviews` are range-partitioned by month on
+`created_at` / `reviewed_at` (see `schema.sql`, and
+`migrations/0002_partition_findings_reviews.sql` for existing databases).
+Queries on recent rows touch only recent partitions, and old history leaves
+the database as whole partitions instead of row-by-row `DELETE`s that bloat
+the table and keep vacuum busy. `PartitionManager.maintain()`:
+
+- pre-creates the next `premake_months` monthly partitions; rows that already
+  landed in the DEFAULT partition for a new month are moved into it first, so
+  attaching never fails;
+- exports every partition older than `retain_months` to an archive file
+  (`archive/<table>/<partition>.ndjson.gz`, `.ndjson.zst` with the optional
+  `zstandard`, or columnar `.parquet` with the optional `pyarrow`), streaming
+  it through a server-side cursor and writing a `.manifest.json` next to it
+  (row count, range and SHA-256); an existing archive is never overwritten,
+  a later run for the same month gets a run suffix (`<partition>.2.ndjson.gz`);
+- detaches the partition once the archived row count matches, and drops it
+  unless `keep_detached` is set;
+- archives and deletes aged rows that sit in the DEFAULT partition (months
+  that had no partition when they were written) the same way, as
+  `<table>_default_pYYYY_MM` archives.
+
+On SQLite (local runs) there are no partitions: aged months are archived the
+same way and then deleted. Run as `python -m src.db.partitions maintain`
+daily. Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..logging.metrics import counter
+from .database import ROOT, Database, DatabaseError, get_database
+
+logger = logging.getLogger(__name__)
+
+_CREATED = counter("db_partitions_created_total", "Partitions created ahead of time", ("table",))
+_ARCHIVED = counter("db_partitions_archived_total", "Partitions (or SQLite months) archived", ("table",))
+_ARCHIVED_ROWS = counter("db_archived_rows_total", "Rows written to archive files", ("table",))
+
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_PARTITION_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+_WRITE_BATCH = 10000
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    """Partitioning/retention settings for one table."""
+
+    table: str
+    column: str
+    premake_months: int = 3
+    retain_months: int = 12
+
+
+DEFAULT_POLICIES = (
+    PartitionPolicy("research_findings", "created_at"),
+    PartitionPolicy("safety_reviews", "reviewed_at"),
+)
+
+
+def month_start(dt: datetime) -> datetime:
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, n: int) -> datetime:
+    y, m = divmod(dt.month - 1 + n, 12)
+    return dt.replace(year=dt.year + y, month=m + 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y_%m}"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)  # Decimal, UUID, ...
+
+
+# -- archive writers ---------------------------------------------------------------
+class _NdjsonWriter:
+    def __init__(self, path: Path, compress: str) -> None:
+        if compress == "zstd":
+            import zstandard  # optional; resolved by _archive_format
+
+            self._raw = open(path, "wb")
+            self._fh = zstandard.ZstdCompressor(level=10).stream_writer(self._raw)
+        elif compress == "gzip":
+            self._raw = None
+            self._fh = gzip.open(path, "wb", compresslevel=6)
+        else:
+            self._raw = None
+            self._fh = open(path, "wb")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._fh.write(
+            b"".join(
+                json.dumps(r, default=_json_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+                for r in rows
+            )
+        )
+
+    def close(self) -> None:
+        self._fh.close()
+        if self._raw is not None:
+            self._raw.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path, compress: str) -> None:
+        import pyarrow  # optional; resolved by _archive_format
+        import pyarrow.parquet
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._codec = "zstd" if compress == "zstd" else "snappy" if compress == "none" else "gzip"
+        self._writer = None
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        # nested JSON/array columns are kept as JSON text so every batch has one schema
+        flat = [
+            {k: json.dumps(v, default=_json_default) if isinstance(v, (dict, list)) else v for k, v in r.items()}
+            for r in rows
+        ]
+        table = self._pa.Table.from_pylist(flat)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema, compression=self._codec)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _archive_format(fmt: str, compress: str) -> Tuple[str, str]:
+    """Resolve (format, compression) against the optional packages installed."""
+    fmt, compress = fmt.lower(), (compress or "none").lower()
+    if fmt not in ("ndjson", "parquet"):
+        raise ValueError(f"Unknown archive format {fmt!r}; expected ndjson or parquet")
+    if compress not in ("gzip", "zstd", "none"):
+        raise ValueError(f"Unknown archive compression {compress!r}; expected gzip, zstd or none")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            logger.warning("pyarrow is not installed; archiving as NDJSON instead of Parquet")
+            fmt = "ndjson"
+    if fmt == "ndjson" and compress == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning("zstandard is not installed; compressing archives with gzip")
+            compress = "gzip"
+    return fmt, compress
+
+
+def _suffix(fmt: str, compress: str) -> str:
+    if fmt == "parquet":
+        return ".parquet"
+    return ".ndjson" + {"gzip": ".gz", "zstd": ".zst", "none": ""}[compress]
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -- manager -----------------------------------------------------------------------
+class PartitionManager:
+    """
+    Creates upcoming partitions and archives/detaches expired ones.
+
+    Parameters
+    - db: `Database` (defaults to `get_database()`).
+    - archive_dir: root directory for archive files.
+    - fmt / compress: "ndjson" or "parquet"; "gzip", "zstd" or "none".
+    - keep_detached: detach expired partitions but do not drop them.
+    - policies: tables to manage (default: findings and reviews).
+    """
+
+    def __init__(
+        self,
+        db: Optional[Database] = None,
+        archive_dir: str | Path = ROOT / "archive",
+        fmt: str = "ndjson",
+        compress: str = "gzip",
+        keep_detached: bool = False,
+        policies: Iterable[PartitionPolicy] = DEFAULT_POLICIES,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.db = db or get_database()
+        self.archive_dir = Path(archive_dir)
+        self.fmt, self.compress = _archive_format(fmt, compress)
+        self.keep_detached = keep_detached
+        self.policies = tuple(policies)
+        for p in self.policies:
+            if not (_IDENT.fullmatch(p.table) and _IDENT.fullmatch(p.column)):
+                raise ValueError(f"Invalid partition policy identifiers: {p}")
+        self._clock = clock
+        self._pg = self.db.backend.name == "postgresql"
+
+    # -- helpers -----------------------------------------------------------------
+    @staticmethod
+    def _bound(dt: datetime) -> str:
+        return dt.strftime("%Y-%m-%d %H:%M:%S") + ("+00" if dt.tzinfo is not None else "")
+
+    def partitions(self, policy: PartitionPolicy) -> List[Tuple[str, datetime]]:
+        """Attached monthly partitions of `policy.table` as (name, month start), oldest first."""
+        if not self._pg:
+            rows = self.db.fetch_all(
+                f"SELECT DISTINCT substr({policy.column}, 1, 7) AS month FROM {policy.table} ORDER BY month"
+            )
+            out = []
+            for r in rows:
+                if r["month"]:
+                    start = datetime.strptime(r["month"], "%Y-%m").replace(tzinfo=timezone.utc)
+                    out.append((partition_name(policy.table, start), start))
+            return out
+        rows = self.db.fetch_all(
+            "SELECT c.relname AS name FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s",
+            [policy.table],
+        )
+        out = []
+        for r in rows:
+            m = _PARTITION_RE.search(r["name"])
+            if m and r["name"] == partition_name(policy.table, datetime(int(m[1]), int(m[2]), 1)):
+                out.append((r["name"], datetime(int(m[1]), int(m[2]), 1, tzinfo=timezone.utc)))
+        return sorted(out, key=lambda x: x[1])
+
+    # -- creation ----------------------------------------------------------------
+    def ensure_partitions(self, policy: PartitionPolicy, now: Optional[datetime] = None) -> List[str]:
+        """Create partitions from the current month through `premake_months` ahead."""
+        if not self._pg:
+            return []
+        now = now or self._clock()
+        existing = {name for name, _ in self.partitions(policy)}
+        created = []
+        for i in range(policy.premake_months + 1):
+            start = add_months(month_start(now), i)
+            name = partition_name(policy.table, start)
+            if name not in existing:
+                self._create_partition(policy, name, start, add_months(start, 1))
+                created.append(name)
+                _CREATED.labels(policy.table).inc()
+        if created:
+            logger.info("Created partitions %s", ", ".join(created))
+        return created
+
+    def _create_partition(self, policy: PartitionPolicy, name: str, start: datetime, end: datetime) -> None:
+        t, col, lo, hi = policy.table, policy.column, self._bound(start), self._bound(end)
+        with self.db.connection() as conn:
+            stray = self.db.fetch_one(
+                f"SELECT 1 AS hit FROM {t}_default WHERE {col} >= %s AND {col} < %s LIMIT 1", [lo, hi], conn
+            )
+            if stray is None:
+                self.db.execute(f"CREATE TABLE {name} PARTITION OF {t} FOR VALUES FROM ('{lo}') TO ('{hi}')", (), conn)
+                return
+            # rows for this month already sit in DEFAULT: move them before attaching,
+            # otherwise ATTACH fails on the default partition's constraint
+            self.db.execute(f"CREATE TABLE {name} (LIKE {t} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)", (), conn)
+            self.db.execute(
+                f"WITH moved AS (DELETE FROM {t}_default WHERE {col} >= %s AND {col} < %s RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved",
+                [lo, hi],
+                conn,
+            )
+            self.db.execute(f"ALTER TABLE {t} ATTACH PARTITION {name} FOR VALUES FROM ('{lo}') TO ('{hi}')", (), conn)
+
+    # -- archival ----------------------------------------------------------------
+    def _month_source(self, policy: PartitionPolicy, start: datetime, from_default: bool) -> Tuple[str, str, List[str]]:
+        """(relation, range predicate, params) selecting one month's rows to archive."""
+        if self._pg and not from_default:
+            return partition_name(policy.table, start), "TRUE", []
+        relation = f"{policy.table}_default" if from_default else policy.table
+        if self._pg:
+            lo, hi = self._bound(start), self._bound(add_months(start, 1))
+        else:
+            lo, hi = start.strftime("%Y-%m-%d %H:%M:%S"), add_months(start, 1).strftime("%Y-%m-%d %H:%M:%S")
+        return relation, f"{policy.column} >= %s AND {policy.column} < %s", [lo, hi]
+
+    def _rows(self, policy: PartitionPolicy, start: datetime, from_default: bool = False) -> Iterator[Dict[str, Any]]:
+        relation, where, params = self._month_source(policy, start, from_default)
+        return self.db.stream(f"SELECT * FROM {relation} WHERE {where} ORDER BY {policy.column}, id", params)
+
+    def _archive_path(self, out_dir: Path, name: str) -> Path:
+        # a month can be archived more than once (late rows on SQLite, a re-run after a
+        # failed detach); never replace what an earlier run wrote
+        suffix = _suffix(self.fmt, self.compress)
+        path = out_dir / (name + suffix)
+        run = 1
+        while path.exists() or path.with_name(path.name + ".manifest.json").exists():
+            run += 1
+            path = out_dir / f"{name}.{run}{suffix}"
+        return path
+
+    def archive_partition(
+        self, policy: PartitionPolicy, name: str, start: datetime, from_default: bool = False
+    ) -> Tuple[Path, int]:
+        """Export one month to `archive_dir/<table>/`; returns (path, rows).
+
+        With `from_default` the month's rows are read from the DEFAULT
+        partition instead of partition `name`.
+        """
+        out_dir = self.archive_dir / policy.table
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = self._archive_path(out_dir, name)
+        tmp = path.with_name(path.name + ".tmp")
+        writer = _ParquetWriter(tmp, self.compress) if self.fmt == "parquet" else _NdjsonWriter(tmp, self.compress)
+        rows = 0
+        batch: List[Dict[str, Any]] = []
+        try:
+            for row in self._rows(policy, start, from_default):
+                batch.append(row)
+                if len(batch) >= _WRITE_BATCH:
+                    writer.write(batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                writer.write(batch)
+                rows += len(batch)
+        finally:
+            writer.close()
+        tmp.replace(path)
+        manifest = {
+            "table": policy.table,
+            "partition": name,
+            "source": f"{policy.table}_default" if from_default else name,
+            "column": policy.column,
+            "from": start.isoformat(),
+            "to": add_months(start, 1).isoformat(),
+            "rows": rows,
+            "format": self.fmt,
+            "compression": self.compress,
+            "sha256": _sha256(path),
+            "archived_at": self._clock().isoformat(),
+        }
+        path.with_name(path.name + ".manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        _ARCHIVED_ROWS.labels(policy.table).inc(rows)
+        return path, rows
+
+    def _retire(
+        self, policy: PartitionPolicy, name: str, start: datetime, archived_rows: int, from_default: bool = False
+    ) -> None:
+        relation, where, params = self._month_source(policy, start, from_default)
+        with self.db.connection() as conn:
+            if not self._pg:
+                conn.execute("BEGIN IMMEDIATE")
+            live = self.db.fetch_one(f"SELECT count(*) AS n FROM {relation} WHERE {where}", params, conn)
+            if int(live["n"]) != archived_rows:
+                raise DatabaseError(
+                    f"{name}: {live['n']} rows in the database but {archived_rows} archived; not detaching"
+                )
+            if self._pg and not from_default:
+                self.db.execute(f"ALTER TABLE {policy.table} DETACH PARTITION {name}", (), conn)
+                if not self.keep_detached:
+                    self.db.execute(f"DROP TABLE {name}", (), conn)
+            else:
+                self.db.execute(f"DELETE FROM {relation} WHERE {where}", params, conn)
+
+    def _aged_default_months(self, policy: PartitionPolicy, cutoff: datetime) -> List[datetime]:
+        """Month starts (UTC) of rows older than `cutoff` left in the DEFAULT partition."""
+        if not self._pg:
+            return []
+        rows = self.db.fetch_all(
+            f"SELECT DISTINCT date_trunc('month', {policy.column} AT TIME ZONE 'UTC') AS month "
+            f"FROM {policy.table}_default WHERE {policy.column} < %s ORDER BY month",
+            [self._bound(cutoff)],
+        )
+        return [r["month"].replace(tzinfo=timezone.utc) for r in rows if r["month"] is not None]
+
+    def expire(self, policy: PartitionPolicy, now: Optional[datetime] = None) -> List[Path]:
+        """Archive and detach every partition older than `retain_months`.
+
+        On PostgreSQL, aged rows in the DEFAULT partition are archived per month
+        and deleted from it as well.
+        """
+        cutoff = add_months(month_start(now or self._clock()), -policy.retain_months)
+        months = [(name, start, False) for name, start in self.partitions(policy) if start < cutoff]
+        months += [
+            (f"{policy.table}_default_p{start:%Y_%m}", start, True)
+            for start in self._aged_default_months(policy, cutoff)
+        ]
+        archived = []
+        for name, start, from_default in months:
+            path, rows = self.archive_partition(policy, name, start, from_default)
+            self._retire(policy, name, start, rows, from_default)
+            _ARCHIVED.labels(policy.table).inc()
+            logger.info("Archived %s (%d rows) to %s", name, rows, path)
+            archived.append(path)
+        return archived
+
+    def maintain(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, List[str]]]:
+        """Run creation and expiry for every policy; returns what was done per table."""
+        now = now or self._clock()
+        report: Dict[str, Dict[str, List[str]]] = {}
+        for policy in self.policies:
+            report[policy.table] = {
+                "created": self.ensure_partitions(policy, now),
+                "archived": [str(p) for p in self.expire(policy, now)],
+            }
+        return report
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Create upcoming partitions and archive expired ones.")
+    parser.add_argument("command", choices=("maintain", "list"), help="maintain: create + archive; list: show partitions")
+    parser.add_argument("--archive-dir", default=str(ROOT / "archive"))
+    parser.add_argument("--format", default="ndjson", choices=("ndjson", "parquet"))
+    parser.add_argument("--compress", default="gzip", choices=("gzip", "zstd", "none"))
+    parser.add_argument("--retain-months", type=int, help="override retention for every table")
+    parser.add_argument("--premake-months", type=int, help="override how many months to create ahead")
+    parser.add_argument("--keep-detached", action="store_true", help="detach expired partitions without dropping")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    policies = [
+        PartitionPolicy(
+            p.table,
+            p.column,
+            args.premake_months if args.premake_months is not None else p.premake_months,
+            args.retain_months if args.retain_months is not None else p.retain_months,
+        )
+        for p in DEFAULT_POLICIES
+    ]
+    manager = PartitionManager(
+        archive_dir=args.archive_dir,
+        fmt=args.format,
+        compress=args.compress,
+        keep_detached=args.keep_detached,
+        policies=policies,
+    )
+    if args.command == "list":
+        for policy in policies:
+            for name, start in manager.partitions(policy):
+                print(f"{policy.table}\t{name}\t{start:%Y-%m}")
+        return 0
+    print(json.dumps(manager.maintain(), indent=2))
+    return 0
+
+
+__all__ = [
+    "DEFAULT_POLICIES",
+    "PartitionManager",
+    "PartitionPolicy",
+    "add_months",
+    "month_start",
+    "partition_name",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""Repository for the Chimera tables defined in `schema.sql`.
+
+Wraps `Database` with table-specific operations so agents never build SQL
+themselves: single-row creates for influencers and tasks (returning ids),
+bulk writers for the high-volume tables (`research_findings`,
+`content_drafts`, `safety_reviews`) and streaming readers for large scans.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .database import Database, get_database
+
+logger = logging.getLogger(__name__)
+
+FINDING_COLUMNS = ("task_id", "trends_data", "topic_ideation", "audience_signals", "source_urls", "cache_key")
+DRAFT_COLUMNS = ("task_id", "research_finding_id", "content_body", "media_prompts", "style_reasoning", "platform")
+REVIEW_COLUMNS = ("draft_id", "verdict", "confidence_score", "policy_violations", "human_reviewer_notes")
+
+TASK_STATUSES = ("pending", "researching", "drafting", "safety_check", "approved", "rejected")
+
+
+class ChimeraRepository:
+    """Data access for influencers, tasks, findings, drafts and safety reviews."""
+
+    def __init__(self, db: Optional[Database] = None) -> None:
+        self.db = db or get_database()
+
+    def _insert_returning(self, sql: str, params: List[Any]) -> int:
+        # RETURNING is supported by PostgreSQL and SQLite >= 3.35
+        with self.db.connection() as conn:
+            row = self.db.fetch_one(sql + " RETURNING id", params, conn)
+        return int(row["id"])
+
+    # -- influencers / tasks ---------------------------------------------------
+    def create_influencer(self, name: str, persona_description: str, long_term_goals: Optional[str] = None) -> int:
+        return self._insert_returning(
+            "INSERT INTO influencers (name, persona_description, long_term_goals) VALUES (%s, %s, %s)",
+            [name, persona_description, long_term_goals],
+        )
+
+    def create_task(self, influencer_id: Optional[int], description: str, priority: int = 0, status: str = "pending") -> int:
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Unknown task status {status!r}")
+        return self._insert_returning(
+            "INSERT INTO tasks (influencer_id, description, status, priority) VALUES (%s, %s, %s, %s)",
+            [influencer_id, description, status, priority],
+        )
+
+    def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
+        return self.db.fetch_one("SELECT * FROM tasks WHERE id = %s", [task_id])
+
+    def update_task_status(self, task_id: int, status: str) -> bool:
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Unknown task status {status!r}")
+        return (
+            self.db.execute(
+                "UPDATE tasks SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s", [status, task_id]
+            )
+            > 0
+        )
+
+    # -- bulk writers ----------------------------------------------------------
+    def add_findings(self, rows: Iterable[Mapping[str, Any]], method: str = "copy") -> int:
+        """Bulk insert research findings (mappings keyed by `FINDING_COLUMNS`)."""
+        return self.db.bulk_insert("research_findings", FINDING_COLUMNS, rows, method=method)
+
+    def add_drafts(self, rows: Iterable[Mapping[str, Any]], method: str = "copy") -> int:
+        """Bulk insert content drafts (mappings keyed by `DRAFT_COLUMNS`)."""
+        return self.db.bulk_insert("content_drafts", DRAFT_COLUMNS, rows, method=method)
+
+    def add_safety_reviews(self, rows: Iterable[Mapping[str, Any]], method: str = "copy") -> int:
+        """Bulk insert safety reviews (mappings keyed by `REVIEW_COLUMNS`)."""
+        return self.db.bulk_insert("safety_reviews", REVIEW_COLUMNS, rows, method=method)
+
+    def latest_finding(self, cache_key: str, since: Any = None) -> Optional[Dict[str, Any]]:
+        """Newest finding stored under `cache_key` (created at or after `since`, if given)."""
+        if since is None:
+            return self.db.fetch_one(
+                "SELECT * FROM research_findings WHERE cache_key = %s ORDER BY created_at DESC, id DESC LIMIT 1",
+                [cache_key],
+            )
+        # the lower bound lets PostgreSQL prune old partitions
+        return self.db.fetch_one(
+            "SELECT * FROM research_findings WHERE cache_key = %s AND created_at >= %s "
+            "ORDER BY created_at DESC, id DESC LIMIT 1",
+            [cache_key, since],
+        )
+
+    # -- safety scanning -------------------------------------------------------
+    def unscanned_drafts(self, limit: int) -> List[Dict[str, Any]]:
+        """Up to `limit` drafts not yet safety-scanned, oldest first."""
+        return self.db.fetch_all(
+            "SELECT * FROM content_drafts WHERE safety_scanned_at IS NULL ORDER BY id LIMIT %s", [limit]
+        )
+
+    def record_safety_reviews(self, reviews: Iterable[Mapping[str, Any]], method: str = "copy") -> List[Any]:
+        """
+        Mark the reviewed drafts as scanned and insert their reviews, in one transaction.
+
+        Drafts another scanner already marked are skipped, so each draft gets
+        one review. Returns the ids of the drafts whose reviews were written.
+        """
+        by_draft = {r["draft_id"]: r for r in reviews}
+        if not by_draft:
+            return []
+        placeholders = ", ".join(["%s"] * len(by_draft))
+        with self.db.connection() as conn:
+            if self.db.backend.name == "sqlite":
+                conn.execute("BEGIN IMMEDIATE")
+            # the row locks taken here make a concurrent scanner wait and then skip these drafts
+            claimed = self.db.fetch_all(
+                "UPDATE content_drafts SET safety_scanned_at = CURRENT_TIMESTAMP "
+                f"WHERE id IN ({placeholders}) AND safety_scanned_at IS NULL RETURNING id",
+                list(by_draft),
+                conn,
+            )
+            ids = [r["id"] for r in claimed]
+            self.db.bulk_insert("safety_reviews", REVIEW_COLUMNS, [by_draft[i] for i in ids], method=method, conn=conn)
+        return ids
+
+    # -- streaming readers -----------------------------------------------------
+    def iter_findings(self, task_id: Optional[int] = None, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        if task_id is None:
+            return self.db.stream("SELECT * FROM research_findings ORDER BY id", (), batch_size)
+        return self.db.stream("SELECT * FROM research_findings WHERE task_id = %s ORDER BY id", [task_id], batch_size)
+
+    def iter_drafts(self, task_id: Optional[int] = None, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        if task_id is None:
+            return self.db.stream("SELECT * FROM content_drafts ORDER BY id", (), batch_size)
+        return self.db.stream("SELECT * FROM content_drafts WHERE task_id = %s ORDER BY id", [task_id], batch_size)
+
+    def iter_reviews(self, verdict: Optional[str] = None, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        if verdict is None:
+            return self.db.stream("SELECT * FROM safety_reviews ORDER BY id", (), batch_size)
+        return self.db.stream("SELECT * FROM safety_reviews WHERE verdict = %s ORDER BY id", [verdict], batch_size)
+
+
+__all__ = [
+    "ChimeraRepository",
+    "DRAFT_COLUMNS",
+    "FINDING_COLUMNS",
+    "REVIEW_COLUMNS",
+    "TASK_STATUSES",
+]
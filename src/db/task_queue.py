@@ -0,0 +1,299 @@
+"""Contention-free work queue on the `tasks` table.
+
+`tasks.status` already encodes the pipeline (pending -> researching ->
+drafting -> safety_check -> approved/rejected). `TaskQueue` lets any number of
+supervisor workers pull work from it without scanning or racing:
+
+- `claim(n, from_status, to_status)` atomically moves up to `n` unclaimed
+  tasks (highest priority, oldest first) into `to_status` and stamps them with
+  the worker id and a lease. On PostgreSQL the candidate rows are locked with
+  `FOR UPDATE SKIP LOCKED`, so concurrent claimers skip each other's rows
+  instead of blocking or double-claiming; on SQLite the claim runs in a
+  `BEGIN IMMEDIATE` transaction (one writer at a time).
+- Tasks stuck in `to_status` without an owner (lease reaped) are claimable
+  again, so a crashed worker's task resumes at the stage it was in.
+- `heartbeat()` extends leases, `complete()` hands the task to the next
+  status and `release()` gives it back. Both check the worker id, so a worker
+  whose lease was reaped cannot clobber the new owner.
+- `reap_expired()` clears expired leases; tasks that already used
+  `max_attempts` claims in their current stage are moved to `dead_status`
+  instead. `complete()` resets the count, so a task that moves through every
+  stage is not dead-lettered for its earlier, successful claims.
+- `wait_for_work()` blocks on `LISTEN chimera_tasks` (fed by the
+  `tasks_notify_ready` trigger in `schema.sql`) instead of polling at a fixed
+  interval; SQLite falls back to an in-process condition plus a poll timeout.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..logging.metrics import counter, histogram
+from .database import Database, get_database
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "chimera_tasks"
+
+_CLAIMED = counter("task_queue_claimed_total", "Tasks claimed from the queue", ("status",))
+_REAPED = counter("task_queue_reaped_total", "Expired leases cleared", ("outcome",))
+_CLAIM_SECONDS = histogram("task_queue_claim_seconds", "Latency of one claim statement")
+
+_PG_CLAIM = """
+WITH picked AS (
+    SELECT id FROM tasks
+    WHERE status = ANY(%s) AND claimed_by IS NULL
+    ORDER BY priority DESC, created_at, id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE tasks AS t
+SET status = %s, claimed_by = %s, lease_expires_at = now() + %s * interval '1 second',
+    attempts = t.attempts + 1, updated_at = now()
+FROM picked
+WHERE t.id = picked.id
+RETURNING t.*
+"""
+
+_SQLITE_CLAIM = """
+UPDATE tasks
+SET status = %s, claimed_by = %s, lease_expires_at = datetime('now', %s),
+    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+WHERE id IN (
+    SELECT id FROM tasks
+    WHERE status IN (%s, %s) AND claimed_by IS NULL
+    ORDER BY priority DESC, created_at, id
+    LIMIT %s
+)
+RETURNING *
+"""
+
+
+class _LocalNotifier:
+    """In-process stand-in for LISTEN/NOTIFY (SQLite)."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._generation = 0
+
+    def notify(self) -> None:
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def wait(self, timeout: float) -> bool:
+        with self._cond:
+            seen = self._generation
+            return self._cond.wait_for(lambda: self._generation != seen, timeout)
+
+    def close(self) -> None:
+        return None
+
+
+class _PgListener:
+    """Dedicated autocommit connection LISTENing on `CHANNEL`."""
+
+    def __init__(self, db: Database) -> None:
+        self._conn = db.backend.connect()
+        self._conn.autocommit = True
+        self._conn.execute(f"LISTEN {CHANNEL}")
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        return None  # the tasks_notify_ready trigger notifies
+
+    def wait(self, timeout: float) -> bool:
+        with self._lock:  # one waiter drives the socket; others time out and re-claim
+            for _ in self._conn.notifies(timeout=timeout, stop_after=1):
+                return True
+        return False
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_notifiers: Dict[int, _LocalNotifier] = {}
+_notifiers_lock = threading.Lock()
+
+
+def _local_notifier(db: Database) -> _LocalNotifier:
+    with _notifiers_lock:
+        return _notifiers.setdefault(id(db), _LocalNotifier())
+
+
+class TaskQueue:
+    """
+    Lease-based claiming of `tasks` rows for one worker.
+
+    Parameters
+    - db: `Database` (defaults to `get_database()`).
+    - worker_id: identity stored in `tasks.claimed_by` (default host:pid:thread).
+    - lease_seconds: how long a claim is valid without `heartbeat()`.
+    - max_attempts: claims per stage allowed before an expired task goes to `dead_status`.
+    - poll_interval: longest `wait_for_work` sleeps without a notification
+      (expired leases produce no notification).
+    """
+
+    def __init__(
+        self,
+        db: Optional[Database] = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = 300,
+        max_attempts: int = 3,
+        dead_status: str = "rejected",
+        poll_interval: float = 30.0,
+    ) -> None:
+        self.db = db or get_database()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.lease_seconds = int(lease_seconds)
+        self.max_attempts = int(max_attempts)
+        self.dead_status = dead_status
+        self.poll_interval = float(poll_interval)
+        self._pg = self.db.backend.name == "postgresql"
+        self._notifier: Any = None
+
+    # -- claiming ---------------------------------------------------------------
+    def claim(self, n: int = 1, from_status: str = "pending", to_status: str = "researching") -> List[Dict[str, Any]]:
+        """Atomically claim up to `n` tasks in `from_status` (or orphaned in `to_status`)."""
+        if n < 1:
+            return []
+        start = time.perf_counter()
+        with self.db.connection() as conn:
+            if self._pg:
+                rows = self.db.fetch_all(
+                    _PG_CLAIM, [[from_status, to_status], n, to_status, self.worker_id, self.lease_seconds], conn
+                )
+            else:
+                conn.execute("BEGIN IMMEDIATE")
+                rows = self.db.fetch_all(
+                    _SQLITE_CLAIM,
+                    [to_status, self.worker_id, f"+{self.lease_seconds} seconds", from_status, to_status, n],
+                    conn,
+                )
+        _CLAIM_SECONDS.observe(time.perf_counter() - start)
+        if rows:
+            _CLAIMED.labels(to_status).inc(len(rows))
+            # RETURNING does not preserve the ORDER BY of the subquery
+            rows.sort(key=lambda r: (-(r.get("priority") or 0), str(r.get("created_at")), r["id"]))
+        return rows
+
+    def claim_wait(
+        self,
+        n: int = 1,
+        from_status: str = "pending",
+        to_status: str = "researching",
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """`claim()`, sleeping on notifications until work arrives or `timeout` passes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            rows = self.claim(n, from_status, to_status)
+            if rows:
+                return rows
+            wait = self.poll_interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return []
+            self.wait_for_work(wait)
+
+    # -- lease management -------------------------------------------------------
+    def _lease_expr(self) -> Tuple[str, Any]:
+        if self._pg:
+            return "now() + %s * interval '1 second'", self.lease_seconds
+        return "datetime('now', %s)", f"+{self.lease_seconds} seconds"
+
+    def _owned(self, task_ids: Sequence[int]) -> Tuple[str, List[Any]]:
+        ids = list(task_ids)
+        return f"id IN ({', '.join(['%s'] * len(ids))}) AND claimed_by = %s", ids + [self.worker_id]
+
+    def heartbeat(self, task_ids: Iterable[int]) -> int:
+        """Extend the lease of tasks this worker still owns; returns how many."""
+        ids = list(task_ids)
+        if not ids:
+            return 0
+        expr, arg = self._lease_expr()
+        where, params = self._owned(ids)
+        return self.db.execute(f"UPDATE tasks SET lease_expires_at = {expr} WHERE {where}", [arg] + params)
+
+    def complete(self, task_id: int, next_status: str) -> bool:
+        """Move an owned task to `next_status` and drop the claim; False if the lease was lost."""
+        where, params = self._owned([task_id])
+        done = self.db.execute(
+            # the stage succeeded: the next stage gets its own max_attempts
+            "UPDATE tasks SET status = %s, claimed_by = NULL, lease_expires_at = NULL, attempts = 0, "
+            f"updated_at = CURRENT_TIMESTAMP WHERE {where}",
+            [next_status] + params,
+        )
+        if done:
+            self._notify()
+        return done > 0
+
+    def release(self, task_id: int, status: Optional[str] = None) -> bool:
+        """Give an owned task back to the queue (optionally resetting its status)."""
+        where, params = self._owned([task_id])
+        if status is None:
+            sql, args = f"UPDATE tasks SET claimed_by = NULL, lease_expires_at = NULL WHERE {where}", params
+        else:
+            sql = f"UPDATE tasks SET status = %s, claimed_by = NULL, lease_expires_at = NULL WHERE {where}"
+            args = [status] + params
+        done = self.db.execute(sql, args)
+        if done:
+            self._notify()
+        return done > 0
+
+    def reap_expired(self) -> Dict[str, int]:
+        """Clear expired leases (crashed workers); exhausted tasks go to `dead_status`."""
+        now = "now()" if self._pg else "CURRENT_TIMESTAMP"
+        expired = f"claimed_by IS NOT NULL AND lease_expires_at < {now}"
+        with self.db.connection() as conn:
+            if not self._pg:
+                conn.execute("BEGIN IMMEDIATE")
+            dead = self.db.execute(
+                f"UPDATE tasks SET status = %s, claimed_by = NULL, lease_expires_at = NULL, updated_at = {now} "
+                f"WHERE {expired} AND attempts >= %s",
+                [self.dead_status, self.max_attempts],
+                conn,
+            )
+            requeued = self.db.execute(
+                f"UPDATE tasks SET claimed_by = NULL, lease_expires_at = NULL WHERE {expired}", [], conn
+            )
+        if dead:
+            _REAPED.labels("dead").inc(dead)
+            logger.warning("Moved %d tasks to %r after %d attempts", dead, self.dead_status, self.max_attempts)
+        if requeued:
+            _REAPED.labels("requeued").inc(requeued)
+            self._notify()
+        return {"requeued": requeued, "dead": dead}
+
+    # -- wakeups ----------------------------------------------------------------
+    def _get_notifier(self) -> Any:
+        if self._notifier is None:
+            self._notifier = _PgListener(self.db) if self._pg else _local_notifier(self.db)
+        return self._notifier
+
+    def _notify(self) -> None:
+        if not self._pg:
+            _local_notifier(self.db).notify()
+
+    def notify(self) -> None:
+        """Wake waiting workers after inserting tasks outside `TaskQueue` (SQLite only; PostgreSQL uses the trigger)."""
+        self._notify()
+
+    def wait_for_work(self, timeout: float) -> bool:
+        """Block until tasks may be claimable (True) or `timeout` elapses (False)."""
+        return self._get_notifier().wait(max(0.0, timeout))
+
+    def close(self) -> None:
+        if self._pg and self._notifier is not None:
+            self._notifier.close()
+        self._notifier = None
+
+
+__all__ = ["CHANNEL", "TaskQueue"]
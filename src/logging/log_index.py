@@ -0,0 +1,468 @@
+"""
+Request-id index over live and rotated Project Chimera logs.
+
+`ConfigurableRequestIdFilter` stamps every line with a request id, which is
+how a task is followed through Supervisor -> Research -> Generation -> Safety.
+Instead of grepping every rotated file, this module keeps a sidecar SQLite
+index next to the log (`<log>.index.db`):
+
+- Rotated segments are split into blocks of whole records (~64 KiB). Each
+  block is stored as an independent gzip member (or zstd frame), so the
+  segment is still an ordinary `.gz` file while any block can be decompressed
+  on its own.
+- The index maps request_id -> (segment, block) and records each block's byte
+  range and first/last timestamp, so lookups and time-range queries touch only
+  the blocks that matter, read through `mmap`.
+- Segments are indexed incrementally as they rotate (enable with
+  `logging.rotation.index: true`); `LogIndex.backfill()` indexes existing
+  uncompressed backups. The live file is searched directly with `mmap.find`.
+
+Both the text format (`ts LEVEL [request_id] name: msg`) and the JSON format
+are understood; traceback continuation lines stay attached to their record.
+
+CLI:
+    python -m src.logging.log_index logs/tenx_chimera.log <request_id> [--since TS] [--until TS]
+    python -m src.logging.log_index logs/tenx_chimera.log --backfill
+
+Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import mmap
+import os
+import shutil
+import sqlite3
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    codec TEXT NOT NULL,
+    start_ts TEXT,
+    end_ts TEXT,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    segment_id INTEGER NOT NULL,
+    block_no INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    start_ts TEXT,
+    end_ts TEXT,
+    PRIMARY KEY (segment_id, block_no)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hits (
+    request_id TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    block_no INTEGER NOT NULL,
+    PRIMARY KEY (request_id, segment_id, block_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS blocks_time ON blocks (end_ts, start_ts);
+"""
+
+_JSON_RID = b'"request_id":"'
+_JSON_TS = b'"ts":"'
+
+
+def _parse_line(line: bytes) -> Optional[Tuple[bytes, bytes]]:
+    """Return (timestamp, request_id) for a record's first line, None for continuation lines."""
+    if line.startswith(b"{"):
+        i = line.find(_JSON_TS)
+        j = line.find(_JSON_RID)
+        if i < 0 or j < 0:
+            return None
+        i += len(_JSON_TS)
+        j += len(_JSON_RID)
+        return line[i:line.find(b'"', i)], line[j:line.find(b'"', j)]
+    if not line[:1].isdigit():
+        return None
+    sp = line.find(b" ")
+    i = line.find(b" [", sp)
+    k = line.find(b"] ", i)
+    if sp < 0 or i < 0 or k < 0:
+        return None
+    return line[:sp], line[i + 2:k]
+
+
+def _records(data: bytes) -> Iterator[Tuple[bytes, bytes, bytes]]:
+    """Yield (timestamp, request_id, record bytes incl. continuation lines)."""
+    current: Optional[Tuple[bytes, bytes]] = None
+    start = 0
+    pos = 0
+    end = len(data)
+    while pos < end:
+        nl = data.find(b"\n", pos)
+        nl = end if nl < 0 else nl + 1
+        parsed = _parse_line(data[pos:nl])
+        if parsed is not None:
+            if current is not None:
+                yield current[0], current[1], data[start:pos]
+            current, start = parsed, pos
+        pos = nl
+    if current is not None:
+        yield current[0], current[1], data[start:end]
+
+
+def _split_blocks(data: bytes, block_size: int) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) ranges of roughly `block_size` cut at record boundaries."""
+    start = 0
+    end = len(data)
+    while start < end:
+        cut = start + block_size
+        if cut >= end:
+            yield start, end
+            return
+        # advance to the next line that starts a record
+        nl = data.find(b"\n", cut)
+        while 0 <= nl < end - 1:
+            nxt = data.find(b"\n", nl + 1)
+            if _parse_line(data[nl + 1:end if nxt < 0 else nxt + 1]) is not None:
+                break
+            nl = nxt
+        if nl < 0 or nl + 1 >= end:
+            yield start, end
+            return
+        yield start, nl + 1
+        start = nl + 1
+
+
+def _in_range(ts: bytes, since: Optional[bytes], until: Optional[bytes]) -> bool:
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+
+def _find_records(
+    buf: bytes | mmap.mmap, rid: Optional[bytes], since: Optional[bytes], until: Optional[bytes]
+) -> Iterator[bytes]:
+    """
+    Yield matching records from `buf` (bytes or an mmap), in file order.
+
+    With a request id only the lines containing its token are parsed (C-level
+    `find`), so cost scales with the number of hits rather than the buffer size.
+    """
+    if rid is None:
+        for ts, _, record in _records(buf[:]):
+            if _in_range(ts, since, until):
+                yield record
+        return
+    size = len(buf)
+    starts: Set[int] = set()
+    for token in (b"[" + rid + b"] ", _JSON_RID + rid + b'"'):
+        pos = buf.find(token)
+        while pos >= 0:
+            starts.add(buf.rfind(b"\n", 0, pos) + 1)
+            pos = buf.find(token, pos + len(token))
+    for line_start in sorted(starts):
+        end = buf.find(b"\n", line_start)
+        end = size if end < 0 else end + 1
+        parsed = _parse_line(buf[line_start:end])
+        # the token may sit inside a message or traceback; require the record's own id
+        if parsed is None or parsed[1] != rid or not _in_range(parsed[0], since, until):
+            continue
+        while end < size:  # extend over continuation lines
+            nxt = buf.find(b"\n", end)
+            nxt = size if nxt < 0 else nxt + 1
+            if _parse_line(buf[end:nxt]) is not None:
+                break
+            end = nxt
+        yield buf[line_start:end]
+
+
+def _compressor(codec: str):
+    if codec == "gzip":
+        def compress(block: bytes) -> bytes:
+            c = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: a standalone gzip member
+            return c.compress(block) + c.flush()
+        return compress
+    if codec == "zstd":
+        import zstandard  # optional dependency; rotation falls back to gzip without it
+
+        return zstandard.ZstdCompressor(level=3).compress
+    raise ValueError(f"Unsupported codec {codec!r}")
+
+
+def _decompress(codec: str, block: bytes) -> bytes:
+    if codec == "gzip":
+        return zlib.decompress(block, 31)
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(block)
+    return block
+
+
+class LogIndex:
+    """Sidecar request-id/time index for one log path and its rotated segments."""
+
+    def __init__(self, log_path: str | os.PathLike[str], db_path: str | os.PathLike[str] | None = None) -> None:
+        self.log_path = Path(log_path).resolve()
+        self.db_path = Path(db_path) if db_path else self.log_path.with_name(self.log_path.name + ".index.db")
+        self._db = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    # -- indexing ------------------------------------------------------------
+    def _store(
+        self,
+        name: str,
+        codec: str,
+        size: int,
+        blocks: List[Tuple[int, int, Optional[bytes], Optional[bytes], Set[bytes]]],
+    ) -> None:
+        starts = [b[2] for b in blocks if b[2]]
+        ends = [b[3] for b in blocks if b[3]]
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM hits WHERE segment_id IN (SELECT id FROM segments WHERE name = ?)", (name,))
+            db.execute("DELETE FROM blocks WHERE segment_id IN (SELECT id FROM segments WHERE name = ?)", (name,))
+            db.execute("DELETE FROM segments WHERE name = ?", (name,))
+            seg_id = db.execute(
+                "INSERT INTO segments (name, codec, start_ts, end_ts, size) VALUES (?, ?, ?, ?, ?)",
+                (
+                    name,
+                    codec,
+                    min(starts).decode() if starts else None,
+                    max(ends).decode() if ends else None,
+                    size,
+                ),
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO blocks (segment_id, block_no, offset, length, start_ts, end_ts) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (seg_id, no, off, length, s.decode() if s else None, e.decode() if e else None)
+                    for no, (off, length, s, e, _) in enumerate(blocks)
+                ],
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO hits (request_id, segment_id, block_no) VALUES (?, ?, ?)",
+                [
+                    (rid.decode("utf-8", "replace"), seg_id, no)
+                    for no, (_, _, _, _, rids) in enumerate(blocks)
+                    for rid in rids
+                ],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _scan_block(data: bytes) -> Tuple[Optional[bytes], Optional[bytes], Set[bytes]]:
+        first = last = None
+        rids: Set[bytes] = set()
+        for ts, rid, _ in _records(data):
+            if first is None:
+                first = ts
+            last = ts
+            if rid != b"-":
+                rids.add(rid)
+        return first, last, rids
+
+    def index_segment(self, segment: str | os.PathLike[str], block_size: int = BLOCK_SIZE) -> int:
+        """Index an uncompressed segment in place; returns the number of blocks."""
+        segment = Path(segment)
+        with open(segment, "rb") as fh:
+            data = fh.read()
+        blocks = []
+        for start, end in _split_blocks(data, block_size):
+            first, last, rids = self._scan_block(data[start:end])
+            blocks.append((start, end - start, first, last, rids))
+        self._store(segment.name, "none", len(data), blocks)
+        return len(blocks)
+
+    def compress_and_index(
+        self, segment: str | os.PathLike[str], codec: str = "gzip", block_size: int = BLOCK_SIZE
+    ) -> Path:
+        """
+        Compress `segment` as independently decompressible blocks and index it.
+
+        Writes `<segment>.gz` (or `.zst`) atomically, records it in the index
+        and removes the uncompressed file. Returns the compressed path.
+        """
+        segment = Path(segment)
+        compress = _compressor(codec)
+        dst = segment.with_name(segment.name + (".gz" if codec == "gzip" else ".zst"))
+        tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+        with open(segment, "rb") as fh:
+            data = fh.read()
+        blocks = []
+        offset = 0
+        with open(tmp, "wb") as out:
+            for start, end in _split_blocks(data, block_size):
+                raw = data[start:end]
+                packed = compress(raw)
+                out.write(packed)
+                first, last, rids = self._scan_block(raw)
+                blocks.append((offset, len(packed), first, last, rids))
+                offset += len(packed)
+        shutil.copystat(segment, tmp)  # keep the rotation time; retention orders segments by it
+        os.replace(tmp, dst)
+        self._store(dst.name, codec, offset, blocks)
+        segment.unlink()
+        return dst
+
+    def remove_segment(self, segment: str | os.PathLike[str]) -> None:
+        """Forget a pruned segment."""
+        name = Path(segment).name
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM hits WHERE segment_id IN (SELECT id FROM segments WHERE name = ?)", (name,))
+            db.execute("DELETE FROM blocks WHERE segment_id IN (SELECT id FROM segments WHERE name = ?)", (name,))
+            db.execute("DELETE FROM segments WHERE name = ?", (name,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def backfill(self, block_size: int = BLOCK_SIZE) -> List[str]:
+        """Index uncompressed rotated files (e.g. `app.log.1`) not yet in the index."""
+        known = {row[0] for row in self._db.execute("SELECT name FROM segments")}
+        prefix = self.log_path.name + "."
+        done = []
+        for entry in sorted(os.scandir(self.log_path.parent), key=lambda e: e.name):
+            name = entry.name
+            if not name.startswith(prefix) or name in known or not entry.is_file():
+                continue
+            if name.endswith((".gz", ".zst", ".tmp", ".lock", ".db", ".db-wal", ".db-shm")):
+                continue  # whole-file compressed backups have no block boundaries to index
+            self.index_segment(entry.path, block_size)
+            done.append(name)
+        return done
+
+    # -- queries -------------------------------------------------------------
+    def _blocks_for(
+        self, request_id: Optional[str], since: Optional[str], until: Optional[str]
+    ) -> List[Tuple[str, str, int, int]]:
+        sql = (
+            "SELECT s.name, s.codec, b.offset, b.length FROM blocks b JOIN segments s ON s.id = b.segment_id"
+        )
+        args: List[object] = []
+        where = []
+        if request_id is not None:
+            sql += " JOIN hits h ON h.segment_id = b.segment_id AND h.block_no = b.block_no"
+            where.append("h.request_id = ?")
+            args.append(request_id)
+        if since is not None:
+            where.append("(b.end_ts IS NULL OR b.end_ts >= ?)")
+            args.append(since)
+        if until is not None:
+            where.append("(b.start_ts IS NULL OR b.start_ts <= ?)")
+            args.append(until)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY s.start_ts, s.name, b.block_no"
+        return self._db.execute(sql, args).fetchall()
+
+    def _search_live(self, rid: Optional[bytes], since: Optional[bytes], until: Optional[bytes]) -> Iterator[bytes]:
+        try:
+            fh = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return
+        with fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                yield from _find_records(mm, rid, since, until)
+
+    def query(
+        self,
+        request_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_live: bool = True,
+    ) -> Iterator[str]:
+        """
+        Yield the records for `request_id` (and/or within [since, until]), oldest first.
+
+        `since`/`until` are timestamp prefixes in the log's own format, e.g.
+        "2026-01-01T12:00". Records include traceback continuation lines.
+        """
+        rid = request_id.encode() if request_id is not None else None
+        lo = since.encode() if since is not None else None
+        hi = until.encode() if until is not None else None
+        if hi is not None:
+            hi += b"\xff"  # make the bound inclusive of any finer-grained suffix
+        # the block filter needs the same inclusive bound ("\uffff" sorts after any ASCII in SQLite)
+        block_until = until + "\uffff" if until is not None else None
+        by_segment: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for name, codec, offset, length in self._blocks_for(request_id, since, block_until):
+            by_segment.setdefault((name, codec), []).append((offset, length))
+        for (name, codec), ranges in by_segment.items():
+            path = self.log_path.with_name(name)
+            try:
+                fh = open(path, "rb")
+            except FileNotFoundError:
+                continue  # pruned since it was indexed
+            with fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset, length in ranges:
+                    data = _decompress(codec, mm[offset:offset + length])
+                    for record in _find_records(data, rid, lo, hi):
+                        yield record.decode("utf-8", "replace")
+        if include_live:
+            for record in self._search_live(rid, lo, hi):
+                yield record.decode("utf-8", "replace")
+
+    def find_request(self, request_id: str, **kwargs) -> List[str]:
+        """Return every record logged under `request_id`."""
+        return list(self.query(request_id, **kwargs))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def find_request(log_path: str | os.PathLike[str], request_id: str, **kwargs) -> List[str]:
+    """Convenience wrapper: open the sidecar index for `log_path` and look up `request_id`."""
+    index = LogIndex(log_path)
+    try:
+        return index.find_request(request_id, **kwargs)
+    finally:
+        index.close()
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Look up log records by request id across rotated logs.")
+    parser.add_argument("log_path", help="live log file, e.g. logs/tenx_chimera.log")
+    parser.add_argument("request_id", nargs="?", help="request id to look up")
+    parser.add_argument("--since", help="only records at or after this timestamp prefix")
+    parser.add_argument("--until", help="only records at or before this timestamp prefix")
+    parser.add_argument("--no-live", action="store_true", help="skip the live (unrotated) log file")
+    parser.add_argument("--backfill", action="store_true", help="index existing uncompressed backups first")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    if args.request_id is None and not (args.backfill or args.since or args.until):
+        parser.error("give a request_id, a time range or --backfill")
+
+    index = LogIndex(args.log_path)
+    try:
+        if args.backfill:
+            for name in index.backfill():
+                print(f"indexed {name}", file=sys.stderr)
+        if args.request_id is None and not (args.since or args.until):
+            return 0
+        found = False
+        for record in index.query(args.request_id, args.since, args.until, include_live=not args.no_live):
+            sys.stdout.write(record if record.endswith("\n") else record + "\n")
+            found = True
+        return 0 if found else 1
+    finally:
+        index.close()
+
+
+__all__ = ["LogIndex", "find_request", "BLOCK_SIZE"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,3 @@
-from __future__ import annotations
-
 """
 Lightweight logging helper for Project Chimera.
 
@@ -10,7 +8,35 @@ Lightweight logging helper for Project Chimera.
       file: logs/tenx_chimera.log
       max_bytes: 10_485_760
       backup_count: 5
-- Emits to console and to a rotating file handler.
+      async: false            # opt-in queue-based pipeline (see below)
+      queue_size: 10000
+      overflow_policy: block  # block | drop_oldest | drop_debug_first
+      format: text            # text | json (one compact object per line)
+      sampling:               # logger-name prefix -> fraction of sub-WARNING records kept
+        src.config: 0.1
+      rotation:               # optional: off-thread rotation (src/logging/rotation.py)
+        when: midnight        # S | M | H | D | midnight; combinable with max_bytes
+        interval: 1
+        compress: gzip        # gzip | zstd | none
+        max_retained_bytes: 1_073_741_824
+        index: false          # request-id sidecar index (src/logging/log_index.py)
+      rate_limit:             # token bucket per (logger, message template)
+        per_second: 5
+        burst: 20
+        max_level: WARNING    # records above this level are never limited
+- Emits to console and to a rotating file handler. With a `rotation` block the
+  file handler rolls over by size and/or time with a single rename and leaves
+  compression and pruning to a background worker.
+- With `async: true` loggers only enqueue records onto a bounded in-memory
+  queue; a single background listener thread owns the console and file
+  handlers, so formatting, disk writes and rotation never run on the caller's
+  thread (or event loop). Use `get_logging_stats()` for drop counters and
+  `shutdown_logging()` (also registered with `atexit`) to flush on exit.
+- `format: json` writes ts, level, logger, request_id, msg and any `extra=`
+  fields as one JSON object per line, so shippers need no regex parsing.
+- Sampling and rate limiting run as a logger filter on the caller's thread,
+  before any formatting; when a rate-limited template passes again the record
+  carries a `suppressed` count of the lines dropped in between.
 - Injects a request / correlation id into each record via `set_request_id`.
 - Reusable across agents (call `get_logger(__name__, config)` in modules).
 
@@ -19,20 +45,34 @@ No business logic is implemented here. Designed for Python 3.11.
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
 import logging.handlers
+import json
 import os
+import random
+import threading
+import time
+from collections import deque
 from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Optional
+from typing import Any, Callable, Deque, Dict, Mapping, MutableMapping, Optional, Tuple
 import uuid
 
+from .metrics import counter
+
 __all__ = [
     "get_logger",
     "set_request_id",
     "clear_request_id",
     "get_request_id",
+    "get_logging_stats",
+    "flush_logging",
+    "shutdown_logging",
     "ConfigurableRequestIdFilter",
+    "JsonFormatter",
+    "SamplingRateLimitFilter",
     "ConfigError",
 ]
 
@@ -103,16 +143,424 @@ def _ensure_log_dir(path: Path) -> None:
         raise ConfigError(f"Unable to create log directory {path.parent!s}: {exc}") from exc
 
 
-def _make_formatter() -> logging.Formatter:
+class _TextFormatter(logging.Formatter):
+    """Free-text formatter that also reports rate-limit suppression counts."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{line} [+{suppressed} suppressed]" if suppressed else line
+
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`.
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "request_id", "suppressed"}
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One compact JSON object per record.
+
+    Keys: ts, level, logger, request_id, msg, then `suppressed`, `exc`,
+    `stack` when present and any `extra=` fields. The encoder is created once
+    and the second-resolution timestamp prefix is cached, so the per-record
+    cost is one dict and one C-accelerated encode.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._ts_second = -1
+        self._ts_prefix = ""
+        self._ts_suffix = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._ts_second:
+            local = time.localtime(second)
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", local)
+            self._ts_suffix = time.strftime("%z", local)
+            self._ts_second = second
+        return f"{self._ts_prefix}.{int((created - second) * 1000):03d}{self._ts_suffix}"
+
+    def format(self, record: logging.LogRecord) -> str:
+        doc: Dict[str, Any] = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            doc["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            doc["exc"] = record.exc_text
+        if record.stack_info:
+            doc["stack"] = self.formatStack(record.stack_info)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                doc.setdefault(key, value)
+        return _json_encode(doc)
+
+
+def _make_formatter(fmt_name: str = "text") -> logging.Formatter:
+    if fmt_name == "json":
+        return JsonFormatter()
+    if fmt_name != "text":
+        raise ConfigError(f"Unknown logging format {fmt_name!r}; expected 'text' or 'json'")
     # ISO-like timestamp with timezone offset
     fmt = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
     datefmt = "%Y-%m-%dT%H:%M:%S%z"
-    return logging.Formatter(fmt=fmt, datefmt=datefmt)
+    return _TextFormatter(fmt=fmt, datefmt=datefmt)
+
+
+# Process-wide sampling / rate-limiting counters reported by get_logging_stats().
+# Filters run on every logging thread; the sharded metrics counters make the
+# increments thread-safe without a shared lock on the hot path.
+_SAMPLED_OUT = counter("log_records_sampled_out_total", "Sub-WARNING records dropped by sampling")
+_RATE_LIMITED = counter("log_records_rate_limited_total", "Records dropped by the per-template rate limit")
+
+
+class SamplingRateLimitFilter(logging.Filter):
+    """
+    Drop a fraction of low-severity records and rate-limit repeated templates.
+
+    - `sample_rate` (0..1) keeps that fraction of records below WARNING.
+    - `per_second`/`burst` define a token bucket per (logger, msg template),
+      i.e. the unformatted `record.msg`, so "loaded %s" with different args
+      shares one bucket. Records above `max_level` always pass.
+    - The first record of a template that passes after suppression gets a
+      `suppressed` attribute with the number of records dropped in between.
+    """
+
+    _MAX_KEYS = 4096
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        per_second: float | None = None,
+        burst: float | None = None,
+        max_level: int = logging.WARNING,
+    ) -> None:
+        super().__init__()
+        self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        self.per_second = float(per_second) if per_second else None
+        self.burst = float(burst) if burst else (self.per_second or 0.0)
+        self.max_level = max_level
+        # key -> [tokens, last refill (monotonic), suppressed since last pass]
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        levelno = record.levelno
+        if self.sample_rate < 1.0 and levelno < logging.WARNING and random.random() >= self.sample_rate:
+            _SAMPLED_OUT.inc()
+            return False
+        if self.per_second is None or levelno > self.max_level:
+            return True
+        msg = record.msg
+        # non-str messages (dicts for structured logs) may be unhashable; key on their text
+        key = (record.name, msg if isinstance(msg, str) else str(msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self._MAX_KEYS:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                _RATE_LIMITED.inc()
+                return False
+            bucket[0] -= 1.0
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+def _make_rate_filter(name: str, log_cfg: Mapping[str, Any]) -> Optional[SamplingRateLimitFilter]:
+    """Build the sampling/rate-limit filter for logger `name`, or None if not configured."""
+    sample_rate = 1.0
+    sampling = log_cfg.get("sampling")
+    if isinstance(sampling, Mapping):
+        # longest matching logger-name prefix wins; "" / "root" is the default
+        best = -1
+        for prefix, rate in sampling.items():
+            prefix = "" if prefix in ("", "root") else str(prefix)
+            if (name == prefix or name.startswith(prefix + ".") or not prefix) and len(prefix) > best:
+                best, sample_rate = len(prefix), float(rate)
+    elif sampling is not None:
+        sample_rate = float(sampling)
+
+    limit = log_cfg.get("rate_limit")
+    per_second = burst = None
+    max_level = logging.WARNING
+    if isinstance(limit, Mapping):
+        per_second = limit.get("per_second")
+        burst = limit.get("burst")
+        max_level = _resolve_level(limit.get("max_level", "WARNING"), default=logging.WARNING)
+
+    if sample_rate >= 1.0 and not per_second:
+        return None
+    return SamplingRateLimitFilter(sample_rate, per_second, burst, max_level)
 
 
 # Keep track of configured loggers to avoid adding handlers multiple times.
 _configured_loggers: set[str] = set()
 
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_debug_first")
+
+_QueueItem = Tuple[logging.LogRecord, Tuple[logging.Handler, ...]]
+
+
+class _AsyncLogPipeline:
+    """
+    Bounded record queue drained by a single background listener thread.
+
+    Each queued item carries the handlers of the logger that produced it, so
+    one listener serves every async logger while still routing records to the
+    right console/file targets.
+
+    Overflow policies when the queue is full:
+    - "block": the producer waits for space (no loss, may stall callers).
+    - "drop_oldest": the oldest queued record is discarded.
+    - "drop_debug_first": an incoming DEBUG record is discarded; otherwise the
+      oldest queued DEBUG record is evicted, falling back to the oldest record.
+    """
+
+    def __init__(self, maxsize: int = 10_000, overflow_policy: str = "block") -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ConfigError(
+                f"Unknown logging overflow_policy {overflow_policy!r}; expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.maxsize = max(1, int(maxsize))
+        self.overflow_policy = overflow_policy
+        self._items: Deque[_QueueItem] = deque()
+        self._debug_queued = 0  # lets drop_debug_first skip the scan when there is nothing to evict
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0  # queued + being handled by the listener
+        self._closed = False
+        self._stats: Dict[str, int] = {
+            "enqueued": 0,
+            "handled": 0,
+            "dropped": 0,
+            "dropped_debug": 0,
+            "blocked": 0,
+            "high_water": 0,
+        }
+        self._thread = threading.Thread(target=self._run, name="chimera-log-listener", daemon=True)
+        self._thread.start()
+
+    # -- producer side -------------------------------------------------------
+    def _drop(self, item: _QueueItem) -> None:
+        self._stats["dropped"] += 1
+        if item[0].levelno <= logging.DEBUG:
+            self._stats["dropped_debug"] += 1
+
+    def _evict(self) -> None:
+        """Make room for one record according to `overflow_policy` (lock held)."""
+        if self.overflow_policy == "drop_debug_first" and self._debug_queued:
+            for idx, item in enumerate(self._items):
+                if item[0].levelno <= logging.DEBUG:
+                    del self._items[idx]
+                    break
+        else:
+            item = self._items.popleft()
+        if item[0].levelno <= logging.DEBUG:
+            self._debug_queued -= 1
+        self._pending -= 1
+        self._drop(item)
+
+    def put(self, record: logging.LogRecord, targets: Tuple[logging.Handler, ...]) -> None:
+        item = (record, targets)
+        with self._lock:
+            queued = self._enqueue(item)
+        if not queued:
+            # after shutdown, fall back to emitting on the caller's thread
+            self._handle(item)
+
+    def _enqueue(self, item: _QueueItem) -> bool:
+        """Append `item` applying the overflow policy (lock held); False once closed."""
+        record = item[0]
+        if len(self._items) >= self.maxsize and not self._closed:
+            if self.overflow_policy == "block":
+                self._stats["blocked"] += 1
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._not_full.wait()
+            elif self.overflow_policy == "drop_debug_first" and record.levelno <= logging.DEBUG:
+                self._drop(item)
+                return True
+            else:
+                self._evict()
+        if self._closed:
+            return False
+        self._items.append(item)
+        if record.levelno <= logging.DEBUG:
+            self._debug_queued += 1
+        self._pending += 1
+        self._stats["enqueued"] += 1
+        if len(self._items) > self._stats["high_water"]:
+            self._stats["high_water"] = len(self._items)
+        self._not_empty.notify()
+        return True
+
+    # -- listener side -------------------------------------------------------
+    @staticmethod
+    def _handle(item: _QueueItem) -> None:
+        record, targets = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)  # Handler.handle routes failures to handleError
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._items and not self._closed:
+                    self._not_empty.wait()
+                if not self._items:
+                    return
+                batch, self._items = self._items, deque()
+                self._debug_queued = 0
+                self._not_full.notify_all()
+            for item in batch:
+                try:
+                    self._handle(item)
+                except Exception:  # pragma: no cover - never let the listener die
+                    pass
+            with self._lock:
+                self._pending -= len(batch)
+                self._stats["handled"] += len(batch)
+                if self._pending <= 0:
+                    self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record has been handled; False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending <= 0, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """Drain the queue, stop the listener and flush the handlers it owns."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+        drained = not self._thread.is_alive()
+        for handler in list(_shared_handlers.values()):
+            try:
+                handler.flush()
+            except Exception:  # pragma: no cover - OS/file errors
+                pass
+        return drained
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "overflow_policy": self.overflow_policy,
+            }
+
+
+class _PipelineHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues onto the shared `_AsyncLogPipeline`."""
+
+    def __init__(self, pipeline: _AsyncLogPipeline, targets: Tuple[logging.Handler, ...]) -> None:
+        super().__init__(None)  # type: ignore[arg-type]  # the pipeline replaces the queue
+        self.pipeline = pipeline
+        self.targets = targets
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Capture the correlation id now: the listener thread runs outside the
+        # caller's context, so `_request_id_var` would read as unset there.
+        if not hasattr(record, "request_id"):
+            ConfigurableRequestIdFilter().filter(record)
+        # Merge msg/args and render the traceback now (args may be mutated
+        # later), but keep the traceback in `exc_text` rather than folding it
+        # into the message so the listener's formatter can place it.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.pipeline.put(record, self.targets)
+
+
+_EXC_FORMATTER = logging.Formatter()
+_pipeline: Optional[_AsyncLogPipeline] = None
+_pipeline_lock = threading.Lock()
+# Handlers owned by the listener, shared between async loggers that target the
+# same stream/file so a log file is never rotated by two handlers at once (the
+# first logger's format/rotation settings win for a given file).
+_shared_handlers: Dict[Tuple[str, str], logging.Handler] = {}
+
+
+def _get_pipeline(log_cfg: Mapping[str, Any]) -> _AsyncLogPipeline:
+    """Return the process-wide pipeline; the first async logger's settings win."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = _AsyncLogPipeline(
+                maxsize=int(log_cfg.get("queue_size", 10_000)),
+                overflow_policy=str(log_cfg.get("overflow_policy", "block")).strip().lower(),
+            )
+            atexit.register(shutdown_logging)
+        return _pipeline
+
+
+def _shared_handler(key: Tuple[str, str], factory: Callable[[], logging.Handler]) -> logging.Handler:
+    with _pipeline_lock:
+        handler = _shared_handlers.get(key)
+        if handler is None:
+            handler = _shared_handlers[key] = factory()
+        return handler
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """
+    Return logging pipeline counters.
+
+    Always includes sampled_out and rate_limited. With async logging enabled
+    also: enqueued, handled, dropped, dropped_debug, blocked (producers that
+    had to wait), high_water, depth, maxsize, overflow_policy.
+    """
+    pipeline = _pipeline
+    stats: Dict[str, Any] = {"sampled_out": int(_SAMPLED_OUT.snapshot()), "rate_limited": int(_RATE_LIMITED.snapshot())}
+    if pipeline is not None:
+        stats.update(pipeline.stats())
+    return stats
+
+
+def flush_logging(timeout: Optional[float] = None) -> bool:
+    """Block until queued records are written; returns False on timeout."""
+    pipeline = _pipeline
+    return pipeline.flush(timeout) if pipeline is not None else True
+
+
+def shutdown_logging(timeout: Optional[float] = 5.0) -> bool:
+    """
+    Drain and stop the async listener.
+
+    Records logged afterwards are emitted synchronously. Safe to call more than
+    once; registered with `atexit` when the pipeline is created.
+    """
+    pipeline = _pipeline
+    return pipeline.close(timeout) if pipeline is not None else True
+
 
 def get_logger(name: str, config: Mapping[str, Any] | None = None, *, default_level: str = "INFO") -> logging.Logger:
     """
@@ -127,9 +575,18 @@ def get_logger(name: str, config: Mapping[str, Any] | None = None, *, default_le
           file: logs/app.log
           max_bytes: 10485760
           backup_count: 5
+          async: true
+          queue_size: 10000
+          overflow_policy: drop_debug_first
+          rotation:
+            when: H
+            compress: gzip
+            max_retained_bytes: 536870912
     - default_level: fallback log level name or numeric.
 
     The returned logger will have console and rotating file handlers (if file provided).
+    With `logging.async` enabled it gets a single queue handler instead and the
+    console/file handlers are owned by the background listener.
     """
     logger = logging.getLogger(name)
 
@@ -152,34 +609,81 @@ def get_logger(name: str, config: Mapping[str, Any] | None = None, *, default_le
     # Add request id filter to logger
     req_filter = ConfigurableRequestIdFilter()
     logger.addFilter(req_filter)
+    rate_filter = _make_rate_filter(name, log_cfg)
+    if rate_filter is not None:
+        logger.addFilter(rate_filter)
 
-    formatter = _make_formatter()
+    fmt_name = str(log_cfg.get("format", "text")).strip().lower()
+    formatter = _make_formatter(fmt_name)
+    use_async = bool(log_cfg.get("async", False))
 
-    # Console handler (StreamHandler to stdout)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    def make_console() -> logging.Handler:
+        # Console handler (StreamHandler to stdout)
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        return console_handler
+
+    rotation = log_cfg.get("rotation")
+
+    def make_file(file_path: Path) -> logging.Handler:
+        max_bytes = int(log_cfg.get("max_bytes", 10_485_760))  # default 10 MB
+        backup_count = int(log_cfg.get("backup_count", 5))
+        try:
+            if isinstance(rotation, Mapping):
+                from .rotation import BackgroundRotatingFileHandler
+
+                fh = BackgroundRotatingFileHandler(
+                    file_path,
+                    max_bytes=max_bytes,
+                    when=rotation.get("when"),
+                    interval=int(rotation.get("interval", 1)),
+                    backup_count=backup_count,
+                    max_retained_bytes=int(rotation.get("max_retained_bytes", 0)),
+                    compress=rotation.get("compress", "gzip"),
+                    index=bool(rotation.get("index", False)),
+                )
+            else:
+                fh = logging.handlers.RotatingFileHandler(
+                    filename=str(file_path),
+                    maxBytes=max_bytes,
+                    backupCount=backup_count,
+                    encoding="utf-8",
+                )
+        except Exception as exc:  # pragma: no cover - OS/file errors
+            raise ConfigError(f"Unable to configure file logging at {file_path!s}: {exc}") from exc
+        fh.setFormatter(formatter)
+        return fh
+
+    targets: list[logging.Handler] = []
+    if use_async:
+        # Shared handlers stay at NOTSET; the logger's level already filters.
+        targets.append(_shared_handler(("console", fmt_name), make_console))
+    else:
+        console_handler = make_console()
+        console_handler.setLevel(level)
+        targets.append(console_handler)
 
     # File handler (RotatingFileHandler) if configured
     log_file = log_cfg.get("file")
     if log_file:
         file_path = Path(log_file)
         _ensure_log_dir(file_path)
-        max_bytes = int(log_cfg.get("max_bytes", 10_485_760))  # default 10 MB
-        backup_count = int(log_cfg.get("backup_count", 5))
-        try:
-            fh = logging.handlers.RotatingFileHandler(
-                filename=str(file_path),
-                maxBytes=max_bytes,
-                backupCount=backup_count,
-                encoding="utf-8",
-            )
+        if use_async or isinstance(rotation, Mapping):
+            # one rotating handler per file in this process (the rotation worker
+            # and inode tracking assume a single writer per process)
+            targets.append(_shared_handler(("file", str(file_path.resolve())), lambda: make_file(file_path)))
+        else:
+            fh = make_file(file_path)
             fh.setLevel(level)
-            fh.setFormatter(formatter)
-            logger.addHandler(fh)
-        except Exception as exc:  # pragma: no cover - OS/file errors
-            raise ConfigError(f"Unable to configure file logging at {file_path!s}: {exc}") from exc
+            targets.append(fh)
+
+    if use_async:
+        queue_handler = _PipelineHandler(_get_pipeline(log_cfg), tuple(targets))
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
+    else:
+        for handler in targets:
+            logger.addHandler(handler)
 
     # Mark as configured to prevent double handlers
     _configured_loggers.add(name)
@@ -0,0 +1,538 @@
+"""
+In-process metrics for Project Chimera hot paths.
+
+- `Counter`, `Gauge` and fixed-bucket `Histogram` metrics, optionally labelled
+  (`metric.labels("POST")`), kept in a `MetricsRegistry` (`REGISTRY` by default).
+- Observations take no lock: each thread increments its own cell array
+  (a `threading.local` list) and readers sum the shards at scrape time, so an
+  `inc()`/`observe()` costs a few hundred nanoseconds. Shards of threads
+  that have exited are folded into a base array, so short-lived threads do
+  not grow the shard list.
+- `render_prometheus()` produces the Prometheus text exposition format,
+  served on a local port by `start_metrics_server()`; `start_snapshot_writer()`
+  periodically writes a JSON snapshot (default `logs/metrics.json`).
+- Instrumented out of the box: `config_loader.load_config`, the adapter's
+  `_request` and retry path, and `run_openclaw_models_status`.
+
+Configured from an optional `metrics:` mapping (see `start_metrics`):
+    metrics:
+      enable: true
+      host: 127.0.0.1
+      port: 9464
+      snapshot_file: logs/metrics.json
+      snapshot_interval_seconds: 60
+
+No business logic is implemented here. Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+_perf_counter = time.perf_counter
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Seconds; covers sub-millisecond cache hits up to slow subprocess calls.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _Sharded:
+    """Per-thread cell arrays summed on read; writers never contend."""
+
+    __slots__ = ("_local", "_shards", "_base", "_lock", "_width")
+
+    def __init__(self, width: int) -> None:
+        self._local = threading.local()
+        # (owning thread, cells); a dead thread's cells move into _base
+        self._shards: List[Tuple["weakref.ref[threading.Thread]", List[float]]] = []
+        self._base = [0.0] * width
+        self._lock = threading.Lock()
+        self._width = width
+
+    def _new_shard(self) -> List[float]:
+        cells = [0.0] * self._width
+        self._local.cells = cells
+        owner = weakref.ref(threading.current_thread())
+        with self._lock:
+            self._fold_dead()
+            self._shards.append((owner, cells))
+        return cells
+
+    def _fold_dead(self) -> None:
+        # caller holds _lock; a thread that has exited can no longer write its cells
+        live = []
+        base = self._base
+        for owner, cells in self._shards:
+            thread = owner()
+            if thread is None or not thread.is_alive():
+                for i, v in enumerate(cells):
+                    base[i] += v
+            else:
+                live.append((owner, cells))
+        self._shards = live
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            self._fold_dead()
+            shards = [cells for _, cells in self._shards]
+            out = list(self._base)
+        for cells in shards:
+            for i, v in enumerate(cells):
+                out[i] += v
+        return out
+
+
+class _CounterChild(_Sharded):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            self._local.cells[0] += amount
+        except AttributeError:
+            self._new_shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_fn", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Compute the value at scrape time instead (e.g. a queue depth)."""
+        self._fn = fn
+
+    @property
+    def value(self) -> float:
+        if self._fn is not None:
+            try:
+                return float(self._fn())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class _Timer:
+    # a plain class rather than @contextmanager: no generator frame per use
+    __slots__ = ("_observe", "_start")
+
+    def __init__(self, observe: Callable[[float], None]) -> None:
+        self._observe = observe
+
+    def __enter__(self) -> "_Timer":
+        self._start = _perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._observe(_perf_counter() - self._start)
+
+
+class _HistogramChild(_Sharded):
+    """Cells: one count per bucket (last is +Inf), then the running sum."""
+
+    __slots__ = ("bounds",)
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        super().__init__(len(bounds) + 2)
+        self.bounds = bounds
+
+    def observe(self, value: float) -> None:
+        try:
+            cells = self._local.cells
+        except AttributeError:
+            cells = self._new_shard()
+        cells[bisect_left(self.bounds, value)] += 1
+        cells[-1] += value
+
+    def time(self) -> "_Timer":
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self.observe)
+
+    def snapshot(self) -> Dict[str, Any]:
+        totals = self.totals()
+        counts = totals[:-1]
+        cumulative = []
+        running = 0.0
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return {"buckets": cumulative, "count": running, "sum": totals[-1]}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lookup: Dict[Tuple[Any, ...], Any] = {}
+        self._lock = threading.Lock()
+        self._default = None if self.labelnames else self._new_child()
+        if self._default is not None:
+            self._bind(self._default)
+
+    def _bind(self, child: Any) -> None:
+        """Unlabelled metrics delegate straight to their child's bound methods."""
+        return None
+
+    def _new_child(self) -> Any:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def labels(self, *values: Any) -> Any:
+        """Return the child for these label values (cached; cheap to call per observation)."""
+        child = self._lookup.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values!r}")
+            key = tuple(str(v) for v in values)
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+                # also index the caller's raw values so the next lookup skips str()
+                self._lookup[values] = child
+        return child
+
+    def _items(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        if self._default is not None:
+            return [((), self._default)]
+        with self._lock:
+            return list(self._children.items())
+
+    def _label_str(self, values: Tuple[str, ...], extra: str = "") -> str:
+        parts = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, values)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def _bind(self, child: _CounterChild) -> None:
+        self.inc = child.inc  # type: ignore[method-assign]
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._label_str(k)} {_fmt(c.value)}" for k, c in self._items()]
+
+    def snapshot(self) -> Any:
+        return {",".join(k): c.value for k, c in self._items()} if self.labelnames else self._default.value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be computed at scrape time."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def _bind(self, child: _GaugeChild) -> None:
+        self.set = child.set  # type: ignore[method-assign]
+        self.inc = child.inc  # type: ignore[method-assign]
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._default.set_function(fn)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._label_str(k)} {_fmt(c.value)}" for k, c in self._items()]
+
+    def snapshot(self) -> Any:
+        return {",".join(k): c.value for k, c in self._items()} if self.labelnames else self._default.value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution (latencies in seconds by default)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def _bind(self, child: _HistogramChild) -> None:
+        self.observe = child.observe  # type: ignore[method-assign]
+        self.time = child.time  # type: ignore[method-assign]
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, child in self._items():
+            snap = child.snapshot()
+            for bound, cum in zip(self.bounds + (math.inf,), snap["buckets"]):
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{self._label_str(key, le)} {_fmt(cum)}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(snap['sum'])}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {_fmt(snap['count'])}")
+        return lines
+
+    def snapshot(self) -> Any:
+        def one(child: _HistogramChild) -> Dict[str, Any]:
+            snap = child.snapshot()
+            return {
+                "count": snap["count"],
+                "sum": snap["sum"],
+                "buckets": dict(zip([_fmt(b) for b in self.bounds + (math.inf,)], snap["buckets"])),
+            }
+
+        if self.labelnames:
+            return {",".join(k): one(c) for k, c in self._items()}
+        return one(self._default)
+
+
+class MetricsRegistry:
+    """Named collection of metrics; `counter()`/`gauge()`/`histogram()` are get-or-create."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, help: str, labelnames: Sequence[str], **kwargs: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        if not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name!r} already registered as {metric.kind} with labels {metric.labelnames}")
+        return metric
+
+    def counter(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        out: List[str] = []
+        for metric in metrics:
+            if metric.help:
+                out.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.render())
+        return "\n".join(out) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {m.name: m.snapshot() for m in metrics}
+
+    def write_snapshot(self, path: str | Path = "logs/metrics.json") -> Path:
+        """Atomically write `{"ts": ..., "metrics": {...}}` as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"ts": time.time(), "metrics": self.snapshot()}, fh, separators=(",", ":"), default=str)
+        os.replace(tmp, path)
+        return path
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, help: str = "", labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.counter(name, help, labelnames)
+
+
+def gauge(name: str, help: str = "", labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.gauge(name, help, labelnames)
+
+
+def histogram(
+    name: str, help: str = "", labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.histogram(name, help, labelnames, buckets)
+
+
+def timed(metric: Histogram, *label_values: Any) -> Callable[[F], F]:
+    """Decorator recording the wall time of each call (including failures)."""
+    child = metric.labels(*label_values) if label_values else metric._default
+
+    def decorate(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = _perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(_perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # keep scrapes out of stderr
+        logger.debug("metrics scrape: " + format, *args)
+
+
+def start_metrics_server(
+    host: str = "127.0.0.1", port: int = 9464, registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Serve `/metrics` in Prometheus text format on a daemon thread; returns the server."""
+    handler = type("MetricsHandler", (_Handler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Serving metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
+
+
+def start_snapshot_writer(
+    path: str | Path = "logs/metrics.json", interval: float = 60.0, registry: MetricsRegistry = REGISTRY
+) -> threading.Event:
+    """Write a JSON snapshot every `interval` seconds; set the returned event to stop."""
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval):
+            try:
+                registry.write_snapshot(path)
+            except OSError:
+                logger.exception("Unable to write metrics snapshot to %s", path)
+        try:
+            registry.write_snapshot(path)
+        except OSError:
+            pass
+
+    threading.Thread(target=run, name="metrics-snapshot", daemon=True).start()
+    return stop
+
+
+def start_metrics(config: Mapping[str, Any] | None) -> Dict[str, Any]:
+    """Start the endpoint and/or snapshot writer from a config containing a `metrics:` mapping."""
+    started: Dict[str, Any] = {}
+    cfg = (config or {}).get("metrics", {}) if isinstance(config, Mapping) else {}
+    if not isinstance(cfg, Mapping) or not cfg.get("enable", False):
+        return started
+    if cfg.get("port") is not None:
+        started["server"] = start_metrics_server(str(cfg.get("host", "127.0.0.1")), int(cfg["port"]))
+    if cfg.get("snapshot_file"):
+        started["snapshot"] = start_snapshot_writer(
+            cfg["snapshot_file"], float(cfg.get("snapshot_interval_seconds", 60))
+        )
+    return started
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "REGISTRY",
+    "DEFAULT_LATENCY_BUCKETS",
+    "counter",
+    "gauge",
+    "histogram",
+    "timed",
+    "start_metrics",
+    "start_metrics_server",
+    "start_snapshot_writer",
+]
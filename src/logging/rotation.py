@@ -0,0 +1,410 @@
+"""
+Size/time based log rotation with off-thread compression for Project Chimera.
+
+`logging.handlers.RotatingFileHandler` renames the whole backup chain on the
+thread that happens to cross `max_bytes` and leaves every backup uncompressed.
+`BackgroundRotatingFileHandler` instead:
+
+- rolls over on size (`max_bytes`), on time (`when`/`interval`) or both;
+- performs a single O(1) rename of the live file to a timestamped segment
+  (`app.log.20260101-120000.1234`) on the logging thread and reopens;
+- hands the segment to a background worker that compresses it (gzip, or zstd
+  when the optional `zstandard` package is installed) and prunes old segments
+  to `backup_count` and/or a `max_retained_bytes` budget;
+- coordinates processes sharing one log path with an advisory lock file
+  (POSIX `fcntl`): only one process renames, the others notice the inode
+  change and reopen instead of writing into a rotated segment. Until they
+  do (up to `_INODE_CHECK_INTERVAL`) they still append to the segment, so it
+  is only compressed once nothing has written to it for `compress_delay`;
+- compresses segments left uncompressed by a crash when it starts;
+- optionally (`index=True`) writes segments as independently compressed
+  blocks and records them in the request-id sidecar index
+  (`src/logging/log_index.py`).
+
+Configured from the `logging.rotation` block (see `get_logger`). Designed for
+Python 3.11.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+try:  # advisory inter-process locking (POSIX only)
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_WHEN_SECONDS = {"S": 1, "M": 60, "H": 3600, "D": 86400}
+_COMPRESSED_SUFFIXES = (".gz", ".zst")
+# how often a handler re-checks whether another process rotated the file
+_INODE_CHECK_INTERVAL = 1.0
+# extra quiet time on top of that before a segment is compressed and removed
+_COMPRESS_GRACE = 1.0
+_STOP = object()
+
+
+def _tmp_path(dst: Path) -> Path:
+    # unique per writer so two processes recovering the same segment never interleave
+    return dst.with_name(f"{dst.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def _compress_gzip(src: Path) -> Path:
+    dst = src.with_name(src.name + ".gz")
+    tmp = _tmp_path(dst)
+    with open(src, "rb") as fin, gzip.open(tmp, "wb", compresslevel=6) as fout:
+        shutil.copyfileobj(fin, fout, 1 << 16)
+    shutil.copystat(src, tmp)  # keep the rotation time for retention ordering
+    os.replace(tmp, dst)
+    return dst
+
+
+def _compress_zstd(src: Path) -> Path:
+    import zstandard  # optional dependency; caller falls back to gzip
+
+    dst = src.with_name(src.name + ".zst")
+    tmp = _tmp_path(dst)
+    with open(src, "rb") as fin, open(tmp, "wb") as fout:
+        zstandard.ZstdCompressor(level=3).copy_stream(fin, fout)
+    shutil.copystat(src, tmp)
+    os.replace(tmp, dst)
+    return dst
+
+
+def _resolve_compression(name: Optional[str]) -> Optional[str]:
+    name = (name or "none").strip().lower()
+    if name in ("none", "false", "off", ""):
+        return None
+    if name == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            logger.warning("zstandard is not installed; compressing rotated logs with gzip")
+            return "gzip"
+        return "zstd"
+    if name != "gzip":
+        raise ValueError(f"Unknown log compression {name!r}; expected gzip, zstd or none")
+    return "gzip"
+
+
+class BackgroundRotatingFileHandler(logging.FileHandler):
+    """
+    Append-only file handler whose rollover work happens off the caller's thread.
+
+    Parameters
+    - filename: live log path.
+    - max_bytes: roll over once the file reaches this size (0 disables).
+    - when/interval: time-based rollover, `when` in S/M/H/D/midnight.
+    - backup_count: keep at most this many rotated segments (0 = unlimited).
+    - max_retained_bytes: keep rotated segments under this total size (0 = unlimited).
+    - compress: "gzip", "zstd" or None.
+    - index: maintain the request-id sidecar index for rotated segments.
+    - compress_delay: seconds a segment must go unwritten (rename included)
+      before it is compressed; default `_INODE_CHECK_INTERVAL + _COMPRESS_GRACE`.
+    """
+
+    def __init__(
+        self,
+        filename: str | os.PathLike[str],
+        max_bytes: int = 0,
+        when: Optional[str] = None,
+        interval: int = 1,
+        backup_count: int = 0,
+        max_retained_bytes: int = 0,
+        compress: Optional[str] = "gzip",
+        encoding: str = "utf-8",
+        index: bool = False,
+        compress_delay: Optional[float] = None,
+    ) -> None:
+        self.base_path = Path(filename).resolve()
+        self.max_bytes = int(max_bytes)
+        self.when = when.strip().upper() if when else None
+        if self.when is not None and self.when != "MIDNIGHT" and self.when not in _WHEN_SECONDS:
+            raise ValueError(f"Invalid rotation 'when' {when!r}; expected S, M, H, D or midnight")
+        self.interval = max(1, int(interval))
+        self.backup_count = int(backup_count)
+        self.max_retained_bytes = int(max_retained_bytes)
+        self.compression = _resolve_compression(compress)
+        self.index = bool(index)
+        self.compress_delay = (
+            _INODE_CHECK_INTERVAL + _COMPRESS_GRACE if compress_delay is None else max(0.0, float(compress_delay))
+        )
+        self._closing = threading.Event()
+        self._log_index = None  # created lazily on the worker thread
+        self._segment_re = re.compile(
+            re.escape(self.base_path.name) + r"\.(\d{8}-\d{6})\.\d+(?:-(\d+))?(?:\.gz|\.zst)?"
+        )
+        self._segment_seq = 0
+        super().__init__(str(self.base_path), mode="a", encoding=encoding)
+        self._lock_path = self.base_path.with_name(self.base_path.name + ".lock")
+        self._size = self._current_size()
+        self._inode = self._current_inode()
+        self._next_inode_check = time.monotonic() + _INODE_CHECK_INTERVAL
+        self._rollover_at = self._compute_rollover(time.time())
+        # worker jobs: a segment to compress then prune, None to prune only, or _STOP
+        self._jobs: "queue.Queue[object]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._work, name=f"log-rotation-{self.base_path.name}", daemon=True
+        )
+        self._worker.start()
+        if self.compression is not None:
+            for leftover in self._segments(compressed=False):
+                self._jobs.put(leftover)
+        self._jobs.put(None)  # enforce retention limits once at startup
+
+    # -- helpers -------------------------------------------------------------
+    def _current_size(self) -> int:
+        try:
+            return os.fstat(self.stream.fileno()).st_size if self.stream else 0
+        except OSError:
+            return 0
+
+    def _current_inode(self) -> int:
+        try:
+            return os.fstat(self.stream.fileno()).st_ino if self.stream else 0
+        except OSError:
+            return 0
+
+    def _compute_rollover(self, now: float) -> Optional[float]:
+        if self.when is None:
+            return None
+        if self.when == "MIDNIGHT":
+            t = time.localtime(now)
+            midnight = time.mktime((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0, 0, 0, -1))
+            return midnight + 86400 * self.interval
+        step = _WHEN_SECONDS[self.when] * self.interval
+        return (now // step + 1) * step
+
+    def _segments(self, compressed: Optional[bool] = None) -> List[Path]:
+        """
+        Rotated segments of this log, oldest first.
+
+        Ordered by the rotation timestamp in the name, then by mtime (which
+        compression preserves) and the per-process sequence suffix.
+        """
+        found = []
+        try:
+            entries = list(os.scandir(self.base_path.parent))
+        except OSError:
+            return []
+        for entry in entries:
+            name = entry.name
+            match = self._segment_re.fullmatch(name)
+            if not match:
+                continue
+            is_compressed = name.endswith(_COMPRESSED_SUFFIXES)
+            if compressed is not None and is_compressed != compressed:
+                continue
+            try:
+                key = (match.group(1), entry.stat().st_mtime_ns, int(match.group(2) or 0), name)
+            except OSError:
+                continue
+            found.append((key, Path(entry.path)))
+        found.sort(key=lambda item: item[0])
+        return [p for _, p in found]
+
+    def _segment_name(self) -> Path:
+        # the suffix only ever grows, so a name freed by pruning is never handed out again
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime())
+        while True:
+            self._segment_seq += 1
+            candidate = self.base_path.with_name(f"{self.base_path.name}.{stamp}.{os.getpid()}-{self._segment_seq}")
+            if not candidate.exists() and not any(
+                candidate.with_name(candidate.name + s).exists() for s in _COMPRESSED_SUFFIXES
+            ):
+                return candidate
+
+    def _interprocess_lock(self):
+        fh = open(self._lock_path, "a")
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        return fh
+
+    def _reopen(self) -> None:
+        if self.stream:
+            self.stream.close()
+        self.stream = self._open()
+        self._size = self._current_size()
+        self._inode = self._current_inode()
+
+    # -- rollover (logging thread) --------------------------------------------
+    def _check_rotated_elsewhere(self) -> None:
+        """Reopen if another process renamed the live file away from us."""
+        self._next_inode_check = time.monotonic() + _INODE_CHECK_INTERVAL
+        try:
+            inode = os.stat(self.base_path).st_ino
+        except FileNotFoundError:
+            inode = -1
+        if inode != self._inode:
+            self._reopen()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self._rollover_at is not None and record.created >= self._rollover_at:
+            return True
+        if self.max_bytes > 0 and self._size >= self.max_bytes:
+            # our counter only sees this process; confirm against the file
+            self._size = self._current_size()
+            return self._size >= self.max_bytes
+        return False
+
+    def doRollover(self) -> None:
+        segment: Optional[Path] = None
+        with self._interprocess_lock():
+            try:
+                live_inode = os.stat(self.base_path).st_ino
+            except FileNotFoundError:
+                live_inode = -1
+            if live_inode == self._inode:
+                segment = self._segment_name()
+                if self.stream:
+                    self.stream.close()
+                    self.stream = None  # type: ignore[assignment]
+                try:
+                    os.rename(self.base_path, segment)
+                except FileNotFoundError:
+                    segment = None
+            # else: another process already rotated; just pick up the new file
+            self._reopen()
+        self._rollover_at = self._compute_rollover(time.time())
+        if segment is not None:
+            self._jobs.put(segment)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self._reopen()
+            if time.monotonic() >= self._next_inode_check:
+                self._check_rotated_elsewhere()
+            if self.shouldRollover(record):
+                self.doRollover()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self.flush()
+            # max_bytes is a byte limit; only non-ASCII text needs encoding to count it
+            self._size += len(msg) if msg.isascii() else len(msg.encode(self.encoding or "utf-8", "replace"))
+        except Exception:
+            self.handleError(record)
+
+    # -- background worker ---------------------------------------------------
+    def _get_log_index(self):
+        if self._log_index is None:
+            from .log_index import LogIndex
+
+            self._log_index = LogIndex(self.base_path)
+        return self._log_index
+
+    def _settled(self, segment: Path) -> bool:
+        """
+        Wait until `segment` went unwritten for `compress_delay` seconds.
+
+        Rename and writes both update st_ctime, so this covers processes that
+        have not yet noticed the rotation. False if the segment vanished or
+        the handler is closing (the next start compresses it as a leftover).
+        """
+        while True:
+            try:
+                changed = os.stat(segment).st_ctime
+            except FileNotFoundError:
+                return False
+            wait = changed + self.compress_delay - time.time()
+            if wait <= 0:
+                return True
+            if self._closing.wait(wait):
+                return False
+
+    def _compress(self, segment: Path) -> None:
+        if not segment.exists() or (self.compression is None and not self.index):
+            return
+        if not self._settled(segment):
+            return
+        try:
+            if self.index:
+                if self.compression is None:
+                    self._get_log_index().index_segment(segment)
+                else:
+                    self._get_log_index().compress_and_index(segment, self.compression)
+                return
+            if self.compression == "zstd":
+                _compress_zstd(segment)
+            else:
+                _compress_gzip(segment)
+            segment.unlink()
+        except FileNotFoundError:
+            pass  # another process compressed it first
+        except (OSError, sqlite3.Error):
+            logger.exception("Unable to compress rotated log %s", segment)
+
+    def _prune(self) -> None:
+        with self._interprocess_lock():
+            segments = self._segments()
+            sizes = []
+            for seg in segments:
+                try:
+                    sizes.append(seg.stat().st_size)
+                except OSError:
+                    sizes.append(0)
+            total = sum(sizes)
+            count = len(segments)
+            for seg, size in zip(segments, sizes):
+                over_count = self.backup_count > 0 and count > self.backup_count
+                over_budget = self.max_retained_bytes > 0 and total > self.max_retained_bytes
+                if not (over_count or over_budget):
+                    break
+                try:
+                    seg.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.exception("Unable to prune rotated log %s", seg)
+                    continue
+                if self.index:
+                    self._get_log_index().remove_segment(seg)
+                total -= size
+                count -= 1
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is _STOP:
+                    if self._log_index is not None:
+                        self._log_index.close()
+                        self._log_index = None
+                    return
+                if isinstance(job, Path):
+                    self._compress(job)
+                self._prune()
+            except Exception:  # pragma: no cover - keep the worker alive
+                logger.exception("Log rotation worker failed")
+            finally:
+                self._jobs.task_done()
+
+    def wait_idle(self) -> None:
+        """Block until pending compression/pruning has finished."""
+        self._jobs.join()
+
+    def close(self) -> None:
+        """Close the file and let the worker finish queued work.
+
+        Segments still inside `compress_delay` are left uncompressed and
+        picked up by the next handler started on this path.
+        """
+        super().close()
+        self._closing.set()  # don't wait out compress_delay on shutdown
+        if self._worker.is_alive():
+            self._jobs.put(_STOP)
+            self._worker.join()
+
+
+__all__ = ["BackgroundRotatingFileHandler"]
@@ -0,0 +1,394 @@
+"""
+Span-based tracing for Project Chimera, built on the logger's request id.
+
+The request id set with `set_request_id` doubles as the trace id, so log lines
+and spans of one task correlate without extra plumbing.
+
+- `start_span(name, **attrs)` opens a nested span (context manager) holding
+  start/end timestamps, attributes and a status; `traced()` decorates a
+  function. A span started without a request id in context gets a fresh one,
+  set as the request id only while the span is active.
+- Context crosses boundaries that `ContextVar` alone does not:
+  * thread/process pools: `ContextThreadPoolExecutor`,
+    `ContextProcessPoolExecutor`, or `propagate(fn)` for any executor;
+  * child processes: `inject_env()` adds `TRACEPARENT` and
+    `CHIMERA_REQUEST_ID`; the child calls `init_from_env()`;
+  * outbound HTTP: `inject_headers()` adds `traceparent` and `X-Request-ID`
+    (done by the OpenClaw adapter for every request).
+- Finished spans go to a buffered `FileSpanExporter` (JSON lines, flushed by
+  size, on an interval and at exit) when tracing is configured:
+    tracing:
+      enable: true
+      file: logs/spans.jsonl
+      buffer_size: 512
+      flush_interval_seconds: 2
+
+Designed for Python 3.11.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, MutableMapping, Optional, TypeVar
+
+from .logger import _request_id_var, set_request_id
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACEPARENT_ENV = "TRACEPARENT"
+REQUEST_ID_ENV = "CHIMERA_REQUEST_ID"
+REQUEST_ID_HEADER = "X-Request-ID"
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_HEX32_RE = re.compile(r"[0-9a-fA-F]{32}")
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+# Innermost active span, and the span id of a remote parent adopted from env/headers.
+_span_var: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("_span", default=None)
+_remote_parent_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("_remote_parent", default=None)
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class Span:
+    """One timed unit of work within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "status", "_token", "_owns_trace", "_rid_token")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+        owns_trace: bool = False,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.status = "ok"
+        self._token: Optional[contextvars.Token] = None
+        # a root span started with no request id publishes its trace id only while active
+        self._owns_trace = owns_trace
+        self._rid_token: Optional[contextvars.Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(exc).__name__
+        self.attributes["error.message"] = str(exc)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end is None else (self.end - self.start) * 1000.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+    # -- context manager -----------------------------------------------------
+    def __enter__(self) -> "Span":
+        self._token = _span_var.set(self)
+        if self._owns_trace:
+            self._rid_token = _request_id_var.set(self.trace_id)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        if exc is not None:
+            self.record_exception(exc)
+        self.finish()
+
+    def finish(self) -> None:
+        if self.end is not None:
+            return
+        self.end = time.time()
+        if self._token is not None:
+            try:
+                _span_var.reset(self._token)
+            except ValueError:  # finished from another context
+                pass
+            self._token = None
+        if self._rid_token is not None:
+            try:
+                _request_id_var.reset(self._rid_token)
+            except ValueError:
+                pass
+            self._rid_token = None
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(self)
+
+
+def current_span() -> Optional[Span]:
+    return _span_var.get()
+
+
+def start_span(name: str, **attributes: Any) -> Span:
+    """
+    Create a child of the current span (use as a context manager).
+
+    With no request id in context the span starts a new trace whose id is the
+    request id only until the span finishes; the caller's context is left as
+    it was.
+    """
+    trace_id = _request_id_var.get()
+    owns_trace = not trace_id
+    if owns_trace:
+        trace_id = uuid.uuid4().hex
+    parent = _span_var.get()
+    if parent is not None and parent.trace_id == trace_id:
+        parent_id: Optional[str] = parent.span_id
+    else:
+        parent_id = _remote_parent_var.get()
+    return Span(name, trace_id, parent_id, attributes, owns_trace)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable[[F], F]:
+    """Decorator wrapping each call in a span named `name` (default: qualified function name)."""
+
+    def decorate(fn: F) -> F:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with start_span(span_name, **attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# -- propagation ---------------------------------------------------------------
+def _traceparent() -> Optional[str]:
+    trace_id = _request_id_var.get()
+    if not trace_id:
+        return None
+    span = _span_var.get()
+    span_id = span.span_id if span is not None else (_remote_parent_var.get() or _new_span_id())
+    # W3C trace ids are 32 lowercase hex chars; uuid4().hex request ids already are
+    tid = trace_id.lower() if _HEX32_RE.fullmatch(trace_id) else None
+    return f"00-{tid}-{span_id}-01" if tid else None
+
+
+def inject_headers(headers: Optional[MutableMapping[str, str]] = None) -> MutableMapping[str, str]:
+    """Add `traceparent` and `X-Request-ID` for the current context to `headers` (returned)."""
+    headers = {} if headers is None else headers
+    rid = _request_id_var.get()
+    if rid:
+        headers.setdefault(REQUEST_ID_HEADER, rid)
+        tp = _traceparent()
+        if tp:
+            headers.setdefault("traceparent", tp)
+    return headers
+
+
+def inject_env(env: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    """Return a copy of `env` (default `os.environ`) carrying the current trace context."""
+    out = dict(os.environ if env is None else env)
+    rid = _request_id_var.get()
+    if rid:
+        out[REQUEST_ID_ENV] = rid
+        tp = _traceparent()
+        if tp:
+            out[TRACEPARENT_ENV] = tp
+    return out
+
+
+def _apply_remote(request_id: Optional[str], traceparent: Optional[str]) -> Optional[str]:
+    parent_id = None
+    if traceparent:
+        match = _TRACEPARENT_RE.match(traceparent.strip().lower())
+        if match:
+            request_id = request_id or match.group(1)
+            parent_id = match.group(2)
+    if request_id:
+        set_request_id(request_id)
+        _remote_parent_var.set(parent_id)
+    return request_id
+
+
+def init_from_env(env: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    """In a child process: adopt the parent's request id and span; returns the request id."""
+    env = os.environ if env is None else env
+    return _apply_remote(env.get(REQUEST_ID_ENV), env.get(TRACEPARENT_ENV))
+
+
+def extract_headers(headers: Mapping[str, str]) -> Optional[str]:
+    """On an inbound request: adopt `X-Request-ID` / `traceparent`; returns the request id."""
+    lowered = {k.lower(): v for k, v in headers.items()}
+    return _apply_remote(lowered.get(REQUEST_ID_HEADER.lower()), lowered.get("traceparent"))
+
+
+def propagate(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind `fn` to a copy of the caller's context (request id, current span)."""
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, fn)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks run in the submitter's context."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class _RemoteCall:
+    """Picklable wrapper re-establishing the trace context in a worker process."""
+
+    def __init__(self, fn: Callable[..., Any], request_id: Optional[str], traceparent: Optional[str]) -> None:
+        self.fn = fn
+        self.request_id = request_id
+        self.traceparent = traceparent
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # a fresh context per call so one task's ids never leak into the next on this worker
+        return contextvars.Context().run(self._run, *args, **kwargs)
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        _apply_remote(self.request_id, self.traceparent)
+        return self.fn(*args, **kwargs)
+
+
+class ContextProcessPoolExecutor(ProcessPoolExecutor):
+    """ProcessPoolExecutor whose tasks adopt the submitter's request id and span."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return super().submit(_RemoteCall(fn, _request_id_var.get(), _traceparent()), *args, **kwargs)
+
+
+# -- export --------------------------------------------------------------------
+class FileSpanExporter:
+    """Buffers finished spans and appends them to a JSON-lines file.
+
+    Flushes when `buffer_size` spans are pending, every `flush_interval`
+    seconds on a daemon thread, and on `shutdown()` (registered with atexit).
+    """
+
+    def __init__(self, path: str | Path = "logs/spans.jsonl", buffer_size: int = 512, flush_interval: float = 2.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_size = max(1, int(buffer_size))
+        self.flush_interval = flush_interval
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.exported = 0
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span)
+            full = len(self._buffer) >= self.buffer_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not spans:
+            return
+        data = "".join(_encode(s.as_dict()) + "\n" for s in spans)
+        with self._write_lock:
+            try:
+                # one O_APPEND write per batch keeps lines intact across processes
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write(data)
+                self.exported += len(spans)
+            except OSError:
+                logger.exception("Unable to export %d spans to %s", len(spans), self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self.flush()
+
+
+_exporter: Optional[FileSpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def set_exporter(exporter: Optional[FileSpanExporter]) -> Optional[FileSpanExporter]:
+    """Install `exporter` (None disables export); returns the previous one after flushing it."""
+    global _exporter
+    with _exporter_lock:
+        previous, _exporter = _exporter, exporter
+    if previous is not None:
+        previous.shutdown()
+    return previous
+
+
+def configure_tracing(config: Mapping[str, Any] | None) -> Optional[FileSpanExporter]:
+    """Install a file exporter from a config's `tracing:` block; returns it (None if disabled)."""
+    cfg = config.get("tracing", {}) if isinstance(config, Mapping) else {}
+    if not isinstance(cfg, Mapping) or not cfg.get("enable", False):
+        return None
+    exporter = FileSpanExporter(
+        cfg.get("file", "logs/spans.jsonl"),
+        buffer_size=int(cfg.get("buffer_size", 512)),
+        flush_interval=float(cfg.get("flush_interval_seconds", 2.0)),
+    )
+    set_exporter(exporter)
+    return exporter
+
+
+def _shutdown() -> None:
+    exporter = _exporter
+    if exporter is not None:
+        exporter.shutdown()
+
+
+atexit.register(_shutdown)
+
+
+__all__ = [
+    "Span",
+    "start_span",
+    "traced",
+    "current_span",
+    "inject_headers",
+    "inject_env",
+    "init_from_env",
+    "extract_headers",
+    "propagate",
+    "ContextThreadPoolExecutor",
+    "ContextProcessPoolExecutor",
+    "FileSpanExporter",
+    "set_exporter",
+    "configure_tracing",
+]
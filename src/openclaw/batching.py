@@ -0,0 +1,326 @@
+"""Batched bulk ingestion for OpenClaw.
+
+Generation and research agents emit many small records per campaign; posting
+each one as its own request multiplies request count and JSON encoding work.
+This module provides:
+
+- `encode_batch`: serialize payloads once into an NDJSON or JSON-array body,
+  optionally gzip-compressed, together with the matching headers.
+- `BatchSender`: a thread-safe buffer that collects payloads and flushes them
+  when a count, byte-size or age threshold is reached (age via a background
+  timer), reporting per-item results through a callback. Optional `validate`
+  and `spool` hooks hold back invalid payloads and hand transient failures
+  to a durable outbox.
+- `item_results`: maps a gateway response to one result per item so partial
+  failures can be retried individually.
+
+The transport is injected as a `send(body, headers, count) -> BatchResult` callable
+so the buffer is independent of the adapter.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .resilience import classify
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_item(payload: Any) -> bytes:
+    """Serialize one payload to compact UTF-8 JSON."""
+    return _encoder.encode(payload).encode("utf-8")
+
+
+def join_items(items: Sequence[bytes], fmt: str = "ndjson") -> bytes:
+    """Join pre-encoded items into an NDJSON or JSON-array body."""
+    if fmt == "ndjson":
+        return b"\n".join(items) + b"\n" if items else b""
+    if fmt == "json":
+        return b"[" + b",".join(items) + b"]"
+    raise ValueError(f"Unknown batch format: {fmt!r}")
+
+
+def encode_batch(
+    payloads: Iterable[Any] | None = None,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    compresslevel: int = 6,
+    *,
+    encoded: Sequence[bytes] | None = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """Return `(body, headers)` for a batch, serializing each payload exactly once.
+
+    Pass `encoded` instead of `payloads` when items were already serialized
+    with `encode_item`.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown batch format: {fmt!r}")
+    items = list(encoded) if encoded is not None else [encode_item(p) for p in payloads or ()]
+    body = join_items(items, fmt)
+    headers = {"Content-Type": FORMATS[fmt]}
+    if compress:
+        body = gzip.compress(body, compresslevel=compresslevel)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+@dataclass
+class ItemResult:
+    """Outcome for one payload of a batch."""
+
+    index: int
+    status: str  # "ok" | "failed" | "invalid"
+    code: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch request."""
+
+    status: str  # "ok" | "partial" | "failed"
+    code: Optional[int]
+    attempts: int
+    items: List[ItemResult] = field(default_factory=list)
+
+    @property
+    def failed_indexes(self) -> List[int]:
+        return [r.index for r in self.items if r.status != "ok"]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "code": self.code,
+            "attempts": self.attempts,
+            "items": [r.__dict__.copy() for r in self.items],
+            "failed_indexes": self.failed_indexes,
+        }
+
+
+def _as_code(value: Any) -> Optional[int]:
+    """A per-item status code as int, or None when the gateway sent something else."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def item_results(count: int, code: Optional[int], body: Optional[str]) -> List[ItemResult]:
+    """Build per-item results from a batch response.
+
+    If the gateway returns a JSON object with a `results` (or `items`) list of
+    the same length, each entry's `status`/`code`/`error` is used (a
+    non-numeric `code` counts as no code). Otherwise the batch status code
+    applies to every item.
+    """
+    batch_ok = bool(code and 200 <= code < 300)
+    entries = None
+    if batch_ok and body:
+        try:
+            doc = json.loads(body)
+        except ValueError:
+            doc = None
+        if isinstance(doc, dict):
+            entries = doc.get("results", doc.get("items"))
+    if isinstance(entries, list) and len(entries) == count:
+        out = []
+        for i, entry in enumerate(entries):
+            entry = entry if isinstance(entry, dict) else {}
+            item_code = _as_code(entry.get("code", code))
+            ok = entry.get("status") in ("ok", "accepted", "success") if "status" in entry else bool(
+                item_code and 200 <= item_code < 300
+            )
+            out.append(ItemResult(i, "ok" if ok else "failed", item_code, entry.get("error")))
+        return out
+    return [ItemResult(i, "ok" if batch_ok else "failed", code) for i in range(count)]
+
+
+def summarize(items: List[ItemResult], code: Optional[int], attempts: int) -> BatchResult:
+    """Wrap per-item results into a `BatchResult` with an overall ok/partial/failed status."""
+    failed = sum(1 for r in items if r.status != "ok")
+    status = "ok" if failed == 0 else ("failed" if failed == len(items) else "partial")
+    return BatchResult(status=status, code=code, attempts=attempts, items=items)
+
+
+SendFn = Callable[[bytes, Dict[str, str], int], BatchResult]
+# payloads -> {index: error} for the ones that must not be sent
+ValidateFn = Callable[[List[Any]], Mapping[int, str]]
+# encoded items that failed transiently -> True if durably stored for replay
+SpoolFn = Callable[[List[bytes]], bool]
+
+
+class BatchSender:
+    """Buffers payloads and flushes them as batches.
+
+    A flush happens when `max_items` payloads or `max_bytes` of encoded payload
+    are buffered (on the adding thread), or when the oldest buffered payload
+    is `max_age` seconds old (on a background timer thread started by
+    `start()`). `on_result(payloads, result)` receives every batch outcome.
+
+    Payloads `validate` rejects are reported as "invalid" and never sent.
+    Items that failed transiently (connection error, 408/429/5xx) are put back
+    for the next flush with `requeue_failed=True`, otherwise handed to
+    `spool`; permanent failures are only reported.
+    """
+
+    def __init__(
+        self,
+        send: SendFn,
+        max_items: int = 500,
+        max_bytes: int = 1_048_576,
+        max_age: float = 2.0,
+        fmt: str = "ndjson",
+        compress: bool = False,
+        on_result: Callable[[List[Any], BatchResult], None] | None = None,
+        requeue_failed: bool = False,
+        validate: ValidateFn | None = None,
+        spool: SpoolFn | None = None,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown batch format: {fmt!r}")
+        self._send = send
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.fmt = fmt
+        self.compress = compress
+        self.on_result = on_result
+        self.requeue_failed = requeue_failed
+        self.validate = validate
+        self.spool = spool
+
+        self._payloads: List[Any] = []
+        self._encoded: List[bytes] = []
+        self._bytes = 0
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self.stats = {"batches": 0, "items_sent": 0, "items_failed": 0, "items_invalid": 0, "items_spooled": 0}
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def add(self, payload: Any) -> Optional[BatchResult]:
+        """Buffer `payload`; returns the flush result if this add triggered one."""
+        data = encode_item(payload)
+        with self._lock:
+            self._payloads.append(payload)
+            self._encoded.append(data)
+            self._bytes += len(data) + 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._payloads) >= self.max_items or self._bytes >= self.max_bytes
+        return self.flush() if full else None
+
+    def _take(self) -> Tuple[List[Any], List[bytes]]:
+        with self._lock:
+            payloads, encoded = self._payloads, self._encoded
+            self._payloads, self._encoded, self._bytes, self._oldest = [], [], 0, None
+        return payloads, encoded
+
+    def flush(self) -> Optional[BatchResult]:
+        """Send everything buffered now; returns None if the buffer was empty."""
+        with self._flush_lock:
+            payloads, encoded = self._take()
+            if not payloads:
+                return None
+            invalid = self.validate(payloads) if self.validate is not None else {}
+            items = [ItemResult(i, "invalid", None, error) for i, error in invalid.items()]
+            sendable = [i for i in range(len(payloads)) if i not in invalid]
+            code: Optional[int] = None
+            attempts = 0
+            if sendable:
+                body, headers = encode_batch(fmt=self.fmt, compress=self.compress, encoded=[encoded[i] for i in sendable])
+                try:
+                    sent = self._send(body, headers, len(sendable))
+                except Exception as exc:  # keep the buffer usable if the transport blows up
+                    logger.exception("Batch send failed")
+                    sent = summarize([ItemResult(i, "failed", None, str(exc)) for i in range(len(sendable))], None, 0)
+                code, attempts = sent.code, sent.attempts
+                # map positions in the sent batch back to buffer positions
+                items.extend(ItemResult(sendable[r.index], r.status, r.code, r.error) for r in sent.items)
+            items.sort(key=lambda r: r.index)
+            result = summarize(items, code, attempts)
+
+            self.stats["batches"] += 1
+            failed = result.failed_indexes
+            self.stats["items_sent"] += len(payloads) - len(failed)
+            # invalid items were never sent: they count as invalid, not as delivery failures
+            self.stats["items_failed"] += len(failed) - len(invalid)
+            self.stats["items_invalid"] += len(invalid)
+            # only transient failures can succeed later; permanent 4xx are just reported
+            retry = [r.index for r in items if r.status == "failed" and classify(r.code) == "retry"]
+            if retry and self.requeue_failed:
+                with self._lock:
+                    self._payloads[:0] = [payloads[i] for i in retry]
+                    self._encoded[:0] = [encoded[i] for i in retry]
+                    self._bytes += sum(len(encoded[i]) + 1 for i in retry)
+                    if self._oldest is None:
+                        self._oldest = time.monotonic()
+            elif retry and self.spool is not None and self.spool([encoded[i] for i in retry]):
+                self.stats["items_spooled"] += len(retry)
+        if self.on_result is not None:
+            try:
+                self.on_result(payloads, result)
+            except Exception:
+                logger.exception("Batch result callback failed")
+        return result
+
+    def start(self, tick: float | None = None) -> None:
+        """Start the background age-based flusher."""
+        if self._timer is not None and self._timer.is_alive():
+            return
+        tick = tick if tick is not None else max(0.05, self.max_age / 4)
+        self._stop.clear()
+
+        def _run() -> None:
+            while not self._stop.wait(tick):
+                oldest = self._oldest
+                if oldest is not None and time.monotonic() - oldest >= self.max_age:
+                    self.flush()
+
+        self._timer = threading.Thread(target=_run, name="openclaw-batch-flush", daemon=True)
+        self._timer.start()
+
+    def close(self) -> Optional[BatchResult]:
+        """Stop the background flusher and flush what is left."""
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        return self.flush()
+
+    def __enter__(self) -> "BatchSender":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+__all__ = [
+    "BatchResult",
+    "BatchSender",
+    "ItemResult",
+    "encode_batch",
+    "encode_item",
+    "item_results",
+    "join_items",
+    "summarize",
+]
@@ -0,0 +1,342 @@
+"""Durable on-disk outbox for OpenClaw deliveries.
+
+When `send_payload` exhausts its retries the payload would otherwise only
+exist in memory. This module spools such payloads to a SQLite database in WAL
+mode so they survive process restarts, and replays them once the gateway
+recovers:
+
+- `Outbox` appends already-serialized bodies (grouped into one transaction per
+  `append_many` call, so fsyncs are batched), leases due entries to a
+  drainer, deletes acknowledged ones and reschedules failed ones with
+  exponential backoff and jitter.
+- `OutboxDrainer` replays the spool on a background thread with bounded
+  concurrency, backs off as a whole while the gateway is down (no thundering
+  herd on recovery), honours `Retry-After` on 429/503 replies and
+  periodically checkpoints/compacts the database.
+- `Outbox.stats()` exposes queue depth and the age of the oldest entry.
+
+`synchronous="NORMAL"` (default) survives process crashes; use `"FULL"` to
+also survive power loss at the cost of an fsync per commit.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .resilience import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    endpoint TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    body BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    leased_until REAL NOT NULL DEFAULT 0,
+    last_code INTEGER
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (next_attempt_at, id);
+"""
+
+
+class OutboxError(RuntimeError):
+    """Raised when the outbox database cannot be opened or written."""
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    """A spooled delivery leased to a drainer."""
+
+    id: int
+    endpoint: str
+    content_type: str
+    body: bytes
+    created_at: float
+    attempts: int
+
+
+class Outbox:
+    """SQLite-backed, crash-safe spool of pending deliveries (thread-safe)."""
+
+    def __init__(
+        self,
+        path: str | Path = "spool/openclaw_outbox.db",
+        synchronous: str = "NORMAL",
+        lease_seconds: float = 60.0,
+        base_backoff: float = 5.0,
+        max_backoff: float = 600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(f"PRAGMA synchronous={synchronous}")
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error as exc:
+            raise OutboxError(f"Unable to open outbox at {self.path}: {exc}") from exc
+
+    def append(self, endpoint: str, body: bytes, content_type: str = "application/json") -> int:
+        """Spool one delivery; returns its id."""
+        return self.append_many([(endpoint, body, content_type)])[0]
+
+    def append_many(self, entries: Iterable[Tuple[str, bytes, str]]) -> List[int]:
+        """Spool several deliveries in a single transaction; returns their ids."""
+        now = self._clock()
+        ids: List[int] = []
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                for endpoint, body, content_type in entries:
+                    cur = self._db.execute(
+                        "INSERT INTO outbox (endpoint, content_type, body, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?)",
+                        (endpoint, content_type, sqlite3.Binary(body), now, now),
+                    )
+                    ids.append(int(cur.lastrowid))
+                self._db.execute("COMMIT")
+            except sqlite3.Error as exc:
+                self._rollback()
+                raise OutboxError(f"Unable to write outbox {self.path}: {exc}") from exc
+        return ids
+
+    def _rollback(self) -> None:
+        # BEGIN itself may have failed (e.g. database locked); never mask the original error
+        if self._db.in_transaction:
+            try:
+                self._db.execute("ROLLBACK")
+            except sqlite3.Error:
+                logger.exception("Outbox rollback failed")
+
+    def claim(self, limit: int = 50) -> List[OutboxEntry]:
+        """Lease up to `limit` due entries (oldest first) for `lease_seconds`."""
+        now = self._clock()
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                rows = self._db.execute(
+                    "SELECT id, endpoint, content_type, body, created_at, attempts FROM outbox "
+                    "WHERE next_attempt_at <= ? AND leased_until <= ? ORDER BY next_attempt_at, id LIMIT ?",
+                    (now, now, limit),
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE outbox SET leased_until = ? WHERE id = ?",
+                    [(now + self.lease_seconds, r[0]) for r in rows],
+                )
+                self._db.execute("COMMIT")
+            except sqlite3.Error as exc:
+                self._rollback()
+                raise OutboxError(f"Unable to lease from outbox {self.path}: {exc}") from exc
+        return [OutboxEntry(r[0], r[1], r[2], bytes(r[3]), r[4], r[5]) for r in rows]
+
+    def ack(self, ids: Sequence[int]) -> None:
+        """Remove delivered entries."""
+        if not ids:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def nack(self, entry: OutboxEntry, code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """Release a failed entry and schedule its next attempt (exponential backoff, full jitter)."""
+        attempts = entry.attempts + 1
+        if retry_after is None:
+            retry_after = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** (attempts - 1))))
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET attempts = ?, last_code = ?, leased_until = 0, next_attempt_at = ? WHERE id = ?",
+                (attempts, code, self._clock() + retry_after, entry.id),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, age of the oldest entry (seconds) and max attempts."""
+        with self._lock:
+            depth, oldest, max_attempts = self._db.execute(
+                "SELECT COUNT(*), MIN(created_at), MAX(attempts) FROM outbox"
+            ).fetchone()
+        return {
+            "depth": depth,
+            "oldest_age_seconds": (self._clock() - oldest) if oldest is not None else 0.0,
+            "max_attempts": max_attempts or 0,
+        }
+
+    def compact(self) -> None:
+        """Checkpoint the WAL into the main file and release free pages."""
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 0:
+                self._db.execute("VACUUM")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# endpoint, body, content_type -> status code (None on connection failure), or
+# (status code, response headers) so the drainer can honour Retry-After
+DeliverResult = Union[Optional[int], Tuple[Optional[int], Mapping[str, str]]]
+DeliverFn = Callable[[str, bytes, str], DeliverResult]
+
+
+def _is_permanent(code: Optional[int]) -> bool:
+    """4xx other than 408/429 will not succeed on replay."""
+    return code is not None and 400 <= code < 500 and code not in (408, 429)
+
+
+class OutboxDrainer:
+    """Replays an `Outbox` in the background with bounded concurrency.
+
+    Entries rejected with a permanent 4xx, or that reach `max_attempts`, are
+    dropped (and logged) so they do not block the queue. When `deliver`
+    returns response headers, a `Retry-After` (capped at `max_retry_after`)
+    schedules the entry's next attempt and holds off the whole drainer.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        deliver: DeliverFn,
+        concurrency: int = 4,
+        batch_size: int = 50,
+        interval: float = 5.0,
+        max_attempts: int = 20,
+        max_idle_backoff: float = 300.0,
+        compact_every: float = 300.0,
+        max_retry_after: float = 3600.0,
+    ) -> None:
+        self.outbox = outbox
+        self.deliver = deliver
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.max_idle_backoff = max_idle_backoff
+        self.compact_every = compact_every
+        self.max_retry_after = max_retry_after
+        # longest Retry-After seen in the last batch; the drainer waits at least this long
+        self._retry_after = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {"delivered": 0, "failed_attempts": 0, "dropped": 0}
+
+    def _attempt(self, entry: OutboxEntry) -> Tuple[OutboxEntry, Optional[int], Optional[float]]:
+        try:
+            result = self.deliver(entry.endpoint, entry.body, entry.content_type)
+        except Exception:
+            logger.exception("Outbox delivery %d raised", entry.id)
+            return entry, None, None
+        if not isinstance(result, tuple):
+            return entry, result, None
+        code, headers = result
+        retry_after = None
+        for name, value in (headers or {}).items():
+            if name.lower() == "retry-after":
+                retry_after = parse_retry_after(value)
+                break
+        if retry_after is not None:
+            retry_after = min(retry_after, self.max_retry_after)
+        return entry, code, retry_after
+
+    def drain_once(self) -> Tuple[int, int]:
+        """Deliver one batch of due entries; returns (delivered, failed)."""
+        self._retry_after = 0.0
+        entries = self.outbox.claim(self.batch_size)
+        if not entries:
+            return 0, 0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="openclaw-outbox")
+        done: List[int] = []
+        delivered = failed = 0
+        for entry, code, retry_after in self._executor.map(self._attempt, entries):
+            if code is not None and 200 <= code < 300:
+                done.append(entry.id)
+                delivered += 1
+            elif _is_permanent(code) or entry.attempts + 1 >= self.max_attempts:
+                logger.error(
+                    "Dropping outbox entry %d to %s after %d attempts (last code %s)",
+                    entry.id, entry.endpoint, entry.attempts + 1, code,
+                )
+                done.append(entry.id)
+                self.stats["dropped"] += 1
+            else:
+                self.outbox.nack(entry, code, retry_after)
+                if retry_after is not None:
+                    self._retry_after = max(self._retry_after, retry_after)
+                failed += 1
+        self.outbox.ack(done)
+        self.stats["delivered"] += delivered
+        self.stats["failed_attempts"] += failed
+        return delivered, failed
+
+    def _run(self) -> None:
+        idle_backoff = self.interval
+        last_compact = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                delivered, failed = self.drain_once()
+            except Exception:
+                logger.exception("Outbox drain failed")
+                delivered, failed = 0, 1
+            if delivered and not failed:
+                idle_backoff = self.interval
+                continue  # more may be due; keep draining
+            if failed and not delivered:
+                # gateway still down: back off as a whole, with jitter
+                idle_backoff = min(self.max_idle_backoff, idle_backoff * 2)
+                wait = random.uniform(self.interval, idle_backoff)
+            else:
+                idle_backoff = self.interval
+                wait = self.interval
+            # the gateway said when to come back; nothing is due before then anyway
+            wait = max(wait, self._retry_after)
+            if time.monotonic() - last_compact >= self.compact_every:
+                try:
+                    self.outbox.compact()
+                except sqlite3.Error:
+                    logger.exception("Outbox compaction failed")
+                last_compact = time.monotonic()
+            self._stop.wait(wait)
+
+    def start(self) -> None:
+        """Start draining on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="openclaw-outbox-drain", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the drainer; in-flight deliveries finish first."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+__all__ = [
+    "Outbox",
+    "OutboxDrainer",
+    "OutboxEntry",
+    "OutboxError",
+]
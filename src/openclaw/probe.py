@@ -0,0 +1,243 @@
+"""Concurrent, early-exit connectivity probing for OpenClaw health checks.
+
+The adapter's `health_check` tries every combination of path x auth header x
+method. Run one after another with the full request timeout each, an
+unreachable gateway can block a readiness check for many minutes. This module
+runs the same probes:
+
+- on a bounded pool of worker threads kept for the engine's lifetime,
+- under an overall deadline (per-probe timeouts are clipped to what is left),
+- stopping as soon as the verdict is decided: the gateway is reachable and
+  accepts one of the auth headers; it is reachable but answered every auth
+  header with 401/403 (or no auth header is being tried); or the first
+  `unreachable_after` probes all got no response at all,
+- caching the verdict for `cache_ttl` seconds per cache key.
+
+The verdict keeps the adapter's keys (`observed_codes`, `any_reachable`,
+`auth_accepted`) and adds per-probe latency.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ..logging.tracing import ContextThreadPoolExecutor  # probes keep the caller's request id / span
+
+# (url, method, headers, data, timeout) -> (status_code | None, body | None)
+RequestFn = Callable[..., Tuple[Optional[int], Optional[str]]]
+
+AUTH_HEADERS = ("Authorization", "X-API-Key", "Api-Key")
+AUTH_REJECTED_CODES = frozenset({401, 403})
+
+
+@dataclass(frozen=True)
+class Probe:
+    """One request to try."""
+
+    path: str
+    method: str
+    headers: Mapping[str, str]
+    data: Optional[bytes] = None
+
+    @property
+    def auth_header(self) -> Optional[str]:
+        for name in AUTH_HEADERS:
+            if name in self.headers:
+                return name
+        return None
+
+
+def build_probes(
+    paths: Iterable[str],
+    header_variants: Iterable[Mapping[str, str]],
+    methods: Iterable[str],
+    post_body: Optional[bytes] = None,
+) -> List[Probe]:
+    """Expand the path x header x method matrix in the adapter's order."""
+    variants = list(header_variants)
+    methods = list(methods)
+    return [
+        Probe(path, method, hdr, post_body if method == "POST" else None)
+        for path in paths
+        for hdr in variants
+        for method in methods
+    ]
+
+
+class ProbeEngine:
+    """Runs probe matrices concurrently with a deadline, early exit and a TTL cache.
+
+    The worker pool is created on first use and reused across runs; call
+    `close()` to release it.
+    """
+
+    def __init__(
+        self,
+        request: RequestFn,
+        max_workers: int = 8,
+        deadline: float = 10.0,
+        cache_ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        unreachable_after: int = 3,
+    ) -> None:
+        self._request = request
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.cache_ttl = cache_ttl
+        self.unreachable_after = max(1, int(unreachable_after))
+        self._clock = clock
+        self._cache: Dict[Any, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+        self._executor: Optional[ContextThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> ContextThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ContextThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="openclaw-probe"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut the worker pool down (a later `run` starts a new one)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def invalidate(self, cache_key: Any = None) -> None:
+        """Drop one cached verdict, or all of them when `cache_key` is None."""
+        with self._cache_lock:
+            if cache_key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(cache_key, None)
+
+    def _cached(self, cache_key: Any) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+        if entry is not None and self._clock() - entry[0] < self.cache_ttl:
+            return dict(entry[1], cached=True)
+        return None
+
+    def run(
+        self,
+        base_url: str,
+        probes: Sequence[Probe],
+        timeout: float,
+        cache_key: Any = None,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """Run `probes` against `base_url` and return the verdict.
+
+        `timeout` is the per-request ceiling. With `force=True` the cache is
+        bypassed (and refreshed).
+        """
+        key = cache_key if cache_key is not None else base_url
+        if not force and self.cache_ttl > 0:
+            hit = self._cached(key)
+            if hit is not None:
+                return hit
+
+        start = self._clock()
+        stop = threading.Event()
+        lock = threading.Lock()
+        state = {"reachable": False, "auth": False, "responses": 0, "no_response": 0}
+        auth_names = {p.auth_header for p in probes if p.auth_header}
+        rejected: set = set()
+        observed: Dict[Optional[int], int] = {}
+        results: List[Dict[str, Any]] = []
+        base = base_url.rstrip("/")
+        pending = iter(probes)
+
+        def run_one(probe: Probe) -> None:
+            remaining = self.deadline - (self._clock() - start)
+            if stop.is_set() or remaining <= 0:
+                return
+            t0 = time.perf_counter()
+            code, _ = self._request(
+                base + probe.path,
+                method=probe.method,
+                headers=dict(probe.headers) or None,
+                data=probe.data,
+                timeout=min(timeout, remaining),
+            )
+            latency_ms = (time.perf_counter() - t0) * 1000.0
+            with lock:
+                observed[code] = observed.get(code, 0) + 1
+                results.append(
+                    {
+                        "path": probe.path,
+                        "method": probe.method,
+                        "auth_header": probe.auth_header,
+                        "code": code,
+                        "latency_ms": round(latency_ms, 3),
+                    }
+                )
+                if code is None:
+                    state["no_response"] += 1
+                else:
+                    state["responses"] += 1
+                    if probe.auth_header and code in AUTH_REJECTED_CODES:
+                        rejected.add(probe.auth_header)
+                if code and 200 <= code < 300:
+                    state["reachable"] = True
+                    if probe.auth_header:
+                        state["auth"] = True
+                if state["reachable"] and (state["auth"] or rejected >= auth_names):
+                    stop.set()  # reachable, and auth either accepted or rejected by every header
+                elif not state["responses"] and state["no_response"] >= self.unreachable_after:
+                    stop.set()  # connection failures are per host: the rest would fail too
+
+        executor = self._pool()
+        in_flight: set[Future] = set()
+        try:
+            while not stop.is_set():
+                while len(in_flight) < self.max_workers:
+                    probe = next(pending, None)
+                    if probe is None:
+                        break
+                    in_flight.add(executor.submit(run_one, probe))
+                if not in_flight:
+                    break
+                remaining = self.deadline - (self._clock() - start)
+                if remaining <= 0:
+                    break
+                done, in_flight = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+        finally:
+            stopped_early = stop.is_set()
+            stop.set()
+            # in-flight requests finish in the background (within the deadline);
+            # their results are discarded
+            for future in in_flight:
+                future.cancel()
+
+        with lock:
+            verdict = {
+                "observed_codes": dict(observed),
+                "any_reachable": state["reachable"],
+                "auth_accepted": state["auth"],
+                "probes": list(results),
+                "probes_total": len(probes),
+                "elapsed_ms": round((self._clock() - start) * 1000.0, 3),
+                "timed_out": self._clock() - start >= self.deadline,
+                "stopped_early": stopped_early,
+                "cached": False,
+            }
+        if self.cache_ttl > 0:
+            with self._cache_lock:
+                self._cache[key] = (self._clock(), verdict)
+        return verdict
+
+
+__all__ = [
+    "Probe",
+    "ProbeEngine",
+    "build_probes",
+]
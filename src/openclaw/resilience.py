@@ -0,0 +1,385 @@
+"""Retry, circuit-breaking and rate-limiting for OpenClaw calls.
+
+The adapter used to sleep a fixed `retry_backoff_seconds` between attempts,
+retry 4xx responses that can never succeed, ignore `Retry-After` and let every
+agent hammer a degraded gateway in lockstep. This module provides reusable
+pieces that the adapter composes through `ResilientCaller`:
+
+- `backoff_delay`: exponential backoff with full jitter,
+- `classify`: status-code-aware retry decisions (2xx ok; 408/425/429/5xx and
+  connection failures retryable; other 4xx permanent),
+- `parse_retry_after`: `Retry-After` as seconds or an HTTP date,
+- `CircuitBreaker`: per-endpoint closed/open/half-open breaker that fails fast,
+- `TokenBucket`: client-side rate limiter (`openclaw.api.rate_limit`),
+- blocking and asyncio (`acall`) execution paths.
+
+All time comes from a `Clock`; `FakeClock` makes the behaviour deterministic
+in tests (its sleeps advance virtual time instantly).
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+# -- clocks -----------------------------------------------------------------
+
+
+class Clock:
+    """Real time source."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wall(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def asleep(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds))
+
+
+class FakeClock(Clock):
+    """Deterministic clock for tests: sleeping advances time immediately."""
+
+    def __init__(self, start: float = 0.0, wall_start: float = 1_700_000_000.0) -> None:
+        self.now = start
+        self._wall_offset = wall_start - start
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def wall(self) -> float:
+        return self.now + self._wall_offset
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.advance(max(0.0, seconds))
+
+    async def asleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+        await asyncio.sleep(0)
+
+
+SYSTEM_CLOCK = Clock()
+
+# -- retry decisions ---------------------------------------------------------
+
+RETRYABLE_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def classify(code: Optional[int]) -> str:
+    """Return "ok", "retry" or "fail" for a response status (None = no response)."""
+    if code is None:
+        return "retry"
+    if 200 <= code < 300:
+        return "ok"
+    if code in RETRYABLE_CODES:
+        return "retry"
+    if 400 <= code < 500:
+        return "fail"
+    return "retry" if code >= 500 else "fail"
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random | None = None) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (1-based)."""
+    upper = min(cap, base * (2 ** max(0, attempt - 1)))
+    return (rng or random).uniform(0.0, upper)
+
+
+def parse_retry_after(value: Optional[str], now: float | None = None) -> Optional[float]:
+    """Parse a `Retry-After` header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+# -- circuit breaker ---------------------------------------------------------
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker.
+
+    Opens after `failure_threshold` consecutive failures; while open, calls
+    fail fast. After `reset_timeout` seconds it lets up to `half_open_max`
+    trial calls through; one success closes it, one failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and self._clock.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._trials < self.half_open_max:
+                self._trials += 1
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker will admit a trial call (0 if not open)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock.monotonic()
+
+
+# -- rate limiting -----------------------------------------------------------
+
+
+class TokenBucket:
+    """Token-bucket limiter: `rate` tokens/second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None, clock: Clock = SYSTEM_CLOCK) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` (possibly going negative); returns seconds to wait."""
+        with self._lock:
+            now = self._clock.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now, without waiting."""
+        with self._lock:
+            now = self._clock.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available; returns the time waited."""
+        wait = self._reserve(tokens)
+        self._clock.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Non-blocking counterpart of `acquire`."""
+        wait = self._reserve(tokens)
+        await self._clock.asleep(wait)
+        return wait
+
+
+# -- composition ---------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Attempt budget and backoff bounds."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    respect_retry_after: bool = True
+    max_retry_after: float = 300.0
+
+    @classmethod
+    def from_config(cls, cfg: Mapping[str, Any]) -> "RetryPolicy":
+        """Build from the adapter config (`max_retries`, `retry_backoff_seconds`, ...)."""
+        return cls(
+            max_attempts=max(1, int(cfg.get("max_retries", 3))),
+            base_delay=float(cfg.get("retry_backoff_seconds", 0.5)),
+            max_delay=float(cfg.get("retry_max_backoff_seconds", 30)),
+        )
+
+
+@dataclass
+class CallOutcome:
+    """Result of a resilient call."""
+
+    status: str  # "ok" | "failed" | "circuit_open"
+    code: Optional[int]
+    body: Optional[str]
+    attempts: int
+    delays: list[float] = field(default_factory=list)
+
+
+# fn() -> (status_code | None, body | None, headers)
+CallFn = Callable[[], Tuple[Optional[int], Optional[str], Mapping[str, str]]]
+AsyncCallFn = Callable[[], Awaitable[Tuple[Optional[int], Optional[str], Mapping[str, str]]]]
+
+
+class ResilientCaller:
+    """Runs calls through a rate limiter, a per-endpoint breaker and a retry policy."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        limiter: TokenBucket | None = None,
+        breaker_factory: Callable[[], CircuitBreaker] | None = None,
+        clock: Clock = SYSTEM_CLOCK,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.limiter = limiter
+        self._breaker_factory = breaker_factory or (lambda: CircuitBreaker(clock=clock))
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._clock = clock
+        self._rng = rng
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the breaker for `endpoint`, creating it on first use."""
+        b = self._breakers.get(endpoint)
+        if b is None:
+            with self._breakers_lock:
+                b = self._breakers.setdefault(endpoint, self._breaker_factory())
+        return b
+
+    def _after(self, breaker: CircuitBreaker, attempt: int, code: Optional[int], headers: Mapping[str, str]) -> Tuple[str, float]:
+        """Record the outcome; returns (decision, delay before the next attempt)."""
+        decision = classify(code)
+        if decision == "retry":
+            breaker.record_failure()
+        else:
+            breaker.record_success()  # 2xx and permanent 4xx both mean the endpoint is up
+        if decision != "retry" or attempt >= self.policy.max_attempts:
+            return decision, 0.0
+        delay = backoff_delay(attempt, self.policy.base_delay, self.policy.max_delay, self._rng)
+        if self.policy.respect_retry_after:
+            ra = parse_retry_after(_header(headers, "Retry-After"), self._clock.wall())
+            if ra is not None:
+                delay = max(delay, min(ra, self.policy.max_retry_after))
+        return decision, delay
+
+    def call(self, endpoint: str, fn: CallFn) -> CallOutcome:
+        """Blocking execution; sleeps only between retryable attempts."""
+        breaker = self.breaker(endpoint)
+        outcome = CallOutcome("failed", None, None, 0)
+        for attempt in range(1, self.policy.max_attempts + 1):
+            if not breaker.allow():
+                outcome.status = "circuit_open"
+                return outcome
+            if self.limiter is not None:
+                self.limiter.acquire()
+            code, body, headers = fn()
+            outcome.attempts, outcome.code, outcome.body = attempt, code, body
+            decision, delay = self._after(breaker, attempt, code, headers)
+            if decision != "retry" or attempt >= self.policy.max_attempts:
+                outcome.status = "ok" if decision == "ok" else "failed"
+                return outcome
+            outcome.delays.append(delay)
+            self._clock.sleep(delay)
+        return outcome
+
+    async def acall(self, endpoint: str, fn: AsyncCallFn) -> CallOutcome:
+        """asyncio execution; waits with `await` instead of blocking the loop."""
+        breaker = self.breaker(endpoint)
+        outcome = CallOutcome("failed", None, None, 0)
+        for attempt in range(1, self.policy.max_attempts + 1):
+            if not breaker.allow():
+                outcome.status = "circuit_open"
+                return outcome
+            if self.limiter is not None:
+                await self.limiter.acquire_async()
+            code, body, headers = await fn()
+            outcome.attempts, outcome.code, outcome.body = attempt, code, body
+            decision, delay = self._after(breaker, attempt, code, headers)
+            if decision != "retry" or attempt >= self.policy.max_attempts:
+                outcome.status = "ok" if decision == "ok" else "failed"
+                return outcome
+            outcome.delays.append(delay)
+            await self._clock.asleep(delay)
+        return outcome
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    lname = name.lower()
+    for k, v in headers.items():
+        if k.lower() == lname:
+            return v
+    return None
+
+
+__all__ = [
+    "CallOutcome",
+    "CircuitBreaker",
+    "Clock",
+    "FakeClock",
+    "ResilientCaller",
+    "RetryPolicy",
+    "TokenBucket",
+    "backoff_delay",
+    "classify",
+    "parse_retry_after",
+]
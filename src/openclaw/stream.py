@@ -0,0 +1,546 @@
+"""Streaming consumer for OpenClaw events (`openclaw.events.stream_url`).
+
+Agents otherwise poll every `polling_interval_seconds` and miss what happens
+between polls. `EventStream` keeps one persistent connection instead:
+
+- `ws://` / `wss://` URLs speak a minimal RFC 6455 client (text messages,
+  ping/pong, close) on asyncio streams; `http://` / `https://` URLs are read
+  as Server-Sent Events (chunked or not). No third-party client is required.
+- Each message is decoded as soon as it is complete and turned into a
+  `StreamEvent` (JSON `{"id", "type", "data", "ts"}` where present).
+- Liveness: a WebSocket ping is sent every `heartbeat_interval`; if nothing at
+  all (event, heartbeat, ping or SSE comment) arrives for `heartbeat_timeout`
+  the connection is dropped.
+- Reconnects use full-jitter exponential backoff and resume from the last seen
+  event id (`Last-Event-ID` header); replayed duplicates (events repeating
+  an id they carry themselves) are discarded.
+- Events fan out to `Subscription`s, each a bounded queue with an explicit
+  overflow policy: "block" (stop reading the socket until the consumer
+  catches up, so TCP pushes back on the server), "drop_oldest" or
+  "drop_newest". Queue depth, drops, reconnects and event lag
+  (receive time minus the event's own timestamp) are exported as metrics.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import ssl
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Deque, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from ..logging.metrics import counter, gauge, histogram
+from .resilience import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_HEARTBEAT_TYPES = frozenset({"heartbeat", "ping", "keepalive"})
+
+_EVENTS = counter("openclaw_stream_events_total", "Stream events received", ("type",))
+_DROPPED = counter("openclaw_stream_dropped_total", "Events dropped by a full subscription queue", ("subscription",))
+_RECONNECTS = counter("openclaw_stream_reconnects_total", "Stream reconnect attempts")
+_LAG = histogram("openclaw_stream_lag_seconds", "Receive time minus event timestamp")
+_DEPTH = gauge("openclaw_stream_queue_depth", "Events waiting in a subscription queue", ("subscription",))
+
+
+class StreamError(RuntimeError):
+    """Raised when the event stream handshake or framing fails."""
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    """One decoded event."""
+
+    id: Optional[str]
+    type: str
+    data: Any
+    received_at: float
+    lag_seconds: Optional[float] = None
+
+
+def _event_time(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value) / (1000.0 if value > 1e12 else 1.0)  # epoch ms or s
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def decode_message(raw: str, event_id: Optional[str], event_type: Optional[str], now: float) -> StreamEvent:
+    """Build a `StreamEvent` from a message body (JSON envelope if possible)."""
+    try:
+        doc: Any = json.loads(raw)
+    except ValueError:
+        doc = raw
+    data = doc
+    ts = None
+    if isinstance(doc, dict):
+        event_id = event_id or (str(doc["id"]) if doc.get("id") is not None else None)
+        event_type = event_type or doc.get("type") or doc.get("event")
+        data = doc.get("data", doc)
+        ts = _event_time(doc.get("ts", doc.get("timestamp")))
+    return StreamEvent(event_id, str(event_type or "message"), data, now, (now - ts) if ts is not None else None)
+
+
+class Subscription:
+    """Bounded per-consumer queue of events (async-iterable)."""
+
+    def __init__(self, name: str, types: Optional[FrozenSet[str]], maxsize: int, policy: str) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}; expected one of {', '.join(OVERFLOW_POLICIES)}")
+        self.name = name
+        self.types = types
+        self.policy = policy
+        self.queue: asyncio.Queue[StreamEvent] = asyncio.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+        self.delivered = 0
+        self.blocked_seconds = 0.0
+        self._dropped_metric = _DROPPED.labels(name)
+        _DEPTH.labels(name).set_function(self.queue.qsize)
+
+    def wants(self, event: StreamEvent) -> bool:
+        return self.types is None or event.type in self.types
+
+    async def put(self, event: StreamEvent) -> None:
+        q = self.queue
+        if not q.full():
+            q.put_nowait(event)
+        elif self.policy == "block":
+            start = time.monotonic()
+            await q.put(event)
+            self.blocked_seconds += time.monotonic() - start
+        elif self.policy == "drop_oldest":
+            q.get_nowait()
+            q.task_done()
+            q.put_nowait(event)
+            self._drop()
+        else:
+            self._drop()
+            return
+        self.delivered += 1
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        self._dropped_metric.inc()
+
+    async def get(self) -> StreamEvent:
+        event = await self.queue.get()
+        self.queue.task_done()
+        return event
+
+    def __aiter__(self) -> AsyncIterator[StreamEvent]:
+        return self
+
+    async def __anext__(self) -> StreamEvent:
+        return await self.get()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+
+# -- transports ------------------------------------------------------------------
+class _Connection:
+    """Common parts of the WebSocket and SSE readers."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def _read_http_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise StreamError(f"Malformed status line: {lines[0]!r}")
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return int(parts[1]), headers
+
+
+def _request_head(method: str, target: str, host: str, headers: Mapping[str, str]) -> bytes:
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+class _WebSocket(_Connection):
+    async def handshake(self, host: str, target: str, headers: Mapping[str, str]) -> None:
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        self.writer.write(
+            _request_head(
+                "GET",
+                target,
+                host,
+                {
+                    "Upgrade": "websocket",
+                    "Connection": "Upgrade",
+                    "Sec-WebSocket-Key": key,
+                    "Sec-WebSocket-Version": "13",
+                    **headers,
+                },
+            )
+        )
+        await self.writer.drain()
+        status, resp = await _read_http_head(self.reader)
+        if status != 101:
+            raise StreamError(f"WebSocket upgrade refused with HTTP {status}")
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+        if resp.get("sec-websocket-accept") != expected:
+            raise StreamError("WebSocket upgrade returned a bad Sec-WebSocket-Accept")
+
+    async def send(self, opcode: int, payload: bytes = b"") -> None:
+        # client frames are always masked (RFC 6455 5.3)
+        mask = os.urandom(4)
+        n = len(payload)
+        if n < 126:
+            head = struct.pack("!BB", 0x80 | opcode, 0x80 | n)
+        elif n < 1 << 16:
+            head = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, n)
+        else:
+            head = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, n)
+        masked = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+        self.writer.write(head + mask + masked)
+        await self.writer.drain()
+
+    async def _frame(self) -> Tuple[bool, int, bytes]:
+        b0, b1 = await self.reader.readexactly(2)
+        n = b1 & 0x7F
+        if n == 126:
+            (n,) = struct.unpack("!H", await self.reader.readexactly(2))
+        elif n == 127:
+            (n,) = struct.unpack("!Q", await self.reader.readexactly(8))
+        mask = await self.reader.readexactly(4) if b1 & 0x80 else None
+        payload = await self.reader.readexactly(n) if n else b""
+        if mask:
+            payload = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+        return bool(b0 & 0x80), b0 & 0x0F, payload
+
+    async def messages(self) -> AsyncIterator[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """Yield (id, type, body) per text message; body None for liveness-only frames."""
+        parts: List[bytes] = []
+        while True:
+            fin, opcode, payload = await self._frame()
+            if opcode == 0x9:  # ping
+                await self.send(0xA, payload)
+                yield None, None, None
+            elif opcode == 0xA:  # pong
+                yield None, None, None
+            elif opcode == 0x8:  # close
+                try:
+                    await self.send(0x8, payload[:2])
+                except (OSError, ConnectionError):
+                    pass
+                return
+            elif opcode in (0x0, 0x1, 0x2):
+                parts.append(payload)
+                if fin:
+                    body = b"".join(parts).decode("utf-8", "replace")
+                    parts = []
+                    yield None, None, body
+
+    async def ping(self) -> None:
+        await self.send(0x9, b"hb")
+
+
+class _SSE(_Connection):
+    async def open(self, host: str, target: str, headers: Mapping[str, str]) -> None:
+        self.writer.write(
+            _request_head("GET", target, host, {"Accept": "text/event-stream", "Cache-Control": "no-cache", **headers})
+        )
+        await self.writer.drain()
+        status, resp = await _read_http_head(self.reader)
+        if status != 200:
+            raise StreamError(f"Event stream request failed with HTTP {status}")
+        self.chunked = "chunked" in resp.get("transfer-encoding", "").lower()
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        if not self.chunked:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    return
+                yield data
+        while True:
+            size_line = await self.reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                return
+            data = await self.reader.readexactly(size)
+            await self.reader.readexactly(2)
+            yield data
+
+    async def messages(self) -> AsyncIterator[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        Yield (id, type, body) per event; body None for liveness-only input.
+
+        The id is only the one the event itself set with an `id:` field. SSE
+        carries the last id forward to later events for resuming, but those
+        events are new, so dedupe must not see the inherited id.
+        """
+        buf = b""
+        event_id: Optional[str] = None
+        event_type: Optional[str] = None
+        data: List[str] = []
+        async for chunk in self._chunks():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for raw in lines:
+                line = raw.rstrip(b"\r").decode("utf-8", "replace")
+                if not line:
+                    if data:
+                        yield event_id, event_type, "\n".join(data)
+                    event_id, event_type, data = None, None, []
+                    continue
+                if line.startswith(":"):
+                    yield None, None, None  # comment = heartbeat
+                    continue
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "data":
+                    data.append(value)
+                elif field == "id":
+                    event_id = value or None
+                elif field == "event":
+                    event_type = value or None
+            if not lines:
+                yield None, None, None  # partial data still proves liveness
+
+    async def ping(self) -> None:
+        return None  # SSE is one-way; the server sends comment heartbeats
+
+
+# -- client ----------------------------------------------------------------------
+class EventStream:
+    """Persistent, self-healing event stream fanned out to bounded subscriptions."""
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        heartbeat_interval: float = 60.0,
+        heartbeat_timeout: Optional[float] = None,
+        reconnect_base: float = 1.0,
+        reconnect_max: float = 60.0,
+        connect_timeout: float = 10.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        clock: Callable[[], float] = time.time,
+        dedupe_window: int = 1024,
+        queue_size: int = 1000,
+        overflow_policy: str = "block",
+    ) -> None:
+        self.url = url
+        parts = urlsplit(url)
+        if parts.scheme not in ("ws", "wss", "http", "https"):
+            raise StreamError(f"Unsupported stream URL scheme {parts.scheme!r}")
+        self._parts = parts
+        self.headers = dict(headers or {})
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout or heartbeat_interval * 2
+        self.reconnect_base = reconnect_base
+        self.reconnect_max = reconnect_max
+        self.connect_timeout = connect_timeout
+        self.ssl_context = ssl_context
+        self._clock = clock
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy!r}; expected one of {', '.join(OVERFLOW_POLICIES)}")
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self._subs: List[Subscription] = []
+        self._seen: Deque[str] = deque(maxlen=dedupe_window)
+        self._seen_set: Set[str] = set()
+        self._stop = asyncio.Event()
+        self._conn: Optional[_Connection] = None
+        self.last_event_id: Optional[str] = None
+        self.connected = False
+        self.stats = {"events": 0, "duplicates": 0, "heartbeats": 0, "reconnects": 0, "connections": 0}
+
+    def subscribe(
+        self,
+        name: str,
+        types: Optional[Iterable[str]] = None,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+    ) -> Subscription:
+        """Register a consumer queue for events of `types` (all when None).
+
+        `maxsize` / `policy` default to the stream's `queue_size` / `overflow_policy`.
+        """
+        sub = Subscription(
+            name,
+            frozenset(types) if types is not None else None,
+            self.queue_size if maxsize is None else maxsize,
+            policy or self.overflow_policy,
+        )
+        self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self._subs:
+            self._subs.remove(sub)
+
+    async def _connect(self) -> _Connection:
+        p = self._parts
+        secure = p.scheme in ("wss", "https")
+        port = p.port or (443 if secure else 80)
+        ctx = (self.ssl_context or ssl.create_default_context()) if secure else None
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(p.hostname, port, ssl=ctx, limit=1 << 20), self.connect_timeout
+        )
+        host = p.hostname if p.port is None else f"{p.hostname}:{p.port}"
+        target = (p.path or "/") + (f"?{p.query}" if p.query else "")
+        headers = dict(self.headers)
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        conn: _Connection
+        try:
+            if p.scheme in ("ws", "wss"):
+                conn = _WebSocket(reader, writer)
+                await asyncio.wait_for(conn.handshake(host, target, headers), self.connect_timeout)
+            else:
+                conn = _SSE(reader, writer)
+                await asyncio.wait_for(conn.open(host, target, headers), self.connect_timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return conn
+
+    def _is_duplicate(self, event_id: Optional[str]) -> bool:
+        if event_id is None:
+            return False
+        if event_id in self._seen_set:
+            return True
+        if len(self._seen) == self._seen.maxlen:
+            self._seen_set.discard(self._seen[0])
+        self._seen.append(event_id)
+        self._seen_set.add(event_id)
+        return False
+
+    async def _dispatch(self, event: StreamEvent) -> None:
+        for sub in list(self._subs):
+            if sub.wants(event):
+                await sub.put(event)
+
+    async def _pinger(self, conn: _Connection) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await conn.ping()
+
+    async def _consume(self, conn: _Connection) -> None:
+        messages = conn.messages().__aiter__()
+        while True:
+            # the watchdog only covers waiting on the socket, not blocked consumers
+            try:
+                event_id, event_type, body = await asyncio.wait_for(messages.__anext__(), self.heartbeat_timeout)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                raise StreamError(f"No data or heartbeat for {self.heartbeat_timeout}s") from None
+            if body is None:
+                self.stats["heartbeats"] += 1
+                continue
+            event = decode_message(body, event_id, event_type, self._clock())
+            if event.type in _HEARTBEAT_TYPES:
+                self.stats["heartbeats"] += 1
+                continue
+            if self._is_duplicate(event.id):
+                self.stats["duplicates"] += 1
+                continue
+            if event.id is not None:
+                self.last_event_id = event.id
+            self.stats["events"] += 1
+            _EVENTS.labels(event.type).inc()
+            if event.lag_seconds is not None:
+                _LAG.observe(max(0.0, event.lag_seconds))
+            await self._dispatch(event)
+
+    async def run(self) -> None:
+        """Consume until `stop()`; reconnects with backoff and resumes from `last_event_id`."""
+        self._stop.clear()
+        failures = 0
+        while not self._stop.is_set():
+            pinger: Optional[asyncio.Task] = None
+            try:
+                conn = await self._connect()
+                self._conn = conn
+                self.connected = True
+                self.stats["connections"] += 1
+                failures = 0
+                logger.info("Connected to event stream %s (resume from %s)", self.url, self.last_event_id)
+                pinger = asyncio.create_task(self._pinger(conn))
+                consume = asyncio.create_task(self._consume(conn))
+                stop = asyncio.create_task(self._stop.wait())
+                done, _ = await asyncio.wait({consume, stop}, return_when=asyncio.FIRST_COMPLETED)
+                if consume in done:
+                    stop.cancel()
+                    consume.result()  # re-raise stream errors
+                    logger.info("Event stream %s closed by server", self.url)
+                else:
+                    consume.cancel()
+                    await asyncio.gather(consume, return_exceptions=True)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, StreamError, ValueError) as exc:
+                failures += 1
+                logger.warning("Event stream %s failed: %s", self.url, exc)
+            finally:
+                self.connected = False
+                if pinger is not None:
+                    pinger.cancel()
+                if self._conn is not None:
+                    await self._conn.close()
+                    self._conn = None
+            if self._stop.is_set():
+                break
+            self.stats["reconnects"] += 1
+            _RECONNECTS.inc()
+            # a clean close still waits `reconnect_base` so a flapping server is not hammered
+            delay = backoff_delay(failures, self.reconnect_base, self.reconnect_max) if failures else self.reconnect_base
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """Ask `run()` to close the connection and return."""
+        self._stop.set()
+
+    def lag(self) -> Dict[str, int]:
+        """Queue depth per subscription (how far each consumer is behind the stream)."""
+        return {sub.name: sub.depth for sub in self._subs}
+
+
+__all__ = [
+    "EventStream",
+    "StreamError",
+    "StreamEvent",
+    "Subscription",
+    "decode_message",
+    "OVERFLOW_POLICIES",
+]
@@ -0,0 +1,472 @@
+"""Pooled, keep-alive HTTP transport for the OpenClaw adapter.
+
+`urllib.request.urlopen` opens a fresh TCP/TLS connection for every call, so
+each retry and each health probe pays the full handshake. This module keeps
+idle HTTP/1.1 connections per (scheme, host, port) and reuses them:
+
+- `pool_size` bounds the idle connections kept per host,
+- connections idle for longer than `idle_timeout` are closed instead of reused,
+- connect and read timeouts are separate (`Timeouts`),
+- idle connections the server has already closed are detected (readable
+  socket / EOF) and discarded before reuse,
+- a request that still fails on a *reused* connection before any response
+  arrives is retried once on a fresh connection, but only if it is safe to
+  repeat: the method is idempotent or the request was never sent. A POST
+  whose body went out may have been processed, so it fails with
+  `TransportError` instead of being delivered twice.
+
+`HTTPTransport` is thread-safe and blocking; `AsyncHTTPTransport` offers the
+same interface for asyncio so agents can keep many requests in flight.
+
+Both return `(status_code, body_text)` from `request()` like the adapter's
+`_request`; `fetch()` additionally returns the response headers (e.g. for
+`Retry-After`). Redirects are not followed.
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import asyncio
+import http.client
+import logging
+import select
+import ssl
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "openclaw-adapter/1.0"
+
+HostKey = Tuple[str, str, int]
+
+# Errors meaning a kept-alive connection was closed by the peer while idle.
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+# Methods a server must treat as safe to repeat (RFC 9110 section 9.2.2).
+_IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"})
+
+
+class Response(NamedTuple):
+    """Status, decoded body and headers of one response."""
+
+    status: int
+    text: str
+    headers: Dict[str, str]
+
+
+class TransportError(RuntimeError):
+    """Raised when a request cannot be completed at the connection level."""
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    """Separate connect and read timeouts in seconds."""
+
+    connect: float = 10.0
+    read: float = 30.0
+
+    @classmethod
+    def from_config(cls, cfg: Mapping[str, Any]) -> "Timeouts":
+        """Build from an `openclaw.api` style mapping or the adapter's flat config.
+
+        `timeout_seconds` is the read timeout; `connect_timeout_seconds` defaults
+        to the smaller of 10s and the read timeout.
+        """
+        read = float(cfg.get("timeout_seconds", 30))
+        connect = float(cfg.get("connect_timeout_seconds", min(10.0, read)))
+        return cls(connect=connect, read=read)
+
+
+def _split(url: str) -> Tuple[HostKey, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise TransportError(f"Unsupported URL: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return (scheme, parts.hostname, port), target
+
+
+def _prepare_headers(key: HostKey, headers: Optional[Mapping[str, str]], data: Optional[bytes]) -> Dict[str, str]:
+    scheme, host, port = key
+    default_port = 443 if scheme == "https" else 80
+    out = {
+        "Host": host if port == default_port else f"{host}:{port}",
+        "User-Agent": USER_AGENT,
+        "Connection": "keep-alive",
+        "Accept-Encoding": "identity",
+    }
+    if headers:
+        out.update(headers)
+    if data is not None:
+        out["Content-Length"] = str(len(data))
+    return out
+
+
+def _dropped(conn: http.client.HTTPConnection) -> bool:
+    """True if an idle connection was closed by the peer (readable means EOF or stray data)."""
+    sock = conn.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class _HostPool:
+    """Idle connections for one host, most recently used first."""
+
+    def __init__(self) -> None:
+        self.idle: Deque[Tuple[Any, float]] = deque()
+        self.lock = threading.Lock()
+
+
+class HTTPTransport:
+    """Thread-safe blocking HTTP/1.1 client with per-host keep-alive pooling."""
+
+    def __init__(
+        self,
+        timeouts: Timeouts | None = None,
+        pool_size: int = 10,
+        idle_timeout: float = 30.0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self.timeouts = timeouts or Timeouts()
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._pools: Dict[HostKey, _HostPool] = {}
+        self._pools_lock = threading.Lock()
+        self.stats = {"connections_opened": 0, "connections_reused": 0}
+
+    def _pool(self, key: HostKey) -> _HostPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.setdefault(key, _HostPool())
+        return pool
+
+    def _connect(self, key: HostKey) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                host, port, timeout=self.timeouts.connect, context=self.ssl_context
+            )
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeouts.connect)
+        conn.connect()
+        self.stats["connections_opened"] += 1
+        return conn
+
+    def _checkout(self, key: HostKey) -> Tuple[Optional[http.client.HTTPConnection], bool]:
+        pool = self._pool(key)
+        now = time.monotonic()
+        with pool.lock:
+            while pool.idle:
+                conn, last_used = pool.idle.popleft()
+                if now - last_used <= self.idle_timeout and not _dropped(conn):
+                    self.stats["connections_reused"] += 1
+                    return conn, True
+                conn.close()
+        return None, False
+
+    def _checkin(self, key: HostKey, conn: http.client.HTTPConnection) -> None:
+        pool = self._pool(key)
+        with pool.lock:
+            if len(pool.idle) < self.pool_size:
+                pool.idle.appendleft((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, str]:
+        """Perform a request and return (status_code, body_text).
+
+        `timeout` overrides the read timeout for this call. Raises
+        TransportError on connection-level failures.
+        """
+        resp = self.fetch(url, method, headers, data, timeout)
+        return resp.status, resp.text
+
+    def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Like `request` but also returns the response headers."""
+        key, target = _split(url)
+        hdrs = _prepare_headers(key, headers, data)
+        read_timeout = self.timeouts.read if timeout is None else float(timeout)
+
+        replayable = method.upper() in _IDEMPOTENT
+        for _ in range(2):
+            conn, reused = self._checkout(key)
+            sent = False
+            try:
+                if conn is None:
+                    conn = self._connect(key)
+                conn.sock.settimeout(read_timeout)
+                conn.request(method, target, body=data, headers=hdrs)
+                sent = True
+                resp = conn.getresponse()
+                body = resp.read()
+            except _STALE_ERRORS as exc:
+                if conn is not None:
+                    conn.close()
+                # once the request is out the server may have acted on it
+                if reused and (replayable or not sent):
+                    logger.debug("Stale pooled connection to %s:%s; reconnecting", key[1], key[2])
+                    continue
+                raise TransportError(f"{method} {url} failed: {exc}") from exc
+            except (OSError, http.client.HTTPException) as exc:
+                if conn is not None:
+                    conn.close()
+                raise TransportError(f"{method} {url} failed: {exc}") from exc
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return Response(resp.status, body.decode("utf-8", errors="ignore"), dict(resp.getheaders()))
+        raise TransportError(f"{method} {url} failed: connection closed")  # pragma: no cover
+
+    def evict_idle(self) -> int:
+        """Close idle connections older than `idle_timeout`; returns how many were closed."""
+        closed = 0
+        now = time.monotonic()
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            with pool.lock:
+                keep: Deque[Tuple[Any, float]] = deque()
+                for conn, last_used in pool.idle:
+                    if now - last_used > self.idle_timeout:
+                        conn.close()
+                        closed += 1
+                    else:
+                        keep.append((conn, last_used))
+                pool.idle = keep
+        return closed
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            with pool.lock:
+                while pool.idle:
+                    pool.idle.popleft()[0].close()
+
+    def __enter__(self) -> "HTTPTransport":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# -- asyncio variant -------------------------------------------------------
+
+_AsyncConn = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+async def _read_response(reader: asyncio.StreamReader, method: str) -> Tuple[int, bytes, Dict[str, str], bool]:
+    """Read one HTTP/1.1 response; returns (status, body, headers, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before response")
+    parts = status_line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise http.client.BadStatusLine(status_line.decode("latin-1", errors="replace"))
+    version, status = parts[0], int(parts[1])
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    conn_hdr = headers.get("connection", "").lower()
+    keep_alive = "close" not in conn_hdr if version == "HTTP/1.1" else "keep-alive" in conn_hdr
+
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return status, b"", headers, keep_alive
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return status, b"".join(chunks), headers, keep_alive
+    if "content-length" in headers:
+        return status, await reader.readexactly(int(headers["content-length"])), headers, keep_alive
+    return status, await reader.read(), headers, False
+
+
+class AsyncHTTPTransport:
+    """asyncio HTTP/1.1 client with per-host keep-alive pooling.
+
+    Same knobs and return values as `HTTPTransport`. Not thread-safe: use one
+    instance per event loop.
+    """
+
+    def __init__(
+        self,
+        timeouts: Timeouts | None = None,
+        pool_size: int = 10,
+        idle_timeout: float = 30.0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self.timeouts = timeouts or Timeouts()
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle: Dict[HostKey, Deque[Tuple[_AsyncConn, float]]] = {}
+        self.stats = {"connections_opened": 0, "connections_reused": 0}
+
+    async def _connect(self, key: HostKey) -> _AsyncConn:
+        scheme, host, port = key
+        ssl_ctx = self.ssl_context if scheme == "https" else None
+        conn = await asyncio.wait_for(asyncio.open_connection(host, port, ssl=ssl_ctx), self.timeouts.connect)
+        self.stats["connections_opened"] += 1
+        return conn
+
+    def _checkout(self, key: HostKey) -> Optional[_AsyncConn]:
+        idle = self._idle.get(key)
+        now = time.monotonic()
+        while idle:
+            conn, last_used = idle.popleft()
+            if now - last_used <= self.idle_timeout and not conn[0].at_eof():
+                self.stats["connections_reused"] += 1
+                return conn
+            conn[1].close()
+        return None
+
+    def _checkin(self, key: HostKey, conn: _AsyncConn) -> None:
+        idle = self._idle.setdefault(key, deque())
+        if len(idle) < self.pool_size:
+            idle.appendleft((conn, time.monotonic()))
+        else:
+            conn[1].close()
+
+    async def request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, str]:
+        """Async counterpart of `HTTPTransport.request`."""
+        resp = await self.fetch(url, method, headers, data, timeout)
+        return resp.status, resp.text
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Async counterpart of `HTTPTransport.fetch`."""
+        key, target = _split(url)
+        hdrs = _prepare_headers(key, headers, data)
+        if data is None and method in ("POST", "PUT", "PATCH"):
+            hdrs["Content-Length"] = "0"
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in hdrs.items()) + "\r\n"
+        payload = head.encode("latin-1") + (data or b"")
+        read_timeout = self.timeouts.read if timeout is None else float(timeout)
+
+        replayable = method.upper() in _IDEMPOTENT
+        for _ in range(2):
+            conn = self._checkout(key)
+            reused = conn is not None
+            sent = False
+            try:
+                if conn is None:
+                    conn = await self._connect(key)
+                reader, writer = conn
+                writer.write(payload)
+                await writer.drain()
+                sent = True
+                status, body, resp_headers, keep_alive = await asyncio.wait_for(_read_response(reader, method), read_timeout)
+            except (_STALE_ERRORS + (asyncio.IncompleteReadError,)) as exc:
+                if conn is not None:
+                    conn[1].close()
+                # once the request is out the server may have acted on it
+                if reused and (replayable or not sent):
+                    continue
+                raise TransportError(f"{method} {url} failed: {exc}") from exc
+            except (OSError, asyncio.TimeoutError, http.client.HTTPException, ValueError) as exc:
+                if conn is not None:
+                    conn[1].close()
+                raise TransportError(f"{method} {url} failed: {exc!r}") from exc
+
+            if keep_alive:
+                self._checkin(key, conn)
+            else:
+                conn[1].close()
+            return Response(status, body.decode("utf-8", errors="ignore"), resp_headers)
+        raise TransportError(f"{method} {url} failed: connection closed")  # pragma: no cover
+
+    def evict_idle(self) -> int:
+        """Close idle connections older than `idle_timeout`; returns how many were closed."""
+        closed = 0
+        now = time.monotonic()
+        for key, idle in self._idle.items():
+            keep: Deque[Tuple[_AsyncConn, float]] = deque()
+            for conn, last_used in idle:
+                if now - last_used > self.idle_timeout:
+                    conn[1].close()
+                    closed += 1
+                else:
+                    keep.append((conn, last_used))
+            self._idle[key] = keep
+        return closed
+
+    async def aclose(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for (_, writer), _ in conns:
+                writer.close()
+
+    async def __aenter__(self) -> "AsyncHTTPTransport":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+__all__ = [
+    "AsyncHTTPTransport",
+    "HTTPTransport",
+    "Response",
+    "Timeouts",
+    "TransportError",
+]
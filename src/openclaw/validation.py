@@ -0,0 +1,509 @@
+"""Compiled, cached JSON-schema validation for OpenClaw payloads.
+
+`openclaw.validation.enforce_schema` / `schema_file` were configured but never
+applied. Interpreting a schema document for every `send_payload` would cost
+far more than the request bookkeeping itself, so this module compiles the
+schema once into two sets of closures:
+
+- a *check* function returning True/False without allocating, used for the
+  common all-valid case;
+- an *explain* function that collects `ValidationIssue`s with JSON paths,
+  only run for payloads that failed the check.
+
+Compiled validators are cached by the schema file's content hash (and the
+definition they were compiled for). `KindValidator` scopes validation per
+payload kind: a payload is checked against the definition for its kind only,
+and kinds without a definition are not validated.
+
+Supported keywords (the subset our payload schemas use): `type`, `enum`,
+`const`, `properties`, `required`, `additionalProperties` (bool or schema),
+`items`, `minItems`, `maxItems`, `minLength`, `maxLength`, `pattern`,
+`minimum`, `maximum`, `format` (`date`, `date-time`), `anyOf`, `oneOf`,
+`allOf` and local `$ref` (`#/definitions/...` or `#/$defs/...`).
+
+Designed for Python 3.11.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+Check = Callable[[Any], bool]
+Explain = Callable[[Any, str, List["ValidationIssue"]], None]
+
+
+class SchemaError(RuntimeError):
+    """Raised when a schema cannot be loaded or compiled."""
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """One validation failure at a JSON-pointer-like `path` (e.g. `$.keywords[2]`)."""
+
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+def _is_int(v: Any) -> bool:
+    return type(v) is int
+
+
+def _is_number(v: Any) -> bool:
+    t = type(v)
+    return t is int or t is float
+
+
+_TYPE_CHECKS: Dict[str, Check] = {
+    "object": lambda v: type(v) is dict,
+    "array": lambda v: type(v) is list,
+    "string": lambda v: type(v) is str,
+    "integer": _is_int,
+    "number": _is_number,
+    "boolean": lambda v: type(v) is bool,
+    "null": lambda v: v is None,
+}
+
+
+def _check_date(v: Any) -> bool:
+    try:
+        date.fromisoformat(v)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _check_datetime(v: Any) -> bool:
+    try:
+        datetime.fromisoformat(v[:-1] + "+00:00" if v.endswith("Z") else v)
+        return "T" in v or " " in v
+    except (TypeError, ValueError, AttributeError):
+        return False
+
+
+_FORMAT_CHECKS: Dict[str, Check] = {"date": _check_date, "date-time": _check_datetime}
+
+
+def _all(checks: Sequence[Check]) -> Check:
+    if not checks:
+        return lambda v: True
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check(v: Any) -> bool:
+        for c in checks:
+            if not c(v):
+                return False
+        return True
+
+    return check
+
+
+class _Compiler:
+    def __init__(self, root: Mapping[str, Any]) -> None:
+        self.root = root
+        # $ref -> compiled pair; placeholders allow recursive references
+        self._refs: Dict[str, Tuple[List[Check], List[Explain]]] = {}
+
+    def _resolve_ref(self, ref: str) -> Mapping[str, Any]:
+        if not ref.startswith("#/"):
+            raise SchemaError(f"Only local $ref is supported: {ref}")
+        node: Any = self.root
+        for part in ref[2:].split("/"):
+            if not isinstance(node, Mapping) or part not in node:
+                raise SchemaError(f"Unresolvable $ref: {ref}")
+            node = node[part]
+        return node
+
+    def _ref(self, ref: str) -> Tuple[Check, Explain]:
+        slot = self._refs.get(ref)
+        if slot is None:
+            slot = ([], [])
+            self._refs[ref] = slot
+            check, explain = self.compile(self._resolve_ref(ref))
+            slot[0].append(check)
+            slot[1].append(explain)
+        if slot[0]:
+            return slot[0][0], slot[1][0]
+        # recursive reference still being compiled: bind late
+        return (lambda v: slot[0][0](v)), (lambda v, p, e: slot[1][0](v, p, e))
+
+    def compile(self, schema: Any) -> Tuple[Check, Explain]:
+        if schema is True or schema == {}:
+            return (lambda v: True), (lambda v, p, e: None)
+        if schema is False:
+            return (lambda v: False), (lambda v, p, e: e.append(ValidationIssue(p, "no value allowed")))
+        if not isinstance(schema, Mapping):
+            raise SchemaError(f"Schema must be an object or boolean, got {type(schema).__name__}")
+        if "$ref" in schema:
+            return self._ref(schema["$ref"])
+
+        checks: List[Check] = []
+        explains: List[Explain] = []
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            try:
+                tchecks = [_TYPE_CHECKS[t] for t in types]
+            except KeyError as exc:
+                raise SchemaError(f"Unknown type: {exc}") from exc
+            tcheck = tchecks[0] if len(tchecks) == 1 else (lambda v, _c=tuple(tchecks): any(c(v) for c in _c))
+            expected = " or ".join(types)
+            checks.append(tcheck)
+
+            def explain_type(v: Any, p: str, e: List[ValidationIssue], _c: Check = tcheck) -> None:
+                if not _c(v):
+                    e.append(ValidationIssue(p, f"expected {expected}, got {type(v).__name__}"))
+
+            explains.append(explain_type)
+
+        if "enum" in schema:
+            allowed = list(schema["enum"])
+            try:
+                allowed_set = frozenset(allowed)
+            except TypeError:
+                allowed_set = frozenset()
+
+            def echeck(v: Any) -> bool:
+                try:
+                    if v in allowed_set:
+                        return True
+                except TypeError:
+                    pass
+                return v in allowed
+
+            checks.append(echeck)
+            explains.append(_explainer(echeck, f"must be one of {allowed!r}"))
+
+        if "const" in schema:
+            const = schema["const"]
+            ccheck: Check = lambda v: v == const
+            checks.append(ccheck)
+            explains.append(_explainer(ccheck, f"must equal {const!r}"))
+
+        self._string_keywords(schema, checks, explains)
+        self._number_keywords(schema, checks, explains)
+        self._object_keywords(schema, checks, explains)
+        self._array_keywords(schema, checks, explains)
+        self._combinators(schema, checks, explains)
+
+        check = _all(checks)
+        explain_list = tuple(explains)
+
+        def explain(v: Any, p: str, e: List[ValidationIssue]) -> None:
+            for ex in explain_list:
+                ex(v, p, e)
+
+        return check, explain
+
+    def _string_keywords(self, schema: Mapping[str, Any], checks: List[Check], explains: List[Explain]) -> None:
+        if "minLength" in schema:
+            n = int(schema["minLength"])
+            c: Check = lambda v: type(v) is not str or len(v) >= n
+            checks.append(c)
+            explains.append(_explainer(c, f"shorter than {n}"))
+        if "maxLength" in schema:
+            m = int(schema["maxLength"])
+            c2: Check = lambda v: type(v) is not str or len(v) <= m
+            checks.append(c2)
+            explains.append(_explainer(c2, f"longer than {m}"))
+        if "pattern" in schema:
+            rx = re.compile(schema["pattern"])
+            c3: Check = lambda v: type(v) is not str or rx.search(v) is not None
+            checks.append(c3)
+            explains.append(_explainer(c3, f"does not match {schema['pattern']!r}"))
+        if "format" in schema and schema["format"] in _FORMAT_CHECKS:
+            fc = _FORMAT_CHECKS[schema["format"]]
+            c4: Check = lambda v: type(v) is not str or fc(v)
+            checks.append(c4)
+            explains.append(_explainer(c4, f"not a valid {schema['format']}"))
+
+    def _number_keywords(self, schema: Mapping[str, Any], checks: List[Check], explains: List[Explain]) -> None:
+        if "minimum" in schema:
+            lo = schema["minimum"]
+            c: Check = lambda v: not _is_number(v) or v >= lo
+            checks.append(c)
+            explains.append(_explainer(c, f"less than minimum {lo}"))
+        if "maximum" in schema:
+            hi = schema["maximum"]
+            c2: Check = lambda v: not _is_number(v) or v <= hi
+            checks.append(c2)
+            explains.append(_explainer(c2, f"greater than maximum {hi}"))
+
+    def _object_keywords(self, schema: Mapping[str, Any], checks: List[Check], explains: List[Explain]) -> None:
+        props = schema.get("properties", {})
+        required = tuple(schema.get("required", ()))
+        additional = schema.get("additionalProperties", True)
+        if not props and not required and additional is True:
+            return
+        compiled = {name: self.compile(sub) for name, sub in props.items()}
+        prop_checks = tuple((name, c) for name, (c, _) in compiled.items())
+        known = frozenset(props)
+        add_check: Optional[Check] = None
+        add_explain: Optional[Explain] = None
+        if additional is False:
+            add_check = lambda v: False
+        elif isinstance(additional, Mapping):
+            add_check, add_explain = self.compile(additional)
+
+        def check(v: Any) -> bool:
+            if type(v) is not dict:
+                return True
+            for name in required:
+                if name not in v:
+                    return False
+            for name, c in prop_checks:
+                if name in v and not c(v[name]):
+                    return False
+            if add_check is not None:
+                for name, val in v.items():
+                    if name not in known and not add_check(val):
+                        return False
+            return True
+
+        def explain(v: Any, p: str, e: List[ValidationIssue]) -> None:
+            if type(v) is not dict:
+                return
+            for name in required:
+                if name not in v:
+                    e.append(ValidationIssue(f"{p}.{name}", "is required"))
+            for name, (c, ex) in compiled.items():
+                if name in v and not c(v[name]):
+                    ex(v[name], f"{p}.{name}", e)
+            if add_check is not None:
+                for name, val in v.items():
+                    if name not in known and not add_check(val):
+                        if add_explain is None:
+                            e.append(ValidationIssue(f"{p}.{name}", "additional property not allowed"))
+                        else:
+                            add_explain(val, f"{p}.{name}", e)
+
+        checks.append(check)
+        explains.append(explain)
+
+    def _array_keywords(self, schema: Mapping[str, Any], checks: List[Check], explains: List[Explain]) -> None:
+        if "minItems" in schema:
+            n = int(schema["minItems"])
+            c: Check = lambda v: type(v) is not list or len(v) >= n
+            checks.append(c)
+            explains.append(_explainer(c, f"fewer than {n} items"))
+        if "maxItems" in schema:
+            m = int(schema["maxItems"])
+            c2: Check = lambda v: type(v) is not list or len(v) <= m
+            checks.append(c2)
+            explains.append(_explainer(c2, f"more than {m} items"))
+        if "items" in schema and isinstance(schema["items"], (Mapping, bool)):
+            ic, iex = self.compile(schema["items"])
+
+            def check(v: Any) -> bool:
+                if type(v) is not list:
+                    return True
+                for item in v:
+                    if not ic(item):
+                        return False
+                return True
+
+            def explain(v: Any, p: str, e: List[ValidationIssue]) -> None:
+                if type(v) is not list:
+                    return
+                for i, item in enumerate(v):
+                    if not ic(item):
+                        iex(item, f"{p}[{i}]", e)
+
+            checks.append(check)
+            explains.append(explain)
+
+    def _combinators(self, schema: Mapping[str, Any], checks: List[Check], explains: List[Explain]) -> None:
+        for sub in schema.get("allOf", ()):
+            c, ex = self.compile(sub)
+            checks.append(c)
+            explains.append(ex)
+        if "anyOf" in schema:
+            subs = tuple(self.compile(s) for s in schema["anyOf"])
+            sub_checks = tuple(c for c, _ in subs)
+
+            def any_check(v: Any) -> bool:
+                for c in sub_checks:
+                    if c(v):
+                        return True
+                return False
+
+            checks.append(any_check)
+            explains.append(_branch_explainer(any_check, subs, "does not match any allowed schema"))
+        if "oneOf" in schema:
+            subs1 = tuple(self.compile(s) for s in schema["oneOf"])
+            one_check: Check = lambda v: sum(1 for c, _ in subs1 if c(v)) == 1
+            checks.append(one_check)
+            explains.append(_branch_explainer(one_check, subs1, "must match exactly one schema"))
+
+
+def _explainer(check: Check, message: str) -> Explain:
+    def explain(v: Any, p: str, e: List[ValidationIssue]) -> None:
+        if not check(v):
+            e.append(ValidationIssue(p, message))
+
+    return explain
+
+
+def _branch_explainer(check: Check, subs: Sequence[Tuple[Check, Explain]], message: str) -> Explain:
+    def explain(v: Any, p: str, e: List[ValidationIssue]) -> None:
+        if check(v):
+            return
+        # report the closest branch (fewest issues) to keep messages actionable
+        best: Optional[List[ValidationIssue]] = None
+        for _, ex in subs:
+            issues: List[ValidationIssue] = []
+            ex(v, p, issues)
+            if issues and (best is None or len(issues) < len(best)):
+                best = issues
+        e.append(ValidationIssue(p, message))
+        if best:
+            e.extend(best)
+
+    return explain
+
+
+class PayloadValidator:
+    """A compiled schema: `is_valid` for the fast path, `validate` for errors.
+
+    With `ref` (e.g. `#/definitions/research`) only that part of the document
+    is compiled; other local `$ref`s still resolve against the whole schema.
+    """
+
+    def __init__(self, schema: Mapping[str, Any], digest: str = "", ref: Optional[str] = None) -> None:
+        self.schema = schema
+        self.digest = digest
+        self.ref = ref
+        self._check, self._explain = _Compiler(schema).compile({"$ref": ref} if ref else schema)
+
+    def is_valid(self, payload: Any) -> bool:
+        return self._check(payload)
+
+    def validate(self, payload: Any) -> List[ValidationIssue]:
+        """Return all issues for `payload` (empty list when valid)."""
+        if self._check(payload):
+            return []
+        issues: List[ValidationIssue] = []
+        self._explain(payload, "$", issues)
+        return issues or [ValidationIssue("$", "invalid")]
+
+    def validate_many(self, payloads: Iterable[Any]) -> Dict[int, List[ValidationIssue]]:
+        """Validate a batch in one pass; returns {index: issues} for invalid payloads only."""
+        check = self._check
+        failed: Dict[int, List[ValidationIssue]] = {}
+        for i, payload in enumerate(payloads):
+            if not check(payload):
+                failed[i] = self.validate(payload)
+        return failed
+
+
+class KindValidator:
+    """
+    Per-kind validation: each payload is checked against the validator of its kind.
+
+    Parameters
+    - kinds: (field, validator) pairs; a payload's kind is the first whose
+      `field` it contains. Payloads of no listed kind are valid as far as this
+      validator is concerned.
+    """
+
+    def __init__(self, kinds: Sequence[Tuple[str, PayloadValidator]]) -> None:
+        self.kinds = tuple(kinds)
+
+    def _select(self, payload: Any) -> Optional[PayloadValidator]:
+        if type(payload) is dict:
+            for field, validator in self.kinds:
+                if field in payload:
+                    return validator
+        return None
+
+    def is_valid(self, payload: Any) -> bool:
+        validator = self._select(payload)
+        return validator is None or validator.is_valid(payload)
+
+    def validate(self, payload: Any) -> List[ValidationIssue]:
+        validator = self._select(payload)
+        return [] if validator is None else validator.validate(payload)
+
+    def validate_many(self, payloads: Iterable[Any]) -> Dict[int, List[ValidationIssue]]:
+        failed: Dict[int, List[ValidationIssue]] = {}
+        for i, payload in enumerate(payloads):
+            validator = self._select(payload)
+            if validator is not None and not validator.is_valid(payload):
+                failed[i] = validator.validate(payload)
+        return failed
+
+
+_cache: Dict[str, PayloadValidator] = {}
+_cache_lock = threading.Lock()
+
+
+def compile_schema(schema: Mapping[str, Any]) -> PayloadValidator:
+    """Compile (or fetch from cache) a validator for an in-memory schema."""
+    raw = json.dumps(schema, sort_keys=True).encode("utf-8")
+    return _cached(hashlib.sha256(raw).hexdigest(), lambda: schema)
+
+
+_stat_digests: Dict[str, Tuple[int, int, str]] = {}
+
+
+def load_validator(path: str | Path, ref: Optional[str] = None) -> PayloadValidator:
+    """Load and compile the schema file at `path` (or its `ref` part), cached by content hash.
+
+    The file is only re-read when its mtime or size changes.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+        known = _stat_digests.get(str(path))
+        if known is not None and known[0] == st.st_mtime_ns and known[1] == st.st_size and _key(known[2], ref) in _cache:
+            return _cache[_key(known[2], ref)]
+        raw = path.read_bytes()
+    except OSError as exc:
+        raise SchemaError(f"Unable to read schema file {path}: {exc}") from exc
+    digest = hashlib.sha256(raw).hexdigest()
+
+    def parse() -> Mapping[str, Any]:
+        try:
+            return json.loads(raw)
+        except ValueError as exc:
+            raise SchemaError(f"Invalid JSON in schema file {path}: {exc}") from exc
+
+    validator = _cached(digest, parse, ref)
+    _stat_digests[str(path)] = (st.st_mtime_ns, st.st_size, digest)
+    return validator
+
+
+def _key(digest: str, ref: Optional[str]) -> str:
+    return digest if ref is None else f"{digest}{ref}"
+
+
+def _cached(digest: str, load: Callable[[], Mapping[str, Any]], ref: Optional[str] = None) -> PayloadValidator:
+    key = _key(digest, ref)
+    validator = _cache.get(key)
+    if validator is None:
+        with _cache_lock:
+            validator = _cache.get(key)
+            if validator is None:
+                validator = PayloadValidator(load(), digest, ref)
+                _cache[key] = validator
+    return validator
+
+
+__all__ = [
+    "KindValidator",
+    "PayloadValidator",
+    "SchemaError",
+    "ValidationIssue",
+    "compile_schema",
+    "load_validator",
+]
@@ -0,0 +1,162 @@
+"""Opt-in async pipeline (`_AsyncLogPipeline`, `_PipelineHandler`) in `src.logging.logger`."""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import List
+
+import pytest
+
+from src.logging import logger as log_mod
+from src.logging.logger import (
+    SamplingRateLimitFilter,
+    _AsyncLogPipeline,
+    _PipelineHandler,
+    clear_request_id,
+    flush_logging,
+    get_logging_stats,
+    set_request_id,
+    shutdown_logging,
+)
+
+
+class _Gate(logging.Handler):
+    """Collects messages; the first `emit` blocks until `open` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entered = threading.Event()
+        self.open = threading.Event()
+        self.seen: List[str] = []
+        self.threads: List[str] = []
+        self.request_ids: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.entered.set()
+        self.open.wait(5)
+        self.seen.append(record.getMessage())
+        self.threads.append(threading.current_thread().name)
+        self.request_ids.append(getattr(record, "request_id", "-"))
+
+
+def _rec(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("t", level, __file__, 0, msg, None, None)
+
+
+@pytest.fixture
+def pipeline():
+    pipes: List[_AsyncLogPipeline] = []
+
+    def make(**kwargs) -> _AsyncLogPipeline:
+        pipes.append(_AsyncLogPipeline(**kwargs))
+        return pipes[-1]
+
+    yield make
+    for p in pipes:
+        p.close(1)
+
+
+def _stall(pipe: _AsyncLogPipeline, gate: _Gate) -> None:
+    """Park the listener inside the handler so later records stay queued."""
+    pipe.put(_rec("first"), (gate,))
+    assert gate.entered.wait(5)
+
+
+def test_drop_oldest_overflow(pipeline) -> None:
+    pipe, gate = pipeline(maxsize=2, overflow_policy="drop_oldest"), _Gate()
+    _stall(pipe, gate)
+    for i in range(4):
+        pipe.put(_rec(f"r{i}"), (gate,))
+    stats = pipe.stats()
+    assert (stats["dropped"], stats["depth"], stats["high_water"]) == (2, 2, 2)
+    gate.open.set()
+    assert pipe.flush(5)
+    assert gate.seen == ["first", "r2", "r3"]
+    assert pipe.stats()["handled"] == 3
+
+
+def test_drop_debug_first_overflow(pipeline) -> None:
+    pipe, gate = pipeline(maxsize=2, overflow_policy="drop_debug_first"), _Gate()
+    _stall(pipe, gate)
+    pipe.put(_rec("debug", logging.DEBUG), (gate,))
+    pipe.put(_rec("info"), (gate,))
+    pipe.put(_rec("late debug", logging.DEBUG), (gate,))  # incoming DEBUG is dropped
+    pipe.put(_rec("warning", logging.WARNING), (gate,))  # evicts the queued DEBUG
+    assert pipe.stats()["dropped_debug"] == 2
+    pipe.put(_rec("error", logging.ERROR), (gate,))  # no DEBUG left: the oldest goes
+    gate.open.set()
+    assert pipe.flush(5)
+    assert gate.seen == ["first", "warning", "error"]
+    assert pipe.stats()["dropped"] == 3
+
+
+def test_block_overflow_waits_for_the_listener(pipeline) -> None:
+    pipe, gate = pipeline(maxsize=1, overflow_policy="block"), _Gate()
+    _stall(pipe, gate)
+    pipe.put(_rec("queued"), (gate,))
+    producer = threading.Thread(target=pipe.put, args=(_rec("blocked"), (gate,)))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive() and pipe.stats()["blocked"] == 1
+    gate.open.set()
+    producer.join(5)
+    assert pipe.flush(5)
+    assert gate.seen == ["first", "queued", "blocked"] and pipe.stats()["dropped"] == 0
+
+
+def test_flush_logging_drains_the_shared_pipeline(pipeline, monkeypatch: pytest.MonkeyPatch) -> None:
+    pipe, gate = pipeline(maxsize=100), _Gate()
+    monkeypatch.setattr(log_mod, "_pipeline", pipe)
+    logger = logging.getLogger("test.async.flush")
+    monkeypatch.setattr(logger, "propagate", False)
+    monkeypatch.setattr(logger, "level", logging.INFO)
+    handler = _PipelineHandler(pipe, (gate,))
+    logger.addHandler(handler)
+    try:
+        set_request_id("req-7")
+        args = {"n": 1}
+        logger.info("payload %s", args)
+        args["n"] = 2  # formatted on the caller's thread, so later mutation does not show
+        assert flush_logging(0.05) is False  # the listener is still parked in the handler
+        gate.open.set()
+        assert flush_logging(5) is True
+    finally:
+        logger.removeHandler(handler)
+        clear_request_id()
+    assert gate.seen == ["payload {'n': 1}"]
+    assert gate.threads == ["chimera-log-listener"] and gate.request_ids == ["req-7"]
+    assert get_logging_stats()["handled"] == 1
+
+
+def test_shutdown_drains_before_stopping_then_emits_inline(pipeline, monkeypatch: pytest.MonkeyPatch) -> None:
+    pipe, gate = pipeline(maxsize=100), _Gate()
+    monkeypatch.setattr(log_mod, "_pipeline", pipe)
+    _stall(pipe, gate)
+    for i in range(3):
+        pipe.put(_rec(f"r{i}"), (gate,))
+    results: List[bool] = []
+    closer = threading.Thread(target=lambda: results.append(shutdown_logging(5)))
+    closer.start()
+    gate.open.set()
+    closer.join(5)
+    assert results == [True]
+    assert gate.seen == ["first", "r0", "r1", "r2"]  # nothing queued is lost
+    pipe.put(_rec("after"), (gate,))
+    assert gate.seen[-1] == "after" and gate.threads[-1] == threading.current_thread().name
+    assert shutdown_logging(1) is True  # idempotent
+
+
+def test_filter_counters_are_exact_across_threads() -> None:
+    flt = SamplingRateLimitFilter(sample_rate=0.0)
+    before = get_logging_stats()["sampled_out"]
+
+    def work() -> None:
+        for _ in range(2000):
+            flt.filter(_rec("x"))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert get_logging_stats()["sampled_out"] - before == 8000
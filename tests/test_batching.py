@@ -0,0 +1,57 @@
+"""`src.openclaw.batching` result mapping and the BatchSender hooks."""
+from __future__ import annotations
+
+import json
+from typing import List
+
+from src.openclaw.batching import BatchSender, ItemResult, item_results, summarize
+
+
+def test_item_results_tolerates_non_numeric_codes() -> None:
+    body = json.dumps({"results": [{"code": 200}, {"code": "E_RATE"}, {"code": "503"}, {"status": "ok"}]})
+    items = item_results(4, 207, body)
+    assert [(r.status, r.code) for r in items] == [("ok", 200), ("failed", None), ("failed", 503), ("ok", 207)]
+
+
+def _sender_with(codes: List[int], sent: List[List[bytes]], **kwargs) -> BatchSender:
+    def send(body: bytes, headers, count: int):
+        sent.append(body.splitlines())
+        return summarize([ItemResult(i, "ok" if 200 <= codes[i] < 300 else "failed", codes[i]) for i in range(count)], 207, 1)
+
+    return BatchSender(send, max_items=100, **kwargs)
+
+
+def test_requeue_only_transient_failures() -> None:
+    sent: List[List[bytes]] = []
+    sender = _sender_with([200, 400, 503, 429], sent, requeue_failed=True)
+    for i in range(4):
+        sender.add({"n": i})
+    result = sender.flush()
+    assert result.failed_indexes == [1, 2, 3]
+    assert len(sender) == 2  # the 400 is permanent and not retried
+    assert sender._payloads == [{"n": 2}, {"n": 3}]
+
+
+def test_validate_and_spool_hooks() -> None:
+    sent: List[List[bytes]] = []
+    spooled: List[bytes] = []
+
+    def spool(items: List[bytes]) -> bool:
+        spooled.extend(items)
+        return True
+
+    sender = _sender_with(
+        [503, 200, 404],
+        sent,
+        validate=lambda payloads: {i: "missing id" for i, p in enumerate(payloads) if "id" not in p},
+        spool=spool,
+    )
+    for p in ({"id": 1}, {"x": 1}, {"id": 2}, {"id": 3}):
+        sender.add(p)
+    result = sender.flush()
+    assert sent == [[b'{"id":1}', b'{"id":2}', b'{"id":3}']]
+    assert [(r.index, r.status) for r in result.items] == [(0, "failed"), (1, "invalid"), (2, "ok"), (3, "failed")]
+    assert spooled == [b'{"id":1}']
+    assert sender.stats["items_invalid"] == 1 and sender.stats["items_spooled"] == 1
+    assert (sender.stats["items_sent"], sender.stats["items_failed"]) == (1, 2)
+    assert len(sender) == 0
@@ -0,0 +1,61 @@
+"""Persistent merged-YAML cache in `src.config.config_cache`."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.config import config_cache
+from src.config.config_cache import load_yaml_files_cached, prune_cache
+
+
+@pytest.fixture
+def dirs(tmp_path: Path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "00_base.yaml").write_text("app:\n  name: chimera\n  workers: 2\n", encoding="utf-8")
+    (config_dir / "10_local.yaml").write_text("app:\n  workers: 4\n", encoding="utf-8")
+    return config_dir, tmp_path / "cache"
+
+
+def _entries(cache_dir: Path) -> list:
+    return sorted(p.name for p in cache_dir.iterdir())
+
+
+def test_hit_skips_parsing_and_returns_a_fresh_copy(dirs, monkeypatch: pytest.MonkeyPatch) -> None:
+    config_dir, cache_dir = dirs
+    first = load_yaml_files_cached(config_dir, cache_dir)
+    assert first == {"app": {"name": "chimera", "workers": 4}}
+    assert len(_entries(cache_dir)) == 1
+
+    def no_parse(inputs):
+        raise AssertionError("cache hit must not parse YAML")
+
+    monkeypatch.setattr(config_cache, "_parse_and_merge", no_parse)
+    first["app"]["workers"] = 99
+    assert load_yaml_files_cached(config_dir, cache_dir) == {"app": {"name": "chimera", "workers": 4}}
+
+
+def test_content_change_invalidates_and_prunes_the_old_entry(dirs) -> None:
+    config_dir, cache_dir = dirs
+    load_yaml_files_cached(config_dir, cache_dir)
+    (old,) = _entries(cache_dir)
+    (config_dir / "10_local.yaml").write_text("app:\n  workers: 8\n", encoding="utf-8")
+    assert load_yaml_files_cached(config_dir, cache_dir)["app"]["workers"] == 8
+    (new,) = _entries(cache_dir)
+    assert new != old
+    # a write still in progress elsewhere is not pruned
+    (cache_dir / ".tmp-abc.marshal").write_bytes(b"")
+    assert prune_cache(cache_dir) == 1
+    assert _entries(cache_dir) == [".tmp-abc.marshal"]
+
+
+def test_corrupt_entry_is_a_miss_and_is_rewritten(dirs, caplog: pytest.LogCaptureFixture) -> None:
+    config_dir, cache_dir = dirs
+    load_yaml_files_cached(config_dir, cache_dir)
+    (entry,) = cache_dir.iterdir()
+    entry.write_bytes(b"\x00 not marshal")
+    assert load_yaml_files_cached(config_dir, cache_dir)["app"]["workers"] == 4
+    assert "Ignoring unreadable config cache" in caplog.text
+    assert load_yaml_files_cached(config_dir, cache_dir)["app"]["name"] == "chimera"
+    assert _entries(cache_dir) == [entry.name]
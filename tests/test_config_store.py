@@ -0,0 +1,70 @@
+"""Reload behaviour of `src.config.config_store.ConfigStore`."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.config.config_store import ConfigStore
+
+KEY = "CHIMERA_TEST_STORE_KEY"
+
+
+def _write(path: Path, text: str, bump: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    st = path.stat()
+    # make the change visible even on filesystems with coarse mtimes
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 1_000_000_000))
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ConfigStore:
+    monkeypatch.delenv(KEY, raising=False)
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "app.yaml").write_text(f'api_key: "${{{KEY}}}"\n', encoding="utf-8")
+    _write(tmp_path / ".env", f"{KEY}=one\n", 0)
+    yield ConfigStore(config_dir, tmp_path / ".env", check_interval=0)
+    os.environ.pop(KEY, None)
+
+
+def test_changed_dotenv_value_reaches_snapshot(store: ConfigStore) -> None:
+    seen = []
+    store.subscribe(lambda old, new: seen.append(new.version))
+    assert store.refresh().get("api_key") == "one"
+
+    _write(store.dotenv_path, f"{KEY}=two\n", 1)
+    snap = store.refresh()
+    assert snap.version == 2
+    assert snap.get("api_key") == "two"
+    assert os.environ[KEY] == "two"
+    assert seen == [1, 2]
+
+
+def test_external_environment_wins_over_dotenv(store: ConfigStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(KEY, "from-env")
+    assert store.refresh().get("api_key") == "from-env"
+    _write(store.dotenv_path, f"{KEY}=two\n", 1)
+    assert store.refresh().get("api_key") == "from-env"
+
+
+def test_key_removed_from_dotenv_is_unset(store: ConfigStore) -> None:
+    store.refresh()
+    _write(store.dotenv_path, "# emptied\n", 1)
+    with pytest.raises(Exception, match=KEY):
+        store.refresh()
+    assert KEY not in os.environ
+    assert store.snapshot.get("api_key") == "one"  # failed rebuild keeps the previous snapshot
+
+
+def test_required_keys_are_checked_through_the_snapshot_view(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(KEY, "one")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "app.yaml").write_text(f'api:\n  key: "${{{KEY}}}"\n  url: null\n', encoding="utf-8")
+    snap = ConfigStore(config_dir, tmp_path / ".env", required_keys=["api.key"]).refresh()
+    assert "view" in snap.__dict__  # built while validating, reused by get()
+    assert snap.get("api.key") == "one"
+    with pytest.raises(Exception, match="api.url, api.missing"):
+        ConfigStore(config_dir, tmp_path / ".env", required_keys=["api.url", "api.missing"]).refresh()
@@ -0,0 +1,98 @@
+"""Dotted-key lookups and typed coercion in `src.config.config_view`."""
+from __future__ import annotations
+
+import pytest
+
+from src.config.config_loader import ConfigError
+from src.config.config_view import ConfigView, parse_bool, parse_duration
+
+CONFIG = {
+    "agents": {
+        "supervisor_agent": {"max_concurrent_tasks": "8", "interval": "5m", "enabled": "yes"},
+        "safety_agent": {"reject_threshold": 0.9, "notes": None},
+    },
+    "name": "chimera",
+}
+
+
+def test_dotted_lookup_reaches_nodes_and_leaves() -> None:
+    view = ConfigView(CONFIG)
+    assert view["agents.supervisor_agent.interval"] == "5m"
+    assert view["agents.safety_agent"] is CONFIG["agents"]["safety_agent"]
+    assert "agents.safety_agent.notes" in view and "agents.nope" not in view
+    assert view.get("agents.nope", 3) == 3 and view.get("name") == "chimera"
+    assert len(view) == len(list(view)) == 9
+    with pytest.raises(KeyError):
+        view["agents.supervisor_agent.interval.x"]
+    assert view.require("name") == "chimera"
+    with pytest.raises(ConfigError, match="agents.safety_agent.notes"):
+        view.require("agents.safety_agent.notes")
+
+
+def test_schema_coerces_once_at_build_time() -> None:
+    view = ConfigView(
+        CONFIG,
+        schema={
+            "agents.supervisor_agent.max_concurrent_tasks": int,
+            "agents.supervisor_agent.interval": "duration",
+            "agents.supervisor_agent.enabled": "bool",
+            "agents.safety_agent.reject_threshold": "str",
+            "agents.safety_agent.notes": "int",  # None is left alone
+            "agents.absent": "int",  # absent keys are ignored
+            "name": str.upper,
+        },
+        required=["name"],
+    )
+    assert view["agents.supervisor_agent.max_concurrent_tasks"] == 8
+    assert view["agents.supervisor_agent.interval"] == 300.0
+    assert view["agents.supervisor_agent.enabled"] is True
+    assert view["agents.safety_agent.reject_threshold"] == "0.9"
+    assert view["agents.safety_agent.notes"] is None and view["name"] == "CHIMERA"
+    assert CONFIG["agents"]["supervisor_agent"]["max_concurrent_tasks"] == "8"  # source untouched
+    with pytest.raises(TypeError):
+        view._index["name"] = "x"  # type: ignore[index]
+
+
+def test_every_problem_is_reported_together() -> None:
+    with pytest.raises(ConfigError) as err:
+        ConfigView(
+            {"a": {"n": 1.5, "flag": "maybe", "t": True}},
+            schema={"a.n": "int", "a.flag": bool, "a.t": "float"},
+            required=["a.n", "a.gone", "b"],
+        )
+    message = str(err.value)
+    assert "Missing required configuration keys: a.gone, b" in message
+    assert all(f"Invalid value for a.{k}" in message for k in ("n", "flag", "t"))
+    with pytest.raises(ConfigError, match="Unknown config type spec"):
+        ConfigView({}, schema={"x": "decimal"})
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [
+        (30, 30.0),
+        (1.5, 1.5),
+        ("250ms", 0.25),
+        ("30", 30.0),
+        (" 2 S ", 2.0),
+        ("5m", 300.0),
+        ("1.5h", 5400.0),
+        ("2d", 172800.0),
+    ],
+)
+def test_parse_duration(value, seconds) -> None:
+    assert parse_duration(value) == seconds
+
+
+@pytest.mark.parametrize("value", [True, "", "5 weeks", "-1s", "1m30s", None])
+def test_parse_duration_rejects(value) -> None:
+    with pytest.raises(ValueError):
+        parse_duration(value)
+
+
+def test_parse_bool() -> None:
+    assert [parse_bool(v) for v in (True, 1, "on", " YES ")] == [True] * 4
+    assert [parse_bool(v) for v in (False, "0", "off", 0.0)] == [False] * 4
+    for value in ("maybe", 2, None):
+        with pytest.raises(ValueError):
+            parse_bool(value)
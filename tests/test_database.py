@@ -0,0 +1,159 @@
+"""Pool, bulk writes and streaming in `src.db.database` and `src.db.repository` on SQLite."""
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.db.database import ConnectionPool, Database, DatabaseError
+from src.db.repository import ChimeraRepository
+
+
+class _Conn:
+    """DB-API stand-in recording commit/rollback/close."""
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = Database.sqlite(tmp_path / "chimera.db", pool_max=2)
+    database.create_schema()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def repo(db: Database) -> ChimeraRepository:
+    return ChimeraRepository(db)
+
+
+def _drafts(repo: ChimeraRepository, n: int) -> list:
+    task = repo.create_task(repo.create_influencer("a", "b"), "t")
+    repo.add_drafts([{"task_id": task, "content_body": f"draft {i}"} for i in range(n)])
+    return [r["id"] for r in repo.db.fetch_all("SELECT id FROM content_drafts ORDER BY id")]
+
+
+def test_pool_times_out_when_exhausted_and_recovers() -> None:
+    pool = ConnectionPool(_Conn, max_size=1, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(DatabaseError, match="Timed out"):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn  # idle connections are reused
+    assert pool.stats() == {"open": 1, "idle": 0, "in_use": 1, "max_size": 1}
+
+
+def test_pool_discards_broken_and_stale_connections() -> None:
+    pool = ConnectionPool(_Conn, max_size=2)
+    with pytest.raises(ConnectionError):
+        with pool.connection() as conn:
+            raise ConnectionError("server went away")
+    assert conn.rollbacks == 1 and conn.closed
+    assert pool.stats()["open"] == 0
+    # an ordinary error rolls back but keeps the connection
+    with pytest.raises(ValueError):
+        with pool.connection() as conn:
+            raise ValueError("bad input")
+    assert not conn.closed and pool.stats()["idle"] == 1
+    # idle connections failing the health check are replaced
+    pool = ConnectionPool(_Conn, max_size=1, min_size=1, check=lambda c: False, check_after=0)
+    stale = pool._idle[0][0]
+    fresh = pool.acquire()
+    assert fresh is not stale and stale.closed
+    pool.release(fresh)
+    pool.close()
+    assert fresh.closed
+    with pytest.raises(DatabaseError, match="closed"):
+        pool.acquire()
+
+
+def test_pool_frees_the_slot_when_connecting_fails() -> None:
+    calls = []
+
+    def factory() -> _Conn:
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("refused")
+        return _Conn()
+
+    pool = ConnectionPool(factory, max_size=1, timeout=0.05)
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+    assert isinstance(pool.acquire(), _Conn)
+
+
+@pytest.mark.parametrize("method", ["copy", "batch"])
+def test_bulk_insert_in_batches_round_trips_encoded_columns(repo: ChimeraRepository, method: str) -> None:
+    task = repo.create_task(repo.create_influencer("a", "b"), "t")
+    rows = [
+        {"task_id": task, "trends_data": {"n": i}, "source_urls": [f"https://x/{i}"], "cache_key": f"k{i}"}
+        for i in range(7)
+    ]
+    columns = ["task_id", "trends_data", "source_urls", "cache_key"]
+    assert repo.db.bulk_insert("research_findings", columns, rows, method=method, batch_size=3) == 7
+    assert repo.db.bulk_insert("research_findings", ["task_id", "cache_key"], [(task, "seq")], method=method) == 1
+    stored = list(repo.iter_findings(task))
+    assert [r["trends_data"] for r in stored[:7]] == [{"n": i} for i in range(7)]
+    assert stored[3]["source_urls"] == ["https://x/3"] and stored[-1]["cache_key"] == "seq"
+    assert repo.latest_finding("k6")["trends_data"] == {"n": 6}
+
+
+def test_bulk_insert_is_one_transaction_and_rejects_bad_input(repo: ChimeraRepository) -> None:
+    task = repo.create_task(repo.create_influencer("a", "b"), "t")
+    rows = [{"task_id": task, "content_body": "ok"}] * 3 + [{"task_id": task, "content_body": None}]
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.add_drafts(rows, method="batch")
+    assert repo.db.fetch_all("SELECT id FROM content_drafts") == []
+    with pytest.raises(ValueError):
+        repo.db.bulk_insert("content_drafts", ["content_body"], [], method="upsert")
+    with pytest.raises(DatabaseError):
+        repo.db.bulk_insert("content_drafts; DROP TABLE tasks", ["content_body"], [])
+
+
+def test_stream_yields_every_row_and_returns_the_connection(repo: ChimeraRepository) -> None:
+    ids = _drafts(repo, 5)
+    stream = repo.iter_drafts(batch_size=2)
+    assert next(stream)["id"] == ids[0]
+    assert repo.db.pool.stats()["in_use"] == 1  # held while the iterator is open
+    assert [r["id"] for r in stream] == ids[1:]
+    assert repo.db.pool.stats()["in_use"] == 0
+    with contextlib.closing(repo.iter_drafts(batch_size=2)) as stream:
+        next(stream)
+    assert repo.db.pool.stats()["in_use"] == 0
+
+
+def test_record_safety_reviews_writes_one_review_per_draft(repo: ChimeraRepository) -> None:
+    first, second, third = _drafts(repo, 3)
+
+    def review(draft_id: int, verdict: str) -> dict:
+        return {"draft_id": draft_id, "verdict": verdict, "confidence_score": 0.9, "policy_violations": [verdict]}
+
+    assert repo.record_safety_reviews([review(first, "approved"), review(second, "rejected")]) == [first, second]
+    assert [d["id"] for d in repo.unscanned_drafts(10)] == [third]
+    # a second scanner that read the same drafts earlier only gets the one left over
+    assert repo.record_safety_reviews([review(second, "approved"), review(third, "approved")], method="batch") == [third]
+    assert repo.record_safety_reviews([]) == []
+    reviews = list(repo.iter_reviews())
+    assert [(r["draft_id"], r["verdict"]) for r in reviews] == [
+        (first, "approved"),
+        (second, "rejected"),
+        (third, "approved"),
+    ]
+    assert reviews[1]["policy_violations"] == ["rejected"]
+    assert [r["draft_id"] for r in repo.iter_reviews("rejected")] == [second]
+    assert repo.unscanned_drafts(10) == []
@@ -0,0 +1,70 @@
+"""`src.openclaw.stream.EventStream` against a local stand-in SSE server."""
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional
+
+from src.openclaw.stream import EventStream
+
+
+async def _serve_sse(connections: List[Optional[str]], script: List[bytes]):
+    """Start a server that answers connection n with script[n] (then holds it open)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        last = None
+        for line in head.split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "last-event-id":
+                last = value.strip()
+        n = len(connections)
+        connections.append(last)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n\r\n")
+        writer.write(script[min(n, len(script) - 1)])
+        await writer.drain()
+        if n == 0:
+            writer.close()  # drop the first connection so the client resumes
+            return
+        try:
+            await reader.read()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_sse_events_without_own_id_are_delivered_and_replays_dropped() -> None:
+    first = (
+        b": hello\n\n"
+        b"id: 1\ndata: a\n\n"
+        b"data: b\n\n"  # inherits id 1 for resuming but is a new event
+        b"data: c\n\n"
+        b"id: 2\nevent: update\ndata: {\"n\": 4}\n\n"
+    )
+    second = (
+        b"id: 2\nevent: update\ndata: {\"n\": 4}\n\n"  # replayed after resume
+        b"id: 3\ndata: e\n\n"
+    )
+
+    async def main() -> None:
+        connections: List[Optional[str]] = []
+        server, port = await _serve_sse(connections, [first, second])
+        stream = EventStream(f"http://127.0.0.1:{port}/events", heartbeat_interval=5, reconnect_base=0.01)
+        sub = stream.subscribe("test")
+        runner = asyncio.create_task(stream.run())
+        try:
+            got = [await asyncio.wait_for(sub.get(), 5) for _ in range(5)]
+        finally:
+            stream.stop()
+            await asyncio.wait_for(runner, 5)
+            server.close()
+            await server.wait_closed()
+        assert [e.data for e in got] == ["a", "b", "c", {"n": 4}, "e"]
+        assert [e.id for e in got] == ["1", None, None, "2", "3"]
+        assert got[3].type == "update"
+        assert connections[:2] == [None, "2"]
+        assert stream.stats["duplicates"] == 1
+        assert stream.last_event_id == "3"
+
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""Request-id and time-range lookups in `src.logging.log_index.LogIndex`."""
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from src.logging.log_index import LogIndex
+
+
+def _segment(path: Path, minute: int = 0) -> None:
+    lines = []
+    for s in range(10, 40):
+        rid = f"rid{s % 3}"
+        lines.append(f"2026-01-01T12:{minute:02d}:{s:02d} INFO [{rid}] app: step {s}\n")
+        if s == 20:
+            lines.append("Traceback (most recent call last):\n  boom [rid1] inside a message\n")
+    path.write_text("".join(lines), encoding="utf-8")
+
+
+@pytest.fixture
+def index(tmp_path: Path):
+    idx = LogIndex(tmp_path / "app.log")
+    yield idx
+    idx.close()
+
+
+def test_request_id_lookup_in_compressed_segment(tmp_path: Path, index: LogIndex) -> None:
+    seg = tmp_path / "app.log.20260101-120100.1"
+    _segment(seg)
+    dst = index.compress_and_index(seg, "gzip", block_size=256)
+    assert not seg.exists()
+    assert gzip.decompress(dst.read_bytes()).count(b"\n") == 32  # still an ordinary .gz file
+    records = index.find_request("rid2")
+    assert [r.split()[5] for r in records] == [str(s) for s in range(10, 40) if s % 3 == 2]
+    # the traceback stays with its record and does not count as a rid1 record
+    (tb,) = [r for r in records if "Traceback" in r]
+    assert tb.startswith("2026-01-01T12:00:20")
+    assert len(index.find_request("rid1")) == 10
+    assert index.find_request("nobody") == []
+
+
+def test_since_until_are_inclusive_prefixes(tmp_path: Path, index: LogIndex) -> None:
+    for minute in (0, 1):
+        seg = tmp_path / f"app.log.20260101-12{minute:02d}59.{minute}"
+        _segment(seg, minute)
+        index.compress_and_index(seg, "gzip", block_size=256)
+    assert len(index.find_request("rid1")) == 20
+    # blocks whose first record is finer-grained than the prefix are still read
+    assert len(index.find_request("rid1", until="2026-01-01T12:00")) == 10
+    assert len(index.find_request("rid1", since="2026-01-01T12:01")) == 10
+    window = list(index.query(since="2026-01-01T12:00:30", until="2026-01-01T12:01:15"))
+    assert window[0].startswith("2026-01-01T12:00:30") and window[-1].startswith("2026-01-01T12:01:15")
+    assert len(window) == 10 + 6
+
+
+def test_uncompressed_backfill_and_live_json(tmp_path: Path, index: LogIndex) -> None:
+    _segment(tmp_path / "app.log.1")
+    assert index.backfill(block_size=128) == ["app.log.1"]
+    assert index.backfill() == []
+    live = {"ts": "2026-01-01T13:00:00", "level": "INFO", "request_id": "rid1", "msg": "live"}
+    (tmp_path / "app.log").write_text(json.dumps(live, separators=(",", ":")) + "\n", encoding="utf-8")
+    records = index.find_request("rid1")
+    assert len(records) == 11 and '"msg":"live"' in records[-1]
+    assert len(index.find_request("rid1", include_live=False)) == 10
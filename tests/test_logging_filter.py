@@ -0,0 +1,23 @@
+"""`src.logging.logger.SamplingRateLimitFilter` rate limiting."""
+from __future__ import annotations
+
+import logging
+
+from src.logging.logger import SamplingRateLimitFilter
+
+
+def _record(msg, *args) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, args or None, None)
+
+
+def test_template_shares_one_bucket() -> None:
+    flt = SamplingRateLimitFilter(per_second=0.001, burst=2)
+    passed = [flt.filter(_record("loaded %s", i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+
+
+def test_unhashable_messages_are_rate_limited() -> None:
+    flt = SamplingRateLimitFilter(per_second=0.001, burst=1)
+    assert flt.filter(_record({"event": "sync", "items": [1, 2]}))
+    assert not flt.filter(_record({"event": "sync", "items": [1, 2]}))
+    assert flt.filter(_record(["other"]))
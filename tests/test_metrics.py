@@ -0,0 +1,43 @@
+"""Sharded counters and histograms in `src.logging.metrics`."""
+from __future__ import annotations
+
+import threading
+
+from src.logging.metrics import MetricsRegistry
+
+
+def _run_threads(fn, n: int) -> None:
+    threads = [threading.Thread(target=fn) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_exited_thread_shards_are_folded() -> None:
+    registry = MetricsRegistry()
+    c = registry.counter("test_total", "test")
+    h = registry.histogram("test_seconds", "test", buckets=(0.1, 1.0))
+
+    def work() -> None:
+        for _ in range(100):
+            c.inc()
+            h.observe(0.5)
+
+    for _ in range(5):
+        _run_threads(work, 20)
+    c.inc()
+    assert c.snapshot() == 10001
+    assert h.snapshot()["count"] == 10000
+    assert h.snapshot()["buckets"]["1"] == 10000
+    # only the calling thread still owns a shard
+    assert len(c._default._shards) == 1
+    assert len(h._default._shards) == 0
+
+
+def test_labelled_children_fold_too() -> None:
+    registry = MetricsRegistry()
+    c = registry.counter("test_labelled_total", "test", ("kind",))
+    _run_threads(lambda: c.labels("a").inc(2), 30)
+    assert c.snapshot() == {"a": 60}
+    assert len(c.labels("a")._shards) == 0
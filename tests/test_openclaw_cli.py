@@ -0,0 +1,144 @@
+"""`src.config.openclaw` against a fake `openclaw` executable on PATH."""
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.config import openclaw
+from src.config.openclaw import OpenClawError, OpenClawStatusService
+
+# behaviour is driven by env vars so one script covers every case; every run
+# appends its pid to FAKE_OPENCLAW_LOG
+FAKE_CLI = """#!{python}
+import json, os, sys, time
+with open(os.environ["FAKE_OPENCLAW_LOG"], "a") as fh:
+    fh.write(f"{{os.getpid()}}\\n")
+mode = os.environ.get("FAKE_OPENCLAW_MODE", "text")
+time.sleep(float(os.environ.get("FAKE_OPENCLAW_DELAY", "0")))
+if mode == "json":
+    print(json.dumps({{"provider": "anthropic", "models": 3, "args": sys.argv[1:]}}))
+elif mode == "fail":
+    print("error: gateway unreachable", file=sys.stderr)
+    sys.exit(2)
+else:
+    print("Provider: anthropic")
+    print("Default model: claude")
+    print("not a pair")
+"""
+
+
+@pytest.fixture
+def fake_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    cli = bin_dir / "openclaw"
+    cli.write_text(FAKE_CLI.format(python=sys.executable), encoding="utf-8")
+    cli.chmod(cli.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    log = tmp_path / "runs.log"
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setenv("FAKE_OPENCLAW_LOG", str(log))
+    monkeypatch.setattr(openclaw, "_cli_path_cache", None)
+    return log
+
+
+def _runs(log: Path) -> list:
+    return log.read_text().split() if log.exists() else []
+
+
+def test_cli_is_found_and_text_output_parsed(fake_cli: Path) -> None:
+    assert openclaw.check_openclaw_cli()
+    code, out = openclaw.run_openclaw_models_status()
+    assert code == 0
+    assert openclaw.parse_models_status(out) == {"provider": "anthropic", "default model": "claude"}
+
+
+def test_json_output_and_exit_code(fake_cli: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FAKE_OPENCLAW_MODE", "json")
+    code, out = asyncio.run(openclaw.run_openclaw_models_status_async(["--json"]))
+    assert code == 0
+    assert openclaw.parse_models_status(out) == {"provider": "anthropic", "models": 3, "args": ["models", "status", "--json"]}
+    monkeypatch.setenv("FAKE_OPENCLAW_MODE", "fail")
+    code, out = openclaw.run_openclaw_models_status()
+    assert code == 2 and "gateway unreachable" in out
+
+
+def test_missing_cli_raises(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setattr(openclaw, "_cli_path_cache", None)
+    assert not openclaw.check_openclaw_cli()
+    with pytest.raises(OpenClawError):
+        openclaw.run_openclaw_models_status()
+
+
+def test_async_timeout_kills_the_process(fake_cli: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FAKE_OPENCLAW_DELAY", "30")
+    start = time.monotonic()
+    with pytest.raises(OpenClawError, match="timed out"):
+        asyncio.run(openclaw.run_openclaw_models_status_async(timeout=1.0))
+    assert time.monotonic() - start < 10
+    (pid,) = _runs(fake_cli)
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid), 0)
+
+
+def test_sync_timeout(fake_cli: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FAKE_OPENCLAW_DELAY", "30")
+    with pytest.raises(OpenClawError, match="timed out"):
+        openclaw.run_openclaw_models_status(timeout=1.0)
+
+
+def test_concurrent_callers_share_one_run(fake_cli: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FAKE_OPENCLAW_DELAY", "0.3")
+    service = OpenClawStatusService(ttl=60)
+
+    async def main():
+        return await asyncio.gather(*(service.get() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(_runs(fake_cli)) == 1
+    assert all(r is results[0] for r in results)
+    assert results[0].parsed["provider"] == "anthropic"
+    assert service.stats["runs"] == 1 and service.stats["coalesced"] == 4
+
+
+def test_stale_result_served_within_stale_ttl(fake_cli: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [0.0]
+    service = OpenClawStatusService(ttl=10, stale_ttl=100, timeout=5, clock=lambda: now[0])
+
+    async def main():
+        first = await service.get()
+        assert (await service.get()) is first  # fresh hit, no run
+        assert len(_runs(fake_cli)) == 1
+
+        now[0] = 50.0
+        monkeypatch.setenv("FAKE_OPENCLAW_MODE", "fail")
+        stale = await service.get()  # served at once; refresh runs in the background
+        assert stale is first
+        await service._inflight
+        assert len(_runs(fake_cli)) == 2
+        # the refresh finished (with a nonzero exit), so it replaced the cache
+        assert service._cached.exit_code == 2
+
+        # a refresh that raises keeps the last result within stale_ttl
+        good = service._cached
+        monkeypatch.setenv("FAKE_OPENCLAW_DELAY", "30")
+        service.timeout = 0.5
+        now[0] = 70.0
+        assert (await service.get()) is good
+        with pytest.raises(OpenClawError):
+            await service._inflight
+        assert service._cached is good
+
+        now[0] = 200.0  # past stale_ttl: the caller waits and sees the error
+        with pytest.raises(OpenClawError):
+            await service.get()
+        return service.stats
+
+    stats = asyncio.run(main())
+    assert stats["hits"] == 1 and stats["stale_hits"] == 2 and stats["errors"] == 2
@@ -0,0 +1,56 @@
+"""`src.openclaw.outbox` error handling and Retry-After replay."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.openclaw.outbox import Outbox, OutboxDrainer, OutboxError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_locked_database_raises_outbox_error(tmp_path: Path) -> None:
+    outbox = Outbox(tmp_path / "outbox.db")
+    outbox._db.execute("PRAGMA busy_timeout=0")
+    other = sqlite3.connect(str(tmp_path / "outbox.db"), isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(OutboxError):
+            outbox.append("/ingest", b"{}")
+        with pytest.raises(OutboxError):
+            outbox.claim()
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    # the connection is usable again once the lock is gone
+    assert outbox.append("/ingest", b"{}") > 0
+    assert len(outbox.claim()) == 1
+    outbox.close()
+
+
+def test_drainer_honours_retry_after(tmp_path: Path) -> None:
+    clock = _Clock()
+    outbox = Outbox(tmp_path / "outbox.db", clock=clock, base_backoff=1.0, max_backoff=1.0)
+    outbox.append_many([("/a", b"1", "application/json"), ("/b", b"2", "application/json")])
+    replies = {"/a": (429, {"Retry-After": "120"}), "/b": 503}
+    drainer = OutboxDrainer(outbox, lambda endpoint, body, ctype: replies[endpoint], concurrency=1, max_retry_after=90)
+    try:
+        assert drainer.drain_once() == (0, 2)
+        assert drainer._retry_after == 90  # capped
+        clock.now += 2  # /b used the 1s jittered backoff; /a must wait for its Retry-After
+        due = outbox.claim()
+        assert [e.endpoint for e in due] == ["/b"]
+        outbox.ack([e.id for e in due])
+        clock.now += 90
+        assert [e.endpoint for e in outbox.claim()] == ["/a"]
+    finally:
+        drainer.stop()
+        outbox.close()
@@ -0,0 +1,49 @@
+"""Archival in `src.db.partitions.PartitionManager` on a SQLite database."""
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.db.database import Database
+from src.db.partitions import PartitionManager, PartitionPolicy
+from src.db.repository import ChimeraRepository
+
+NOW = datetime(2026, 6, 15, tzinfo=timezone.utc)
+POLICY = PartitionPolicy("research_findings", "created_at", retain_months=2)
+
+
+def _add(db: Database, task_id: int, topic: str, created_at: str) -> None:
+    db.execute(
+        "INSERT INTO research_findings (task_id, topic_ideation, created_at) VALUES (%s, %s, %s)",
+        [task_id, topic, created_at],
+    )
+
+
+def test_rearchiving_a_month_keeps_the_first_archive(tmp_path: Path) -> None:
+    db = Database.sqlite(tmp_path / "chimera.db")
+    db.create_schema()
+    repo = ChimeraRepository(db)
+    task_id = repo.create_task(repo.create_influencer("a", "b"), "t")
+    _add(db, task_id, "first", "2026-01-10 12:00:00")
+    _add(db, task_id, "kept", "2026-05-10 12:00:00")
+    manager = PartitionManager(db, archive_dir=tmp_path / "archive", policies=[POLICY], clock=lambda: NOW)
+
+    first = manager.expire(POLICY)
+    assert [p.name for p in first] == ["research_findings_p2026_01.ndjson.gz"]
+
+    _add(db, task_id, "late", "2026-01-20 12:00:00")  # a late row for the archived month
+    second = manager.expire(POLICY)
+    assert [p.name for p in second] == ["research_findings_p2026_01.2.ndjson.gz"]
+
+    def topics(path: Path):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return [json.loads(line)["topic_ideation"] for line in fh]
+
+    assert topics(first[0]) == ["first"]
+    assert topics(second[0]) == ["late"]
+    manifest = json.loads(second[0].with_name(second[0].name + ".manifest.json").read_text(encoding="utf-8"))
+    assert manifest["rows"] == 1
+    assert [r["topic_ideation"] for r in db.fetch_all("SELECT topic_ideation FROM research_findings")] == ["kept"]
+    db.close()
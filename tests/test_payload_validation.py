@@ -0,0 +1,45 @@
+"""Opt-in payload schema enforcement in `config.openclaw_adapter.get_validator`."""
+from __future__ import annotations
+
+from config import openclaw_adapter as adapter
+
+SCHEMA = "schemas/openclaw_payload_schema.json"
+
+
+def test_enforcement_is_opt_in() -> None:
+    assert adapter.get_validator({"validation": {"schema_file": SCHEMA}}) is None
+    validator = adapter.get_validator({"validation": {"enforce_schema": True, "schema_file": SCHEMA}})
+    assert validator is not None
+    assert validator.validate({"ping": True})
+    assert not validator.validate({"trend": "x", "influencer_ids": [], "insights": "", "timestamp": "2026-01-01T00:00:00Z"})
+
+
+def test_cache_follows_the_config_object() -> None:
+    for _ in range(50):
+        # short-lived configs may reuse an id(); the cache must not hand back the old verdict
+        assert adapter.get_validator({"validation": {"enforce_schema": True, "schema_file": SCHEMA}}) is not None
+        assert adapter.get_validator({"validation": {"enforce_schema": False}}) is None
+
+
+KINDS = {"influencer": "influencer_id", "campaign": "campaign_id", "research": "trend"}
+RESEARCH = {"trend": "x", "influencer_ids": [], "insights": "", "timestamp": "2026-01-01T00:00:00Z"}
+
+
+def test_kinds_scope_validation_to_their_own_definition() -> None:
+    validator = adapter.get_validator({"validation": {"enforce_schema": True, "schema_file": SCHEMA, "kinds": KINDS}})
+    assert validator.validate({"ping": True}) == []  # no schema for this kind
+    assert validator.validate(RESEARCH) == []
+    issues = validator.validate({"campaign_id": "c1", "keywords": ["a"], "start_date": "2026-13-01"})
+    # only the campaign definition is reported, not the closest of every branch
+    assert {i.path for i in issues} == {"$.end_date", "$.objective", "$.start_date"}
+    failed = validator.validate_many([RESEARCH, {"trend": ""}, {"other": 1}, {"influencer_id": "i", "followers": -1}])
+    assert sorted(failed) == [1, 3]
+
+
+def test_shipped_config_enforces_per_kind() -> None:
+    cfg = adapter.load_config()
+    assert cfg["validation"]["enforce_schema"] is True
+    validator = adapter.get_validator(cfg)
+    assert validator is not None
+    assert validator.validate({"event": "heartbeat"}) == []
+    assert validator.validate({"trend": "x"})
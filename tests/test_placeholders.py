@@ -0,0 +1,63 @@
+"""Compiled `${VAR}` resolution in `src.config.placeholders.PlaceholderPlan`."""
+from __future__ import annotations
+
+import pytest
+
+from src.config.config_loader import ConfigError, resolve_placeholders
+from src.config.placeholders import compile_placeholders
+
+DOC = {
+    "a": {"u": "${USER_NAME}@${HOST}", "n": 1},
+    "b": {"deep": {"x": [1, 2]}},
+    "c": ["${HOST}", "plain"],
+}
+ENV = {"USER_NAME": "ada", "HOST": "example.org"}
+
+
+def test_resolution_matches_the_recursive_resolver() -> None:
+    plan = compile_placeholders(DOC)
+    assert plan.variables == ("HOST", "USER_NAME")
+    assert plan.paths == (("a", "u"), ("c", 0))
+    expected = resolve_placeholders(DOC, ENV)
+    assert compile_placeholders(DOC, frozen=False).resolve(ENV) == expected
+    frozen = plan.resolve(ENV)
+    assert frozen["a"]["u"] == "ada@example.org" and list(frozen["c"]) == ["example.org", "plain"]
+    assert compile_placeholders("${HOST}:80").resolve(ENV) == "example.org:80"
+
+
+def test_every_missing_variable_is_reported() -> None:
+    with pytest.raises(ConfigError) as err:
+        compile_placeholders(DOC).resolve({})
+    assert "${HOST}" in str(err.value) and "${USER_NAME}" in str(err.value)
+
+
+def test_unchanged_subtrees_are_shared() -> None:
+    plan = compile_placeholders(DOC)
+    first = plan.resolve(ENV)
+    assert plan.resolve(dict(ENV)) is first  # memoized by variable values
+    second = plan.resolve({**ENV, "HOST": "other"})
+    assert second is not first and second["a"] is not first["a"]
+    assert second["b"] is first["b"] is plan.source["b"]
+
+
+def test_results_cannot_change_later_resolutions() -> None:
+    plan = compile_placeholders(DOC)
+    result = plan.resolve(ENV)
+    with pytest.raises(TypeError):
+        result["a"]["u"] = "MUT"
+    with pytest.raises(TypeError):
+        result["b"]["deep"]["x"][0] = 9
+    assert plan.resolve(ENV)["a"]["u"] == "ada@example.org"
+    # the caller's original document is copied, so editing it does not leak in either
+    doc = {"k": {"v": "${HOST}"}, "s": {"t": 1}}
+    plan = compile_placeholders(doc)
+    doc["s"]["t"] = 2
+    assert plan.resolve(ENV)["s"]["t"] == 1
+
+
+def test_unfrozen_plans_return_plain_containers_and_do_not_cache() -> None:
+    plan = compile_placeholders(DOC, frozen=False)
+    result = plan.resolve(ENV)
+    assert type(result) is dict and type(result["c"]) is list
+    result["a"]["u"] = "MUT"
+    assert plan.resolve(ENV)["a"]["u"] == "ada@example.org"
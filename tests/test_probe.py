@@ -0,0 +1,83 @@
+"""Early decisions, deadlines and pool reuse in `src.openclaw.probe.ProbeEngine`."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import List
+
+from src.openclaw.probe import ProbeEngine, build_probes
+
+PATHS = ["", "/health", "/status", "/v1/health"]
+HEADERS = [{"Authorization": "Bearer k"}, {"X-API-Key": "k"}, {}]
+METHODS = ["HEAD", "GET", "POST"]
+
+
+def _engine(request, **kwargs) -> ProbeEngine:
+    kwargs.setdefault("max_workers", 1)
+    kwargs.setdefault("cache_ttl", 0)
+    return ProbeEngine(request, **kwargs)
+
+
+def test_stops_once_auth_is_accepted() -> None:
+    calls: List[str] = []
+
+    def request(url, method="GET", headers=None, data=None, timeout=10):
+        calls.append(url)
+        return 200, "ok"
+
+    engine = _engine(request)
+    verdict = engine.run("http://gw", build_probes(PATHS, HEADERS, METHODS), timeout=5)
+    assert verdict["any_reachable"] and verdict["auth_accepted"] and verdict["stopped_early"]
+    assert len(calls) == 1
+    engine.close()
+
+
+def test_stops_when_every_auth_header_is_rejected() -> None:
+    calls: List[str] = []
+
+    def request(url, method="GET", headers=None, data=None, timeout=10):
+        calls.append(url)
+        return (401, None) if headers else (200, "ok")
+
+    engine = _engine(request)
+    probes = build_probes(PATHS, HEADERS, METHODS)
+    verdict = engine.run("http://gw", probes, timeout=5)
+    assert verdict["any_reachable"] and not verdict["auth_accepted"] and verdict["stopped_early"]
+    # both auth headers rejected on the first path, then one unauthenticated 200
+    assert len(calls) == 7 < len(probes)
+    engine.close()
+
+
+def test_stops_when_unreachable() -> None:
+    calls: List[str] = []
+
+    def request(url, method="GET", headers=None, data=None, timeout=10):
+        calls.append(url)
+        return None, None
+
+    engine = _engine(request, unreachable_after=3)
+    verdict = engine.run("http://gw", build_probes(PATHS, HEADERS, METHODS), timeout=5)
+    assert not verdict["any_reachable"] and verdict["stopped_early"]
+    assert len(calls) == 3
+    engine.close()
+
+
+def test_timeouts_clipped_to_deadline_and_pool_reused() -> None:
+    timeouts: List[float] = []
+    threads = set()
+
+    def request(url, method="GET", headers=None, data=None, timeout=10):
+        timeouts.append(timeout)
+        threads.add(threading.get_ident())
+        time.sleep(min(timeout, 0.05))
+        return 404, None
+
+    engine = _engine(request, max_workers=2, deadline=0.2)
+    probes = build_probes(PATHS, HEADERS, METHODS)
+    for _ in range(2):
+        verdict = engine.run("http://gw", probes, timeout=30, force=True)
+        assert verdict["timed_out"] and not verdict["stopped_early"]
+        assert len(verdict["probes"]) < len(probes)
+    assert max(timeouts) <= 0.2
+    assert len(threads) <= 2  # the same workers served both runs
+    engine.close()
@@ -0,0 +1,70 @@
+"""Lookup accounting in `src.agents.research_agent.cache.ResearchCache`."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from src.agents.research_agent.cache import ResearchCache, ResearchQuery
+
+
+class _Rows:
+    """Stand-in for `ChimeraRepository` holding one finding per key."""
+
+    def __init__(self) -> None:
+        self.db = SimpleNamespace(backend=SimpleNamespace(name="postgres"))
+        self.rows = {}
+
+    def latest_finding(self, key, since):
+        row = self.rows.get(key)
+        return row if row is not None and row["created_at"] >= since else None
+
+    def add_findings(self, rows, mode):
+        pass
+
+
+def _compute(calls):
+    async def compute(query):
+        calls.append(query.keywords)
+        await asyncio.sleep(0.01)
+        return {"trends_data": list(query.keywords)}
+
+    return compute
+
+
+def test_coalesced_callers_are_not_misses() -> None:
+    calls = []
+    cache = ResearchCache(_compute(calls))
+
+    async def main():
+        return await asyncio.gather(*(cache.get(["ai"]) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert calls == [("ai",)] and all(r is results[0] for r in results)
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["lookups"]) == (1, 3, 4)
+    assert stats["miss_rate"] == 0.25 and stats["reuse_rate"] == 0.75
+
+
+def test_db_hits_are_not_misses_and_old_rows_are_not_hits() -> None:
+    now = [1_000_000.0]
+    repo = _Rows()
+    calls = []
+    cache = ResearchCache(_compute(calls), repository=repo, ttl=60, stale_ttl=600, clock=lambda: now[0])
+
+    def row(age):
+        return {"trends_data": ["db"], "created_at": datetime.fromtimestamp(now[0] - age, timezone.utc)}
+
+    repo.rows[ResearchQuery.normalize(["fresh"]).key] = row(10)
+    repo.rows[ResearchQuery.normalize(["old"]).key] = row(3600)  # past stale_ttl, within max_stale_on_error
+
+    async def main():
+        hit = await cache.get(["fresh"])
+        recomputed = await cache.get(["old"])
+        return hit, recomputed
+
+    hit, recomputed = asyncio.run(main())
+    assert hit.source == "database" and recomputed.source == "compute"
+    assert calls == [("old",)]
+    stats = cache.stats()
+    assert (stats["db_hits"], stats["misses"], stats["lookups"]) == (1, 1, 2)
@@ -0,0 +1,200 @@
+"""Retry, breaker and rate-limit behaviour of `src.openclaw.resilience` on a `FakeClock`."""
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+
+import pytest
+
+from src.openclaw.resilience import (
+    CircuitBreaker,
+    FakeClock,
+    ResilientCaller,
+    RetryPolicy,
+    TokenBucket,
+    backoff_delay,
+    classify,
+    parse_retry_after,
+)
+
+
+# -- backoff and classification ---------------------------------------------------
+def test_backoff_stays_within_exponential_bounds() -> None:
+    rng = random.Random(1)
+    for attempt in range(1, 12):
+        upper = min(10.0, 0.5 * 2 ** (attempt - 1))
+        delays = [backoff_delay(attempt, 0.5, 10.0, rng) for _ in range(200)]
+        assert all(0.0 <= d <= upper for d in delays)
+        assert max(delays) > upper / 2  # full jitter actually spreads over the range
+
+
+@pytest.mark.parametrize(
+    "code, decision",
+    [
+        (None, "retry"),
+        (200, "ok"),
+        (204, "ok"),
+        (400, "fail"),
+        (401, "fail"),
+        (404, "fail"),
+        (408, "retry"),
+        (425, "retry"),
+        (429, "retry"),
+        (500, "retry"),
+        (503, "retry"),
+        (599, "retry"),
+        (302, "fail"),
+    ],
+)
+def test_classify(code, decision) -> None:
+    assert classify(code) == decision
+
+
+def test_parse_retry_after() -> None:
+    clock = FakeClock()
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after(" 7 ") == 7.0
+    assert parse_retry_after("soon") is None
+    date = email.utils.formatdate(clock.wall() + 30, usegmt=True)
+    assert parse_retry_after(date, clock.wall()) == pytest.approx(30.0, abs=1.0)
+    past = email.utils.formatdate(clock.wall() - 30, usegmt=True)
+    assert parse_retry_after(past, clock.wall()) == 0.0
+
+
+# -- circuit breaker --------------------------------------------------------------
+def test_breaker_opens_half_opens_and_closes() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0, half_open_max=1, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    clock.advance(4.0)
+    assert breaker.retry_in() == pytest.approx(6.0)
+    clock.advance(6.0)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only half_open_max trials
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_half_open_failure_reopens() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+    breaker.record_failure()
+    clock.advance(5.0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in() == pytest.approx(5.0)
+
+
+# -- token bucket -----------------------------------------------------------------
+def test_token_bucket_refills_at_rate() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=4.0, clock=clock)
+    assert all(bucket.try_acquire() for _ in range(4))
+    assert not bucket.try_acquire()
+    clock.advance(0.5)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.advance(100.0)  # never refills past capacity
+    assert sum(bucket.try_acquire() for _ in range(10)) == 4
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_token_bucket_async_waits_on_clock() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=1.0, clock=clock)
+
+    async def main() -> list:
+        return [await bucket.acquire_async() for _ in range(3)]
+
+    assert asyncio.run(main()) == [0.0, pytest.approx(1.0), pytest.approx(1.0)]
+    assert clock.now == pytest.approx(2.0)
+
+
+# -- composed caller --------------------------------------------------------------
+def _script(*responses):
+    calls = iter(responses)
+    return lambda: next(calls)
+
+
+def test_caller_retries_then_succeeds() -> None:
+    clock = FakeClock()
+    caller = ResilientCaller(RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=4.0), clock=clock, rng=random.Random(3))
+    outcome = caller.call("/x", _script((503, None, {}), (None, None, {}), (200, "ok", {})))
+    assert (outcome.status, outcome.code, outcome.body, outcome.attempts) == ("ok", 200, "ok", 3)
+    assert 0.0 <= outcome.delays[0] <= 1.0 and 0.0 <= outcome.delays[1] <= 2.0
+    assert clock.sleeps == outcome.delays
+
+
+def test_caller_does_not_retry_permanent_errors() -> None:
+    clock = FakeClock()
+    caller = ResilientCaller(RetryPolicy(max_attempts=5), clock=clock)
+    outcome = caller.call("/x", _script((404, "missing", {})))
+    assert (outcome.status, outcome.attempts, clock.sleeps) == ("failed", 1, [])
+
+
+def test_caller_honours_retry_after_with_cap() -> None:
+    clock = FakeClock()
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, max_delay=0.1, max_retry_after=20.0)
+    caller = ResilientCaller(policy, clock=clock)
+    date = email.utils.formatdate(clock.wall() + 12, usegmt=True)
+    outcome = caller.call(
+        "/x",
+        _script((429, None, {"retry-after": "7"}), (503, None, {"Retry-After": date}), (200, "ok", {})),
+    )
+    assert outcome.status == "ok"
+    assert outcome.delays[0] == pytest.approx(7.0)
+    assert outcome.delays[1] == pytest.approx(12.0 - 7.0, abs=1.0)
+
+    clock = FakeClock()
+    caller = ResilientCaller(policy, clock=clock)
+    outcome = caller.call("/x", _script((429, None, {"Retry-After": "3600"}), (200, "ok", {})))
+    assert outcome.delays == [20.0]
+
+
+def test_caller_fails_fast_while_breaker_open() -> None:
+    clock = FakeClock()
+    caller = ResilientCaller(
+        RetryPolicy(max_attempts=2, base_delay=0.0, max_delay=0.0),
+        breaker_factory=lambda: CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=clock),
+        clock=clock,
+    )
+    calls = []
+
+    def down():
+        calls.append(1)
+        return 500, None, {}
+
+    assert caller.call("/a", down).status == "failed"
+    assert caller.call("/a", down).status == "circuit_open"
+    assert len(calls) == 2
+    # breakers are per endpoint
+    assert caller.call("/b", _script((200, "ok", {}))).status == "ok"
+    clock.advance(30.0)
+    assert caller.call("/a", _script((200, "ok", {}))).status == "ok"
+    assert caller.breaker("/a").state == CircuitBreaker.CLOSED
+
+
+def test_async_caller_matches_blocking() -> None:
+    clock = FakeClock()
+    caller = ResilientCaller(RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=1.0), clock=clock)
+    responses = iter([(429, None, {"Retry-After": "2"}), (200, "done", {})])
+
+    async def fn():
+        return next(responses)
+
+    outcome = asyncio.run(caller.acall("/x", fn))
+    assert (outcome.status, outcome.body, outcome.attempts) == ("ok", "done", 2)
+    assert outcome.delays == [2.0]
+    assert clock.now == pytest.approx(2.0)
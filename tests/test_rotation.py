@@ -0,0 +1,130 @@
+"""Retention and sizing in `src.logging.rotation.BackgroundRotatingFileHandler`."""
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.logging.rotation import BackgroundRotatingFileHandler
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# another process with the log open: waits for "go", then appends for a while
+WRITER = """
+import logging, sys, time
+from src.logging.rotation import BackgroundRotatingFileHandler
+handler = BackgroundRotatingFileHandler(sys.argv[1], compress="gzip")
+handler.setFormatter(logging.Formatter("%(message)s"))
+print("ready", flush=True)
+sys.stdin.readline()
+for i in range(40):
+    handler.emit(logging.LogRecord("t", logging.INFO, "", 0, f"late {i:05d}", None, None))
+    time.sleep(0.02)
+handler.close()
+"""
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, None, None)
+
+
+def _read(path: Path) -> str:
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return fh.read()
+    return path.read_text(encoding="utf-8")
+
+
+def test_prune_keeps_newest_segments_after_compression(tmp_path: Path) -> None:
+    handler = BackgroundRotatingFileHandler(
+        tmp_path / "app.log", max_bytes=200, backup_count=3, compress="gzip", compress_delay=0
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        for i in range(60):
+            handler.emit(_record(f"line {i:04d} " + "x" * 40))
+        handler.wait_idle()
+        segments = handler._segments()
+    finally:
+        handler.close()
+    assert len(segments) == 3
+    assert all(p.suffix == ".gz" for p in segments)
+    kept = "".join(_read(p) for p in segments) + _read(tmp_path / "app.log")
+    assert "line 0059" in kept
+    # everything after the oldest kept line survived; the oldest segments went
+    first = int(_read(segments[0]).split()[1])
+    assert first > 0
+    assert all(f"line {i:04d}" in kept for i in range(first, 60))
+
+
+@pytest.mark.parametrize("index", [False, True])
+def test_compression_keeps_rotation_order(tmp_path: Path, index: bool) -> None:
+    handler = BackgroundRotatingFileHandler(tmp_path / "app.log", compress="gzip", index=index, compress_delay=0)
+    try:
+        segments = [tmp_path / f"app.log.2026010{i}-120000.1" for i in range(1, 4)]
+        past = time.time() - 3600
+        for i, seg in enumerate(segments):
+            seg.write_text(f"segment {i}\n", encoding="utf-8")
+            os.utime(seg, (past + i, past + i))
+        # the oldest segment is compressed last, e.g. by a worker that fell behind
+        handler._compress(segments[0])
+        handler.wait_idle()
+        ordered = handler._segments()
+    finally:
+        handler.close()
+    assert [p.name.split(".gz")[0] for p in ordered] == [p.name for p in segments]
+
+
+def test_segment_names_are_never_reused(tmp_path: Path) -> None:
+    handler = BackgroundRotatingFileHandler(tmp_path / "app.log", max_bytes=0, backup_count=1, compress=None)
+    try:
+        names = []
+        for _ in range(5):
+            seg = handler._segment_name()
+            seg.write_text("x", encoding="utf-8")
+            names.append(seg.name)
+            for old in handler._segments()[:-1]:
+                old.unlink()
+    finally:
+        handler.close()
+    assert len(set(names)) == len(names)
+
+
+def test_size_counts_encoded_bytes(tmp_path: Path) -> None:
+    handler = BackgroundRotatingFileHandler(tmp_path / "app.log", compress=None)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        handler.emit(_record("héllo ✓"))
+        assert handler._size == (tmp_path / "app.log").stat().st_size
+    finally:
+        handler.close()
+
+
+def test_lines_from_other_processes_survive_compression(tmp_path: Path) -> None:
+    log = tmp_path / "shared.log"
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    child = subprocess.Popen(
+        [sys.executable, "-c", WRITER, str(log)], cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    handler = BackgroundRotatingFileHandler(log, compress="gzip")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        assert child.stdout.readline().strip() == "ready"
+        handler.emit(_record("early"))
+        handler.doRollover()  # the child keeps appending to the segment until it notices
+        child.stdin.write("go\n")
+        child.stdin.flush()
+        assert child.wait(timeout=60) == 0
+        handler.wait_idle()
+    finally:
+        handler.close()
+    text = "".join(_read(p) for p in tmp_path.iterdir() if p.name.startswith("shared.log") and not p.name.endswith(".lock"))
+    words = text.split()
+    assert "early" in words
+    assert sorted(words[i + 1] for i, w in enumerate(words) if w == "late") == [f"{i:05d}" for i in range(40)]
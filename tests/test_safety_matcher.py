@@ -0,0 +1,31 @@
+"""Aho-Corasick phrase matching in `src.agents.safety_agent.matcher.PhraseMatcher`."""
+from __future__ import annotations
+
+import random
+
+from src.agents.safety_agent.matcher import PhraseMatcher, tokenize
+
+
+def test_matches_whole_words_case_folded_in_text_order() -> None:
+    m = PhraseMatcher(["kill", "Self-Harm", "buy followers", "followers", "!!!"])
+    assert tokenize("Self-HARM, ok?") == ["self", "harm", "ok"]
+    assert m.find("skill killer") == []
+    assert m.find("KILL it; self harm; buy  Followers") == [0, 1, 2, 3]
+    assert m.counts("followers followers buy followers") == {3: 3, 2: 1}
+    assert m.find("!!!") == []  # phrases without word characters are ignored
+
+
+def test_nested_and_overlapping_phrases_agree_with_the_naive_scan() -> None:
+    m = PhraseMatcher(["a b a", "b a b", "a", "a a", "c a b a d"])
+    text = "a b a b a a c a b a d"
+    assert sorted(m.find(text)) == sorted(m.find_naive(text))
+
+
+def test_random_phrases_agree_with_the_naive_scan() -> None:
+    rng = random.Random(7)
+    vocab = ["ab", "ba", "a", "b", "c"]
+    for _ in range(200):
+        phrases = [" ".join(rng.choices(vocab, k=rng.randint(1, 4))) for _ in range(rng.randint(1, 12))]
+        m = PhraseMatcher(phrases)
+        text = " ".join(rng.choices(vocab, k=rng.randint(0, 40)))
+        assert sorted(m.find(text)) == sorted(m.find_naive(text)), (phrases, text)
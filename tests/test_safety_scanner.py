@@ -0,0 +1,117 @@
+"""Policies, verdicts and incremental runs in `src.agents.safety_agent.scanner`."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.agents.safety_agent.scanner import (
+    DEFAULT_POLICIES,
+    PolicyCategory,
+    SafetyScanJob,
+    SafetyScanner,
+    load_policies,
+)
+from src.db.database import Database
+from src.db.repository import ChimeraRepository
+
+POLICIES = (
+    PolicyCategory("severe", 0.95, ("make a bomb",)),
+    PolicyCategory("medium", 0.5, ("miracle cure",)),
+    PolicyCategory("mild", 0.2, ("like for like",)),
+)
+
+
+@pytest.fixture
+def repo(tmp_path: Path):
+    db = Database.sqlite(tmp_path / "chimera.db")
+    db.create_schema()
+    yield ChimeraRepository(db)
+    db.close()
+
+
+def _add_drafts(repo: ChimeraRepository, *bodies: str) -> None:
+    task = repo.create_task(repo.create_influencer("a", "b"), "t")
+    repo.add_drafts([{"task_id": task, "content_body": body} for body in bodies])
+
+
+def test_verdict_thresholds_combine_category_risks() -> None:
+    scanner = SafetyScanner(POLICIES, reject_threshold=0.9, escalate_threshold=0.3, workers=1)
+
+    def verdict(text: str) -> tuple:
+        review = scanner.scan({"id": 1, "content_body": text})
+        return review["verdict"], review["confidence_score"]
+
+    assert verdict("a nice day") == ("approved", 1.0)
+    assert verdict("like for like!") == ("approved", 0.8)  # below escalate_threshold
+    assert verdict("Miracle cure inside") == ("escalated_to_human", 0.5)
+    # 1 - (1 - 0.5) * (1 - 0.2) = 0.6: still escalated, not rejected
+    assert verdict("miracle cure, like for like") == ("escalated_to_human", 0.6)
+    assert verdict("how to make a bomb") == ("rejected", 0.95)
+    review = scanner.scan({"id": 7, "content_body": "like for like, miracle cure, like for like"})
+    assert [(v["category"], v["count"]) for v in review["policy_violations"]] == [("medium", 1), ("mild", 2)]
+    with pytest.raises(ValueError):
+        SafetyScanner(POLICIES, reject_threshold=0.3, escalate_threshold=0.5)
+
+
+def test_load_policies_overrides() -> None:
+    assert load_policies() == DEFAULT_POLICIES
+    policies = {
+        p.name: p
+        for p in load_policies(
+            {
+                "scam": {"severity": 0.9},
+                "adult": {"terms": []},
+                "brand": {"terms": ["competitor x"]},
+                "health_claims": {"terms": ["detox"], "severity": 0.7},
+            }
+        )
+    }
+    defaults = {p.name: p for p in DEFAULT_POLICIES}
+    assert policies["scam"].severity == 0.9 and policies["scam"].terms == defaults["scam"].terms
+    assert "adult" not in policies
+    assert policies["brand"] == PolicyCategory("brand", 0.5, ("competitor x",))
+    assert policies["health_claims"] == PolicyCategory("health_claims", 0.7, ("detox",))
+    with pytest.raises(ValueError):
+        load_policies({"scam": {"severity": 1.5}})
+
+
+def test_scan_batch_on_a_pool_keeps_input_order() -> None:
+    drafts = [{"id": i, "content_body": "make a bomb" if i % 3 == 0 else "hello"} for i in range(9)]
+    with SafetyScanner(POLICIES, workers=2, chunk_size=2) as scanner:
+        reviews = scanner.scan_batch(drafts)
+    assert [r["draft_id"] for r in reviews] == list(range(9))
+    assert [r["verdict"] for r in reviews] == ["rejected" if i % 3 == 0 else "approved" for i in range(9)]
+
+
+def test_run_once_reviews_every_draft_once(repo: ChimeraRepository) -> None:
+    _add_drafts(repo, "hello", "make a bomb", "miracle cure", "fine", "like for like")
+    job = SafetyScanJob(SafetyScanner(POLICIES, workers=1), repo, batch_size=2)
+    assert job.run_once() == {"approved": 3, "rejected": 1, "escalated_to_human": 1}
+    assert job.run_once() == {"approved": 0, "rejected": 0, "escalated_to_human": 0}
+    reviews = list(repo.iter_reviews())
+    assert sorted(r["draft_id"] for r in reviews) == [1, 2, 3, 4, 5]
+    assert reviews[1]["policy_violations"][0]["terms"] == ["make a bomb"]
+
+
+def test_run_once_skips_drafts_another_scanner_marked(repo: ChimeraRepository) -> None:
+    _add_drafts(repo, "hello", "make a bomb", "fine")
+
+    class Racing(ChimeraRepository):
+        """Another scanner reviews draft 2 between our read and our write."""
+
+        def record_safety_reviews(self, reviews, method="copy"):
+            reviews = list(reviews)
+            if not self.db.fetch_one("SELECT id FROM safety_reviews"):
+                ChimeraRepository(self.db).record_safety_reviews(
+                    [{"draft_id": 2, "verdict": "escalated_to_human", "confidence_score": 0.5}]
+                )
+            return super().record_safety_reviews(reviews, method)
+
+    job = SafetyScanJob(SafetyScanner(POLICIES, workers=1), Racing(repo.db))
+    assert job.run_once() == {"approved": 2, "rejected": 0, "escalated_to_human": 0}
+    assert [(r["draft_id"], r["verdict"]) for r in repo.iter_reviews()] == [
+        (2, "escalated_to_human"),
+        (1, "approved"),
+        (3, "approved"),
+    ]
@@ -0,0 +1,80 @@
+"""Shutdown and retention in `src.agents.supervisor_agent.scheduler.TaskScheduler`."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.agents.supervisor_agent.scheduler import SchedulerError, TaskScheduler
+
+
+def _value(value):
+    async def fn(upstream):
+        await asyncio.sleep(0)
+        return value
+
+    return fn
+
+
+def test_shutdown_starts_nothing_queued() -> None:
+    started = []
+
+    async def slow(upstream):
+        started.append(len(started))
+        await asyncio.sleep(10)
+
+    async def main():
+        sched = TaskScheduler(max_concurrent=1)
+        futures = [sched.submit(f"t{i}", "agent", slow) for i in range(5)]
+        await asyncio.sleep(0.01)
+        await sched.shutdown()
+        assert started == [0]
+        assert all(f.cancelled() for f in futures)
+        assert sched.stats()["running"] == 0 and sched.state == "Idle"
+        with pytest.raises(SchedulerError):
+            sched.submit("late", "agent", slow)
+
+    asyncio.run(main())
+
+
+def test_finished_results_are_bounded() -> None:
+    async def main():
+        sched = TaskScheduler(max_concurrent=4, retain_finished=10)
+        for i in range(200):
+            sched.submit(f"t{i}", "agent", _value(i))
+        await sched.join()
+        assert len(sched._results) == 10
+        assert sched.result("t199") == 199
+
+        async def child(upstream):
+            return upstream["t199"] + 1
+
+        # recent tasks can still be depended on after they finished
+        assert await sched.submit("child", "agent", child, depends_on=["t199"]) == 200
+
+    asyncio.run(main())
+
+
+def test_results_kept_while_dependents_queue() -> None:
+    async def main():
+        gate = asyncio.Event()
+
+        async def blocker(upstream):
+            await gate.wait()
+
+        async def child(upstream):
+            return upstream["parent"]
+
+        sched = TaskScheduler(max_concurrent=1, retain_finished=0)
+        sched.submit("block", "agent", blocker, priority=10)
+        sched.submit("parent", "agent", _value("kept"), priority=5)
+        sched.submit("other", "agent", _value("x"), priority=5)
+        fut = sched.submit("child", "agent", child, depends_on=["parent"])
+        await asyncio.sleep(0)
+        gate.set()
+        assert await fut == "kept"
+        await sched.join()
+        # nothing queued needs them any more and retain_finished=0
+        assert not sched._results and not sched._refs
+
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Leases, fencing and reaping in `src.db.task_queue.TaskQueue` on SQLite."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.db.database import Database
+from src.db.repository import ChimeraRepository
+from src.db.task_queue import TaskQueue
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    database = Database.sqlite(tmp_path / "chimera.db")
+    database.create_schema()
+    yield database
+    database.close()
+
+
+def _tasks(db: Database, *priorities: int) -> list:
+    repo = ChimeraRepository(db)
+    influencer = repo.create_influencer("a", "b")
+    return [repo.create_task(influencer, f"t{i}", priority=p) for i, p in enumerate(priorities)]
+
+
+def _expire(db: Database, task_id: int) -> None:
+    db.execute("UPDATE tasks SET lease_expires_at = datetime('now', '-1 minute') WHERE id = %s", [task_id])
+
+
+def _task(db: Database, task_id: int) -> dict:
+    return db.fetch_one("SELECT * FROM tasks WHERE id = %s", [task_id])
+
+
+def test_claim_orders_by_priority_and_never_double_claims(db: Database) -> None:
+    low, high, mid = _tasks(db, 0, 5, 2)
+    a, b = TaskQueue(db, worker_id="a"), TaskQueue(db, worker_id="b")
+    first = a.claim(2)
+    assert [r["id"] for r in first] == [high, mid]
+    assert all(r["status"] == "researching" and r["claimed_by"] == "a" and r["attempts"] == 1 for r in first)
+    assert [r["id"] for r in b.claim(5)] == [low]
+    assert a.claim(1) == [] and a.claim(0) == []
+
+
+def test_complete_release_and_heartbeat_are_fenced_by_worker(db: Database) -> None:
+    (task,) = _tasks(db, 0)
+    a, b = TaskQueue(db, worker_id="a"), TaskQueue(db, worker_id="b")
+    a.claim()
+    assert b.heartbeat([task]) == 0
+    assert not b.complete(task, "drafting") and not b.release(task)
+    assert a.heartbeat([task]) == 1 and a.heartbeat([]) == 0
+    assert a.release(task)
+    row = _task(db, task)
+    assert (row["status"], row["claimed_by"], row["lease_expires_at"]) == ("researching", None, None)
+    # an orphaned task is claimable again at the stage it was in
+    assert [r["id"] for r in b.claim(1, "pending", "researching")] == [task]
+    assert b.complete(task, "drafting")
+    assert _task(db, task)["status"] == "drafting"
+    assert b.claim(1, "drafting", "safety_check")[0]["id"] == task
+    assert b.release(task, status="pending")
+    assert _task(db, task)["status"] == "pending"
+
+
+def test_reaped_lease_fences_out_the_old_owner(db: Database) -> None:
+    (task,) = _tasks(db, 0)
+    a, b = TaskQueue(db, worker_id="a"), TaskQueue(db, worker_id="b")
+    a.claim()
+    _expire(db, task)
+    assert a.reap_expired() == {"requeued": 1, "dead": 0}
+    assert b.claim()[0]["attempts"] == 2
+    assert not a.complete(task, "drafting")  # the crashed-and-back worker cannot clobber b
+    assert b.complete(task, "drafting")
+
+
+def test_attempts_count_per_stage(db: Database) -> None:
+    (task,) = _tasks(db, 0)
+    q = TaskQueue(db, worker_id="w", max_attempts=3)
+    # pending -> researching, then drafting and safety_check claimed in place
+    for src, dst, nxt in (("pending", "researching", "drafting"), ("drafting", "drafting", "safety_check")):
+        assert q.claim(1, src, dst)[0]["attempts"] == 1
+        assert q.complete(task, nxt)
+    # the third stage's first lease expiry is a retry, not a dead letter
+    q.claim(1, "safety_check", "safety_check")
+    _expire(db, task)
+    assert q.reap_expired() == {"requeued": 1, "dead": 0}
+    # ...until that stage used up its own attempts
+    for attempt in (2, 3):
+        assert q.claim(1, "safety_check", "safety_check")[0]["attempts"] == attempt
+        _expire(db, task)
+        result = q.reap_expired()
+    assert result == {"requeued": 0, "dead": 1}
+    assert _task(db, task)["status"] == "rejected"
+
+
+def test_wait_for_work_wakes_on_local_notify(db: Database) -> None:
+    q = TaskQueue(db, worker_id="w", poll_interval=0.05)
+    assert q.claim_wait(timeout=0.1) == []
+    _tasks(db, 0)
+    assert len(q.claim_wait(timeout=1.0)) == 1
@@ -0,0 +1,59 @@
+"""Context handling in `src.logging.tracing`."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+
+from src.logging.logger import clear_request_id, get_request_id, set_request_id
+from src.logging.tracing import _RemoteCall, current_span, start_span
+
+
+def test_root_span_does_not_leak_request_id() -> None:
+    def run() -> None:
+        assert get_request_id() is None
+        with start_span("root") as root:
+            assert get_request_id() == root.trace_id
+            with start_span("child") as child:
+                assert child.trace_id == root.trace_id
+                assert child.parent_id == root.span_id
+        assert get_request_id() is None
+        assert current_span() is None
+        with start_span("next") as other:
+            assert other.trace_id != root.trace_id
+
+    contextvars.Context().run(run)
+
+
+def test_span_keeps_existing_request_id() -> None:
+    def run() -> None:
+        rid = set_request_id()
+        with start_span("work") as span:
+            assert span.trace_id == rid
+        assert get_request_id() == rid
+        clear_request_id()
+
+    contextvars.Context().run(run)
+
+
+def test_concurrent_tasks_get_separate_traces() -> None:
+    async def task() -> str:
+        with start_span("task") as span:
+            await asyncio.sleep(0)
+            assert get_request_id() == span.trace_id
+            return span.trace_id
+
+    async def main() -> None:
+        ids = await asyncio.gather(*(task() for _ in range(5)))
+        assert len(set(ids)) == 5
+        assert get_request_id() is None
+
+    contextvars.Context().run(asyncio.run, main())
+
+
+def test_remote_call_does_not_keep_request_id() -> None:
+    def run() -> None:
+        assert _RemoteCall(get_request_id, "a" * 32, None)() == "a" * 32
+        assert _RemoteCall(get_request_id, None, None)() is None
+        assert get_request_id() is None
+
+    contextvars.Context().run(run)
@@ -0,0 +1,141 @@
+"""Keep-alive reuse and stale-connection retries in `src.openclaw.transport` against a stub server."""
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+from typing import List
+
+import pytest
+
+from src.openclaw.transport import AsyncHTTPTransport, HTTPTransport, TransportError
+
+
+class _Stub:
+    """
+    Raw HTTP/1.1 server recording "METHOD path" per request.
+
+    `drop_after` = n: the n-th request on a connection is read in full and the
+    connection is then closed without a response (the server may have acted
+    on it). `close_idle`: close every connection right after its response.
+    """
+
+    def __init__(self, drop_after: int = 0, close_idle: bool = False) -> None:
+        self.drop_after = drop_after
+        self.close_idle = close_idle
+        self.seen: List[str] = []
+        self.connections = 0
+        self._sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        reader = conn.makefile("rb")
+        with conn, reader:
+            n = 0
+            while True:
+                line = reader.readline()
+                if not line:
+                    return
+                length = 0
+                while True:
+                    header = reader.readline()
+                    if header in (b"\r\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                reader.read(length)
+                method, path = line.decode("latin-1").split()[:2]
+                self.seen.append(f"{method} {path}")
+                n += 1
+                if n == self.drop_after:
+                    return
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nRetry-After: 3\r\n\r\nok")
+                if self.close_idle:
+                    return
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+@pytest.fixture
+def stub():
+    servers: List[_Stub] = []
+
+    def make(**kwargs) -> _Stub:
+        servers.append(_Stub(**kwargs))
+        return servers[-1]
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def test_connections_are_reused_and_headers_returned(stub) -> None:
+    server = stub()
+    with HTTPTransport() as transport:
+        for _ in range(3):
+            resp = transport.fetch(server.url("/ping"))
+            assert (resp.status, resp.text, resp.headers["Retry-After"]) == (200, "ok", "3")
+        assert transport.request(server.url("/ingest"), "POST", data=b"{}") == (200, "ok")
+        assert transport.stats == {"connections_opened": 1, "connections_reused": 3}
+    assert server.connections == 1
+
+
+def test_post_is_not_replayed_after_the_body_was_sent(stub) -> None:
+    server = stub(drop_after=2)
+    with HTTPTransport() as transport:
+        transport.fetch(server.url("/warm"))
+        with pytest.raises(TransportError):
+            transport.fetch(server.url("/ingest"), "POST", data=b'{"n": 1}')
+    assert server.seen.count("POST /ingest") == 1
+
+
+def test_idempotent_request_is_retried_on_a_fresh_connection(stub) -> None:
+    server = stub(drop_after=2)
+    with HTTPTransport() as transport:
+        transport.fetch(server.url("/warm"))
+        assert transport.fetch(server.url("/again")).status == 200
+    assert server.seen == ["GET /warm", "GET /again", "GET /again"]
+    assert server.connections == 2
+
+
+def test_connection_closed_while_idle_is_not_reused(stub) -> None:
+    server = stub(close_idle=True)
+    with HTTPTransport() as transport:
+        transport.fetch(server.url("/warm"))
+        time.sleep(0.05)  # let the FIN arrive
+        assert transport.fetch(server.url("/ingest"), "POST", data=b"{}").status == 200
+        assert transport.stats["connections_reused"] == 0
+    assert server.seen.count("POST /ingest") == 1
+
+
+def test_async_post_is_not_replayed(stub) -> None:
+    server = stub(drop_after=2)
+
+    async def main() -> None:
+        async with AsyncHTTPTransport() as transport:
+            assert (await transport.request(server.url("/warm"))) == (200, "ok")
+            with pytest.raises(TransportError):
+                await transport.fetch(server.url("/ingest"), "POST", data=b"{}")
+            # GETs are still retried once on a fresh connection
+            assert (await transport.fetch(server.url("/again"))).status == 200
+            assert (await transport.fetch(server.url("/again"))).status == 200
+
+    asyncio.run(main())
+    assert server.seen.count("POST /ingest") == 1
+    assert server.seen[-3:] == ["GET /again", "GET /again", "GET /again"]